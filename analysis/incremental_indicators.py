@@ -0,0 +1,415 @@
+"""
+增量技术指标计算模块
+
+逐根K线更新指标状态，每根K线 O(1)，计算口径与 TechnicalIndicators 保持一致
+"""
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+def _div(a, b):
+    """按 IEEE 语义做除法（与 pandas 一致，除零返回 inf/nan 而不抛异常）"""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class _RollingWindow:
+    """定长滚动窗口：均值（Kahan补偿求和）与样本标准差（Welford）"""
+
+    def __init__(self, size, with_std=False, values=None):
+        self.size = size
+        self.with_std = with_std
+        self.values = deque()
+        self.nan_count = 0
+        self.total = 0.0
+        self.compensation = 0.0
+        self.count = 0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        for value in values or []:
+            self.push(value)
+
+    def _add(self, value):
+        if value != value:
+            self.nan_count += 1
+            return
+        y = value - self.compensation
+        t = self.total + y
+        self.compensation = t - self.total - y
+        self.total = t
+        if self.with_std:
+            self.count += 1
+            delta = value - self.mean
+            self.mean += delta / self.count
+            self.ssqdm += delta * (value - self.mean)
+
+    def _remove(self, value):
+        if value != value:
+            self.nan_count -= 1
+            return
+        y = -value - self.compensation
+        t = self.total + y
+        self.compensation = t - self.total - y
+        self.total = t
+        if self.with_std:
+            self.count -= 1
+            if self.count:
+                delta = value - self.mean
+                self.mean -= delta / self.count
+                self.ssqdm -= delta * (value - self.mean)
+            else:
+                self.mean = 0.0
+                self.ssqdm = 0.0
+
+    def push(self, value):
+        """加入新值，窗口满时移出最旧的值"""
+        if len(self.values) == self.size:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        self._add(value)
+
+    @property
+    def ready(self):
+        return len(self.values) == self.size and self.nan_count == 0
+
+    def get_mean(self):
+        return self.total / self.size if self.ready else NAN
+
+    def get_std(self):
+        if not self.ready or self.size < 2:
+            return NAN
+        return math.sqrt(max(self.ssqdm, 0.0) / (self.size - 1))
+
+    def to_dict(self):
+        return {'size': self.size, 'with_std': self.with_std, 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['size'], state['with_std'], state['values'])
+
+
+class _RollingExtreme:
+    """定长滚动最大/最小值（单调队列，均摊 O(1)）"""
+
+    def __init__(self, size, mode='max', index=0, nan_index=None, queue=None):
+        self.size = size
+        self.mode = mode
+        self.index = index
+        self.nan_index = deque(nan_index or [])
+        self.queue = deque(tuple(item) for item in queue or [])
+
+    def _dominates(self, a, b):
+        return a >= b if self.mode == 'max' else a <= b
+
+    def push(self, value):
+        """加入新值并返回窗口极值（窗口未满或含空值时返回 NaN）"""
+        i = self.index
+        self.index += 1
+        expire = i - self.size
+
+        while self.queue and self.queue[0][0] <= expire:
+            self.queue.popleft()
+        while self.nan_index and self.nan_index[0] <= expire:
+            self.nan_index.popleft()
+
+        if value != value:
+            self.nan_index.append(i)
+        else:
+            while self.queue and self._dominates(value, self.queue[-1][1]):
+                self.queue.pop()
+            self.queue.append((i, value))
+
+        if self.index < self.size or self.nan_index or not self.queue:
+            return NAN
+        return self.queue[0][1]
+
+    def to_dict(self):
+        return {
+            'size': self.size,
+            'mode': self.mode,
+            'index': self.index,
+            'nan_index': list(self.nan_index),
+            'queue': [list(item) for item in self.queue],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['size'], state['mode'], state['index'], state['nan_index'], state['queue'])
+
+
+class _EWM:
+    """递推指数移动平均（与 pandas ewm(adjust=False) 的递推及空值处理一致）"""
+
+    def __init__(self, com, value=NAN, old_wt=1.0):
+        self.com = com
+        self.alpha = 1.0 / (1.0 + com)
+        self.value = value
+        self.old_wt = old_wt
+
+    def push(self, x):
+        if self.value == self.value:
+            self.old_wt *= 1.0 - self.alpha
+            if x == x:
+                if self.value != x:
+                    self.value = (self.old_wt * self.value + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif x == x:
+            self.value = x
+        return self.value
+
+    def to_dict(self):
+        return {'com': self.com, 'value': self.value, 'old_wt': self.old_wt}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['com'], state['value'], state['old_wt'])
+
+
+class IncrementalIndicators:
+    """增量技术指标计算器（单只股票）"""
+
+    def __init__(self, ma_periods=(5, 10, 20, 60), ema_periods=(12, 26),
+                 macd_fast=12, macd_slow=26, macd_signal=9, rsi_period=14,
+                 kdj_n=9, kdj_m1=3, kdj_m2=3, boll_period=20, boll_std=2,
+                 atr_period=14, volume_ma_periods=(5, 10)):
+        """
+        初始化增量指标计算器（默认参数与 TechnicalIndicators.calculate_all 一致）
+        """
+        self.params = {
+            'ma_periods': list(ma_periods),
+            'ema_periods': list(ema_periods),
+            'macd_fast': macd_fast,
+            'macd_slow': macd_slow,
+            'macd_signal': macd_signal,
+            'rsi_period': rsi_period,
+            'kdj_n': kdj_n,
+            'kdj_m1': kdj_m1,
+            'kdj_m2': kdj_m2,
+            'boll_period': boll_period,
+            'boll_std': boll_std,
+            'atr_period': atr_period,
+            'volume_ma_periods': list(volume_ma_periods),
+        }
+
+        # 趋势
+        self.ma = {p: _RollingWindow(p) for p in ma_periods}
+        spans = set(ema_periods) | {macd_fast, macd_slow}
+        self.ema = {p: _EWM((p - 1) / 2.0) for p in spans}
+        self.macd_signal_ewm = _EWM((macd_signal - 1) / 2.0)
+
+        # 震荡
+        self.gain = _RollingWindow(rsi_period)
+        self.loss = _RollingWindow(rsi_period)
+        self.low_n = _RollingExtreme(kdj_n, 'min')
+        self.high_n = _RollingExtreme(kdj_n, 'max')
+        self.kdj_k = _EWM(kdj_m1 - 1)
+        self.kdj_d = _EWM(kdj_m2 - 1)
+
+        # 波动
+        self.boll = _RollingWindow(boll_period, with_std=True)
+        self.tr = _RollingWindow(atr_period)
+
+        # 成交量
+        self.obv = NAN
+        self.volume_ma = {p: _RollingWindow(p) for p in volume_ma_periods}
+
+        self.prev_close = None
+        self.bar_count = 0
+        self.last_values = {}
+
+    @staticmethod
+    def _value(bar, key):
+        value = bar.get(key)
+        return NAN if value is None else float(value)
+
+    def update(self, bar):
+        """
+        输入一根新K线并返回最新指标
+
+        Args:
+            bar: dict，包含 'high', 'low', 'close', 'volume'
+
+        Returns:
+            dict: 最新指标值
+        """
+        high = self._value(bar, 'high')
+        low = self._value(bar, 'low')
+        close = self._value(bar, 'close')
+        volume = self._value(bar, 'volume')
+        prev_close = self.prev_close
+        first_bar = self.bar_count == 0
+        p = self.params
+        out = {}
+
+        # 趋势指标
+        for period, window in self.ma.items():
+            window.push(close)
+            out[f'ma{period}'] = window.get_mean()
+        for ewm in self.ema.values():
+            ewm.push(close)
+        for period in p['ema_periods']:
+            out[f'ema{period}'] = self.ema[period].value
+
+        macd = self.ema[p['macd_fast']].value - self.ema[p['macd_slow']].value
+        out['macd'] = macd
+        out['macd_signal'] = self.macd_signal_ewm.push(macd)
+        out['macd_hist'] = macd - out['macd_signal']
+
+        # 震荡指标（首根K线的涨跌按0计入，与 pandas where 的口径一致）
+        delta = NAN if first_bar else close - prev_close
+        self.gain.push(delta if delta > 0 else 0.0)
+        self.loss.push(-delta if delta < 0 else 0.0)
+        rs = _div(self.gain.get_mean(), self.loss.get_mean())
+        out['rsi'] = 100 - _div(100, 1 + rs)
+
+        low_n = self.low_n.push(low)
+        high_n = self.high_n.push(high)
+        rsv = _div(close - low_n, high_n - low_n) * 100
+        out['kdj_k'] = self.kdj_k.push(rsv)
+        out['kdj_d'] = self.kdj_d.push(out['kdj_k'])
+        out['kdj_j'] = 3 * out['kdj_k'] - 2 * out['kdj_d']
+
+        # 波动指标
+        self.boll.push(close)
+        middle = self.boll.get_mean()
+        std = self.boll.get_std()
+        out['boll_upper'] = middle + std * p['boll_std']
+        out['boll_middle'] = middle
+        out['boll_lower'] = middle - std * p['boll_std']
+
+        ranges = [high - low]
+        if not first_bar:
+            ranges += [abs(high - prev_close), abs(low - prev_close)]
+        ranges = [r for r in ranges if r == r]
+        self.tr.push(max(ranges) if ranges else NAN)
+        out['atr'] = self.tr.get_mean()
+
+        # 成交量指标
+        if first_bar:
+            self.obv = volume
+        elif close > prev_close:
+            self.obv += volume
+        elif close < prev_close:
+            self.obv -= volume
+        out['obv'] = self.obv
+        for period, window in self.volume_ma.items():
+            window.push(volume)
+            out[f'volume_ma{period}'] = window.get_mean()
+
+        self.prev_close = close
+        self.bar_count += 1
+        self.last_values = out
+        return out
+
+    def recursive_columns(self):
+        """
+        续算所需的递推状态对应的指标列（包括 MACD 快慢线所用的 EMA）
+
+        Returns:
+            list: 列名
+        """
+        return [f'ema{period}' for period in sorted(self.ema)] + ['macd_signal', 'kdj_k', 'kdj_d', 'obv']
+
+    def restore_recursive(self, values):
+        """
+        用已保存的指标值覆盖递推状态（EMA、MACD信号线、KDJ、OBV）
+
+        滚动窗口类指标只依赖最近N根K线，可通过回放预热窗口恢复；
+        递推类指标依赖全部历史，需从上次保存的结果续算。
+
+        Args:
+            values: dict，包含 recursive_columns() 中的全部键
+        """
+        states = {
+            'macd_signal': self.macd_signal_ewm,
+            'kdj_k': self.kdj_k,
+            'kdj_d': self.kdj_d,
+        }
+        for period, ewm in self.ema.items():
+            states[f'ema{period}'] = ewm
+
+        for key, ewm in states.items():
+            ewm.value = float(values[key])
+            ewm.old_wt = 1.0
+        self.obv = float(values['obv'])
+
+    @classmethod
+    def from_history(cls, df, **params):
+        """
+        用历史K线预热状态
+
+        Args:
+            df: DataFrame，包含 ['high', 'low', 'close', 'volume'] 列，按时间升序
+            **params: 指标参数
+
+        Returns:
+            IncrementalIndicators实例
+        """
+        calculator = cls(**params)
+        for bar in df[['high', 'low', 'close', 'volume']].to_dict('records'):
+            calculator.update(bar)
+        return calculator
+
+    # ==================== 状态序列化 ====================
+
+    def to_dict(self):
+        """
+        导出状态（可直接 json.dumps）
+
+        Returns:
+            dict: 状态字典
+        """
+        return {
+            'params': self.params,
+            'ma': {str(k): v.to_dict() for k, v in self.ma.items()},
+            'ema': {str(k): v.to_dict() for k, v in self.ema.items()},
+            'macd_signal_ewm': self.macd_signal_ewm.to_dict(),
+            'gain': self.gain.to_dict(),
+            'loss': self.loss.to_dict(),
+            'low_n': self.low_n.to_dict(),
+            'high_n': self.high_n.to_dict(),
+            'kdj_k': self.kdj_k.to_dict(),
+            'kdj_d': self.kdj_d.to_dict(),
+            'boll': self.boll.to_dict(),
+            'tr': self.tr.to_dict(),
+            'obv': self.obv,
+            'volume_ma': {str(k): v.to_dict() for k, v in self.volume_ma.items()},
+            'prev_close': self.prev_close,
+            'bar_count': self.bar_count,
+            'last_values': self.last_values,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        从状态字典恢复计算器
+
+        Args:
+            state: to_dict() 导出的状态
+
+        Returns:
+            IncrementalIndicators实例
+        """
+        calculator = cls(**state['params'])
+        calculator.ma = {int(k): _RollingWindow.from_dict(v) for k, v in state['ma'].items()}
+        calculator.ema = {int(k): _EWM.from_dict(v) for k, v in state['ema'].items()}
+        calculator.macd_signal_ewm = _EWM.from_dict(state['macd_signal_ewm'])
+        calculator.gain = _RollingWindow.from_dict(state['gain'])
+        calculator.loss = _RollingWindow.from_dict(state['loss'])
+        calculator.low_n = _RollingExtreme.from_dict(state['low_n'])
+        calculator.high_n = _RollingExtreme.from_dict(state['high_n'])
+        calculator.kdj_k = _EWM.from_dict(state['kdj_k'])
+        calculator.kdj_d = _EWM.from_dict(state['kdj_d'])
+        calculator.boll = _RollingWindow.from_dict(state['boll'])
+        calculator.tr = _RollingWindow.from_dict(state['tr'])
+        calculator.obv = state['obv']
+        calculator.volume_ma = {int(k): _RollingWindow.from_dict(v) for k, v in state['volume_ma'].items()}
+        calculator.prev_close = state['prev_close']
+        calculator.bar_count = state['bar_count']
+        calculator.last_values = state['last_values']
+        return calculator
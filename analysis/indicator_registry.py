@@ -0,0 +1,381 @@
+"""
+技术指标注册表
+
+每个指标声明自己的参数、依赖的中间量和输出列；IndicatorPipeline 根据配置
+（config.yaml 中的 analysis.technical_indicators）构建依赖图，共享的中间量
+（EMA、均线、真实波幅、滚动最高/最低价、差分等）只计算一次，未启用的指标不计算。
+
+所有计算既适用于单只股票的 Series，也适用于 (K线序号 × 股票) 的宽表 DataFrame。
+"""
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from analysis import kernels
+
+
+# 与 technical_indicators 表字段对应的默认指标集合
+DEFAULT_INDICATORS = [
+    {'name': 'MA', 'params': {'periods': [5, 10, 20, 60]}},
+    {'name': 'EMA', 'params': {'periods': [12, 26]}},
+    {'name': 'MACD', 'params': {'fast': 12, 'slow': 26, 'signal': 9}},
+    {'name': 'RSI', 'params': {'period': 14}},
+    {'name': 'KDJ', 'params': {'n': 9, 'm1': 3, 'm2': 3}},
+    {'name': 'BOLL', 'params': {'period': 20, 'std': 2}},
+    {'name': 'ATR', 'params': {'period': 14}},
+    {'name': 'OBV'},
+    {'name': 'VOLUME_MA', 'params': {'periods': [5, 10]}},
+]
+
+# 原始输入列
+INPUT_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _like(template, values):
+    """用 numpy 结果构造与模板同形的 Series/DataFrame"""
+    if isinstance(template, pd.DataFrame):
+        return pd.DataFrame(values, index=template.index, columns=template.columns)
+    return pd.Series(values, index=template.index)
+
+
+def _kernel(func):
+    """把 kernels 中的数组函数包装为作用于 Series/DataFrame 的函数"""
+    def apply(*args):
+        arrays = [arg.to_numpy(dtype=np.float64) if isinstance(arg, (pd.Series, pd.DataFrame)) else arg
+                  for arg in args]
+        return _like(args[0], func(*arrays))
+    return apply
+
+
+# ==================== 中间量 ====================
+
+# 中间量的键为元组: (操作, 源, 参数...)，源为输入列名或另一个中间量的键
+NODE_OPS = {
+    'ema': lambda src, span: src.ewm(span=span, adjust=False).mean(),
+    'sma': _kernel(kernels.rolling_mean),
+    'std': lambda src, window: src.rolling(window=window).std(),
+    'rolling_min': _kernel(kernels.rolling_min),
+    'rolling_max': _kernel(kernels.rolling_max),
+    'mean_deviation': _kernel(kernels.rolling_mean_deviation),
+    'diff': lambda src: src.diff(),
+    'shift': lambda src, periods: src.shift(periods),
+}
+
+# 由多个输入组合而成的中间量: 键 -> (依赖键列表, 计算函数)
+COMPOSITE_NODES = {
+    ('true_range',): (
+        [('col', 'high'), ('col', 'low'), ('col', 'close')],
+        _kernel(kernels.true_range)
+    ),
+    ('typical_price',): (
+        [('col', 'high'), ('col', 'low'), ('col', 'close')],
+        lambda high, low, close: (high + low + close) / 3
+    ),
+}
+
+
+def node_key(source):
+    """把输入列名规范化为中间量键"""
+    return source if isinstance(source, tuple) else ('col', source)
+
+
+def node_dependencies(key):
+    """中间量的直接依赖"""
+    if key[0] == 'col':
+        return []
+    if key in COMPOSITE_NODES:
+        return COMPOSITE_NODES[key][0]
+    return [node_key(key[1])]
+
+
+# ==================== 指标注册 ====================
+
+class IndicatorSpec:
+    """指标声明：参数默认值、依赖的中间量、输出列和计算函数"""
+
+    def __init__(self, name, compute, defaults=None, inputs=None, outputs=None):
+        """
+        Args:
+            name: 指标名（与配置中的 name 一致，大写）
+            compute: 计算函数 (nodes, params) -> {输出列: 值}，nodes(key) 返回中间量
+            defaults: 参数默认值
+            inputs: 函数 params -> 依赖的中间量键列表
+            outputs: 函数 params -> 输出列名列表
+        """
+        self.name = name
+        self.compute = compute
+        self.defaults = defaults or {}
+        self.inputs = inputs or (lambda p: [])
+        self.outputs = outputs or (lambda p: [name.lower()])
+
+    def resolve_params(self, params=None):
+        """合并默认参数"""
+        resolved = dict(self.defaults)
+        resolved.update(params or {})
+        return resolved
+
+
+INDICATOR_REGISTRY = {}
+
+
+def register_indicator(name, defaults=None, inputs=None, outputs=None):
+    """
+    注册指标（装饰器）
+
+    示例:
+        @register_indicator('MA', defaults={'periods': [5]},
+                            inputs=lambda p: [('sma', 'close', n) for n in p['periods']],
+                            outputs=lambda p: [f'ma{n}' for n in p['periods']])
+        def _ma(nodes, p):
+            return {f'ma{n}': nodes(('sma', 'close', n)) for n in p['periods']}
+    """
+    def decorator(compute):
+        INDICATOR_REGISTRY[name.upper()] = IndicatorSpec(name.upper(), compute, defaults, inputs, outputs)
+        return compute
+    return decorator
+
+
+# ---------- 趋势指标 ----------
+
+@register_indicator(
+    'MA', defaults={'periods': [5, 10, 20, 60]},
+    inputs=lambda p: [('sma', 'close', n) for n in p['periods']],
+    outputs=lambda p: [f'ma{n}' for n in p['periods']]
+)
+def _ma(nodes, p):
+    return {f'ma{n}': nodes(('sma', 'close', n)) for n in p['periods']}
+
+
+@register_indicator(
+    'EMA', defaults={'periods': [12, 26]},
+    inputs=lambda p: [('ema', 'close', n) for n in p['periods']],
+    outputs=lambda p: [f'ema{n}' for n in p['periods']]
+)
+def _ema(nodes, p):
+    return {f'ema{n}': nodes(('ema', 'close', n)) for n in p['periods']}
+
+
+@register_indicator(
+    'MACD', defaults={'fast': 12, 'slow': 26, 'signal': 9},
+    inputs=lambda p: [('ema', 'close', p['fast']), ('ema', 'close', p['slow'])],
+    outputs=lambda p: ['macd', 'macd_signal', 'macd_hist']
+)
+def _macd(nodes, p):
+    macd = nodes(('ema', 'close', p['fast'])) - nodes(('ema', 'close', p['slow']))
+    signal = macd.ewm(span=p['signal'], adjust=False).mean()
+    return {'macd': macd, 'macd_signal': signal, 'macd_hist': macd - signal}
+
+
+# ---------- 震荡指标 ----------
+
+@register_indicator(
+    'RSI', defaults={'period': 14},
+    inputs=lambda p: [('diff', 'close')],
+    outputs=lambda p: ['rsi']
+)
+def _rsi(nodes, p):
+    delta = nodes(('diff', 'close'))
+    rolling_mean = _kernel(kernels.rolling_mean)
+    gain = rolling_mean(delta.where(delta > 0, 0), p['period'])
+    loss = rolling_mean(-delta.where(delta < 0, 0), p['period'])
+    rs = gain / loss
+    return {'rsi': 100 - (100 / (1 + rs))}
+
+
+@register_indicator(
+    'KDJ', defaults={'n': 9, 'm1': 3, 'm2': 3},
+    inputs=lambda p: [('rolling_min', 'low', p['n']), ('rolling_max', 'high', p['n']), ('col', 'close')],
+    outputs=lambda p: ['kdj_k', 'kdj_d', 'kdj_j']
+)
+def _kdj(nodes, p):
+    low_n = nodes(('rolling_min', 'low', p['n']))
+    high_n = nodes(('rolling_max', 'high', p['n']))
+    rsv = (nodes(('col', 'close')) - low_n) / (high_n - low_n) * 100
+    k = rsv.ewm(com=p['m1'] - 1, adjust=False).mean()
+    d = k.ewm(com=p['m2'] - 1, adjust=False).mean()
+    return {'kdj_k': k, 'kdj_d': d, 'kdj_j': 3 * k - 2 * d}
+
+
+@register_indicator(
+    'CCI', defaults={'period': 14},
+    inputs=lambda p: [('typical_price',),
+                      ('sma', ('typical_price',), p['period']),
+                      ('mean_deviation', ('typical_price',), p['period'])],
+    outputs=lambda p: ['cci']
+)
+def _cci(nodes, p):
+    tp = nodes(('typical_price',))
+    tp_ma = nodes(('sma', ('typical_price',), p['period']))
+    mean_dev = nodes(('mean_deviation', ('typical_price',), p['period']))
+    return {'cci': (tp - tp_ma) / (0.015 * mean_dev)}
+
+
+# ---------- 波动指标 ----------
+
+@register_indicator(
+    'BOLL', defaults={'period': 20, 'std': 2},
+    inputs=lambda p: [('sma', 'close', p['period']), ('std', 'close', p['period'])],
+    outputs=lambda p: ['boll_middle', 'boll_upper', 'boll_lower']
+)
+def _boll(nodes, p):
+    middle = nodes(('sma', 'close', p['period']))
+    std = nodes(('std', 'close', p['period']))
+    return {
+        'boll_middle': middle,
+        'boll_upper': middle + (std * p['std']),
+        'boll_lower': middle - (std * p['std']),
+    }
+
+
+@register_indicator(
+    'ATR', defaults={'period': 14},
+    inputs=lambda p: [('sma', ('true_range',), p['period'])],
+    outputs=lambda p: ['atr']
+)
+def _atr(nodes, p):
+    return {'atr': nodes(('sma', ('true_range',), p['period']))}
+
+
+# ---------- 成交量指标 ----------
+
+@register_indicator(
+    'OBV',
+    inputs=lambda p: [('col', 'close'), ('col', 'volume')],
+    outputs=lambda p: ['obv']
+)
+def _obv(nodes, p):
+    return {'obv': _kernel(kernels.obv)(nodes(('col', 'close')), nodes(('col', 'volume')))}
+
+
+@register_indicator(
+    'VOLUME_MA', defaults={'periods': [5, 10]},
+    inputs=lambda p: [('sma', 'volume', n) for n in p['periods']],
+    outputs=lambda p: [f'volume_ma{n}' for n in p['periods']]
+)
+def _volume_ma(nodes, p):
+    return {f'volume_ma{n}': nodes(('sma', 'volume', n)) for n in p['periods']}
+
+
+# ==================== 计算流水线 ====================
+
+def load_indicator_config():
+    """
+    读取配置中的指标列表（analysis.technical_indicators），配置未初始化时返回默认集合
+
+    Returns:
+        list: [{'name': ..., 'params': {...}}, ...]
+    """
+    try:
+        from utils.config_loader import get_config_loader
+        indicators = get_config_loader().get('analysis.technical_indicators')
+    except RuntimeError:
+        indicators = None
+    return indicators or DEFAULT_INDICATORS
+
+
+class IndicatorPipeline:
+    """按依赖图计算一组指标"""
+
+    def __init__(self, indicators=None):
+        """
+        Args:
+            indicators: 指标配置列表 [{'name': ..., 'params': {...}}]，为空时读取配置
+        """
+        if indicators is None:
+            indicators = load_indicator_config()
+
+        self.indicators = []
+        for item in indicators:
+            name = item['name'].upper()
+            spec = INDICATOR_REGISTRY.get(name)
+            if spec is None:
+                logger.warning(f"未注册的技术指标: {name}，已跳过")
+                continue
+            self.indicators.append((spec, spec.resolve_params(item.get('params'))))
+
+        self.output_columns = []
+        for spec, params in self.indicators:
+            for col in spec.outputs(params):
+                if col not in self.output_columns:
+                    self.output_columns.append(col)
+
+    def params(self, name):
+        """返回指定指标的参数（未启用时返回None）"""
+        for spec, params in self.indicators:
+            if spec.name == name.upper():
+                return params
+        return None
+
+    def plan(self):
+        """
+        按拓扑顺序列出需要计算的中间量（去重）
+
+        Returns:
+            list: 中间量键列表
+        """
+        order = []
+        visited = set()
+
+        def visit(key):
+            if key in visited:
+                return
+            visited.add(key)
+            for dep in node_dependencies(key):
+                visit(dep)
+            order.append(key)
+
+        for spec, params in self.indicators:
+            for key in spec.inputs(params):
+                visit(node_key(key))
+        return order
+
+    def compute(self, data):
+        """
+        计算全部指标
+
+        Args:
+            data: 包含 open/high/low/close/volume 的 DataFrame（单只股票），
+                  或 列名 -> Series/宽表DataFrame 的字典（面板）
+
+        Returns:
+            dict: 输出列 -> Series/宽表DataFrame
+        """
+        nodes = {}
+        for key in self.plan():
+            if key[0] == 'col':
+                nodes[key] = data[key[1]]
+            elif key in COMPOSITE_NODES:
+                deps, func = COMPOSITE_NODES[key]
+                nodes[key] = func(*[nodes[dep] for dep in deps])
+            else:
+                nodes[key] = NODE_OPS[key[0]](nodes[node_key(key[1])], *key[2:])
+
+        out = {}
+        for spec, params in self.indicators:
+            out.update(spec.compute(nodes.__getitem__, params))
+
+        logger.debug(f"指标计算完成: {[spec.name for spec, _ in self.indicators]}（中间量 {len(nodes)} 个）")
+        return out
+
+    def incremental_params(self):
+        """
+        转换为 IncrementalIndicators 的构造参数（未启用的指标使用其默认值）
+
+        Returns:
+            dict: 关键字参数
+        """
+        mapping = {
+            'MA': {'periods': 'ma_periods'},
+            'EMA': {'periods': 'ema_periods'},
+            'MACD': {'fast': 'macd_fast', 'slow': 'macd_slow', 'signal': 'macd_signal'},
+            'RSI': {'period': 'rsi_period'},
+            'KDJ': {'n': 'kdj_n', 'm1': 'kdj_m1', 'm2': 'kdj_m2'},
+            'BOLL': {'period': 'boll_period', 'std': 'boll_std'},
+            'ATR': {'period': 'atr_period'},
+            'VOLUME_MA': {'periods': 'volume_ma_periods'},
+        }
+        kwargs = {}
+        for spec, params in self.indicators:
+            for param, arg in mapping.get(spec.name, {}).items():
+                kwargs[arg] = params[param]
+        return kwargs
@@ -0,0 +1,131 @@
+"""
+技术指标计算内核
+
+纯 NumPy 实现，输入为连续的 float64 数组：一维为单只股票，二维为 (K线序号 × 股票) 宽表，
+均沿第0维计算。空值语义与 pandas 的 rolling(window) 一致：窗口内有空值时结果为空。
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def as_float64(values):
+    """转换为连续的 float64 数组（已满足时不复制）"""
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _window_sum(cumsum, window):
+    """由前缀和得到长度为 window 的窗口和（前 window-1 行为空）"""
+    out = np.full(cumsum.shape, np.nan)
+    if len(cumsum) >= window:
+        out[window - 1] = cumsum[window - 1]
+        out[window:] = cumsum[window:] - cumsum[:-window]
+    return out
+
+
+def rolling_mean(values, window):
+    """
+    滚动均值（前缀和实现，O(n)，与窗口长度无关）
+
+    窗口内数值完全相同时直接返回该值，与 pandas 的处理一致，避免前缀和相减引入的末位误差
+
+    Args:
+        values: float64 数组
+        window: 窗口长度
+
+    Returns:
+        ndarray: 与输入同形
+    """
+    values = as_float64(values)
+    isnan = np.isnan(values)
+
+    total = _window_sum(np.cumsum(np.where(isnan, 0.0, values), axis=0), window)
+    nan_count = _window_sum(np.cumsum(isnan, axis=0, dtype=np.int64), window)
+    out = total / window
+    out[nan_count != 0] = np.nan
+
+    # 窗口内无变化（常数窗口）时精确返回原值
+    changed = np.zeros(values.shape, dtype=np.int64)
+    changed[1:] = values[1:] != values[:-1]
+    n_changes = np.full(values.shape, -1)
+    if len(values) >= window:
+        changes = np.cumsum(changed, axis=0)
+        n_changes[window - 1:] = changes[window - 1:] - changes[:len(values) - window + 1]
+    constant = (n_changes == 0) & ~isnan
+    out[constant] = values[constant]
+    return out
+
+
+def _rolling_reduce(values, window, reducer):
+    """基于滑动窗口视图的滚动归约（窗口内有空值时为空）"""
+    values = as_float64(values)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window, axis=0)
+        out[window - 1:] = reducer(windows, axis=-1)
+    return out
+
+
+def rolling_min(values, window):
+    """滚动最小值"""
+    return _rolling_reduce(values, window, np.min)
+
+
+def rolling_max(values, window):
+    """滚动最大值"""
+    return _rolling_reduce(values, window, np.max)
+
+
+def rolling_mean_deviation(values, window):
+    """滚动平均绝对偏差（CCI 使用，按窗口内顺序累加，一维/二维结果一致）"""
+    values = as_float64(values)
+    out = np.full(values.shape, np.nan)
+    n = len(values) - window + 1
+    if n > 0:
+        total = np.zeros((n,) + values.shape[1:])
+        for offset in range(window):
+            total += values[offset:offset + n]
+        mean = total / window
+
+        deviation = np.zeros_like(mean)
+        for offset in range(window):
+            deviation += np.abs(values[offset:offset + n] - mean)
+        out[window - 1:] = deviation / window
+    return out
+
+
+def true_range(high, low, close):
+    """
+    真实波幅: max(最高-最低, |最高-前收|, |最低-前收|)，忽略空值
+
+    Args:
+        high, low, close: float64 数组
+
+    Returns:
+        ndarray: 与输入同形（首行前收为空，取最高-最低）
+    """
+    high, low, close = as_float64(high), as_float64(low), as_float64(close)
+    prev_close = np.empty_like(close)
+    prev_close[:1] = np.nan
+    prev_close[1:] = close[:-1]
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+
+def obv(close, volume):
+    """
+    能量潮: 按收盘价涨跌方向累加成交量，首根K线取当日成交量
+
+    Args:
+        close, volume: float64 数组
+
+    Returns:
+        ndarray: 与输入同形
+    """
+    close, volume = as_float64(close), as_float64(volume)
+    diff = close[1:] - close[:-1]
+    # 涨为1、跌为-1，平盘或空值为0（平盘时不累加，即使成交量为空）
+    direction = (diff > 0).astype(np.int8) - (diff < 0).astype(np.int8)
+
+    flow = np.empty_like(volume)
+    flow[:1] = volume[:1]
+    flow[1:] = np.where(direction != 0, direction * volume[1:], 0.0)
+    return np.cumsum(flow, axis=0)
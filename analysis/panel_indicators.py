@@ -0,0 +1,113 @@
+"""
+截面面板技术指标计算模块
+
+一次性为整个股票池计算技术指标，与 TechnicalIndicators 共用指标注册表，结果与逐只计算完全一致
+"""
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from analysis.indicator_registry import IndicatorPipeline
+
+
+class PanelIndicators:
+    """截面面板技术指标计算器"""
+
+    def __init__(self, df, chunk_size=1000, indicators=None):
+        """
+        初始化面板指标计算器
+
+        Args:
+            df: 长表 DataFrame，必须包含 ['symbol', 'trade_date', 'open', 'high', 'low', 'close', 'volume'] 列
+            chunk_size: 每批计算的股票数量（控制宽表内存占用）
+            indicators: 指标配置列表，为空时读取 analysis.technical_indicators 配置
+        """
+        self._validate_data(df)
+        self.pipeline = IndicatorPipeline(indicators)
+        self.columns = self.pipeline.output_columns
+        self.df = df.sort_values(['symbol', 'trade_date'], kind='mergesort').reset_index(drop=True)
+        self.chunk_size = max(1, int(chunk_size))
+
+        # 按股票对齐：每只股票自己的第 i 根K线落在宽表第 i 行，
+        # 这样宽表上的 rolling/ewm 与单只股票的计算完全相同（停牌日不会引入空洞）
+        self.codes, self.symbols = pd.factorize(self.df['symbol'], sort=True)
+        self.positions = self.df.groupby('symbol', sort=False).cumcount().to_numpy()
+
+    @staticmethod
+    def _validate_data(df):
+        """验证数据格式"""
+        required_columns = ['symbol', 'trade_date', 'open', 'high', 'low', 'close', 'volume']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+
+        if missing_columns:
+            raise ValueError(f"数据缺少必要的列: {missing_columns}")
+
+        if len(df) == 0:
+            raise ValueError("数据为空")
+
+    # ==================== 宽表转换 ====================
+
+    def _to_wide(self, column, rows, codes, n_rows, n_cols):
+        """把长表中的一列散布到 (K线序号 × 股票) 宽表"""
+        wide = np.full((n_rows, n_cols), np.nan)
+        wide[self.positions[rows], codes] = self.df[column].to_numpy(dtype=float)[rows]
+        return pd.DataFrame(wide)
+
+    # ==================== 指标计算 ====================
+
+    def _input_columns(self):
+        """依赖图中用到的原始输入列"""
+        return [key[1] for key in self.pipeline.plan() if key[0] == 'col']
+
+    def calculate_all(self):
+        """
+        计算所有股票的全部技术指标
+
+        Returns:
+            DataFrame: 输入长表（按 symbol、trade_date 排序）附加全部指标列
+        """
+        n_symbols = len(self.symbols)
+        logger.info(f"开始面板计算技术指标: {n_symbols} 只股票, {len(self.df)} 条K线")
+
+        results = {col: np.full(len(self.df), np.nan) for col in self.columns}
+        inputs = self._input_columns()
+
+        for start in range(0, n_symbols, self.chunk_size):
+            stop = min(start + self.chunk_size, n_symbols)
+            rows = np.flatnonzero((self.codes >= start) & (self.codes < stop))
+            codes = self.codes[rows] - start
+            n_rows = int(self.positions[rows].max()) + 1
+            n_cols = stop - start
+
+            wide = {
+                col: self._to_wide(col, rows, codes, n_rows, n_cols)
+                for col in inputs
+            }
+            out = self.pipeline.compute(wide)
+
+            positions = self.positions[rows]
+            for col in self.columns:
+                results[col][rows] = out[col].to_numpy()[positions, codes]
+
+            logger.debug(f"面板指标计算进度: {stop}/{n_symbols}")
+
+        df = self.df.copy()
+        for col in self.columns:
+            df[col] = results[col]
+
+        logger.info("面板技术指标计算完成")
+        return df
+
+    def get_latest_indicators(self, df=None):
+        """
+        获取每只股票最新一根K线的指标
+
+        Args:
+            df: calculate_all() 的结果，为空时重新计算
+
+        Returns:
+            DataFrame: 以 symbol 为索引的最新指标
+        """
+        if df is None:
+            df = self.calculate_all()
+        return df.groupby('symbol').tail(1).set_index('symbol')[['trade_date'] + self.columns]
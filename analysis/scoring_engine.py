@@ -14,9 +14,9 @@ class ScoringEngine:
         初始化评分引擎
         
         Args:
-            df: DataFrame，包含价格数据和技术指标
+            df: DataFrame，包含价格数据和技术指标（只读，不复制）
         """
-        self.df = df.copy()
+        self.df = df
         self.scores = {}
     
     # ==================== 技术指标评分（30分） ====================
@@ -357,7 +357,405 @@ class ScoringEngine:
             'max_score': 100
         }
         
-        logger.info(f"总分: {total_score}/100 (技术:{technical_score}, 量价:{volume_score}, 趋势:{trend_score}, 形态:{pattern_score})")
+        logger.debug(f"总分: {total_score}/100 (技术:{technical_score}, 量价:{volume_score}, 趋势:{trend_score}, 形态:{pattern_score})")
         
         return result
 
+
+
+class PanelScoringEngine:
+    """
+    全市场截面评分引擎
+
+    与 ScoringEngine 的评分规则完全一致，但一次对所有股票做向量化计算：
+    - calculate_scores(): 每只股票最新一根K线的评分（选股）
+    - calculate_score_history(): 每只股票每个交易日的评分（研究、回测）
+    """
+
+    # 评分所需的最近K线数（量价评分使用最近5天）
+    LOOKBACK = 5
+
+    SCORE_COLUMNS = ['total_score', 'technical_score', 'volume_score', 'trend_score', 'pattern_score']
+
+    def __init__(self, panel):
+        """
+        初始化截面评分引擎
+
+        Args:
+            panel: DataFrame，MultiIndex (symbol, trade_date) 且按时间升序（load_universe_panel 的结果），
+                   包含价格数据和技术指标
+        """
+        self.panel = panel
+        self.bar_count = None
+        self._cur = {}
+        self._prev = {}
+        self._prev2 = {}
+        self._avg_volume = None
+
+    def _value_columns(self):
+        return [col for col in self.panel.columns if col != 'has_indicators']
+
+    def _group_positions(self):
+        """返回 (股票编码, 股票列表, 每只股票首行位置, 每只股票行数, 每行在组内的时间序号)"""
+        codes, uniques = pd.factorize(self.panel.index.get_level_values(0))
+        counts = np.bincount(codes, minlength=len(uniques))
+        first = np.zeros(len(uniques), dtype=np.int64)
+        first[1:] = np.cumsum(counts)[:-1]
+        seq = np.arange(len(codes)) - first[codes]
+        return codes, uniques, first, counts, seq
+
+    def _prepare_latest(self):
+        """取每只股票最近 LOOKBACK 根K线，评分对象为最新一根"""
+        codes, uniques, first, counts, seq = self._group_positions()
+        n_symbols = len(uniques)
+
+        # 距最新一根的位置（0=最新）
+        pos = counts[codes] - 1 - seq
+        keep = pos < self.LOOKBACK
+
+        rows = {}
+        for col in self._value_columns():
+            values = np.full((n_symbols, self.LOOKBACK), np.nan)
+            values[codes[keep], pos[keep]] = self.panel[col].to_numpy(dtype=float)[keep]
+            rows[col] = values
+
+        self.bar_count = counts
+        self._cur = {col: values[:, 0] for col, values in rows.items()}
+        self._prev = {col: values[:, 1] for col, values in rows.items()}
+        self._prev2 = {col: values[:, 2] for col, values in rows.items()}
+        # 按时间顺序（旧→新）排列的最近5天成交量
+        self._avg_volume = self._nanmean([rows['volume'][:, k] for k in range(self.LOOKBACK - 1, -1, -1)])
+
+        return uniques, np.asarray(self.panel.index.get_level_values(1))[first + counts - 1]
+
+    def _prepare_history(self):
+        """每一行都作为评分对象，前几根K线通过组内移位得到"""
+        codes, uniques, first, counts, seq = self._group_positions()
+
+        def shifted(values, k):
+            out = np.full(len(values), np.nan)
+            out[k:] = values[:-k]
+            out[seq < k] = np.nan
+            return out
+
+        self.bar_count = seq + 1
+        for col in self._value_columns():
+            values = self.panel[col].to_numpy(dtype=float)
+            self._cur[col] = values
+            self._prev[col] = shifted(values, 1)
+            self._prev2[col] = shifted(values, 2)
+
+        volume = self._cur['volume']
+        self._avg_volume = self._nanmean(
+            [shifted(volume, k) for k in range(self.LOOKBACK - 1, 0, -1)] + [volume]
+        )
+
+    @staticmethod
+    def _nanmean(columns):
+        """按给定顺序累加的忽略空值均值（与 pandas Series.mean 的累加顺序一致）"""
+        total = np.zeros(len(columns[0]))
+        count = np.zeros(len(columns[0]))
+        for values in columns:
+            valid = ~np.isnan(values)
+            total += np.where(valid, values, 0)
+            count += valid
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(count > 0, total / count, np.nan)
+
+    def _latest(self, col, default=np.nan):
+        """当前一根的值（缺少该列时返回默认值）"""
+        if col not in self._cur:
+            return np.full(len(self.bar_count), default)
+        return self._cur[col]
+
+    def _previous(self, col, default=np.nan):
+        """前一根的值（只有一根K线时取当前一根，与 ScoringEngine 一致）"""
+        if col not in self._cur:
+            return np.full(len(self.bar_count), default)
+        return np.where(self.bar_count > 1, self._prev[col], self._cur[col])
+
+    def _previous2(self, col):
+        """前两根的值"""
+        if col not in self._cur:
+            return np.full(len(self.bar_count), np.nan)
+        return self._prev2[col]
+
+    # ==================== 技术指标评分（30分） ====================
+
+    def score_technical_indicators(self):
+        """技术指标评分（30分），规则同 ScoringEngine.score_technical_indicators"""
+        # 1. MACD评分（10分）
+        macd = self._latest('macd')
+        signal = self._latest('macd_signal')
+        prev_macd = self._previous('macd', 0)
+        prev_signal = self._previous('macd_signal', 0)
+        hist = self._latest('macd_hist', 0)
+        prev_hist = self._previous('macd_hist', 0)
+
+        macd_score = np.select(
+            [
+                (macd > signal) & (prev_macd <= prev_signal),
+                macd > signal,
+                (hist > 0) & (prev_hist <= 0),
+                macd > 0,
+                (macd < signal) & (prev_macd >= prev_signal),
+            ],
+            [10, 7, 8, 5, 0],
+            default=3
+        )
+        macd_score = np.where(~np.isnan(macd) & ~np.isnan(signal), macd_score, 0)
+
+        # 2. RSI评分（10分）
+        rsi = self._latest('rsi')
+        rsi_score = np.select(
+            [
+                (rsi >= 50) & (rsi <= 70),
+                (rsi >= 30) & (rsi < 50),
+                (rsi >= 20) & (rsi < 30),
+                rsi > 70,
+            ],
+            [10, 7, 5, 3],
+            default=2
+        )
+        rsi_score = np.where(~np.isnan(rsi), rsi_score, 0)
+
+        # 3. KDJ评分（10分）
+        k = self._latest('kdj_k')
+        d = self._latest('kdj_d')
+        prev_k = self._previous('kdj_k')
+        prev_d = self._previous('kdj_d')
+
+        kdj_score = np.select(
+            [
+                (k > d) & (prev_k <= prev_d) & (k < 80),
+                (k > 20) & (k < 80) & (d > 20) & (d < 80) & (k > d),
+                (k < 20) & (d < 20) & (k > d),
+                (k < d) & (prev_k >= prev_d),
+                k > 80,
+            ],
+            [10, 8, 7, 2, 3],
+            default=5
+        )
+        kdj_score = np.where(~np.isnan(k) & ~np.isnan(d), kdj_score, 0)
+
+        return macd_score + rsi_score + kdj_score
+
+    # ==================== 量价分析评分（25分） ====================
+
+    def score_volume_analysis(self):
+        """量价分析评分（25分），规则同 ScoringEngine.score_volume_analysis"""
+        # 1. 放量上涨评分（15分）
+        close = self._latest('close')
+        prev_close = self._previous('close')
+        volume = self._latest('volume')
+        avg_volume = self._avg_volume
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_change = (close - prev_close) / prev_close
+            volume_ratio = np.where(avg_volume > 0, volume / avg_volume, 1)
+
+        volume_price_score = np.select(
+            [
+                (price_change > 0.02) & (volume_ratio > 1.5),
+                (price_change > 0.01) & (volume_ratio > 1.2),
+                (price_change > 0) & (volume_ratio > 1),
+                (price_change > 0.01) & (volume_ratio < 0.8),
+                (price_change < -0.01) & (volume_ratio > 1.5),
+            ],
+            [15, 12, 8, 6, 2],
+            default=5
+        )
+        volume_price_score = np.where(self.bar_count >= 2, volume_price_score, 0)
+
+        # 2. 成交量趋势评分（10分）
+        vol_ma5 = self._latest('volume_ma5')
+        vol_ma10 = self._latest('volume_ma10')
+        volume_trend_score = np.select(
+            [vol_ma5 > vol_ma10 * 1.1, vol_ma5 > vol_ma10],
+            [10, 7],
+            default=4
+        )
+        volume_trend_score = np.where(~np.isnan(vol_ma5) & ~np.isnan(vol_ma10), volume_trend_score, 0)
+
+        return volume_price_score + volume_trend_score
+
+    # ==================== 趋势分析评分（25分） ====================
+
+    def score_trend_analysis(self):
+        """趋势分析评分（25分），规则同 ScoringEngine.score_trend_analysis"""
+        close = self._latest('close')
+
+        # 1. 均线排列评分（15分）
+        ma5, ma10, ma20, ma60 = (self._latest(f'ma{p}') for p in [5, 10, 20, 60])
+        bull_3 = (close > ma5) & (ma5 > ma10)
+        bull_4 = bull_3 & (ma10 > ma20)
+        ma_score = np.select(
+            [
+                bull_4 & (ma20 > ma60),
+                bull_4,
+                bull_3,
+                close > ma5,
+                (close < ma5) & (ma5 < ma10) & (ma10 < ma20),
+            ],
+            [15, 12, 9, 6, 2],
+            default=4
+        )
+        ma_valid = ~(np.isnan(ma5) | np.isnan(ma10) | np.isnan(ma20) | np.isnan(ma60))
+        ma_score = np.where(ma_valid, ma_score, 0)
+
+        # 2. 价格位置评分（10分）
+        boll_upper = self._latest('boll_upper')
+        boll_lower = self._latest('boll_lower')
+        boll_range = boll_upper - boll_lower
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = (close - boll_lower) / boll_range
+
+        price_position_score = np.select(
+            [
+                (position >= 0.5) & (position <= 0.8),
+                position > 0.8,
+                (position >= 0.2) & (position < 0.5),
+                position < 0.2,
+            ],
+            [10, 6, 7, 5],
+            default=4
+        )
+        price_position_score = np.where(
+            ~np.isnan(boll_upper) & ~np.isnan(boll_lower) & (boll_range > 0),
+            price_position_score, 0
+        )
+
+        return ma_score + price_position_score
+
+    # ==================== 形态识别评分（20分） ====================
+
+    def score_pattern_recognition(self):
+        """形态识别评分（20分），规则同 ScoringEngine.score_pattern_recognition"""
+        open_, high, low, close = (self._latest(c) for c in ['open', 'high', 'low', 'close'])
+        prev_open = self._previous('open')
+        prev_close = self._previous('close')
+        prev2_open = self._previous2('open')
+        prev2_close = self._previous2('close')
+
+        # 1. K线形态评分（10分）
+        # 内置 max/min 遇到空值时保留第一个参数，这里按相同顺序取值
+        body = np.abs(close - open_)
+        upper_shadow = high - np.where(open_ > close, open_, close)
+        lower_shadow = np.where(open_ < close, open_, close) - low
+        total_range = high - low
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            body_ratio = body / total_range
+
+        pattern_score = np.select(
+            [
+                (close > open_) & (body_ratio > 0.7),
+                (lower_shadow > body * 2) & (upper_shadow < body),
+                (prev2_close < prev2_open) & (np.abs(prev_close - prev_open) < body) & (close > open_),
+                close > open_,
+                body_ratio < 0.1,
+            ],
+            [10, 8, 9, 6, 5],
+            default=3
+        )
+        pattern_score = np.where(total_range > 0, pattern_score, 0)
+
+        # 2. 突破信号评分（10分）
+        ma20 = self._latest('ma20')
+        prev_ma20 = self._previous('ma20')
+        breakthrough_score = np.select(
+            [(close > ma20) & (prev_close <= prev_ma20), close > ma20],
+            [10, 7],
+            default=3
+        )
+        breakthrough_score = np.where(~np.isnan(ma20) & ~np.isnan(prev_ma20), breakthrough_score, 0)
+
+        return np.where(self.bar_count >= 3, pattern_score + breakthrough_score, 0)
+
+    # ==================== 综合评分 ====================
+
+    def _score_all(self):
+        """按当前准备好的数据计算各维度分数"""
+        technical_score = self.score_technical_indicators()
+        volume_score = self.score_volume_analysis()
+        trend_score = self.score_trend_analysis()
+        pattern_score = self.score_pattern_recognition()
+
+        return {
+            'total_score': technical_score + volume_score + trend_score + pattern_score,
+            'technical_score': technical_score,
+            'volume_score': volume_score,
+            'trend_score': trend_score,
+            'pattern_score': pattern_score,
+        }
+
+    def calculate_scores(self):
+        """
+        计算所有股票最新一根K线的各维度分数和总分
+
+        Returns:
+            DataFrame: 以 symbol 为索引，包含 total_score、technical_score、volume_score、trend_score、
+                       pattern_score、latest_price、latest_date、bar_count
+        """
+        columns = self.SCORE_COLUMNS + ['latest_price', 'latest_date', 'bar_count']
+        if self.panel.empty:
+            return pd.DataFrame(columns=columns).rename_axis('symbol')
+
+        symbols, dates = self._prepare_latest()
+
+        result = pd.DataFrame(self._score_all(), index=pd.Index(np.asarray(symbols), name='symbol'))
+        result['latest_price'] = self._latest('close')
+        result['latest_date'] = dates
+        result['bar_count'] = self.bar_count
+
+        logger.debug(f"截面评分完成: {len(result)} 只股票")
+        return result
+
+    def calculate_score_history(self):
+        """
+        计算所有股票每个交易日的各维度分数和总分
+
+        每一行的分数等于把该股票截至当日的K线交给 ScoringEngine 得到的结果
+
+        Returns:
+            DataFrame: 与 panel 相同的 (symbol, trade_date) 索引，包含各维度分数和总分（int8）
+        """
+        if self.panel.empty:
+            return pd.DataFrame(columns=self.SCORE_COLUMNS, index=self.panel.index)
+
+        self._prepare_history()
+
+        result = pd.DataFrame(
+            {col: values.astype(np.int8) for col, values in self._score_all().items()},
+            index=self.panel.index
+        )
+
+        logger.debug(f"历史评分完成: {len(result)} 行")
+        return result
+
+    @staticmethod
+    def select_top(scores, top_n, min_score=0):
+        """
+        选出总分最高的N只股票（部分排序，同分时保持原有顺序）
+
+        Args:
+            scores: calculate_scores() 的结果
+            top_n: 返回前N只股票
+            min_score: 最低分数
+
+        Returns:
+            DataFrame: 按总分降序排列的前N只股票
+        """
+        scores = scores[scores['total_score'] >= min_score]
+        if top_n <= 0 or scores.empty:
+            return scores.iloc[:0]
+
+        neg_total = -scores['total_score'].to_numpy()
+        candidates = np.arange(len(scores))
+        if top_n < len(scores):
+            # 第N名的分数，同分的全部保留后再排序截断
+            kth = np.partition(neg_total, top_n - 1)[top_n - 1]
+            candidates = np.flatnonzero(neg_total <= kth)
+
+        order = candidates[np.lexsort((candidates, neg_total[candidates]))][:top_n]
+        return scores.iloc[order]
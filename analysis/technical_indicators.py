@@ -1,22 +1,36 @@
 """
 技术指标计算模块
 """
-import pandas as pd
-import numpy as np
 from loguru import logger
 
+from analysis.indicator_registry import IndicatorPipeline
+
+
+# calculate_all() 输出的指标列（与 technical_indicators 表字段一致）
+INDICATOR_COLUMNS = [
+    'ma5', 'ma10', 'ma20', 'ma60', 'ema12', 'ema26',
+    'macd', 'macd_signal', 'macd_hist',
+    'rsi', 'kdj_k', 'kdj_d', 'kdj_j',
+    'boll_upper', 'boll_middle', 'boll_lower', 'atr',
+    'obv', 'volume_ma5', 'volume_ma10',
+]
+
 
 class TechnicalIndicators:
     """技术指标计算器"""
     
-    def __init__(self, df):
+    def __init__(self, df, indicators=None):
         """
         初始化技术指标计算器
         
+        指标列直接追加到传入的 DataFrame 上（不复制）
+        
         Args:
             df: DataFrame，必须包含 ['open', 'high', 'low', 'close', 'volume'] 列
+            indicators: calculate_all() 计算的指标配置列表，为空时读取 analysis.technical_indicators 配置
         """
-        self.df = df.copy()
+        self.df = df
+        self.indicators = indicators
         self._validate_data()
     
     def _validate_data(self):
@@ -30,6 +44,13 @@ class TechnicalIndicators:
         if len(self.df) == 0:
             raise ValueError("数据为空")
     
+    def _apply(self, indicators):
+        """按指标配置计算并写入 self.df"""
+        pipeline = IndicatorPipeline(indicators)
+        for col, values in pipeline.compute(self.df).items():
+            self.df[col] = values
+        return self.df
+    
     # ==================== 趋势指标 ====================
     
     def calculate_ma(self, periods=[5, 10, 20, 60]):
@@ -42,8 +63,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with MA columns
         """
-        for period in periods:
-            self.df[f'ma{period}'] = self.df['close'].rolling(window=period).mean()
+        self._apply([{'name': 'MA', 'params': {'periods': periods}}])
         
         logger.debug(f"计算MA完成: {periods}")
         return self.df
@@ -58,8 +78,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with EMA columns
         """
-        for period in periods:
-            self.df[f'ema{period}'] = self.df['close'].ewm(span=period, adjust=False).mean()
+        self._apply([{'name': 'EMA', 'params': {'periods': periods}}])
         
         logger.debug(f"计算EMA完成: {periods}")
         return self.df
@@ -76,18 +95,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with MACD columns
         """
-        # 计算EMA
-        ema_fast = self.df['close'].ewm(span=fast, adjust=False).mean()
-        ema_slow = self.df['close'].ewm(span=slow, adjust=False).mean()
-        
-        # MACD线 = 快线 - 慢线
-        self.df['macd'] = ema_fast - ema_slow
-        
-        # 信号线 = MACD的EMA
-        self.df['macd_signal'] = self.df['macd'].ewm(span=signal, adjust=False).mean()
-        
-        # MACD柱状图 = MACD - 信号线
-        self.df['macd_hist'] = self.df['macd'] - self.df['macd_signal']
+        self._apply([{'name': 'MACD', 'params': {'fast': fast, 'slow': slow, 'signal': signal}}])
         
         logger.debug(f"计算MACD完成: fast={fast}, slow={slow}, signal={signal}")
         return self.df
@@ -104,16 +112,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with RSI column
         """
-        # 计算价格变化
-        delta = self.df['close'].diff()
-        
-        # 分离上涨和下跌
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        # 计算RS和RSI
-        rs = gain / loss
-        self.df['rsi'] = 100 - (100 / (1 + rs))
+        self._apply([{'name': 'RSI', 'params': {'period': period}}])
         
         logger.debug(f"计算RSI完成: period={period}")
         return self.df
@@ -130,22 +129,24 @@ class TechnicalIndicators:
         Returns:
             DataFrame with KDJ columns
         """
-        # 计算RSV (未成熟随机值)
-        low_n = self.df['low'].rolling(window=n).min()
-        high_n = self.df['high'].rolling(window=n).max()
-        
-        rsv = (self.df['close'] - low_n) / (high_n - low_n) * 100
+        self._apply([{'name': 'KDJ', 'params': {'n': n, 'm1': m1, 'm2': m2}}])
         
-        # 计算K值 (RSV的移动平均)
-        self.df['kdj_k'] = rsv.ewm(com=m1-1, adjust=False).mean()
-        
-        # 计算D值 (K值的移动平均)
-        self.df['kdj_d'] = self.df['kdj_k'].ewm(com=m2-1, adjust=False).mean()
+        logger.debug(f"计算KDJ完成: n={n}, m1={m1}, m2={m2}")
+        return self.df
+    
+    def calculate_cci(self, period=14):
+        """
+        计算顺势指标 (CCI)
         
-        # 计算J值
-        self.df['kdj_j'] = 3 * self.df['kdj_k'] - 2 * self.df['kdj_d']
+        Args:
+            period: 周期
+            
+        Returns:
+            DataFrame with CCI column
+        """
+        self._apply([{'name': 'CCI', 'params': {'period': period}}])
         
-        logger.debug(f"计算KDJ完成: n={n}, m1={m1}, m2={m2}")
+        logger.debug(f"计算CCI完成: period={period}")
         return self.df
     
     # ==================== 波动指标 ====================
@@ -161,17 +162,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with Bollinger Bands columns
         """
-        # 中轨 = 移动平均线
-        self.df['boll_middle'] = self.df['close'].rolling(window=period).mean()
-        
-        # 标准差
-        std = self.df['close'].rolling(window=period).std()
-        
-        # 上轨 = 中轨 + 标准差 * 倍数
-        self.df['boll_upper'] = self.df['boll_middle'] + (std * std_dev)
-        
-        # 下轨 = 中轨 - 标准差 * 倍数
-        self.df['boll_lower'] = self.df['boll_middle'] - (std * std_dev)
+        self._apply([{'name': 'BOLL', 'params': {'period': period, 'std': std_dev}}])
         
         logger.debug(f"计算布林带完成: period={period}, std_dev={std_dev}")
         return self.df
@@ -186,15 +177,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with ATR column
         """
-        # 计算真实波幅 (TR)
-        high_low = self.df['high'] - self.df['low']
-        high_close = np.abs(self.df['high'] - self.df['close'].shift())
-        low_close = np.abs(self.df['low'] - self.df['close'].shift())
-        
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        
-        # ATR = TR的移动平均
-        self.df['atr'] = tr.rolling(window=period).mean()
+        self._apply([{'name': 'ATR', 'params': {'period': period}}])
         
         logger.debug(f"计算ATR完成: period={period}")
         return self.df
@@ -208,21 +191,7 @@ class TechnicalIndicators:
         Returns:
             DataFrame with OBV column
         """
-        # 价格上涨时加上成交量，下跌时减去成交量
-        obv = []
-        obv_value = 0
-        
-        for i in range(len(self.df)):
-            if i == 0:
-                obv_value = self.df['volume'].iloc[i]
-            else:
-                if self.df['close'].iloc[i] > self.df['close'].iloc[i-1]:
-                    obv_value += self.df['volume'].iloc[i]
-                elif self.df['close'].iloc[i] < self.df['close'].iloc[i-1]:
-                    obv_value -= self.df['volume'].iloc[i]
-            obv.append(obv_value)
-        
-        self.df['obv'] = obv
+        self._apply([{'name': 'OBV'}])
         
         logger.debug("计算OBV完成")
         return self.df
@@ -237,39 +206,26 @@ class TechnicalIndicators:
         Returns:
             DataFrame with volume MA columns
         """
-        for period in periods:
-            self.df[f'volume_ma{period}'] = self.df['volume'].rolling(window=period).mean()
+        self._apply([{'name': 'VOLUME_MA', 'params': {'periods': periods}}])
         
         logger.debug(f"计算成交量MA完成: {periods}")
         return self.df
     
     # ==================== 综合计算 ====================
     
-    def calculate_all(self):
+    def calculate_all(self, indicators=None):
         """
-        计算所有技术指标
+        计算所有启用的技术指标（共享的中间量只计算一次）
         
+        Args:
+            indicators: 指标配置列表，为空时使用构造参数或 analysis.technical_indicators 配置
+            
         Returns:
             DataFrame with all indicators
         """
         logger.info("开始计算所有技术指标...")
         
-        # 趋势指标
-        self.calculate_ma([5, 10, 20, 60])
-        self.calculate_ema([12, 26])
-        self.calculate_macd()
-        
-        # 震荡指标
-        self.calculate_rsi()
-        self.calculate_kdj()
-        
-        # 波动指标
-        self.calculate_bollinger_bands()
-        self.calculate_atr()
-        
-        # 成交量指标
-        self.calculate_obv()
-        self.calculate_volume_ma([5, 10])
+        self._apply(indicators or self.indicators)
         
         logger.info("所有技术指标计算完成")
         return self.df
@@ -0,0 +1,266 @@
+"""
+并发行情入库流水线（生产者/消费者）
+
+    抓取线程池（有界，API调用经共享限流器） -> 列式转换 -> 有界队列 -> 单写线程批量 upsert
+
+- 抓取：workers 个线程并发请求，失败按 utils/retry 的退避重试，请求速率由客户端的共享限流窗口控制
+- 转换：每只股票的响应整体转换为 DataFrame（不逐行 iterrows）
+- 写入：单个写线程从队列取数据，累积到 batch_rows 行或 flush_interval 秒后一次 bulk_upsert
+- 反压：队列有界，写库跟不上时抓取线程在 put 处阻塞，内存占用有上限
+- 指标：各阶段的调用数、行数、耗时和吞吐，结束时输出
+
+    pipeline = IngestPipeline(db_manager, fetch=..., convert=candles_to_frame)
+    stats = pipeline.run(symbols)
+"""
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from database.models import DailyData
+from utils.retry import retry_on_failure
+
+
+# 队列中最多积压的股票数（反压上限）
+DEFAULT_QUEUE_SIZE = 256
+
+# 写线程每批写入的行数
+DEFAULT_BATCH_ROWS = 5000
+
+# 写线程最长多久写一次（秒）
+DEFAULT_FLUSH_INTERVAL = 2.0
+
+# 队列结束标记
+_DONE = object()
+
+
+class StageMetrics:
+    """流水线单个阶段的计数与耗时（线程安全）"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.rows = 0
+        self.errors = 0
+        self.busy = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, rows: int = 0, error: bool = False):
+        """记录一次调用"""
+        with self._lock:
+            self.calls += 1
+            self.rows += rows
+            self.busy += seconds
+            if error:
+                self.errors += 1
+
+    def summary(self, elapsed: float) -> str:
+        """格式化的统计信息"""
+        rate = self.calls / elapsed if elapsed > 0 else 0.0
+        avg = self.busy / self.calls * 1000 if self.calls else 0.0
+        return (f"{self.name}: {self.calls} 次（失败 {self.errors}），{self.rows} 行，"
+                f"{rate:.1f} 次/秒，平均 {avg:.0f} 毫秒/次")
+
+
+class IngestPipeline:
+    """抓取 -> 转换 -> 批量写库 的并发流水线"""
+
+    def __init__(self, db_manager, fetch: Callable[[Any], Any], convert: Callable[[Any, Any], pd.DataFrame],
+                 model=DailyData, key=('symbol', 'trade_date'), update: bool = True, workers: int = 8,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, batch_rows: int = DEFAULT_BATCH_ROWS,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_retries: int = 3, retry_delay: float = 1.0):
+        """
+        Args:
+            db_manager: 数据库管理器
+            fetch: 抓取函数 fetch(item) -> 原始响应（通常是一次API调用）
+            convert: 转换函数 convert(item, response) -> DataFrame（列与 model 一致）
+            model: 写入的模型
+            key: bulk_upsert 的自然键
+            update: 自然键已存在时是否更新（False 时保留已有记录）
+            workers: 抓取线程数
+            queue_size: 队列容量（股票数）
+            batch_rows: 每批写入的行数
+            flush_interval: 最长写入间隔（秒）
+            max_retries: 抓取失败的重试次数
+            retry_delay: 首次重试的等待秒数（之后按倍数退避）
+        """
+        self.db = db_manager
+        self.fetch = retry_on_failure(max_retries=max_retries, delay=retry_delay, logger_name='ingest')(fetch)
+        self.convert = convert
+        self.model = model
+        self.key = key
+        self.update = update
+        self.workers = workers
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+
+        self.metrics = {name: StageMetrics(name) for name in ('fetch', 'convert', 'backpressure', 'write')}
+        self.failed = []
+        self.empty = []
+
+    def _produce(self, item):
+        """抓取并转换一只股票，结果放入队列（队列满时阻塞）"""
+        started = time.time()
+        try:
+            response = self.fetch(item)
+        except Exception as e:
+            self.metrics['fetch'].record(time.time() - started, error=True)
+            logger.error(f"抓取 {item} 失败: {e}")
+            self.failed.append(item)
+            return
+        self.metrics['fetch'].record(time.time() - started)
+
+        started = time.time()
+        try:
+            frame = self.convert(item, response)
+        except Exception as e:
+            self.metrics['convert'].record(time.time() - started, error=True)
+            logger.error(f"转换 {item} 失败: {e}")
+            self.failed.append(item)
+            return
+        rows = 0 if frame is None else len(frame)
+        self.metrics['convert'].record(time.time() - started, rows)
+
+        if not rows:
+            self.empty.append(item)
+            return
+
+        started = time.time()
+        self.queue.put((item, frame))
+        self.metrics['backpressure'].record(time.time() - started, rows)
+
+    def _flush(self, batch: List[Tuple[Any, pd.DataFrame]]):
+        """写入一批（项, 数据）；失败时整批的项记入 failed"""
+        records = pd.concat([frame for _, frame in batch], ignore_index=True)
+        started = time.time()
+        try:
+            saved = self.db.bulk_upsert(self.model, records, key=self.key, update=self.update)
+            self.metrics['write'].record(time.time() - started, saved)
+        except Exception as e:
+            self.metrics['write'].record(time.time() - started, error=True)
+            logger.error(f"批量写入 {len(batch)} 项共 {len(records)} 行失败: {e}")
+            self.failed.extend(item for item, _ in batch)
+        batch.clear()
+
+    def _consume(self):
+        """写线程：从队列取数据，按行数或时间间隔批量写入"""
+        batch = []
+        pending_rows = 0
+        last_flush = time.time()
+        while True:
+            try:
+                entry = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                entry = None
+
+            if entry is _DONE:
+                if batch:
+                    self._flush(batch)
+                return
+            if entry is not None:
+                batch.append(entry)
+                pending_rows += len(entry[1])
+
+            if batch and (pending_rows >= self.batch_rows or time.time() - last_flush >= self.flush_interval):
+                self._flush(batch)
+                pending_rows = 0
+                last_flush = time.time()
+
+    def run(self, items: Iterable[Any]) -> Dict[str, Any]:
+        """
+        运行流水线
+
+        Args:
+            items: 待抓取的项（通常是股票代码）
+
+        Returns:
+            dict: total、saved（写入行数）、failed（抓取、转换或写入失败的项列表）、empty（无数据项列表）、elapsed（秒）
+        """
+        items = list(items)
+        started = time.time()
+
+        writer = threading.Thread(target=self._consume, name='ingest-writer', daemon=True)
+        writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='ingest-fetch') as executor:
+                for i, _ in enumerate(executor.map(self._produce, items), 1):
+                    if i % 100 == 0:
+                        elapsed = time.time() - started
+                        logger.info(f"[{i}/{len(items)}] 已写入 {self.metrics['write'].rows} 行，"
+                                    f"队列积压 {self.queue.qsize()}，已用时 {elapsed:.0f} 秒")
+        finally:
+            self.queue.put(_DONE)
+            writer.join()
+
+        elapsed = time.time() - started
+        logger.info(f"入库流水线完成: {len(items)} 项，用时 {elapsed:.1f} 秒")
+        for metrics in self.metrics.values():
+            logger.info(f"  {metrics.summary(elapsed)}")
+
+        return {
+            'total': len(items),
+            'saved': self.metrics['write'].rows,
+            'failed': self.failed,
+            'empty': self.empty,
+            'elapsed': elapsed
+        }
+
+
+def candles_to_frame(symbol: str, candles) -> pd.DataFrame:
+    """
+    长桥K线列表按列转换为 daily_data 记录
+
+    Args:
+        symbol: 股票代码
+        candles: get_candlesticks / get_history_candlesticks 的结果
+
+    Returns:
+        DataFrame: symbol, trade_date, open, high, low, close, volume, turnover
+    """
+    if not candles:
+        return pd.DataFrame()
+
+    def column(field):
+        return np.fromiter((float(getattr(c, field)) for c in candles), dtype=np.float64, count=len(candles))
+
+    return pd.DataFrame({
+        'symbol': symbol,
+        'trade_date': [c.timestamp.date() for c in candles],
+        **{field: column(field) for field in ('open', 'high', 'low', 'close', 'volume', 'turnover')}
+    })
+
+
+def refresh_daily_bars(db_manager, client, symbols: Iterable[str], count: int = 10, update: bool = True,
+                       workers: int = 8, since=None) -> Dict[str, Any]:
+    """
+    并发刷新股票最近的日线（长桥）
+
+    Args:
+        db_manager: 数据库管理器
+        client: LongPortClient
+        symbols: 股票代码列表
+        count: 每只股票取最近多少根日线
+        update: 已有记录是否更新（False 时只插入新日期）
+        workers: 抓取线程数
+        since: 只写入该日期（含）之后的K线（可选）
+
+    Returns:
+        dict: 同 IngestPipeline.run
+    """
+    def fetch(symbol):
+        return client.get_candlesticks(symbol, 'day', count)
+
+    def convert(symbol, candles):
+        frame = candles_to_frame(symbol, candles)
+        if since is not None and not frame.empty:
+            frame = frame[frame['trade_date'] >= since]
+        return frame
+
+    pipeline = IngestPipeline(db_manager, fetch, convert, update=update, workers=workers)
+    return pipeline.run(symbols)
@@ -2,9 +2,17 @@
 长桥证券API客户端
 """
 import os
+import threading
 from longport.openapi import Config, QuoteContext, TradeContext, Period as LPPeriod, AdjustType
 from loguru import logger
 
+from utils.rate_limiter import get_rate_limiter
+from data_collection.response_cache import get_response_cache, candles_to_cache, candles_from_cache
+
+
+# 响应可以缓存的K线周期
+CACHEABLE_PERIODS = ('day', 'week', 'month')
+
 
 class LongPortClient:
     """长桥证券API客户端"""
@@ -19,6 +27,10 @@ class LongPortClient:
         self.api_config = api_config.get('longport', {})
         self.quote_ctx = None
         self.trade_ctx = None
+        # 抓取线程池并发调用时只创建一个上下文
+        self._ctx_lock = threading.Lock()
+        self.rate_limiter = get_rate_limiter()
+        self.cache = get_response_cache()
         self._init_config()
     
     def _init_config(self):
@@ -56,12 +68,14 @@ class LongPortClient:
             QuoteContext实例
         """
         if self.quote_ctx is None:
-            try:
-                self.quote_ctx = QuoteContext(self.config)
-                logger.info("行情上下文创建成功")
-            except Exception as e:
-                logger.error(f"创建行情上下文失败: {e}")
-                raise
+            with self._ctx_lock:
+                if self.quote_ctx is None:
+                    try:
+                        self.quote_ctx = QuoteContext(self.config)
+                        logger.info("行情上下文创建成功")
+                    except Exception as e:
+                        logger.error(f"创建行情上下文失败: {e}")
+                        raise
         return self.quote_ctx
     
     def get_trade_context(self):
@@ -72,12 +86,14 @@ class LongPortClient:
             TradeContext实例
         """
         if self.trade_ctx is None:
-            try:
-                self.trade_ctx = TradeContext(self.config)
-                logger.info("交易上下文创建成功")
-            except Exception as e:
-                logger.error(f"创建交易上下文失败: {e}")
-                raise
+            with self._ctx_lock:
+                if self.trade_ctx is None:
+                    try:
+                        self.trade_ctx = TradeContext(self.config)
+                        logger.info("交易上下文创建成功")
+                    except Exception as e:
+                        logger.error(f"创建交易上下文失败: {e}")
+                        raise
         return self.trade_ctx
     
     def get_quote(self, symbols):
@@ -92,6 +108,7 @@ class LongPortClient:
         """
         try:
             ctx = self.get_quote_context()
+            self.rate_limiter.acquire('longport_quote')
             quotes = ctx.quote(symbols)
             logger.info(f"获取 {len(symbols)} 只股票的实时行情成功")
             return quotes
@@ -111,6 +128,7 @@ class LongPortClient:
         """
         try:
             ctx = self.get_quote_context()
+            self.rate_limiter.acquire('longport_quote')
             info = ctx.static_info(symbols)
             logger.info(f"获取 {len(symbols)} 只股票的静态信息成功")
             return info
@@ -128,9 +146,16 @@ class LongPortClient:
             count: 获取数量
 
         Returns:
-            K线数据列表
+            K线数据列表（缓存命中时为 CachedCandle 列表，属性与 Candlestick 一致）
         """
         try:
+            # 最近N根日/周/月K线包含今天，只短时缓存；分钟K线用于实时监控，不缓存
+            params = {'symbol': symbol, 'period': period, 'count': count}
+            cacheable = period.lower() in CACHEABLE_PERIODS
+            frame = self.cache.get('longport', 'candlesticks', params) if cacheable else None
+            if frame is not None:
+                return candles_from_cache(frame)
+
             ctx = self.get_quote_context()
 
             # 转换周期格式 - 使用字符串形式的枚举值
@@ -150,8 +175,12 @@ class LongPortClient:
                 raise ValueError(f"不支持的K线周期: {period}")
 
             # 获取K线数据 - 添加复权类型参数
+            self.rate_limiter.acquire('longport_candlesticks')
             candlesticks = ctx.candlesticks(symbol, period_enum, count, AdjustType.ForwardAdjust)
             logger.info(f"获取 {symbol} 的 {count} 条 {period} K线数据成功")
+            if cacheable:
+                self.cache.put('longport', 'candlesticks', params, candles_to_cache(candlesticks),
+                               ttl=self.cache.today_ttl)
             return candlesticks
         except Exception as e:
             logger.error(f"获取K线数据失败: {e}")
@@ -168,9 +197,15 @@ class LongPortClient:
             end_date: 结束日期 (datetime.date)
             
         Returns:
-            K线数据列表
+            K线数据列表（缓存命中时为 CachedCandle 列表，属性与 Candlestick 一致）
         """
         try:
+            # 前复权价格在除权除息后整体变化，只短期缓存
+            params = {'symbol': symbol, 'period': period, 'start': start_date, 'end': end_date}
+            frame = self.cache.get('longport', 'history_candlesticks', params)
+            if frame is not None:
+                return candles_from_cache(frame)
+
             ctx = self.get_quote_context()
 
             # 转换周期格式
@@ -185,6 +220,7 @@ class LongPortClient:
                 raise ValueError(f"不支持的K线周期: {period}")
 
             # 获取历史K线
+            self.rate_limiter.acquire('longport_history')
             candlesticks = ctx.history_candlesticks_by_date(
                 symbol,
                 period_enum,
@@ -193,6 +229,9 @@ class LongPortClient:
                 end_date
             )
             logger.info(f"获取 {symbol} 从 {start_date} 到 {end_date} 的历史K线成功")
+            frame = candles_to_cache(candlesticks)
+            self.cache.put('longport', 'history_candlesticks', params, frame,
+                           ttl=self.cache.adjusted_ttl if len(frame) else self.cache.today_ttl)
             return candlesticks
         except Exception as e:
             logger.error(f"获取历史K线失败: {e}")
@@ -211,6 +250,7 @@ class LongPortClient:
             
             ctx = self.get_quote_context()
             ctx.set_on_quote(callback)
+            self.rate_limiter.acquire('longport_quote')
             ctx.subscribe(symbols, [SubType.Quote], is_first_push=True)
             logger.info(f"订阅 {len(symbols)} 只股票的实时行情成功")
         except Exception as e:
@@ -228,6 +268,7 @@ class LongPortClient:
             from longport.openapi import SubType
             
             ctx = self.get_quote_context()
+            self.rate_limiter.acquire('longport_quote')
             ctx.unsubscribe(symbols, [SubType.Quote])
             logger.info(f"取消订阅 {len(symbols)} 只股票的实时行情成功")
         except Exception as e:
@@ -243,6 +284,7 @@ class LongPortClient:
         """
         try:
             ctx = self.get_quote_context()
+            self.rate_limiter.acquire('longport_quote')
             watch_list = ctx.watchlist()  # 修正：watch_list -> watchlist
             logger.info("获取自选股列表成功")
             return watch_list
@@ -0,0 +1,313 @@
+"""
+数据源响应磁盘缓存
+
+按 (数据源, 接口, 规范化参数) 缓存 Tushare / 长桥接口的响应（DataFrame），存为 gzip 压缩的 pickle：
+- 已收盘的历史区间（结束日期早于今天）永久有效，重跑回补任务不再访问网络
+- 包含今天的请求、以及空响应（数据可能尚未发布）只缓存 today_ttl 秒
+- 复权价格在除权除息后会整体变化，复权K线只缓存 adjusted_ttl 秒
+- 缓存目录总大小超过 max_size_mb 时按最近使用时间（命中时刷新文件修改时间）淘汰
+
+    cache = get_response_cache()
+    df = cache.fetch('tushare', 'daily', {'ts_code': ts_code, 'start': start, 'end': end},
+                     lambda: pro.daily(...), closed=end < today)
+"""
+import gzip
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+from loguru import logger
+
+
+# 默认配置
+DEFAULT_CACHE_DIR = './data/cache'
+DEFAULT_MAX_SIZE_MB = 512
+DEFAULT_TODAY_TTL = 300
+DEFAULT_ADJUSTED_TTL = 86400
+
+# 超过上限时淘汰到上限的该比例，避免每次写入都扫描目录
+EVICT_TARGET_RATIO = 0.9
+
+# 缓存的长桥K线（与 longport Candlestick 的常用属性一致）
+CachedCandle = namedtuple('CachedCandle', ['timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover'])
+
+
+def _normalize(value):
+    """参数规范化为可稳定序列化的值"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S') if (value.hour or value.minute or value.second) \
+            else value.strftime('%Y-%m-%d')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, (list, tuple, set)):
+        items = [_normalize(v) for v in value]
+        return sorted(items) if isinstance(value, set) else items
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in sorted(value.items())}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def is_closed(end_date) -> bool:
+    """请求的结束日期是否早于今天（历史区间已收盘，数据不再变化）"""
+    if end_date is None:
+        return False
+    if isinstance(end_date, str):
+        end_date = datetime.strptime(end_date.replace('-', '')[:8], '%Y%m%d')
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+    return end_date < date.today()
+
+
+def candles_to_cache(candles) -> pd.DataFrame:
+    """长桥K线列表 -> 可缓存的 DataFrame"""
+    return pd.DataFrame([
+        (c.timestamp, float(c.open), float(c.high), float(c.low), float(c.close),
+         float(c.volume), float(c.turnover))
+        for c in candles or []
+    ], columns=CachedCandle._fields)
+
+
+def candles_from_cache(frame: pd.DataFrame):
+    """缓存的 DataFrame -> K线列表（按属性访问 timestamp/open/.../turnover）"""
+    return [CachedCandle(ts.to_pydatetime(), *values) for ts, *values in
+            zip(frame['timestamp'], frame['open'], frame['high'], frame['low'],
+                frame['close'], frame['volume'], frame['turnover'])]
+
+
+class ResponseCache:
+    """数据源响应磁盘缓存"""
+
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+                 today_ttl: float = DEFAULT_TODAY_TTL, enabled: bool = True,
+                 adjusted_ttl: float = DEFAULT_ADJUSTED_TTL):
+        """
+        Args:
+            root: 缓存目录
+            max_size_mb: 缓存总大小上限（MB）
+            today_ttl: 包含今天的请求的缓存秒数
+            enabled: 是否启用
+            adjusted_ttl: 复权K线的缓存秒数
+        """
+        self.root = root
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.today_ttl = today_ttl
+        self.adjusted_ttl = adjusted_ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size = None
+
+    def __repr__(self):
+        return f"<ResponseCache(root='{self.root}', hits={self.hits}, misses={self.misses})>"
+
+    def _path(self, provider: str, endpoint: str, params: Dict[str, Any]) -> str:
+        """缓存文件路径"""
+        key = json.dumps(_normalize(params), sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, provider, endpoint, digest[:2], f'{digest}.pkl.gz')
+
+    def _files(self):
+        """遍历缓存文件：(路径, 大小, 修改时间)"""
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if filename.endswith('.pkl.gz'):
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def get(self, provider: str, endpoint: str, params: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        读取缓存
+
+        Returns:
+            DataFrame，未命中或已过期时为 None
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(provider, endpoint, params)
+        try:
+            with gzip.open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"缓存文件损坏，已忽略: {path} ({e})")
+            return None
+
+        if entry['expires'] is not None and entry['expires'] < time.time():
+            return None
+
+        # 刷新修改时间，作为LRU淘汰依据
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry['data']
+
+    def put(self, provider: str, endpoint: str, params: Dict[str, Any], data: pd.DataFrame,
+            ttl: Optional[float] = None):
+        """
+        写入缓存
+
+        Args:
+            provider: 数据源
+            endpoint: 接口
+            params: 请求参数
+            data: 响应（DataFrame）
+            ttl: 有效秒数，None 为永久
+        """
+        if not self.enabled:
+            return
+
+        path = self._path(provider, endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {'expires': None if ttl is None else time.time() + ttl, 'data': data}
+
+        # 先写临时文件再替换，并发读取不会读到写了一半的文件
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with gzip.open(tmp, 'wb', compresslevel=6) as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        size = os.path.getsize(tmp)
+
+        with self._lock:
+            # 覆盖已有文件时只计入大小之差
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._files())
+            else:
+                self._size += size - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """按最近使用时间淘汰到上限的 EVICT_TARGET_RATIO 以下（调用方持有锁）"""
+        files = sorted(self._files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * EVICT_TARGET_RATIO
+        removed = 0
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._size = total
+        logger.debug(f"响应缓存淘汰 {removed} 个文件，当前 {total / 1024 / 1024:.1f} MB")
+
+    def fetch(self, provider: str, endpoint: str, params: Dict[str, Any], loader: Callable[[], pd.DataFrame],
+              closed: bool = False, ttl: Optional[float] = None) -> pd.DataFrame:
+        """
+        读取缓存，未命中时调用 loader 请求并写入缓存
+
+        Args:
+            provider: 数据源（如 tushare / longport）
+            endpoint: 接口（如 daily / history_candlesticks）
+            params: 请求参数（规范化后作为缓存键）
+            loader: 实际请求函数，返回 DataFrame
+            closed: 请求的是否为已收盘的历史区间（是且响应非空时永久缓存）
+            ttl: 非历史区间的缓存秒数，默认 today_ttl
+
+        Returns:
+            DataFrame
+        """
+        data = self.get(provider, endpoint, params)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        self.misses += 1
+        data = loader()
+        if data is not None:
+            self.put(provider, endpoint, params, data, ttl=self.ttl_for(data, closed, ttl))
+        return data
+
+    def ttl_for(self, data: pd.DataFrame, closed: bool, ttl: Optional[float] = None) -> Optional[float]:
+        """缓存秒数：已收盘区间的非空响应永久有效（None），其余为 ttl 或 today_ttl"""
+        if closed and len(data):
+            return None
+        return ttl or self.today_ttl
+
+    def clear(self, provider: Optional[str] = None) -> int:
+        """
+        清空缓存
+
+        Args:
+            provider: 只清空该数据源，为空时全部清空
+
+        Returns:
+            int: 删除的文件数
+        """
+        root = os.path.join(self.root, provider) if provider else self.root
+        removed = 0
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith('.pkl.gz'):
+                    os.remove(os.path.join(dirpath, filename))
+                    removed += 1
+        with self._lock:
+            self._size = None
+        return removed
+
+
+# 全局缓存实例
+_response_cache = None
+
+
+def init_response_cache(config: Optional[Dict[str, Any]] = None) -> ResponseCache:
+    """
+    初始化全局响应缓存
+
+    Args:
+        config: 完整配置字典（读取 data_collection.response_cache）
+
+    Returns:
+        ResponseCache实例
+    """
+    global _response_cache
+    cache_config = ((config or {}).get('data_collection') or {}).get('response_cache') or {}
+    _response_cache = ResponseCache(
+        root=cache_config.get('path', DEFAULT_CACHE_DIR),
+        max_size_mb=cache_config.get('max_size_mb', DEFAULT_MAX_SIZE_MB),
+        today_ttl=cache_config.get('today_ttl', DEFAULT_TODAY_TTL),
+        enabled=cache_config.get('enabled', True),
+        adjusted_ttl=cache_config.get('adjusted_ttl', DEFAULT_ADJUSTED_TTL)
+    )
+    return _response_cache
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    获取全局响应缓存；未初始化时按已加载的配置（没有配置时按默认值）初始化
+
+    Returns:
+        ResponseCache实例
+    """
+    if _response_cache is None:
+        from utils.config_loader import get_config_loader
+        try:
+            config = get_config_loader().config
+        except RuntimeError:
+            config = None
+        return init_response_cache(config)
+    return _response_cache
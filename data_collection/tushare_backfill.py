@@ -0,0 +1,188 @@
+"""
+Tushare A股历史日线回补（按交易日）
+
+沿交易日历逐日请求全市场快照（pro.daily(trade_date=...)，daily_basic 同样按日期一次请求），
+筛选出跟踪的股票后批量写库。请求次数只与交易日数有关、与股票数无关：
+回补120天约120~240次请求，而按股票逐只请求5000只A股需要5000次以上。
+交易日历缓存到 trade_calendar，已完整的交易日由日线覆盖索引判断（见 database.coverage），只请求缺失的交易日。
+"""
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+import pandas as pd
+from sqlalchemy import select
+from loguru import logger
+
+from database.models import StockInfo, DailyData
+from database.coverage import plan_gaps, sync_trade_calendar
+
+
+# 累积多少个交易日的数据写一次库
+FLUSH_DAYS = 20
+
+# 交易日已有数据的股票占比达到该值视为完整（其余按停牌处理）
+COMPLETE_RATIO = 0.98
+
+
+def load_tracked_symbols(db_manager, symbols: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    加载跟踪的活跃A股代码
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 只取其中的股票（可选）
+
+    Returns:
+        股票代码集合
+    """
+    stmt = select(StockInfo.symbol).where(StockInfo.market == 'CN', StockInfo.is_active == True)
+    if symbols is not None:
+        stmt = stmt.where(StockInfo.symbol.in_(list(symbols)))
+    with db_manager.get_read_session('CN') as session:
+        return {row.symbol for row in session.execute(stmt)}
+
+
+def register_stocks(db_manager, client, symbols: Optional[Iterable[str]] = None) -> int:
+    """
+    将上市A股登记到 stock_info（已存在的跳过）
+
+    Args:
+        db_manager: 数据库管理器
+        client: TushareClient
+        symbols: 只登记其中的股票，为空时登记全部上市的沪深A股
+
+    Returns:
+        int: 新增的股票数
+    """
+    listed = client.get_stock_list()
+    if symbols is not None:
+        wanted = set(symbols)
+        listed = listed[listed['symbol'].isin(wanted)]
+        missing = wanted - set(listed['symbol'])
+        if missing:
+            logger.warning(f"{len(missing)} 只股票不在上市A股列表中: {', '.join(sorted(missing)[:10])}")
+
+    with db_manager.get_session('CN') as session:
+        existing = {row.symbol for row in session.execute(
+            select(StockInfo.symbol).where(StockInfo.symbol.in_(listed['symbol'].tolist()))
+        )}
+        new = listed[~listed['symbol'].isin(existing)]
+        now = datetime.now()
+        session.add_all([
+            StockInfo(
+                symbol=row.symbol,
+                name=row.name,
+                market='CN',
+                exchange=row.exchange,
+                currency='CNY',
+                lot_size=100,  # A股最小交易单位100股
+                industry=row.industry,
+                is_active=True,
+                created_at=now
+            )
+            for row in new.itertuples()
+        ])
+
+    logger.info(f"登记A股 {len(new)} 只（已存在 {len(existing)} 只）")
+    return len(new)
+
+
+def complete_dates(db_manager, dates: Iterable[str], symbols: Set[str]) -> Set[str]:
+    """
+    找出目标股票日线已完整的交易日（回补时跳过）
+
+    区间内每只目标股票都至少有一条日线（没有新加入、尚未回补的股票），
+    且该交易日缺少的股票不超过 1 - COMPLETE_RATIO（停牌股票当日没有数据）。
+    按日线覆盖索引计算，不扫描 daily_data；dates 需已写入交易日历（sync_trade_calendar）
+
+    Args:
+        db_manager: 数据库管理器
+        dates: 交易日列表（YYYYMMDD）
+        symbols: 目标股票
+
+    Returns:
+        已完整的交易日集合（YYYYMMDD）
+    """
+    dates = sorted(dates)
+    if not dates or not symbols:
+        return set()
+
+    plan = plan_gaps(db_manager, 'CN', datetime.strptime(dates[0], '%Y%m%d'), datetime.strptime(dates[-1], '%Y%m%d'),
+                     symbols, include_history=True)
+    if plan.uncovered:
+        return set()
+    missing = {d.strftime('%Y%m%d'): int(n) for d, n in zip(plan.calendar, plan.date_counts())}
+    return {d for d in dates if d in missing and missing[d] <= len(symbols) * (1 - COMPLETE_RATIO)}
+
+
+def _flush(db_manager, frames) -> int:
+    """写入累积的快照，返回写入行数"""
+    if not frames:
+        return 0
+    # 某个交易日整列为空的可选字段（如 daily_basic 请求失败时的换手率）不写，避免覆盖已有值；
+    # 同一批中各交易日的可选字段可能不同，按实际包含的列分组写入
+    groups = defaultdict(list)
+    for frame in frames:
+        frame = frame.dropna(axis=1, how='all')
+        groups[tuple(frame.columns)].append(frame)
+
+    now = datetime.now()
+    saved = 0
+    for group in groups.values():
+        records = pd.concat(group, ignore_index=True)
+        records['created_at'] = now
+        saved += db_manager.bulk_upsert(DailyData, records)
+    frames.clear()
+    return saved
+
+
+def backfill_daily_data(db_manager, client, start_date: datetime, end_date: datetime,
+                        symbols: Optional[Iterable[str]] = None, force: bool = False,
+                        flush_days: int = FLUSH_DAYS) -> Dict[str, int]:
+    """
+    按交易日回补A股日线
+
+    Args:
+        db_manager: 数据库管理器
+        client: TushareClient
+        start_date: 开始日期
+        end_date: 结束日期
+        symbols: 只回补其中的股票，为空时回补全部跟踪的活跃A股
+        force: 是否重新获取已完整的交易日
+        flush_days: 累积多少个交易日写一次库
+
+    Returns:
+        dict: dates（交易日数）、fetched（请求的交易日数）、skipped（跳过的交易日数）、saved（写入行数）
+    """
+    targets = load_tracked_symbols(db_manager, symbols)
+    stats = {'dates': 0, 'fetched': 0, 'skipped': 0, 'saved': 0}
+    if not targets:
+        logger.warning("没有需要回补的A股（请先登记到 stock_info）")
+        return stats
+
+    dates = client.get_trade_calendar(start_date, end_date)
+    sync_trade_calendar(db_manager, 'CN', dates)
+    done = set() if force else complete_dates(db_manager, dates, targets)
+    pending = [d for d in dates if d not in done]
+    stats.update(dates=len(dates), skipped=len(done))
+
+    logger.info(f"回补 {len(targets)} 只A股日线: {len(dates)} 个交易日，"
+                f"已完整 {len(done)} 个，需请求 {len(pending)} 个")
+
+    frames = []
+    start_time = time.time()
+    for i, trade_date in enumerate(pending, 1):
+        snapshot = client.get_daily_snapshot(trade_date)
+        stats['fetched'] += 1
+        if not snapshot.empty:
+            frames.append(snapshot[snapshot['symbol'].isin(targets)])
+
+        if len(frames) >= flush_days or i == len(pending):
+            stats['saved'] += _flush(db_manager, frames)
+            elapsed = time.time() - start_time
+            logger.info(f"[{i}/{len(pending)}] {trade_date} 已写入 {stats['saved']} 条，"
+                        f"已用时 {elapsed:.0f} 秒，预计剩余 {elapsed / i * (len(pending) - i):.0f} 秒")
+
+    return stats
@@ -4,7 +4,7 @@ Tushare数据源客户端
 """
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import tushare as ts
@@ -15,19 +15,25 @@ import time
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.retry import retry_on_failure
+from utils.rate_limiter import get_rate_limiter
 from utils.helpers import convert_to_tushare_code
+from data_collection.response_cache import get_response_cache, is_closed
+
+
+# 上市股票列表的缓存秒数
+STOCK_LIST_TTL = 24 * 3600
 
 
 class TushareClient:
     """Tushare数据源客户端"""
 
-    def __init__(self, token: str, request_interval: float = 0.3, enable_daily_basic: bool = True):
+    def __init__(self, token: str, request_interval: float = 0.0, enable_daily_basic: bool = True):
         """
         初始化Tushare客户端
 
         Args:
             token: Tushare API Token
-            request_interval: 请求间隔（秒）
+            request_interval: 本客户端额外的最小请求间隔（秒），默认只受共享限流器（tushare 限流窗口）约束
             enable_daily_basic: 是否尝试调用 daily_basic 接口（无权限时应关闭以加速）
         """
         self.logger = logger.bind(name='tushare_client')
@@ -40,11 +46,15 @@ class TushareClient:
         self.request_interval = request_interval
         self.last_request_time = 0
         self.enable_daily_basic = enable_daily_basic
+        self.rate_limiter = get_rate_limiter()
+        self.cache = get_response_cache()
 
         self.logger.info(f"Tushare客户端初始化成功 (请求间隔: {request_interval}秒, daily_basic: {'ON' if enable_daily_basic else 'OFF'})")
 
     def _wait_before_request(self):
-        """请求前等待，避免请求过快"""
+        """请求前从共享限流窗口取额度（多线程、多进程共用Tushare的频率额度）"""
+        self.rate_limiter.acquire('tushare')
+
         current_time = time.time()
         time_since_last_request = current_time - self.last_request_time
         
@@ -67,8 +77,6 @@ class TushareClient:
         Returns:
             日线数据列表
         """
-        self._wait_before_request()
-        
         try:
             # 转换为Tushare格式
             ts_code = convert_to_tushare_code(symbol)
@@ -82,38 +90,19 @@ class TushareClient:
             if end_date_str > today:
                 end_date_str = today
             
-            self.logger.info(f"获取 {symbol} 从 {start_date_str} 到 {end_date_str} 的日线数据")
-            
-            # 获取日线数据
-            df = self.pro.daily(
-                ts_code=ts_code,
-                start_date=start_date_str,
-                end_date=end_date_str
-            )
+            # 已收盘的历史区间永久缓存，包含今天的区间短时缓存；daily_basic 合并失败时不缓存
+            params = {'ts_code': ts_code, 'start_date': start_date_str, 'end_date': end_date_str,
+                      'daily_basic': self.enable_daily_basic}
+            df = self.cache.get('tushare', 'daily', params)
+            if df is None:
+                df, complete = self._request_daily(symbol, ts_code, start_date_str, end_date_str)
+                if complete:
+                    self.cache.put('tushare', 'daily', params, df,
+                                   ttl=self.cache.ttl_for(df, is_closed(end_date_str)))
             
             if df.empty:
                 self.logger.warning(f"股票 {symbol} 在指定期间没有数据")
                 return []
-            
-            # 可选：获取每日指标数据（包含换手率）
-            if self.enable_daily_basic:
-                try:
-                    self._wait_before_request()
-                    daily_basic_df = self.pro.daily_basic(
-                        ts_code=ts_code,
-                        start_date=start_date_str,
-                        end_date=end_date_str,
-                        fields='ts_code,trade_date,turnover_rate,turnover_rate_f,volume_ratio,pe,pb'
-                    )
-
-                    if not daily_basic_df.empty:
-                        df = df.merge(daily_basic_df, on='trade_date', how='left', suffixes=('', '_basic'))
-                        self.logger.debug(f"成功获取每日指标数据")
-                except Exception as e:
-                    if '权限' in str(e) or 'permission' in str(e).lower():
-                        self.logger.warning(f"无权限访问 daily_basic 接口，部分字段将为空")
-                    else:
-                        self.logger.warning(f"获取 daily_basic 数据失败: {e}")
 
             # 不使用复权 - 使用原始价格进行技术分析
             # 复权主要用于长期收益率计算，对于技术指标分析应使用不复权价格
@@ -139,35 +128,30 @@ class TushareClient:
             # except Exception as e:
             #     self.logger.warning(f"获取复权因子失败: {e}")
             
-            # 转换为系统格式
-            results = []
-            for _, row in df.iterrows():
+            # 转换为系统格式（按列转换）
+            records = pd.DataFrame({
+                'symbol': symbol,
                 # 转换日期格式：YYYYMMDD -> datetime
-                trade_date = datetime.strptime(str(row['trade_date']), '%Y%m%d')
-                
-                data = {
-                    'symbol': symbol,
-                    'trade_date': trade_date,
-                    'open': float(row['open']),
-                    'high': float(row['high']),
-                    'low': float(row['low']),
-                    'close': float(row['close']),
-                    'volume': int(row['vol'] * 100) if pd.notna(row['vol']) else 0,  # Tushare的vol单位是手，转换为股
-                    'turnover': float(row['amount'] * 1000) if pd.notna(row['amount']) else 0.0,  # Tushare的amount单位是千元，转换为元
-                    'created_at': datetime.now()
-                }
-                
-                # 添加可选字段
-                if 'turnover_rate' in row and pd.notna(row['turnover_rate']):
-                    data['turnover_rate'] = float(row['turnover_rate'])
-
-                if 'pct_chg' in row and pd.notna(row['pct_chg']):
-                    data['change_pct'] = float(row['pct_chg'])  # 注意：字段名是change_pct不是change_percent
-                
-                results.append(data)
-            
-            # 按日期升序排序
-            results.sort(key=lambda x: x['trade_date'])
+                'trade_date': pd.to_datetime(df['trade_date'].astype(str), format='%Y%m%d'),
+                'open': df['open'].astype(float),
+                'high': df['high'].astype(float),
+                'low': df['low'].astype(float),
+                'close': df['close'].astype(float),
+                'volume': (df['vol'] * 100).fillna(0).astype('int64'),  # Tushare的vol单位是手，转换为股
+                'turnover': (df['amount'] * 1000).fillna(0.0),  # Tushare的amount单位是千元，转换为元
+                'created_at': datetime.now()
+            })
+
+            # 添加可选字段
+            if 'turnover_rate' in df.columns:
+                records['turnover_rate'] = df['turnover_rate']
+            if 'pct_chg' in df.columns:
+                records['change_pct'] = df['pct_chg']  # 注意：字段名是change_pct不是change_percent
+
+            # 按日期升序排序，空的可选字段不输出
+            records = records.sort_values('trade_date')
+            results = [{k: v for k, v in row.items() if not (k in ('turnover_rate', 'change_pct') and pd.isna(v))}
+                       for row in records.to_dict('records')]
             
             self.logger.info(f"成功获取 {symbol} 的 {len(results)} 条日线数据")
             return results
@@ -176,6 +160,174 @@ class TushareClient:
             self.logger.error(f"获取 {symbol} 日线数据失败: {e}")
             raise
     
+    def _request_daily(self, symbol: str, ts_code: str, start_date_str: str,
+                       end_date_str: str) -> Tuple[pd.DataFrame, bool]:
+        """
+        请求单只股票区间日线（合并 daily_basic）
+
+        Returns:
+            (DataFrame, bool): Tushare 原始格式的日线，以及是否完整（daily_basic 请求失败时为 False）
+        """
+        self._wait_before_request()
+
+        self.logger.info(f"获取 {symbol} 从 {start_date_str} 到 {end_date_str} 的日线数据")
+
+        # 获取日线数据
+        df = self.pro.daily(
+            ts_code=ts_code,
+            start_date=start_date_str,
+            end_date=end_date_str
+        )
+
+        # 可选：获取每日指标数据（包含换手率）
+        if self.enable_daily_basic and not df.empty:
+            try:
+                self._wait_before_request()
+                daily_basic_df = self.pro.daily_basic(
+                    ts_code=ts_code,
+                    start_date=start_date_str,
+                    end_date=end_date_str,
+                    fields='ts_code,trade_date,turnover_rate,turnover_rate_f,volume_ratio,pe,pb'
+                )
+
+                if not daily_basic_df.empty:
+                    df = df.merge(daily_basic_df, on='trade_date', how='left', suffixes=('', '_basic'))
+                    self.logger.debug(f"成功获取每日指标数据")
+            except Exception as e:
+                if '权限' in str(e) or 'permission' in str(e).lower():
+                    self.logger.warning(f"无权限访问 daily_basic 接口，部分字段将为空")
+                else:
+                    self.logger.warning(f"获取 daily_basic 数据失败: {e}")
+                return df, False
+
+        return df, True
+
+    @retry_on_failure(max_retries=3, delay=2.0, logger_name='tushare_client')
+    def get_trade_calendar(self, start_date: datetime, end_date: datetime, exchange: str = 'SSE') -> List[str]:
+        """
+        获取区间内的交易日
+
+        Args:
+            start_date: 开始日期
+            end_date: 结束日期
+            exchange: 交易所（SSE/SZSE）
+
+        Returns:
+            交易日列表（YYYYMMDD，升序）
+        """
+        start_date_str = start_date.strftime('%Y%m%d')
+        end_date_str = min(end_date.strftime('%Y%m%d'), datetime.now().strftime('%Y%m%d'))
+
+        def request():
+            self._wait_before_request()
+            return self.pro.trade_cal(exchange=exchange, start_date=start_date_str, end_date=end_date_str,
+                                      fields='cal_date,is_open')
+
+        df = self.cache.fetch('tushare', 'trade_cal',
+                              {'exchange': exchange, 'start_date': start_date_str, 'end_date': end_date_str},
+                              request, closed=is_closed(end_date_str))
+        dates = sorted(str(d) for d in df.loc[df['is_open'].astype(int) == 1, 'cal_date'])
+
+        self.logger.info(f"{start_date_str} 至 {end_date_str} 共 {len(dates)} 个交易日")
+        return dates
+
+    @retry_on_failure(max_retries=3, delay=2.0, logger_name='tushare_client')
+    def get_daily_snapshot(self, trade_date: str) -> pd.DataFrame:
+        """
+        获取某个交易日全市场的日线数据（一次请求，daily_basic 同样按日期一次请求）
+
+        Args:
+            trade_date: 交易日（YYYYMMDD）
+
+        Returns:
+            DataFrame: 系统格式的日线记录（symbol, trade_date, open, high, low, close, volume,
+            turnover, change, change_pct, turnover_rate），当日无数据时为空
+        """
+        # 已收盘交易日的快照永久缓存（重跑回补不再请求），当天的快照短时缓存；daily_basic 合并失败时不缓存
+        records = self.cache.get('tushare', 'daily_snapshot',
+                                 {'trade_date': trade_date, 'daily_basic': self.enable_daily_basic})
+        if records is None:
+            records, complete = self._request_daily_snapshot(trade_date)
+            # 请求中可能因无权限关闭了 daily_basic，按实际内容写入缓存
+            if complete:
+                self.cache.put('tushare', 'daily_snapshot',
+                               {'trade_date': trade_date, 'daily_basic': self.enable_daily_basic},
+                               records, ttl=self.cache.ttl_for(records, is_closed(trade_date)))
+        return records
+
+    def _request_daily_snapshot(self, trade_date: str) -> Tuple[pd.DataFrame, bool]:
+        """
+        请求某个交易日的全市场日线并转换为系统格式
+
+        Returns:
+            (DataFrame, bool): 日线记录，以及是否完整（daily_basic 请求临时失败时为 False）
+        """
+        self._wait_before_request()
+
+        df = self.pro.daily(trade_date=trade_date)
+        if df is None or df.empty:
+            self.logger.warning(f"{trade_date} 没有全市场日线数据")
+            return pd.DataFrame(), True
+
+        complete = True
+
+        if self.enable_daily_basic:
+            try:
+                self._wait_before_request()
+                daily_basic_df = self.pro.daily_basic(trade_date=trade_date, fields='ts_code,turnover_rate')
+                if daily_basic_df is not None and not daily_basic_df.empty:
+                    df = df.merge(daily_basic_df, on='ts_code', how='left')
+            except Exception as e:
+                if '权限' in str(e) or 'permission' in str(e).lower():
+                    self.logger.warning(f"无权限访问 daily_basic 接口，换手率将为空")
+                    self.enable_daily_basic = False
+                else:
+                    self.logger.warning(f"获取 {trade_date} daily_basic 数据失败: {e}")
+                    complete = False
+
+        # 向量化转换（Tushare vol 单位：手；amount 单位：千元）
+        records = pd.DataFrame({
+            'symbol': df['ts_code'].astype(str),
+            'trade_date': datetime.strptime(trade_date, '%Y%m%d').date(),
+            'open': df['open'],
+            'high': df['high'],
+            'low': df['low'],
+            'close': df['close'],
+            'volume': (df['vol'] * 100).round(),
+            'turnover': df['amount'] * 1000,
+            'change': df['change'] if 'change' in df.columns else None,
+            'change_pct': df['pct_chg'] if 'pct_chg' in df.columns else None,
+            'turnover_rate': df['turnover_rate'] if 'turnover_rate' in df.columns else None,
+        })
+
+        self.logger.debug(f"获取 {trade_date} 全市场日线 {len(records)} 条")
+        return records, complete
+
+    @retry_on_failure(max_retries=3, delay=2.0, logger_name='tushare_client')
+    def get_stock_list(self) -> pd.DataFrame:
+        """
+        获取全部上市的沪深A股基本信息（一次请求，不含北交所）
+
+        Returns:
+            DataFrame: symbol, name, exchange（SH/SZ）, industry, list_date
+        """
+        # 上市列表变化很慢，缓存一天
+        return self.cache.fetch('tushare', 'stock_basic', {'list_status': 'L'}, self._request_stock_list,
+                                ttl=STOCK_LIST_TTL)
+
+    def _request_stock_list(self) -> pd.DataFrame:
+        """请求上市的沪深A股列表"""
+        self._wait_before_request()
+
+        columns = ['symbol', 'name', 'exchange', 'industry', 'list_date']
+        df = self.pro.stock_basic(list_status='L', fields='ts_code,name,industry,list_date,market')
+        if df is None or df.empty:
+            return pd.DataFrame(columns=columns)
+
+        df = df[df['market'].isin(['主板', '创业板', '科创板'])].rename(columns={'ts_code': 'symbol'})
+        df['exchange'] = df['symbol'].str.split('.').str[-1]
+        return df[columns].reset_index(drop=True)
+
     @retry_on_failure(max_retries=3, delay=2.0, logger_name='tushare_client')
     def get_stock_info(self, symbol: str) -> Dict[str, Any]:
         """
@@ -260,7 +412,7 @@ def init_tushare_client(config: Dict[str, Any]) -> TushareClient:
     if not token:
         raise ValueError("配置中缺少 Tushare token")
     
-    request_interval = config.get('request_interval', 0.3)
+    request_interval = config.get('request_interval', 0.0)
     
     _tushare_client = TushareClient(token, request_interval)
     return _tushare_client
@@ -7,10 +7,28 @@ from database.models import (
     DailyData,
     TechnicalIndicator,
     StockSelection,
+    StockScore,
+    LatestBar,
+    MinuteBar,
+    DataChange,
+    PipelineCheckpoint,
+    DataCoverage,
+    TradeCalendar,
     BacktestResult,
     TradingSignal
 )
 from database.db_manager import DatabaseManager, init_database, get_db_manager
+from database.fast_read import fetch_arrays, fetch_frame, read_frame, load_bars
+from database.panel_loader import load_universe_panel, load_score_history, to_kline_records
+from database.columnar_store import ColumnarData, load_columnar, sync_columnar_store
+from database.latest_bars import get_latest_bars, get_latest_prices, refresh_latest_bars
+from database.security_ids import SecurityIdMap
+from database.change_feed import ChangeSet, pending_changes
+from database.coverage import (
+    Coverage, GapPlan, load_coverage, rebuild_coverage, plan_gaps, coverage_report,
+    load_trade_calendar, sync_trade_calendar, derive_trade_calendar
+)
+from database.minute_archive import load_minute_data, rollup_minute_data, archive_minute_data, check_daily_rollup
 
 __all__ = [
     'Base',
@@ -18,10 +36,46 @@ __all__ = [
     'DailyData',
     'TechnicalIndicator',
     'StockSelection',
+    'StockScore',
+    'LatestBar',
+    'MinuteBar',
+    'DataChange',
+    'PipelineCheckpoint',
+    'DataCoverage',
+    'TradeCalendar',
     'BacktestResult',
     'TradingSignal',
     'DatabaseManager',
     'init_database',
-    'get_db_manager'
+    'get_db_manager',
+    'fetch_arrays',
+    'fetch_frame',
+    'read_frame',
+    'load_bars',
+    'load_universe_panel',
+    'load_score_history',
+    'to_kline_records',
+    'ColumnarData',
+    'load_columnar',
+    'sync_columnar_store',
+    'get_latest_bars',
+    'get_latest_prices',
+    'refresh_latest_bars',
+    'SecurityIdMap',
+    'load_minute_data',
+    'rollup_minute_data',
+    'archive_minute_data',
+    'check_daily_rollup',
+    'ChangeSet',
+    'pending_changes',
+    'Coverage',
+    'GapPlan',
+    'load_coverage',
+    'rebuild_coverage',
+    'plan_gaps',
+    'coverage_report',
+    'load_trade_calendar',
+    'sync_trade_calendar',
+    'derive_trade_calendar'
 ]
 
@@ -0,0 +1,154 @@
+"""
+数据变更日志模块（增量下游计算）
+
+写入 daily_data / technical_indicators / stock_selection 的会话在提交前按 (表, 股票) 向 data_changes
+追加一行（与数据写入同一事务，见 DatabaseManager），seq 单调递增即数据版本。
+下游阶段（计算指标 → 选股 → 生成信号）各自在 pipeline_checkpoints 记录已处理到的 seq，
+每次只取检查点之后有变化的股票处理，处理成功后推进检查点:
+
+    changes = pending_changes(db_manager, 'calculate_indicators', 'CN', ['daily_data'])
+    symbols = None if changes.full else changes.symbols   # 首次运行没有检查点，需全量处理
+    ...
+    changes.commit(failed)   # 处理失败的股票重新记为变更，下次仍会处理
+
+PostgreSQL 上 seq 在插入时分配、提交时才可见，并发事务可能先拿到较小的 seq 却后提交，
+下游按 max(seq) 推进检查点就会永久跳过这些变更。因此写日志前先取事务级咨询锁，
+使写日志的事务串行提交，已提交的 seq 总小于任何未提交事务的 seq（SQLite 本身单写者，无需加锁）。
+"""
+from datetime import datetime
+from sqlalchemy import select, delete, func, insert, text
+from loguru import logger
+
+from database.models import StockInfo, DataChange, PipelineCheckpoint
+
+
+# 记录变更的表
+CHANGE_TRACKED_TABLES = ('daily_data', 'technical_indicators', 'stock_selection')
+
+# 串行化写变更日志的 PostgreSQL 咨询锁键
+CHANGE_LOG_LOCK_KEY = 0x7164636c
+
+
+def record_data_changes(session, changes):
+    """
+    在调用方的事务内写入变更日志
+
+    Args:
+        session: 写会话
+        changes: 表名 -> 股票代码集合
+
+    Returns:
+        int: 写入的日志行数
+    """
+    now = datetime.now()
+    rows = [{'table_name': table_name, 'symbol': symbol, 'changed_at': now}
+            for table_name, symbols in changes.items() for symbol in sorted(symbols)]
+    if rows:
+        if session.get_bind(DataChange).dialect.name == 'postgresql':
+            # 持有到事务结束，保证 seq 按提交顺序可见
+            session.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': CHANGE_LOG_LOCK_KEY})
+        session.execute(insert(DataChange), rows)
+    return len(rows)
+
+
+class ChangeSet:
+    """一个处理阶段在某市场待处理的变更"""
+
+    def __init__(self, db_manager, stage, market, tables, since, until, symbols):
+        """
+        Args:
+            db_manager: 数据库管理器
+            stage: 处理阶段
+            market: 市场
+            tables: 关注的表
+            since: 检查点（已处理到的 seq），没有检查点时为 None
+            until: 本次处理到的 seq
+            symbols: 有变化的股票代码（没有检查点时为 None）
+        """
+        self.db = db_manager
+        self.stage = stage
+        self.market = market
+        self.tables = tables
+        self.since = since
+        self.until = until
+        self.symbols = symbols
+
+    @property
+    def full(self):
+        """没有检查点（首次运行），需要全量处理"""
+        return self.since is None
+
+    def __repr__(self):
+        count = 'full' if self.full else len(self.symbols)
+        return f"<ChangeSet(stage='{self.stage}', market='{self.market}', seq={self.since}..{self.until}, symbols={count})>"
+
+    def commit(self, failed=None):
+        """
+        处理后推进检查点，并清理所有阶段都已处理过的日志
+
+        Args:
+            failed: 处理失败的股票代码。与推进检查点在同一事务内重新记为变更（seq 在本次之后），
+                下次运行仍会处理；其他关注同一张表的阶段也会多处理一次这些股票
+        """
+        with self.db.get_session(self.market) as session:
+            if failed:
+                record_data_changes(session, {self.tables[0]: set(failed)})
+            checkpoint = session.query(PipelineCheckpoint).filter_by(
+                stage=self.stage, market=self.market
+            ).first()
+            if checkpoint is None:
+                session.add(PipelineCheckpoint(stage=self.stage, market=self.market, last_seq=self.until))
+            elif checkpoint.last_seq < self.until:
+                checkpoint.last_seq = self.until
+            session.flush()
+
+            oldest = session.execute(select(func.min(PipelineCheckpoint.last_seq))).scalar()
+            if oldest:
+                pruned = session.execute(delete(DataChange).where(DataChange.seq <= oldest)).rowcount
+                if pruned:
+                    logger.debug(f"清理已处理的变更日志 {pruned} 条（seq <= {oldest}）")
+
+        logger.info(f"{self.stage} {self.market} 检查点推进到 seq {self.until}")
+        if failed:
+            logger.warning(f"{self.stage} {self.market} {len(failed)} 只股票处理失败，保留到下次处理")
+
+
+def pending_changes(db_manager, stage, market, tables):
+    """
+    查询处理阶段自上次检查点以来有变化的股票
+
+    Args:
+        db_manager: 数据库管理器
+        stage: 处理阶段名称
+        market: 市场代码
+        tables: 关注的表名列表（如 ['daily_data']）
+
+    Returns:
+        ChangeSet: full 为 True 时没有检查点，调用方应全量处理
+    """
+    tables = list(tables)
+    with db_manager.get_read_session(market) as session:
+        until = session.execute(select(func.max(DataChange.seq))).scalar() or 0
+        since = session.execute(
+            select(PipelineCheckpoint.last_seq).where(
+                PipelineCheckpoint.stage == stage, PipelineCheckpoint.market == market
+            )
+        ).scalar()
+
+        symbols = None
+        if since is not None:
+            rows = session.execute(
+                select(DataChange.symbol).distinct()
+                .join(StockInfo, StockInfo.symbol == DataChange.symbol)
+                .where(StockInfo.market == market,
+                       DataChange.table_name.in_(tables),
+                       DataChange.seq > since, DataChange.seq <= until)
+            ).all()
+            symbols = sorted(row.symbol for row in rows)
+
+    changes = ChangeSet(db_manager, stage, market, tables, since, until, symbols)
+    if changes.full:
+        logger.info(f"{stage} {market} 没有检查点，本次全量处理")
+    else:
+        logger.info(f"{stage} {market} 自 seq {since} 以来 {len(symbols)} 只股票的 {', '.join(tables)} 有变化")
+    return changes
@@ -0,0 +1,324 @@
+"""
+列式行情存储模块
+
+按市场把日线保存为内存映射的 NumPy 矩阵（每个字段一个 .npy 文件，行为交易日、列为股票），
+作为 daily_data 表之外的只读通道：研究脚本和回测直接映射整段历史，不经过 SQL 和 ORM。
+
+目录结构:
+    {root}/{market}/meta.json     股票列表、字段、同步时间
+    {root}/{market}/dates.npy     交易日（datetime64[D]，升序）
+    {root}/{market}/{column}.npy  float64 矩阵 (交易日 × 股票)，无数据为 NaN
+"""
+import os
+import json
+import shutil
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from loguru import logger
+
+from database.fast_read import fetch_frame
+from database.models import StockInfo, DailyData
+
+
+# 存储的K线字段
+COLUMNAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'turnover']
+
+# 默认存储目录（可通过配置 database.columnar.path 修改）
+DEFAULT_COLUMNAR_ROOT = 'data/columnar'
+
+# 增量同步时重新读取的最近交易日数（覆盖盘后修正的K线）
+SYNC_OVERLAP_DAYS = 5
+
+# 每次查询的股票数
+SYNC_CHUNK_SIZE = 500
+
+
+def get_columnar_root(root=None):
+    """
+    获取列式存储根目录
+
+    Args:
+        root: 指定目录，为空时读取配置 database.columnar.path
+
+    Returns:
+        str: 根目录
+    """
+    if root:
+        return root
+    try:
+        from utils.config_loader import get_config_loader
+        return get_config_loader().get('database.columnar.path', DEFAULT_COLUMNAR_ROOT)
+    except RuntimeError:
+        return DEFAULT_COLUMNAR_ROOT
+
+
+class ColumnarData:
+    """一个市场的列式行情（字段矩阵为只读内存映射，按日期切片不复制）"""
+
+    def __init__(self, market, symbols, dates, arrays):
+        """
+        Args:
+            market: 市场代码
+            symbols: 股票代码数组（对应矩阵的列）
+            dates: 交易日数组 datetime64[D]（对应矩阵的行）
+            arrays: 字段名 -> 矩阵 (交易日 × 股票)
+        """
+        self.market = market
+        self.symbols = symbols
+        self.dates = dates
+        self.arrays = arrays
+        self._positions = None
+
+    def __getitem__(self, column):
+        return self.arrays[column]
+
+    @property
+    def columns(self):
+        return list(self.arrays)
+
+    @property
+    def shape(self):
+        return (len(self.dates), len(self.symbols))
+
+    def symbol_index(self, symbols):
+        """
+        股票代码对应的列号
+
+        Args:
+            symbols: 股票代码列表
+
+        Returns:
+            ndarray: 列号（不存在的股票为 -1）
+        """
+        if self._positions is None:
+            self._positions = {symbol: i for i, symbol in enumerate(self.symbols.tolist())}
+        return np.array([self._positions.get(symbol, -1) for symbol in symbols], dtype=np.int64)
+
+    def frame(self, column):
+        """
+        字段矩阵包装为宽表 DataFrame（index 为交易日，columns 为股票代码）
+
+        Args:
+            column: 字段名
+
+        Returns:
+            DataFrame
+        """
+        return pd.DataFrame(self.arrays[column], index=pd.DatetimeIndex(self.dates, name='trade_date'),
+                            columns=pd.Index(self.symbols, name='symbol'), copy=False)
+
+
+def _read_meta(path):
+    """读取市场目录的元数据，不存在时返回 None"""
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_columnar(market, columns=None, start_date=None, end_date=None, root=None):
+    """
+    映射一个市场的列式行情
+
+    Args:
+        market: 市场代码
+        columns: 字段列表，默认全部
+        start_date: 开始日期（含）
+        end_date: 结束日期（含）
+        root: 存储根目录
+
+    Returns:
+        ColumnarData: 字段矩阵为只读内存映射的视图
+
+    Raises:
+        FileNotFoundError: 该市场尚未同步
+    """
+    path = os.path.join(get_columnar_root(root), market)
+    meta = _read_meta(path)
+    if meta is None:
+        raise FileNotFoundError(f"列式存储不存在: {path}，请先运行 scripts/sync_columnar_store.py")
+
+    columns = columns or meta['columns']
+    missing = [col for col in columns if col not in meta['columns']]
+    if missing:
+        raise ValueError(f"列式存储不包含字段: {missing}")
+
+    dates = np.load(os.path.join(path, 'dates.npy'))
+    lo = np.searchsorted(dates, np.datetime64(start_date, 'D')) if start_date else 0
+    hi = np.searchsorted(dates, np.datetime64(end_date, 'D'), side='right') if end_date else len(dates)
+
+    arrays = {col: np.load(os.path.join(path, f'{col}.npy'), mmap_mode='r')[lo:hi] for col in columns}
+    return ColumnarData(market, np.array(meta['symbols']), dates[lo:hi], arrays)
+
+
+def _market_symbols(session, market):
+    """市场内全部股票（含已停用，避免幸存者偏差）"""
+    rows = session.execute(
+        select(StockInfo.symbol).where(StockInfo.market == market).order_by(StockInfo.symbol)
+    ).all()
+    return [row.symbol for row in rows]
+
+
+def _market_dates(session, market, since=None):
+    """市场内出现过的交易日（升序）"""
+    stmt = select(DailyData.trade_date).distinct().join(
+        StockInfo, DailyData.security_id == StockInfo.id
+    ).where(StockInfo.market == market)
+    if since is not None:
+        stmt = stmt.where(DailyData.trade_date >= since)
+    return [row.trade_date for row in session.execute(stmt.order_by(DailyData.trade_date)).all()]
+
+
+def _fill_bars(session, arrays, symbols, dates, positions, since=None):
+    """
+    分批查询K线并写入字段矩阵
+
+    Returns:
+        tuple: (写入的K线数, 不在交易日轴上的日期数组)；后者非空时这些K线未写入，需扩展日期轴后重新同步
+    """
+    count = 0
+    outside = []
+    for start in range(0, len(symbols), SYNC_CHUNK_SIZE):
+        chunk = symbols[start:start + SYNC_CHUNK_SIZE]
+        stmt = select(DailyData.symbol, DailyData.trade_date, *[getattr(DailyData, c) for c in COLUMNAR_COLUMNS]
+                      ).where(DailyData.symbol.in_(chunk))
+        if since is not None:
+            stmt = stmt.where(DailyData.trade_date >= since)
+
+        df = fetch_frame(session, stmt, parse_dates=True)
+        if df.empty:
+            continue
+
+        # searchsorted 只给出插入位置，日期不在轴上时会落到相邻行，需核对是否精确命中
+        trade_dates = df['trade_date'].to_numpy(dtype='datetime64[D]')
+        rows = np.searchsorted(dates, trade_dates)
+        matched = rows < len(dates)
+        matched[matched] = dates[rows[matched]] == trade_dates[matched]
+        if not matched.all():
+            outside.append(np.unique(trade_dates[~matched]))
+            df, rows = df[matched], rows[matched]
+
+        cols = df['symbol'].map(positions).to_numpy(dtype=np.int64)
+        for col in COLUMNAR_COLUMNS:
+            arrays[col][rows, cols] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        count += len(df)
+
+    outside = np.unique(np.concatenate(outside)) if outside else np.array([], dtype='datetime64[D]')
+    return count, outside
+
+
+def _write_arrays(session, tmp_path, path, old, symbols, dates, since):
+    """
+    在临时目录创建字段矩阵并写入K线（增量模式先复制旧矩阵）
+
+    Returns:
+        tuple: (写入的K线数, 不在交易日轴上的日期数组)
+    """
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    shape = (len(dates), len(symbols))
+    arrays = {}
+    for col in COLUMNAR_COLUMNS:
+        arrays[col] = np.lib.format.open_memmap(
+            os.path.join(tmp_path, f'{col}.npy'), mode='w+', dtype=np.float64, shape=shape
+        )
+        arrays[col][:] = np.nan
+
+    positions = {symbol: i for i, symbol in enumerate(symbols)}
+
+    if old is None:
+        count, outside = _fill_bars(session, arrays, symbols, dates, positions)
+    else:
+        # 复制已有数据（旧股票列号不变；通常新交易日都在最后，直接按行切片复制）
+        old_dates = np.load(os.path.join(path, 'dates.npy'))
+        rows = np.searchsorted(dates, old_dates)
+        if len(rows) and rows[-1] == len(rows) - 1:
+            rows = slice(0, len(rows))
+        n_old = len(old['symbols'])
+        for col in COLUMNAR_COLUMNS:
+            arrays[col][rows, :n_old] = np.load(os.path.join(path, f'{col}.npy'), mmap_mode='r')
+
+        count, outside = _fill_bars(session, arrays, old['symbols'], dates, positions, since)
+        added, more = _fill_bars(session, arrays, symbols[n_old:], dates, positions)
+        count += added
+        outside = np.union1d(outside, more)
+
+    for array in arrays.values():
+        array.flush()
+    return count, outside
+
+
+def sync_columnar_store(db_manager, market, root=None, full=False, overlap=SYNC_OVERLAP_DAYS):
+    """
+    从 daily_data 同步一个市场的列式行情
+
+    增量模式只读取最近 overlap 个已存交易日之后的K线，以及新上市股票的全部历史；
+    结果写入临时目录后整体替换，读取方不会看到写了一半的文件。
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场代码
+        root: 存储根目录
+        full: 是否全量重建
+        overlap: 增量模式重新读取的最近交易日数
+
+    Returns:
+        int: 本次从数据库读取并写入的K线数
+    """
+    root = get_columnar_root(root)
+    path = os.path.join(root, market)
+    old = None if full else _read_meta(path)
+    if old is not None and old.get('columns') != COLUMNAR_COLUMNS:
+        logger.info("列式存储字段已变化，执行全量重建")
+        old = None
+
+    with db_manager.get_read_session(market) as session:
+        market_symbols = _market_symbols(session, market)
+
+        since = None
+        if old is None:
+            symbols = market_symbols
+            dates = np.array(_market_dates(session, market), dtype='datetime64[D]')
+        else:
+            # 已有股票保持原列序，新股票追加在后
+            known = set(old['symbols'])
+            symbols = old['symbols'] + [s for s in market_symbols if s not in known]
+            old_dates = np.load(os.path.join(path, 'dates.npy'))
+            since = old_dates[-overlap].astype(object) if len(old_dates) >= overlap else None
+            new_dates = np.array(_market_dates(session, market, since), dtype='datetime64[D]')
+            dates = np.union1d(old_dates, new_dates)
+
+        # 写入临时目录；有K线不在日期轴上（新股回补了更早的历史、同步期间有新写入等）时扩展日期轴重写
+        tmp_path = path + '.tmp'
+        while True:
+            count, outside = _write_arrays(session, tmp_path, path, old, symbols, dates, since)
+            if not len(outside):
+                break
+            logger.info(f"{market} 有 {len(outside)} 个交易日不在日期轴上，扩展日期轴后重新写入")
+            dates = np.union1d(dates, outside)
+
+    np.save(os.path.join(tmp_path, 'dates.npy'), dates)
+    with open(os.path.join(tmp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'market': market,
+            'columns': COLUMNAR_COLUMNS,
+            'symbols': symbols,
+            'start_date': str(dates[0]) if len(dates) else None,
+            'end_date': str(dates[-1]) if len(dates) else None,
+            'synced_at': datetime.now().isoformat(timespec='seconds'),
+        }, f, ensure_ascii=False)
+
+    # 整体替换旧目录
+    old_path = path + '.old'
+    shutil.rmtree(old_path, ignore_errors=True)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    logger.info(f"{market} 列式存储同步完成: {len(symbols)} 只股票 × {len(dates)} 个交易日，读取 {count} 条K线")
+    return count
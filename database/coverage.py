@@ -0,0 +1,475 @@
+"""
+日线覆盖索引模块
+
+data_coverage 表每只股票一行，用位图记录哪些日期有日线：第 i 位对应 first_date 之后第 i 个自然日
+（按自然日而不是交易日编号，交易日历更新后不需要重建位图）。写入 daily_data 的会话在提交前把写入的日期
+并入位图、删除过日线的股票按 daily_data 重建位图（见 DatabaseManager），覆盖统计不再按股票扫描 daily_data。
+
+trade_calendar 表缓存各市场的交易日（A股来自 Tushare 交易日历，其余市场由覆盖位图推断）。
+plan_gaps 用交易日历和位图求出缺失的 (股票, 交易日)，合并为最少的请求:
+
+    plan = plan_gaps(db_manager, 'HK', start_date, end_date)
+    plan.ranges        # [(symbol, start, end), ...]  按股票请求区间的数据源（长桥历史K线）
+    plan.trade_dates   # [trade_date, ...]            按交易日请求全市场的数据源（Tushare 快照）
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, delete, func
+from loguru import logger
+
+from database.models import StockInfo, DailyData, DataCoverage, TradeCalendar
+from database.latest_bars import _insert
+
+
+# 维护覆盖索引的表
+COVERAGE_TABLE = DailyData.__tablename__
+
+# 每条语句处理的股票数（SQLite 参数个数限制）
+COVERAGE_CHUNK_SIZE = 500
+
+# 由数据推断交易日历：当天有日线的股票占当时已上市（位图区间覆盖该日）股票的比例下限
+CALENDAR_MIN_RATIO = 0.5
+
+
+def to_date(value) -> date:
+    """日期、datetime、Timestamp 统一为 date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _ordinals(dates) -> np.ndarray:
+    """日期列表 -> 序数数组（date.toordinal）"""
+    return np.fromiter((d.toordinal() for d in dates), dtype=np.int64)
+
+
+def _chunks(items, size=COVERAGE_CHUNK_SIZE):
+    """按 size 分块"""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Coverage:
+    """单只股票的日线覆盖位图"""
+
+    def __init__(self, first_date: date, bits: np.ndarray):
+        """
+        Args:
+            first_date: 位图第0位对应的日期
+            bits: 布尔数组，第 i 位为 first_date 之后第 i 个自然日是否有日线
+        """
+        self.first_date = first_date
+        self.bits = bits
+
+    def __repr__(self):
+        return f"<Coverage({self.first_date}~{self.last_date}, days={self.days})>"
+
+    @property
+    def last_date(self) -> date:
+        return self.first_date + timedelta(days=len(self.bits) - 1)
+
+    @property
+    def days(self) -> int:
+        return int(self.bits.sum())
+
+    @classmethod
+    def from_dates(cls, dates: Iterable) -> Optional['Coverage']:
+        """由日期集合构建位图，没有日期时返回 None"""
+        ordinals = np.unique(_ordinals(dates))
+        if not len(ordinals):
+            return None
+        bits = np.zeros(ordinals[-1] - ordinals[0] + 1, dtype=bool)
+        bits[ordinals - ordinals[0]] = True
+        return cls(date.fromordinal(int(ordinals[0])), bits)
+
+    @classmethod
+    def decode(cls, first_date: date, last_date: date, bitmap: bytes) -> 'Coverage':
+        """由 data_coverage 的一行解码"""
+        count = (last_date - first_date).days + 1
+        bits = np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8), count=count, bitorder='little')
+        return cls(first_date, bits.astype(bool))
+
+    def encode(self) -> bytes:
+        """编码为 data_coverage.bitmap"""
+        return np.packbits(self.bits, bitorder='little').tobytes()
+
+    def merge(self, other: Optional['Coverage']) -> 'Coverage':
+        """与另一个位图取并集"""
+        if other is None:
+            return self
+        first = min(self.first_date, other.first_date)
+        last = max(self.last_date, other.last_date)
+        bits = np.zeros((last - first).days + 1, dtype=bool)
+        for part in (self, other):
+            offset = (part.first_date - first).days
+            bits[offset:offset + len(part.bits)] |= part.bits
+        return Coverage(first, bits)
+
+    def contains(self, ordinals: np.ndarray) -> np.ndarray:
+        """
+        判断各日期是否有日线
+
+        Args:
+            ordinals: 日期序数数组
+
+        Returns:
+            布尔数组
+        """
+        offsets = ordinals - self.first_date.toordinal()
+        inside = (offsets >= 0) & (offsets < len(self.bits))
+        result = np.zeros(len(ordinals), dtype=bool)
+        result[inside] = self.bits[offsets[inside]]
+        return result
+
+    def dates(self) -> List[date]:
+        """有日线的日期列表"""
+        base = self.first_date.toordinal()
+        return [date.fromordinal(base + int(i)) for i in np.flatnonzero(self.bits)]
+
+
+def _write(session, coverages: Dict[str, Optional[Coverage]]):
+    """写入位图（值为 None 的股票删除覆盖记录）"""
+    insert = _insert(session.get_bind())
+    now = datetime.now()
+    rows = [{'symbol': symbol, 'first_date': cov.first_date, 'last_date': cov.last_date,
+             'days': cov.days, 'bitmap': cov.encode(), 'updated_at': now}
+            for symbol, cov in coverages.items() if cov is not None]
+    removed = [symbol for symbol, cov in coverages.items() if cov is None]
+
+    for chunk in _chunks(rows):
+        stmt = insert(DataCoverage.__table__).values(chunk)
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=['symbol'],
+            set_={col: stmt.excluded[col] for col in ('first_date', 'last_date', 'days', 'bitmap', 'updated_at')}
+        ))
+    for chunk in _chunks(removed):
+        session.execute(delete(DataCoverage).where(DataCoverage.symbol.in_(chunk)))
+
+
+def update_coverage(session, added: Dict[str, Iterable]) -> int:
+    """
+    在调用方的事务内把新写入的日期并入位图
+
+    Args:
+        session: 写会话
+        added: 股票代码 -> 写入的交易日期
+
+    Returns:
+        int: 更新的股票数
+    """
+    symbols = sorted(symbol for symbol, dates in added.items() if dates)
+    for chunk in _chunks(symbols):
+        current = {row.symbol: Coverage.decode(row.first_date, row.last_date, row.bitmap)
+                   for row in session.execute(
+                       select(DataCoverage.symbol, DataCoverage.first_date, DataCoverage.last_date,
+                              DataCoverage.bitmap)
+                       .where(DataCoverage.symbol.in_(chunk)).with_for_update()
+                   )}
+        _write(session, {symbol: Coverage.from_dates(added[symbol]).merge(current.get(symbol))
+                         for symbol in chunk})
+
+    logger.debug(f"更新日线覆盖索引 {len(symbols)} 只股票")
+    return len(symbols)
+
+
+def rebuild_coverage(session, symbols: Optional[Iterable[str]] = None) -> int:
+    """
+    按 daily_data 重建位图（删除过日线、或覆盖索引新建时使用）
+
+    Args:
+        session: 写会话（在调用方的事务内执行）
+        symbols: 股票代码，为空时重建会话所在库的全部股票
+
+    Returns:
+        int: 重建的股票数
+    """
+    if symbols is None:
+        symbols = {row.symbol for row in session.execute(select(StockInfo.symbol))}
+        symbols |= {row.symbol for row in session.execute(select(DataCoverage.symbol))}
+
+    symbols = sorted(set(symbols))
+    for chunk in _chunks(symbols):
+        dates = defaultdict(list)
+        for row in session.execute(select(DailyData.symbol, DailyData.trade_date)
+                                   .where(DailyData.symbol.in_(chunk))):
+            dates[row.symbol].append(row.trade_date)
+        _write(session, {symbol: Coverage.from_dates(dates[symbol]) for symbol in chunk})
+
+    logger.info(f"重建日线覆盖索引 {len(symbols)} 只股票")
+    return len(symbols)
+
+
+def load_coverage(db_manager, market: Optional[str] = None,
+                  symbols: Optional[Iterable[str]] = None) -> Dict[str, Coverage]:
+    """
+    读取覆盖位图
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场（分库时读取该市场的库）
+        symbols: 股票代码，为空时读取全部
+
+    Returns:
+        dict: symbol -> Coverage（没有日线的股票不在其中）
+    """
+    stmt = select(DataCoverage.symbol, DataCoverage.first_date, DataCoverage.last_date, DataCoverage.bitmap)
+    with db_manager.get_read_session(market) as session:
+        if symbols is None:
+            rows = session.execute(stmt).all()
+        else:
+            rows = [row for chunk in _chunks(sorted(set(symbols)))
+                    for row in session.execute(stmt.where(DataCoverage.symbol.in_(chunk)))]
+    return {row.symbol: Coverage.decode(row.first_date, row.last_date, row.bitmap) for row in rows}
+
+
+def load_trade_calendar(db_manager, market: str, start_date=None, end_date=None) -> List[date]:
+    """
+    读取缓存的交易日历
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场
+        start_date: 开始日期（含）
+        end_date: 结束日期（含）
+
+    Returns:
+        交易日列表（升序）
+    """
+    stmt = select(TradeCalendar.trade_date).where(TradeCalendar.market == market)
+    if start_date is not None:
+        stmt = stmt.where(TradeCalendar.trade_date >= to_date(start_date))
+    if end_date is not None:
+        stmt = stmt.where(TradeCalendar.trade_date <= to_date(end_date))
+    with db_manager.get_read_session(market) as session:
+        return [row.trade_date for row in session.execute(stmt.order_by(TradeCalendar.trade_date))]
+
+
+def sync_trade_calendar(db_manager, market: str, dates: Iterable, source: str = 'exchange') -> int:
+    """
+    写入交易日历
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场
+        dates: 交易日（date / datetime / 'YYYYMMDD' 字符串）
+        source: 来源，exchange（交易所日历，覆盖推断结果）或 data（由数据推断，不覆盖已有记录）
+
+    Returns:
+        int: 写入的交易日数
+    """
+    rows = [{'market': market, 'trade_date': to_date(d), 'source': source} for d in dates]
+    if not rows:
+        return 0
+
+    with db_manager.get_session(market) as session:
+        insert = _insert(session.get_bind())
+        for chunk in _chunks(rows):
+            stmt = insert(TradeCalendar.__table__).values(chunk)
+            if source == 'exchange':
+                stmt = stmt.on_conflict_do_update(index_elements=['market', 'trade_date'],
+                                                  set_={'source': stmt.excluded.source})
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=['market', 'trade_date'])
+            session.execute(stmt)
+
+    logger.info(f"{market} 交易日历写入 {len(rows)} 天（{source}）")
+    return len(rows)
+
+
+def derive_trade_calendar(db_manager, market: str, min_ratio: float = CALENDAR_MIN_RATIO) -> int:
+    """
+    由覆盖位图推断交易日历（没有交易所日历的市场使用）
+
+    某天有日线的股票数达到当时已有日线区间覆盖该日的股票数的 min_ratio 即视为交易日
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场
+        min_ratio: 比例下限
+
+    Returns:
+        int: 推断出的交易日数
+    """
+    coverages = load_coverage(db_manager, market, _market_symbols(db_manager, market, active_only=False))
+    if not coverages:
+        return 0
+
+    base = min(cov.first_date for cov in coverages.values()).toordinal()
+    size = max(cov.last_date for cov in coverages.values()).toordinal() - base + 1
+    counts = np.zeros(size, dtype=np.int64)
+    spans = np.zeros(size + 1, dtype=np.int64)
+    for cov in coverages.values():
+        offset = cov.first_date.toordinal() - base
+        counts[offset:offset + len(cov.bits)] += cov.bits
+        spans[offset] += 1
+        spans[offset + len(cov.bits)] -= 1
+    active = np.cumsum(spans)[:size]
+
+    trading = np.flatnonzero((counts > 0) & (counts >= active * min_ratio))
+    return sync_trade_calendar(db_manager, market, [date.fromordinal(base + int(i)) for i in trading],
+                               source='data')
+
+
+def _market_symbols(db_manager, market: str, active_only: bool = True) -> List[str]:
+    """市场的股票代码"""
+    stmt = select(StockInfo.symbol).where(StockInfo.market == market)
+    if active_only:
+        stmt = stmt.where(StockInfo.is_active == True)
+    with db_manager.get_read_session(market) as session:
+        return [row.symbol for row in session.execute(stmt)]
+
+
+class GapPlan:
+    """补齐缺失日线的请求计划"""
+
+    def __init__(self, market: str, calendar: List[date], missing: Dict[str, np.ndarray], uncovered: List[str]):
+        """
+        Args:
+            market: 市场
+            calendar: 计划区间内的交易日
+            missing: 股票代码 -> 缺失交易日在 calendar 中的下标（升序）
+            uncovered: 区间内完全没有日线的股票
+        """
+        self.market = market
+        self.calendar = calendar
+        self.missing = missing
+        self.uncovered = uncovered
+
+    def __repr__(self):
+        return (f"<GapPlan(market='{self.market}', symbols={len(self.missing)}, missing={self.total}, "
+                f"ranges={len(self.ranges)}, trade_dates={len(self.trade_dates)})>")
+
+    @property
+    def symbols(self) -> List[str]:
+        """有缺失的股票"""
+        return sorted(self.missing)
+
+    @property
+    def total(self) -> int:
+        """缺失的 (股票, 交易日) 数"""
+        return sum(len(indexes) for indexes in self.missing.values())
+
+    @property
+    def ranges(self) -> List[tuple]:
+        """
+        按股票请求区间的计划：每只股票连续缺失的交易日合并为一个 (symbol, start, end)，
+        请求的都是缺失的交易日，不重复获取已有数据
+        """
+        ranges = []
+        for symbol in self.symbols:
+            indexes = self.missing[symbol]
+            breaks = np.flatnonzero(np.diff(indexes) != 1)
+            starts = np.concatenate(([0], breaks + 1))
+            ends = np.concatenate((breaks, [len(indexes) - 1]))
+            ranges.extend((symbol, self.calendar[indexes[s]], self.calendar[indexes[e]]) for s, e in zip(starts, ends))
+        return ranges
+
+    @property
+    def trade_dates(self) -> List[date]:
+        """按交易日请求全市场的计划：至少一只股票缺失的交易日"""
+        return [self.calendar[i] for i in np.flatnonzero(self.date_counts() > 0)]
+
+    def date_counts(self) -> np.ndarray:
+        """各交易日（与 calendar 对齐）缺失的股票数"""
+        counts = np.zeros(len(self.calendar), dtype=np.int64)
+        for indexes in self.missing.values():
+            counts[indexes] += 1
+        return counts
+
+
+def plan_gaps(db_manager, market: str, start_date, end_date, symbols: Optional[Iterable[str]] = None,
+              include_history: bool = False) -> GapPlan:
+    """
+    按交易日历和覆盖位图计算缺失的日线
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场
+        start_date: 开始日期
+        end_date: 结束日期
+        symbols: 股票代码，为空时为该市场全部活跃股票
+        include_history: 是否把股票最早日线之前的区间也算作缺失（回补更早的历史时使用；
+                         默认只补已有区间中间的缺口和最新日线之后的交易日，没有日线的股票补整个区间）
+
+    Returns:
+        GapPlan
+    """
+    start_date, end_date = to_date(start_date), to_date(end_date)
+    symbols = sorted(set(symbols)) if symbols is not None else _market_symbols(db_manager, market)
+
+    calendar = load_trade_calendar(db_manager, market, start_date, end_date)
+    with db_manager.get_read_session(market) as session:
+        cached_until = session.execute(
+            select(func.max(TradeCalendar.trade_date)).where(TradeCalendar.market == market)
+        ).scalar()
+    if cached_until is None or cached_until < end_date:
+        # 缓存的日历之后（由数据推断的日历只到最近有数据的交易日）按工作日估算
+        estimate_from = max(start_date, cached_until + timedelta(days=1)) if cached_until else start_date
+        estimated = [d for d in (estimate_from + timedelta(days=i) for i in range((end_date - estimate_from).days + 1))
+                     if d.weekday() < 5]
+        if estimated:
+            logger.info(f"{market} 交易日历 {estimate_from} 之后未缓存，按工作日估算 {len(estimated)} 天")
+        calendar += estimated
+
+    ordinals = _ordinals(calendar)
+    coverages = load_coverage(db_manager, market, symbols)
+    missing, uncovered = {}, []
+    for symbol in symbols:
+        coverage = coverages.get(symbol)
+        if coverage is None:
+            mask = np.ones(len(ordinals), dtype=bool)
+        else:
+            mask = ~coverage.contains(ordinals)
+            if not include_history:
+                mask &= ordinals >= coverage.first_date.toordinal()
+        indexes = np.flatnonzero(mask)
+        if len(indexes) == len(ordinals) and len(indexes):
+            uncovered.append(symbol)
+        if len(indexes):
+            missing[symbol] = indexes
+
+    plan = GapPlan(market, calendar, missing, uncovered)
+    logger.info(f"{market} {start_date} 至 {end_date}（{len(calendar)} 个交易日）: {len(symbols)} 只股票中 "
+                f"{len(missing)} 只缺失 {plan.total} 条日线（其中 {len(uncovered)} 只整段缺失）")
+    return plan
+
+
+def coverage_report(db_manager, market: str, as_of=None) -> pd.DataFrame:
+    """
+    各股票的日线覆盖统计（只读覆盖索引和交易日历，不扫描 daily_data）
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场
+        as_of: 统计截止日期，默认为交易日历中的最新交易日
+
+    Returns:
+        DataFrame: symbol, name, first_date, last_date, days, missing（首条日线至截止日之间缺失的交易日数），
+        没有日线的股票 days 为 0、日期为空
+    """
+    with db_manager.get_read_session(market) as session:
+        stocks = session.execute(
+            select(StockInfo.symbol, StockInfo.name).where(StockInfo.market == market)
+        ).all()
+
+    ordinals = _ordinals(load_trade_calendar(db_manager, market, end_date=as_of))
+    coverages = load_coverage(db_manager, market, [symbol for symbol, _ in stocks])
+
+    records = []
+    for symbol, name in stocks:
+        coverage = coverages.get(symbol)
+        if coverage is None:
+            records.append((symbol, name, None, None, 0, 0))
+            continue
+        expected = ordinals[ordinals >= coverage.first_date.toordinal()]
+        records.append((symbol, name, coverage.first_date, coverage.last_date, coverage.days,
+                        int((~coverage.contains(expected)).sum())))
+
+    return pd.DataFrame(records, columns=['symbol', 'name', 'first_date', 'last_date', 'days', 'missing'])
@@ -2,13 +2,83 @@
 数据库管理模块
 """
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+import pandas as pd
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine.base import OptionEngine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from sqlalchemy.sql.util import find_tables
 from sqlalchemy.pool import QueuePool
 from loguru import logger
 
-from database.models import Base
+from database.models import Base, LatestBar, DataCoverage, DailyData
+from database.latest_bars import LATEST_BAR_SOURCES, refresh_latest_bars
+from database.coverage import COVERAGE_TABLE, to_date, update_coverage, rebuild_coverage
+from database.change_feed import CHANGE_TRACKED_TABLES, record_data_changes
+from database.profiler import enable_profiling, get_profiler, profile_unit, DEFAULT_REPEAT_THRESHOLD
+from database.security_ids import SecurityIdMap, market_of_symbol
+
+
+# SQLite性能参数默认值（database.sqlite 下同名配置项可覆盖）
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',      # 读写并发：读不阻塞写、写不阻塞读
+    'synchronous': 'NORMAL',    # WAL模式下安全且显著减少fsync
+    'cache_size': -65536,       # 页缓存，负数单位为KB（64MB）
+    'mmap_size': 268435456,     # 内存映射读取（256MB）
+    'temp_store': 'MEMORY',     # 排序/临时表放内存
+    'busy_timeout': 30000,      # 锁等待（毫秒），避免立即报 database is locked
+}
+
+
+# 按市场分库的表（其余为各市场共享、留在核心库的表：订单、成交、持仓、组合快照、回测结果）
+MARKET_TABLES = (
+    'stock_info', 'daily_data', 'technical_indicators', 'minute_data', 'minute_bars', 'latest_bars',
+    'stock_selection', 'stock_scores', 'trading_signals', 'money_flow_alerts',
+    'data_changes', 'pipeline_checkpoints', 'data_coverage', 'trade_calendar',
+)
+
+class UnroutedSession(Session):
+    """
+    分库模式下未指定市场的会话：只能访问核心库的共享表
+
+    访问市场表时报错，而不是静默读写默认市场的分库；需要市场表的调用方应使用
+    get_session(market) / get_read_session(market)（按股票代码可用 market_of(symbol)）
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        tables = set()
+        if mapper is not None:
+            entity = inspect(mapper, raiseerr=False)
+            table = getattr(entity, 'local_table', entity)
+            tables.add(getattr(table, 'name', None))
+        if clause is not None:
+            tables.update(table.name for table in find_tables(clause, include_crud=True))
+        routed = sorted(name for name in tables if name in MARKET_TABLES)
+        if routed:
+            raise ValueError(
+                f"已按市场分库，访问 {', '.join(routed)} 需要指定市场: "
+                f"get_session(market) / get_read_session(market)"
+            )
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+# 被 security_id 索引取代的旧索引（表名 -> 旧索引名列表）
+LEGACY_INDEXES = {
+    'daily_data': ['idx_symbol_date', 'uq_daily_symbol_date', 'ix_daily_data_symbol'],
+    'technical_indicators': ['idx_ti_symbol_date', 'uq_ti_symbol_date', 'ix_technical_indicators_symbol'],
+    'minute_data': ['idx_minute_symbol_datetime', 'uq_minute_symbol_datetime', 'ix_minute_data_symbol'],
+    'trading_signals': ['uq_signal_symbol_date_type', 'ix_trading_signals_symbol'],
+    'money_flow_alerts': ['idx_alert_symbol_datetime', 'ix_money_flow_alerts_symbol'],
+}
+
+# 去重时每组保留的记录（表名 -> 聚合表达式），默认保留 id 最大（最新写入）的一条
+DEDUP_KEEP = {
+    # 交易信号优先保留已执行的记录，避免丢失执行状态
+    'trading_signals': 'COALESCE(MAX(CASE WHEN is_executed THEN id END), MAX(id))',
+}
 
 
 class DatabaseManager:
@@ -24,7 +94,17 @@ class DatabaseManager:
         self.config = config
         self.engine = None
         self.Session = None
+        self.read_engine = None
+        self.ReadSession = None
+        self.market_engines = {}
+        self.market_read_engines = {}
+        self.market_schemas = {}
+        self.default_market = None
+        self.upsert_chunk_size = config.get('database', {}).get('upsert_chunk_size', 500)
+        self._unique_checked = set()
         self._init_engine()
+        self._init_shards()
+        self._init_profiler()
     
     def _init_engine(self):
         """初始化数据库引擎"""
@@ -33,18 +113,9 @@ class DatabaseManager:
         
         if db_type == 'sqlite':
             # SQLite配置
-            db_path = db_config.get('sqlite', {}).get('path', 'data/longport_quant.db')
-            
-            # 确保目录存在
-            os.makedirs(os.path.dirname(db_path), exist_ok=True)
-            
-            database_url = f'sqlite:///{db_path}'
-            self.engine = create_engine(
-                database_url,
-                echo=False,
-                connect_args={'check_same_thread': False}
-            )
-            logger.info(f"使用SQLite数据库: {db_path}")
+            sqlite_config = db_config.get('sqlite', {})
+            db_path = sqlite_config.get('path', 'data/longport_quant.db')
+            self.engine, self.read_engine = self._create_sqlite_engines(db_path, sqlite_config)
             
         elif db_type == 'postgresql':
             # PostgreSQL配置
@@ -75,13 +146,407 @@ class DatabaseManager:
         else:
             raise ValueError(f"不支持的数据库类型: {db_type}")
         
-        # 创建Session工厂
-        self.Session = scoped_session(sessionmaker(bind=self.engine))
+        if self.read_engine is None:
+            self.read_engine = self.engine
+
+    def _create_sqlite_engines(self, db_path, sqlite_config):
+        """
+        创建一个SQLite数据库文件的写引擎和只读引擎
+
+        Args:
+            db_path: 数据库文件路径
+            sqlite_config: database.sqlite 配置
+
+        Returns:
+            (engine, read_engine)
+        """
+        # 确保目录存在
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+
+        database_url = f'sqlite:///{db_path}'
+        engine = create_engine(
+            database_url,
+            echo=False,
+            connect_args={'check_same_thread': False}
+        )
+
+        # 只读连接池：供Web和查询密集型调用方使用，与写连接分开
+        read_pool_size = sqlite_config.get('read_pool_size', 5)
+        read_engine = create_engine(
+            database_url,
+            echo=False,
+            connect_args={'check_same_thread': False},
+            poolclass=QueuePool,
+            pool_size=read_pool_size,
+            max_overflow=read_pool_size * 2
+        )
+
+        pragmas = {k: sqlite_config.get(k, v) for k, v in SQLITE_PRAGMAS.items()}
+        event.listen(engine, 'connect', self._sqlite_pragma_hook(pragmas))
+        event.listen(read_engine, 'connect', self._sqlite_pragma_hook(pragmas, read_only=True))
+
+        logger.info(f"使用SQLite数据库: {db_path} ({', '.join(f'{k}={v}' for k, v in pragmas.items())})")
+        return engine, read_engine
+
+    def _init_shards(self):
+        """
+        按配置 database.sharding 为每个市场建立分库，并创建各市场的Session工厂
+
+        分库后 MARKET_TABLES 中的表按 StockInfo.market 存放在各市场的库（SQLite 为独立文件，
+        PostgreSQL 为独立 schema），其余表留在核心库。每个会话按表路由：市场表走该市场的分库，
+        共享表走核心库；未指定市场的会话只能访问共享表（见 UnroutedSession）。
+        default_market 只用于后缀无法识别的股票代码。
+        """
+        db_config = self.config.get('database', {})
+        sharding = db_config.get('sharding', {})
+
+        if sharding.get('enabled'):
+            for market, location in sharding.get('markets', {}).items():
+                if self.engine.dialect.name == 'sqlite':
+                    engine, read_engine = self._create_sqlite_engines(location, db_config.get('sqlite', {}))
+                else:
+                    self.market_schemas[market] = location
+                    engine = self.engine.execution_options(schema_translate_map={None: location})
+                    read_engine = engine
+                self.market_engines[market] = engine
+                self.market_read_engines[market] = read_engine
+
+            if not self.market_engines:
+                raise ValueError("已启用 database.sharding 但未配置 markets")
+            self.default_market = sharding.get('default_market') or next(iter(self.market_engines))
+            logger.info(f"按市场分库: {', '.join(self.market_engines)}（默认 {self.default_market}）")
+
+        self._sessions = {}
+        self._security_maps = {}
+        for market in self.markets:
+            write_binds = self._binds(self._market_engine(market), self.engine)
+            read_binds = self._binds(self._market_engine(market, read=True), self.read_engine)
+
+            session_factory = sessionmaker(bind=self.engine, binds=write_binds, info={'market': market})
+            event.listen(session_factory, 'before_flush', self._assign_security_ids)
+            event.listen(session_factory, 'after_flush', self._track_latest_bars)
+            event.listen(session_factory, 'before_commit', self._refresh_latest_bars)
+            event.listen(session_factory, 'before_commit', self._record_data_changes)
+            event.listen(session_factory, 'before_commit', self._update_coverage)
+            event.listen(session_factory, 'do_orm_execute', self._track_bulk_deletes)
+            event.listen(session_factory, 'after_rollback', self._discard_pending_changes)
+            read_factory = sessionmaker(bind=self.read_engine, binds=read_binds, info={'market': market})
+
+            self._sessions[market] = (scoped_session(session_factory), scoped_session(read_factory))
+            self._security_maps[market] = SecurityIdMap(self._market_engine(market))
+
+        if self.sharded:
+            self._sessions[None] = (
+                scoped_session(sessionmaker(bind=self.engine, class_=UnroutedSession, info={'market': None})),
+                scoped_session(sessionmaker(bind=self.read_engine, class_=UnroutedSession, info={'market': None})),
+            )
+
+        self.Session, self.ReadSession = self._sessions[None]
+        self.security_ids = self._security_maps[self.default_market]
+
+    @staticmethod
+    def _binds(market_engine, core_engine):
+        """会话的按表路由：市场表 -> 市场分库，其余 -> 核心库"""
+        if market_engine is core_engine:
+            return None
+        return {
+            mapper.class_: market_engine if mapper.local_table.name in MARKET_TABLES else core_engine
+            for mapper in Base.registry.mappers
+        }
+
+    @property
+    def sharded(self):
+        """是否按市场分库"""
+        return bool(self.market_engines)
+
+    @property
+    def markets(self):
+        """分库的市场列表，未分库时为 [None]"""
+        return list(self.market_engines) if self.sharded else [None]
+
+    def _resolve_market(self, market):
+        """会话的市场：未分库时为 None，未指定时为默认市场"""
+        if not self.sharded:
+            return None
+        market = market or self.default_market
+        if market not in self.market_engines:
+            raise ValueError(f"未配置分库的市场: {market}")
+        return market
+
+    def _session_factories(self, market):
+        """会话的 (写, 只读) 工厂：分库且未指定市场时为只能访问共享表的会话"""
+        if self.sharded and market is None:
+            return self._sessions[None]
+        return self._sessions[self._resolve_market(market)]
+
+    def _market_engine(self, market, read=False):
+        """市场表所在的引擎"""
+        if not self.sharded:
+            return self.read_engine if read else self.engine
+        engines = self.market_read_engines if read else self.market_engines
+        return engines[self._resolve_market(market)]
+
+    def _table_engines(self, table):
+        """存放该表的所有引擎（市场表在每个分库各有一份）"""
+        if self.sharded and table.name in MARKET_TABLES:
+            return list(self.market_engines.values())
+        return [self.engine]
+
+    def _schema(self, engine):
+        """引擎对应的 PostgreSQL schema（SQLite 或核心库为 None）"""
+        return engine.get_execution_options().get('schema_translate_map', {}).get(None)
+
+    def _qualify(self, engine, name):
+        """原生SQL中的表名/索引名（PostgreSQL 分库加 schema 前缀）"""
+        schema = self._schema(engine)
+        return f'{schema}.{name}' if schema else name
+
+    def market_of(self, symbol):
+        """
+        股票代码所在的分库市场
+
+        Args:
+            symbol: 股票代码
+
+        Returns:
+            str: 市场，未分库时为 None（后缀无法识别或未配置分库的市场归入默认市场）
+        """
+        if not self.sharded:
+            return None
+        market = market_of_symbol(symbol)
+        return market if market in self.market_engines else self.default_market
+
+    def group_by_market(self, symbols):
+        """
+        按分库市场分组股票代码
+
+        Args:
+            symbols: 股票代码列表
+
+        Returns:
+            dict: market -> 股票代码列表（未分库时只有一组，键为 None）
+        """
+        groups = defaultdict(list)
+        for symbol in symbols:
+            groups[self.market_of(symbol)].append(symbol)
+        return dict(groups)
+
+    def security_id_map(self, market=None):
+        """
+        市场分库的 symbol <-> security_id 缓存
+
+        Args:
+            market: 市场，为空时为默认市场
+
+        Returns:
+            SecurityIdMap实例
+        """
+        return self._security_maps[self._resolve_market(market)]
+
+    def _init_profiler(self):
+        """按配置 database.profiling 或环境变量 SQL_PROFILE 挂载SQL分析器"""
+        profiling = self.config.get('database', {}).get('profiling', {})
+        if profiling.get('enabled') or os.environ.get('SQL_PROFILE'):
+            enable_profiling(
+                repeat_threshold=profiling.get('repeat_threshold', DEFAULT_REPEAT_THRESHOLD),
+                slow_query_ms=profiling.get('slow_query_ms')
+            )
+
+        profiler = get_profiler()
+        if profiler is not None:
+            # PostgreSQL 分库的引擎与核心库共享连接和事件，只挂载独立引擎
+            for engine in self._engines(include_read=True):
+                if not isinstance(engine, OptionEngine):
+                    profiler.attach(engine)
+            logger.info(f"SQL分析已启用（N+1 告警阈值 {profiler.repeat_threshold} 次）")
+
+    @staticmethod
+    def _sqlite_pragma_hook(pragmas, read_only=False):
+        """
+        生成SQLite连接事件回调，在每个新连接上设置PRAGMA
+
+        Args:
+            pragmas: PRAGMA名 -> 值
+            read_only: 是否为只读连接（设置 query_only）
+        """
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    if value is None:
+                        continue
+                    if name == 'journal_mode' and read_only:
+                        # 日志模式由写连接设置，读连接只继承
+                        continue
+                    cursor.execute(f'PRAGMA {name}={value}')
+                if read_only:
+                    cursor.execute('PRAGMA query_only=ON')
+            finally:
+                cursor.close()
+
+        return set_pragmas
     
+    @staticmethod
+    def mark_latest_bars(session, table_name, symbols):
+        """
+        登记本会话写入的股票，提交前刷新其最新行情快照
+
+        Args:
+            session: 写会话
+            table_name: 写入的表名（daily_data / technical_indicators，其余忽略）
+            symbols: 股票代码集合
+        """
+        source = LATEST_BAR_SOURCES.get(table_name)
+        if source and symbols:
+            session.info.setdefault('latest_bars', {}).setdefault(source, set()).update(symbols)
+
+    @staticmethod
+    def mark_data_changes(session, table_name, symbols):
+        """
+        登记本会话写入的 (表, 股票)，提交前写入变更日志（见 database.change_feed）
+
+        Args:
+            session: 写会话
+            table_name: 写入的表名（只记录 CHANGE_TRACKED_TABLES，其余忽略）
+            symbols: 股票代码集合
+        """
+        if table_name in CHANGE_TRACKED_TABLES and symbols:
+            session.info.setdefault('data_changes', {}).setdefault(table_name, set()).update(symbols)
+
+    @staticmethod
+    def mark_coverage(session, table_name, rows):
+        """
+        登记本会话写入的 (股票, 交易日期)，提交前并入日线覆盖索引（见 database.coverage）
+
+        Args:
+            session: 写会话
+            table_name: 写入的表名（只记录 daily_data，其余忽略）
+            rows: (股票代码, 交易日期) 的可迭代对象
+        """
+        if table_name != COVERAGE_TABLE:
+            return
+        pending = session.info.setdefault('coverage', {})
+        for symbol, trade_date in rows:
+            pending.setdefault(symbol, set()).add(to_date(trade_date))
+
+    def _assign_security_ids(self, session, flush_context, instances):
+        """before_flush 回调：为新增的时间序列对象按 symbol 填充 security_id"""
+        if self.sharded:
+            market = session.info.get('market')
+            for obj in session.new:
+                symbol = getattr(obj, 'symbol', None)
+                if symbol and obj.__tablename__ in MARKET_TABLES and self.market_of(symbol) != market:
+                    raise ValueError(
+                        f"{symbol} 属于 {self.market_of(symbol)} 分库，不能写入 {market} 分库的会话，"
+                        f"请使用 get_session('{self.market_of(symbol)}')"
+                    )
+        pending = [obj for obj in session.new
+                   if hasattr(obj, 'security_id') and obj.security_id is None and getattr(obj, 'symbol', None)]
+        if not pending:
+            return
+        ids = self.security_id_map(session.info.get('market')).get_ids({obj.symbol for obj in pending}, session)
+        for obj in pending:
+            obj.security_id = ids[obj.symbol]
+
+    def _track_latest_bars(self, session, flush_context):
+        """after_flush 回调：记录ORM方式写入的对象所属股票（刷新快照、写入变更日志、维护覆盖索引）"""
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            symbol = getattr(obj, 'symbol', None)
+            if symbol:
+                self.mark_latest_bars(session, obj.__tablename__, {symbol})
+                self.mark_data_changes(session, obj.__tablename__, {symbol})
+        for obj in session.new:
+            if isinstance(obj, DailyData) and obj.symbol and obj.trade_date:
+                self.mark_coverage(session, COVERAGE_TABLE, [(obj.symbol, obj.trade_date)])
+        for obj in list(session.dirty) + list(session.deleted):
+            if isinstance(obj, DailyData) and obj.symbol:
+                # 修改或删除的日线按 daily_data 重建该股票的位图
+                session.info.setdefault('coverage_rebuild', set()).add(obj.symbol)
+
+    @staticmethod
+    def _track_bulk_deletes(orm_execute_state):
+        """do_orm_execute 回调：按条件批量删除日线（query.delete()）后，提交前重建整个库的覆盖索引"""
+        if orm_execute_state.is_delete and any(
+                mapper.class_ is DailyData for mapper in orm_execute_state.all_mappers):
+            orm_execute_state.session.info['coverage_rebuild_all'] = True
+
+    def _refresh_latest_bars(self, session):
+        """before_commit 回调：在同一事务内刷新受影响股票的快照"""
+        # before_commit 在提交前的最后一次 flush 之前触发，先 flush 让未 flush 的ORM写入
+        # 经 after_flush 登记到 latest_bars，否则 session.add 后直接提交的写入不会刷新快照
+        session.flush()
+        if not session.info.get('latest_bars'):
+            return
+        pending = session.info.pop('latest_bars')
+        for source, symbols in pending.items():
+            refresh_latest_bars(session, symbols, sources=(source,))
+
+    @staticmethod
+    def _discard_pending_changes(session):
+        """after_rollback 回调：丢弃已回滚写入的快照刷新和变更登记"""
+        session.info.pop('latest_bars', None)
+        session.info.pop('data_changes', None)
+        session.info.pop('coverage', None)
+        session.info.pop('coverage_rebuild', None)
+        session.info.pop('coverage_rebuild_all', None)
+
+    def _record_data_changes(self, session):
+        """before_commit 回调：在同一事务内写入变更日志"""
+        # 先刷新：待写的 ORM 对象在 flush 时才登记变更
+        session.flush()
+        if not session.info.get('data_changes'):
+            return
+        record_data_changes(session, session.info.pop('data_changes'))
+
+    def _update_coverage(self, session):
+        """before_commit 回调：在同一事务内更新日线覆盖索引"""
+        if not any(session.info.get(key) for key in ('coverage', 'coverage_rebuild', 'coverage_rebuild_all')):
+            return
+        session.flush()
+        added = session.info.pop('coverage', {})
+        rebuild = session.info.pop('coverage_rebuild', set())
+        if session.info.pop('coverage_rebuild_all', False):
+            rebuild_coverage(session)
+            return
+        update_coverage(session, {symbol: dates for symbol, dates in added.items() if symbol not in rebuild})
+        if rebuild:
+            rebuild_coverage(session, rebuild)
+
+    def _engines(self, include_read=False):
+        """核心库和各市场分库的引擎（去重）"""
+        engines = [self.engine] + list(self.market_engines.values())
+        if include_read:
+            engines += [self.read_engine] + list(self.market_read_engines.values())
+        return list(dict.fromkeys(engines))
+
+    def _engine_tables(self):
+        """引擎 -> 存放在该引擎的表"""
+        groups = defaultdict(list)
+        for table in Base.metadata.sorted_tables:
+            for engine in self._table_engines(table):
+                groups[engine].append(table)
+        return groups
+
     def create_tables(self):
-        """创建所有表"""
+        """创建所有表（分库时市场表建在各市场的库，共享表建在核心库）"""
         try:
-            Base.metadata.create_all(self.engine)
+            for schema in self.market_schemas.values():
+                with self.engine.begin() as conn:
+                    conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS {schema}'))
+            for engine, tables in self._engine_tables().items():
+                Base.metadata.create_all(engine, tables=tables)
+            self.ensure_unique_keys()
+
+            # 新建的快照表按已有数据初始化
+            for market in self.markets:
+                with self.get_session(market) as session:
+                    if session.query(LatestBar.id).first() is None:
+                        refresh_latest_bars(session)
+                        logger.info(f"{market or ''}最新行情快照表初始化完成")
+                    if session.query(DataCoverage.id).first() is None:
+                        rebuild_coverage(session)
+                        logger.info(f"{market or ''}日线覆盖索引初始化完成")
+
             logger.info("数据库表创建成功")
         except Exception as e:
             logger.error(f"创建数据库表失败: {e}")
@@ -90,25 +555,36 @@ class DatabaseManager:
     def drop_tables(self):
         """删除所有表（谨慎使用）"""
         try:
-            Base.metadata.drop_all(self.engine)
+            for engine, tables in self._engine_tables().items():
+                Base.metadata.drop_all(engine, tables=tables)
             logger.warning("数据库表已删除")
         except Exception as e:
             logger.error(f"删除数据库表失败: {e}")
             raise
     
     @contextmanager
-    def get_session(self):
+    def get_session(self, market=None):
         """
         获取数据库会话（上下文管理器）
+
+        Args:
+            market: 市场（分库时市场表路由到该市场的库，为空时只能访问共享表；未分库时忽略）
         
         使用示例:
-            with db_manager.get_session() as session:
+            with db_manager.get_session('CN') as session:
                 stocks = session.query(StockInfo).all()
+
+            with db_manager.get_session() as session:
+                positions = session.query(Position).all()
+
+            with db_manager.get_session('HK') as session:
+                bars = session.query(DailyData).filter_by(symbol='700.HK').all()
         """
-        session = self.Session()
+        session = self._session_factories(market)[0]()
         try:
-            yield session
-            session.commit()
+            with profile_unit('session'):
+                yield session
+                session.commit()
         except Exception as e:
             session.rollback()
             logger.error(f"数据库操作失败: {e}")
@@ -116,48 +592,370 @@ class DatabaseManager:
         finally:
             session.close()
     
-    def execute_query(self, query_func):
+    @contextmanager
+    def get_read_session(self, market=None):
+        """
+        获取只读数据库会话（上下文管理器，使用独立的只读连接池，不提交）
+
+        Args:
+            market: 市场（同 get_session）
+
+        使用示例:
+            with db_manager.get_read_session('HK') as session:
+                stocks = session.query(StockInfo).all()
+        """
+        session = self._session_factories(market)[1]()
+        try:
+            with profile_unit('read_session'):
+                yield session
+        except Exception as e:
+            logger.error(f"数据库查询失败: {e}")
+            raise
+        finally:
+            session.rollback()
+            session.close()
+
+    def execute_query(self, query_func, market=None):
         """
         执行查询函数
         
         Args:
             query_func: 接受session参数的查询函数
+            market: 市场（同 get_session）
             
         Returns:
             查询结果
         """
-        with self.get_session() as session:
+        with self.get_session(market) as session:
             return query_func(session)
+
+    def fan_out(self, query_func, markets=None, symbols=None):
+        """
+        跨市场查询：在各市场分库的只读会话上并行执行查询函数
+
+        Args:
+            query_func: 接受session参数的查询函数；给出 symbols 时为 query_func(session, 该市场的股票代码)
+            markets: 市场列表，默认所有分库
+            symbols: 股票代码列表，给出时按所在市场分组，只查询相关分库
+
+        Returns:
+            dict: market -> 查询结果（未分库时只执行一次，键为 None）
+        """
+        if symbols is not None:
+            groups = self.group_by_market(symbols)
+            markets = list(groups)
+        elif markets and self.sharded:
+            markets = [self._resolve_market(m) for m in markets]
+        else:
+            markets = self.markets
+
+        def run(market):
+            with self.get_read_session(market) as session:
+                if symbols is not None:
+                    return query_func(session, groups[market])
+                return query_func(session)
+
+        if len(markets) <= 1:
+            return {market: run(market) for market in markets}
+        with ThreadPoolExecutor(max_workers=len(markets)) as executor:
+            return dict(zip(markets, executor.map(run, markets)))
     
     def bulk_insert(self, objects):
         """
-        批量插入对象
+        批量插入对象（分库时按股票代码所在市场分别写入）
         
         Args:
             objects: 要插入的对象列表
         """
         if not objects:
             return
-        
-        with self.get_session() as session:
-            session.bulk_save_objects(objects)
-            logger.info(f"批量插入 {len(objects)} 条记录")
+
+        groups = defaultdict(list)
+        for obj in objects:
+            symbol = getattr(obj, 'symbol', None)
+            groups[self.market_of(symbol) if symbol and obj.__tablename__ in MARKET_TABLES else None].append(obj)
+
+        for market, group in groups.items():
+            with self.get_session(market) as session:
+                # bulk_save_objects 不触发 flush 事件，需单独填充 security_id 并登记快照刷新
+                pending = [obj for obj in group if getattr(obj, 'security_id', False) is None]
+                if pending:
+                    ids = self.security_id_map(market).get_ids({obj.symbol for obj in pending}, session)
+                    for obj in pending:
+                        obj.security_id = ids[obj.symbol]
+                for obj in group:
+                    symbol = getattr(obj, 'symbol', None)
+                    if symbol:
+                        self.mark_latest_bars(session, obj.__tablename__, {symbol})
+                        self.mark_data_changes(session, obj.__tablename__, {symbol})
+                        if getattr(obj, 'trade_date', None):
+                            self.mark_coverage(session, obj.__tablename__, [(symbol, obj.trade_date)])
+                session.bulk_save_objects(group)
+        logger.info(f"批量插入 {len(objects)} 条记录")
     
-    def bulk_update(self, model, mappings):
+    def bulk_update(self, model, mappings, market=None):
         """
         批量更新
         
         Args:
             model: 模型类
             mappings: 更新映射列表
+            market: 市场（分库时更新市场表需指定）
         """
         if not mappings:
             return
         
-        with self.get_session() as session:
+        with self.get_session(market) as session:
             session.bulk_update_mappings(model, mappings)
             logger.info(f"批量更新 {len(mappings)} 条记录")
     
+    def ensure_security_ids(self, models=None, dry_run=False):
+        """
+        为旧库的时间序列表补建 security_id 列：按 symbol 回填、建立 security_id 索引、删除旧的 symbol 索引
+
+        时间序列表中出现但 stock_info 中没有的股票会先登记到 stock_info
+
+        Args:
+            models: 模型类列表，默认处理所有带 security_id 列的表
+            dry_run: 只统计需要迁移的表，不修改数据库
+
+        Returns:
+            set: 需要迁移（dry_run）或已迁移的表名
+        """
+        tables = [m.__table__ for m in models] if models else Base.metadata.sorted_tables
+        migrated = set()
+
+        for engine in self._engines():
+            inspector = inspect(engine)
+            schema = self._schema(engine)
+            existing = set(inspector.get_table_names(schema=schema))
+
+            for table in tables:
+                if 'security_id' not in table.c or table.name not in existing or engine not in self._table_engines(table):
+                    continue
+                if 'security_id' in {col['name'] for col in inspector.get_columns(table.name, schema=schema)}:
+                    continue
+
+                name = self._qualify(engine, table.name)
+                stock_info = self._qualify(engine, 'stock_info')
+                migrated.add(table.name)
+                if dry_run:
+                    with engine.connect() as conn:
+                        orphans = conn.execute(text(
+                            f'SELECT COUNT(DISTINCT symbol) FROM {name} '
+                            f'WHERE symbol NOT IN (SELECT symbol FROM {stock_info})'
+                        )).scalar()
+                    logger.info(f"{name} 需要迁移为 security_id 索引键（将登记 {orphans} 只 stock_info 中没有的股票）")
+                    continue
+
+                logger.info(f"{name} 迁移为 security_id 索引键...")
+                with engine.begin() as conn:
+                    conn.execute(text(
+                        f'ALTER TABLE {name} ADD COLUMN security_id INTEGER REFERENCES {stock_info}(id)'
+                    ))
+                    orphans = conn.execute(text(
+                        f'SELECT DISTINCT symbol FROM {name} '
+                        f'WHERE symbol NOT IN (SELECT symbol FROM {stock_info})'
+                    )).scalars().all()
+                    if orphans:
+                        SecurityIdMap(engine).register(conn, orphans)
+                    updated = conn.execute(text(
+                        f'UPDATE {name} SET security_id = '
+                        f'(SELECT id FROM {stock_info} WHERE {stock_info}.symbol = {name}.symbol)'
+                    )).rowcount
+
+                    # 非唯一索引在此创建，唯一索引由 ensure_unique_keys 创建（可能需要先去重）
+                    for index in table.indexes:
+                        if not index.unique:
+                            index.create(conn, checkfirst=True)
+                    for legacy in LEGACY_INDEXES.get(table.name, []):
+                        conn.execute(text(f'DROP INDEX IF EXISTS {self._qualify(engine, legacy)}'))
+
+                logger.info(f"{name} 回填 security_id {updated} 行")
+
+        return migrated
+
+    def ensure_unique_keys(self, models=None):
+        """
+        为时间序列表补建自然键唯一索引，并删除被取代的旧索引
+
+        旧库中若仍有重复数据，唯一索引无法创建，需先运行 scripts/remove_duplicates.py；
+        这样的表不计入已检查，之后的 bulk_upsert 会再次尝试并报错
+
+        Args:
+            models: 模型类列表，默认处理所有定义了唯一索引的表
+
+        Returns:
+            list: 无法创建唯一索引的表名
+        """
+        tables = [m.__table__ for m in models] if models else Base.metadata.sorted_tables
+        self.ensure_security_ids(models)
+        failed = []
+
+        for table in tables:
+            complete = True
+            for engine in self._table_engines(table):
+                # 跳过尚未创建的表（如旧库还没有的新表）
+                if not inspect(engine).has_table(table.name, schema=self._schema(engine)):
+                    continue
+                name = self._qualify(engine, table.name)
+                for index in table.indexes:
+                    if not index.unique:
+                        continue
+                    columns = ', '.join(col.name for col in index.columns)
+                    try:
+                        with engine.begin() as conn:
+                            conn.execute(text(
+                                f'CREATE UNIQUE INDEX IF NOT EXISTS {index.name} ON {name} ({columns})'
+                            ))
+                            for legacy in LEGACY_INDEXES.get(table.name, []):
+                                conn.execute(text(f'DROP INDEX IF EXISTS {self._qualify(engine, legacy)}'))
+                    except IntegrityError:
+                        logger.error(
+                            f"{name} 存在重复的 ({columns}) 记录，无法创建唯一索引 {index.name}，"
+                            f"请先运行 scripts/remove_duplicates.py"
+                        )
+                        complete = False
+
+            if complete:
+                self._unique_checked.add(table.name)
+            else:
+                failed.append(table.name)
+
+        return failed
+
+    def remove_duplicates(self, models=None, dry_run=False):
+        """
+        按自然键（唯一索引的列）集合式删除重复记录，每组只保留一条
+
+        每张表一条 DELETE ... WHERE id NOT IN (SELECT MAX(id) ... GROUP BY 自然键)，
+        完成后即可创建唯一索引（见 ensure_unique_keys）
+
+        Args:
+            models: 模型类列表，默认处理所有定义了唯一索引的表
+            dry_run: 只统计不删除（不修改数据库：尚未迁移 security_id 的表按 symbol 统计）
+
+        Returns:
+            dict: 表名 -> 重复（将删除/已删除）的记录数（分库时为各库之和）
+        """
+        tables = [m.__table__ for m in models] if models else Base.metadata.sorted_tables
+        migrated = self.ensure_security_ids(models, dry_run=dry_run)
+        pending = migrated if dry_run else set()
+        result = {}
+
+        for table in tables:
+            for engine in self._table_engines(table):
+                if table.name not in inspect(engine).get_table_names(schema=self._schema(engine)):
+                    continue
+                name = self._qualify(engine, table.name)
+                for index in table.indexes:
+                    if not index.unique:
+                        continue
+                    # 未迁移的表 security_id 与 symbol 一一对应，按 symbol 统计结果相同
+                    columns = ', '.join('symbol' if table.name in pending and col.name == 'security_id' else col.name
+                                        for col in index.columns)
+                    keep = DEDUP_KEEP.get(table.name, 'MAX(id)')
+
+                    with engine.begin() as conn:
+                        duplicates = conn.execute(text(
+                            f'SELECT COALESCE(SUM(n - 1), 0) FROM '
+                            f'(SELECT COUNT(*) AS n FROM {name} GROUP BY {columns} HAVING COUNT(*) > 1) AS t'
+                        )).scalar()
+
+                        if duplicates and not dry_run:
+                            conn.execute(text(
+                                f'DELETE FROM {name} WHERE id NOT IN '
+                                f'(SELECT {keep} FROM {name} GROUP BY {columns})'
+                            ))
+
+                    result[table.name] = result.get(table.name, 0) + int(duplicates or 0)
+                    if duplicates:
+                        action = '发现' if dry_run else '删除'
+                        logger.info(f"{name} 按 ({columns}) {action} {duplicates} 条重复记录")
+
+        return result
+
+    def bulk_upsert(self, model, rows, key=('symbol', 'trade_date'), chunk_size=None, update=True):
+        """
+        批量插入或更新（INSERT ... ON CONFLICT DO UPDATE），支持SQLite和PostgreSQL
+
+        Args:
+            model: 模型类
+            rows: 字典列表或DataFrame，所有行需包含相同的列
+            key: 自然键列（需有对应的唯一索引），带 security_id 的表仍按 symbol 传入
+            chunk_size: 每条语句的行数，默认取配置 database.upsert_chunk_size
+            update: 自然键已存在时是否更新，False 时保留已有记录（INSERT ... ON CONFLICT DO NOTHING）
+
+        Returns:
+            int: 写入的行数
+        """
+        if isinstance(rows, pd.DataFrame):
+            rows = rows.astype(object).where(rows.notna(), None).to_dict('records')
+
+        if not rows:
+            return 0
+
+        dialect = self.engine.dialect.name
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        elif dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            raise ValueError(f"bulk_upsert 不支持的数据库类型: {dialect}")
+
+        table = model.__table__
+        if table.name not in self._unique_checked and self.ensure_unique_keys([model]):
+            # 没有唯一索引时 ON CONFLICT 会被数据库拒绝，提前给出原因
+            raise RuntimeError(
+                f"{table.name} 存在重复的自然键记录，缺少唯一索引，无法 upsert；"
+                f"请先运行 python scripts/remove_duplicates.py 去重"
+            )
+
+        if self.sharded and table.name in MARKET_TABLES and 'symbol' in rows[0]:
+            # 按股票代码所在市场分别写入各分库
+            groups = defaultdict(list)
+            for row in rows:
+                groups[self.market_of(row['symbol'])].append(row)
+            return sum(self._bulk_upsert(insert, table, group, key, chunk_size, update, market)
+                       for market, group in groups.items())
+
+        return self._bulk_upsert(insert, table, rows, key, chunk_size, update)
+
+    def _bulk_upsert(self, insert, table, rows, key, chunk_size, update, market=None):
+        """在一个库内执行 bulk_upsert"""
+        key = list(key)
+        chunk_size = chunk_size or self.upsert_chunk_size
+
+        with self.get_session(market) as session:
+            if 'security_id' in table.c and 'symbol' in rows[0]:
+                # 调用方按股票代码传入，自然键中的 symbol 换成 security_id
+                ids = self.security_id_map(market).get_ids({row['symbol'] for row in rows}, session)
+                rows = [dict(row, security_id=ids[row['symbol']]) for row in rows]
+                key = ['security_id' if col == 'symbol' else col for col in key]
+
+            update_columns = [c for c in rows[0]
+                              if c not in key and c not in ('id', 'created_at', 'symbol')] if update else []
+
+            if 'symbol' in rows[0]:
+                symbols = {row['symbol'] for row in rows}
+                self.mark_latest_bars(session, table.name, symbols)
+                self.mark_data_changes(session, table.name, symbols)
+                if 'trade_date' in rows[0]:
+                    self.mark_coverage(session, table.name, ((row['symbol'], row['trade_date']) for row in rows))
+            for start in range(0, len(rows), chunk_size):
+                stmt = insert(table).values(rows[start:start + chunk_size])
+                if update_columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=key,
+                        set_={col: stmt.excluded[col] for col in update_columns}
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=key)
+                session.execute(stmt)
+
+        logger.debug(f"批量写入 {market + ' ' if market else ''}{table.name} {len(rows)} 条记录")
+        return len(rows)
+
     def get_or_create(self, session, model, defaults=None, **kwargs):
         """
         获取或创建对象
@@ -184,10 +982,12 @@ class DatabaseManager:
     
     def close(self):
         """关闭数据库连接"""
-        if self.Session:
-            self.Session.remove()
-        if self.engine:
-            self.engine.dispose()
+        for Session, ReadSession in self._sessions.values():
+            Session.remove()
+            ReadSession.remove()
+        for engine in self._engines(include_read=True):
+            if not isinstance(engine, OptionEngine):
+                engine.dispose()
         logger.info("数据库连接已关闭")
 
 
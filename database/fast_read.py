@@ -0,0 +1,257 @@
+"""
+快速只读数据访问模块
+
+批量分析查询不经过ORM：Core select() 只取需要的列，按 yield_per 分批流式读取（PostgreSQL 为服务端游标），
+每批直接转换为 NumPy 列数组，不构造ORM对象、不进入身份映射，峰值内存只多出一批行对象。
+结果为 NumPy 结构化数组（fetch_arrays）或 DataFrame（fetch_frame / read_frame / load_bars）。
+"""
+import numpy as np
+import pandas as pd
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, and_, select
+from sqlalchemy.orm import Session
+
+from database.models import DailyData, TechnicalIndicator
+
+
+# 每批读取的行数
+DEFAULT_CHUNK_SIZE = 10000
+
+# load_bars 默认的K线字段
+DEFAULT_BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _connection(session, stmt):
+    """会话按语句涉及的表选择连接（分库时路由到对应的库）；连接直接返回"""
+    if isinstance(session, Session):
+        return session.connection(bind_arguments={'clause': stmt})
+    return session
+
+
+def _kind(column_type):
+    """SQL类型 -> 列数组类型"""
+    if isinstance(column_type, Boolean):
+        return 'bool'
+    if isinstance(column_type, DateTime):
+        return 'datetime'
+    if isinstance(column_type, Date):
+        return 'date'
+    if isinstance(column_type, (Float, Numeric)):
+        return 'float'
+    if isinstance(column_type, Integer):
+        return 'int'
+    return 'object'
+
+
+def _to_array(values, kind):
+    """一批值转换为列数组（空值：浮点为 NaN、日期为 NaT）"""
+    if kind == 'float':
+        return np.array(values, dtype=np.float64)
+    if kind == 'int':
+        try:
+            return np.array(values, dtype=np.int64)
+        except TypeError:
+            # 含空值的整数列按浮点返回
+            return np.array(values, dtype=np.float64)
+    if kind == 'bool':
+        return np.array([bool(v) for v in values], dtype=bool)
+    if kind == 'date':
+        return np.array(values, dtype='datetime64[D]')
+    if kind == 'datetime':
+        return np.array(values, dtype='datetime64[us]')
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def iter_arrays(session, stmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    分批流式执行查询，每批返回列数组
+
+    Args:
+        session: 数据库会话或连接
+        stmt: Core select() 语句（只选需要的列）
+        chunk_size: 每批行数
+
+    Yields:
+        dict: 列名 -> ndarray（日期为 datetime64[D]，时间为 datetime64[us]）
+    """
+    kinds = [_kind(col.type) for col in stmt.selected_columns]
+    result = _connection(session, stmt).execution_options(yield_per=chunk_size).execute(stmt)
+    keys = list(result.keys())
+    for rows in result.partitions():
+        columns = list(zip(*rows))
+        yield {key: _to_array(values, kind) for key, values, kind in zip(keys, columns, kinds)}
+
+
+def _collect(session, stmt, chunk_size):
+    """读取全部分批并拼接为列数组"""
+    kinds = [_kind(col.type) for col in stmt.selected_columns]
+    chunks = list(iter_arrays(session, stmt, chunk_size))
+    keys = [col.key for col in stmt.selected_columns]
+    if not chunks:
+        empty = {'float': np.float64, 'int': np.int64, 'bool': bool,
+                 'date': 'datetime64[D]', 'datetime': 'datetime64[us]', 'object': object}
+        return {key: np.array([], dtype=empty[kind]) for key, kind in zip(keys, kinds)}
+    arrays = {}
+    for key in chunks[0]:
+        parts = [chunk[key] for chunk in chunks]
+        if len({part.dtype for part in parts}) > 1:
+            # 某些批次整数列含空值
+            parts = [part.astype(np.float64) for part in parts]
+        arrays[key] = np.concatenate(parts)
+    return arrays
+
+
+def fetch_arrays(session, stmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    执行查询返回 NumPy 结构化数组
+
+    Args:
+        session: 数据库会话或连接
+        stmt: Core select() 语句
+        chunk_size: 每批行数
+
+    Returns:
+        ndarray: 结构化数组，字段与查询列一致
+    """
+    arrays = _collect(session, stmt, chunk_size)
+    n = len(next(iter(arrays.values()))) if arrays else 0
+    result = np.empty(n, dtype=[(key, array.dtype) for key, array in arrays.items()])
+    for key, array in arrays.items():
+        result[key] = array
+    return result
+
+
+def _date_objects(array):
+    """datetime64[D] 列转换为 datetime.date 对象列（同一日期共用一个对象）"""
+    codes, uniques = pd.factorize(array)
+    objects = np.asarray(uniques, dtype='datetime64[D]').astype(object)
+    result = np.full(len(codes), None, dtype=object)
+    valid = codes >= 0
+    result[valid] = objects[codes[valid]]
+    return result
+
+
+def fetch_frame(session, stmt, chunk_size=DEFAULT_CHUNK_SIZE, parse_dates=False):
+    """
+    执行查询返回 DataFrame
+
+    Args:
+        session: 数据库会话或连接
+        stmt: Core select() 语句
+        chunk_size: 每批行数
+        parse_dates: 日期列是否保留为 datetime64；默认转换为 datetime.date（与ORM读取的值一致）
+
+    Returns:
+        DataFrame
+    """
+    arrays = _collect(session, stmt, chunk_size)
+    if not parse_dates:
+        for key, array in arrays.items():
+            if array.dtype == np.dtype('datetime64[D]'):
+                arrays[key] = _date_objects(array)
+    return pd.DataFrame(arrays, copy=False)
+
+
+def read_frame(db_manager, stmt, market=None, symbols=None, chunk_size=DEFAULT_CHUNK_SIZE,
+               parse_dates=False, sort=('symbol', 'trade_date')):
+    """
+    执行查询返回DataFrame；按市场分库且未指定市场时在相关分库并行查询后合并
+
+    Args:
+        db_manager: 数据库管理器
+        stmt: Core select() 语句
+        market: 市场代码
+        symbols: 股票代码列表（用于确定需要查询的分库）
+        chunk_size: 每批行数
+        parse_dates: 同 fetch_frame
+        sort: 合并多个分库的结果后的排序列
+
+    Returns:
+        DataFrame
+    """
+    if market or not db_manager.sharded:
+        markets = [market]
+    elif symbols is not None:
+        markets = list(db_manager.group_by_market(symbols)) or [None]
+    else:
+        markets = None
+
+    frames = list(db_manager.fan_out(
+        lambda session: fetch_frame(session, stmt, chunk_size, parse_dates), markets
+    ).values())
+    if len(frames) == 1:
+        return frames[0]
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(list(sort), ignore_index=True) if sort else df
+
+
+def bars_query(symbols=None, columns=None, indicator_columns=None, start_date=None, end_date=None):
+    """
+    构建日线（可左联结技术指标）查询
+
+    Args:
+        symbols: 股票代码列表，为空时不过滤
+        columns: 日线字段，默认 open/high/low/close/volume
+        indicator_columns: 技术指标字段，给出时左联结 technical_indicators，并增加 has_indicators 列
+        start_date: 开始日期（含）
+        end_date: 结束日期（含）
+
+    Returns:
+        Select语句（按 security_id、日期排序，走唯一索引）
+    """
+    columns = columns or DEFAULT_BAR_COLUMNS
+    selected = [DailyData.symbol, DailyData.trade_date] + [getattr(DailyData, col) for col in columns]
+    if indicator_columns:
+        selected += [getattr(TechnicalIndicator, col) for col in indicator_columns]
+        selected.append(TechnicalIndicator.id.isnot(None).label('has_indicators'))
+
+    stmt = select(*selected)
+    if indicator_columns:
+        stmt = stmt.outerjoin(TechnicalIndicator, and_(
+            TechnicalIndicator.security_id == DailyData.security_id,
+            TechnicalIndicator.trade_date == DailyData.trade_date
+        ))
+    if symbols is not None:
+        stmt = stmt.where(DailyData.symbol.in_(list(symbols)))
+    if start_date is not None:
+        stmt = stmt.where(DailyData.trade_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(DailyData.trade_date <= end_date)
+    return stmt.order_by(DailyData.security_id, DailyData.trade_date)
+
+
+def load_bars(db_manager, symbols, columns=None, indicator_columns=None, start_date=None, end_date=None,
+              as_array=False, parse_dates=False):
+    """
+    读取股票的日线（及技术指标），不经过ORM
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 股票代码列表
+        columns: 日线字段，默认 open/high/low/close/volume
+        indicator_columns: 技术指标字段（可选）
+        start_date: 开始日期（含）
+        end_date: 结束日期（含）
+        as_array: 是否返回 NumPy 结构化数组
+        parse_dates: DataFrame 的日期列是否保留为 datetime64
+
+    Returns:
+        DataFrame（symbol、trade_date + 字段列，同一股票的行连续、按日期升序）或结构化数组
+    """
+    symbols = list(symbols)
+
+    def query(session, group):
+        stmt = bars_query(group, columns, indicator_columns, start_date, end_date)
+        if as_array:
+            return fetch_arrays(session, stmt)
+        return fetch_frame(session, stmt, parse_dates=parse_dates)
+
+    if not symbols:
+        with db_manager.get_read_session(db_manager.markets[0]) as session:
+            return query(session, [])
+
+    parts = list(db_manager.fan_out(query, symbols=symbols).values())
+    if len(parts) == 1:
+        return parts[0]
+    return np.concatenate(parts) if as_array else pd.concat(parts, ignore_index=True)
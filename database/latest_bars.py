@@ -0,0 +1,211 @@
+"""
+最新行情快照模块
+
+latest_bars 表每只股票一行，保存最新收盘价、日期、涨跌幅和主要技术指标。
+写入 daily_data / technical_indicators 的会话在提交前自动刷新受影响股票的快照（见 DatabaseManager），
+持仓估值、止盈止损检查只需按股票代码读一次快照表，不再逐只执行 ORDER BY trade_date DESC LIMIT 1。
+"""
+from datetime import datetime
+from sqlalchemy import select, literal
+from sqlalchemy.orm import aliased
+from loguru import logger
+
+from database.models import DailyData, TechnicalIndicator, LatestBar
+
+
+# 快照中的日线字段
+LATEST_BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'turnover', 'change_pct']
+
+# 快照中的技术指标字段
+LATEST_INDICATOR_COLUMNS = ['ma5', 'ma10', 'ma20', 'ma60', 'macd', 'macd_signal', 'macd_hist',
+                            'rsi', 'kdj_k', 'kdj_d', 'kdj_j']
+
+# 触发快照刷新的表
+LATEST_BAR_SOURCES = {DailyData.__tablename__: 'bars', TechnicalIndicator.__tablename__: 'indicators'}
+
+# 每条语句处理的股票数（SQLite 参数个数限制）
+REFRESH_CHUNK_SIZE = 500
+
+
+def _insert(connection):
+    """按数据库类型选择支持 ON CONFLICT 的 insert"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise ValueError(f"latest_bars 不支持的数据库类型: {dialect}")
+    return insert
+
+
+def _latest_of(model, symbols):
+    """每只股票最新一行的查询条件（相关子查询走 (security_id, trade_date) 唯一索引）"""
+    inner = aliased(model)
+    latest = select(inner.trade_date).where(
+        inner.security_id == model.security_id
+    ).order_by(inner.trade_date.desc()).limit(1).scalar_subquery()
+
+    conditions = [model.trade_date == latest]
+    if symbols is not None:
+        conditions.append(model.symbol.in_(symbols))
+    return conditions
+
+
+def _bars_statement(insert, symbols, now):
+    """从 daily_data 刷新快照的日线字段"""
+    columns = ['symbol', 'trade_date'] + LATEST_BAR_COLUMNS + ['updated_at']
+    source = select(
+        DailyData.symbol, DailyData.trade_date,
+        *[getattr(DailyData, col) for col in LATEST_BAR_COLUMNS],
+        literal(now)
+    ).where(*_latest_of(DailyData, symbols))
+
+    stmt = insert(LatestBar.__table__).from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=['symbol'],
+        set_={col: stmt.excluded[col] for col in columns[1:]}
+    )
+
+
+def _indicators_statement(insert, symbols, now):
+    """从 technical_indicators 刷新快照的指标字段（含前一日 MACD）"""
+    previous = aliased(TechnicalIndicator)
+
+    def prev(column):
+        return select(getattr(previous, column)).where(
+            previous.security_id == TechnicalIndicator.security_id,
+            previous.trade_date < TechnicalIndicator.trade_date
+        ).order_by(previous.trade_date.desc()).limit(1).scalar_subquery()
+
+    columns = (['symbol', 'indicator_date'] + LATEST_INDICATOR_COLUMNS +
+               ['prev_macd', 'prev_macd_signal', 'updated_at'])
+    source = select(
+        TechnicalIndicator.symbol, TechnicalIndicator.trade_date,
+        *[getattr(TechnicalIndicator, col) for col in LATEST_INDICATOR_COLUMNS],
+        prev('macd'), prev('macd_signal'),
+        literal(now)
+    ).where(*_latest_of(TechnicalIndicator, symbols))
+
+    stmt = insert(LatestBar.__table__).from_select(columns, source)
+    return stmt.on_conflict_do_update(
+        index_elements=['symbol'],
+        set_={col: stmt.excluded[col] for col in columns[1:]}
+    )
+
+
+def refresh_latest_bars(connection, symbols=None, sources=('bars', 'indicators')):
+    """
+    按 daily_data / technical_indicators 的最新一行刷新快照
+
+    Args:
+        connection: 数据库连接或会话（在调用方的事务内执行）
+        symbols: 股票代码集合，为空时刷新全部股票
+        sources: 刷新的部分（'bars' 日线，'indicators' 技术指标）
+
+    Returns:
+        int: 处理的股票数（全量刷新时为 -1）
+    """
+    insert = _insert(connection.get_bind() if hasattr(connection, 'get_bind') else connection)
+    now = datetime.now()
+    builders = [b for name, b in (('bars', _bars_statement), ('indicators', _indicators_statement))
+                if name in sources]
+
+    if symbols is None:
+        for build in builders:
+            connection.execute(build(insert, None, now))
+        return -1
+
+    symbols = sorted(symbols)
+    for start in range(0, len(symbols), REFRESH_CHUNK_SIZE):
+        chunk = symbols[start:start + REFRESH_CHUNK_SIZE]
+        for build in builders:
+            connection.execute(build(insert, chunk, now))
+
+    logger.debug(f"刷新最新行情快照 {len(symbols)} 只股票")
+    return len(symbols)
+
+
+def get_latest_bars(session, symbols):
+    """
+    批量读取最新行情快照
+
+    Args:
+        session: 数据库会话
+        symbols: 股票代码列表
+
+    Returns:
+        dict: symbol -> 快照行（Row，可按属性访问 close/trade_date/rsi/... ，会话关闭后仍可用）
+    """
+    symbols = list(dict.fromkeys(symbols))
+    result = {}
+    for start in range(0, len(symbols), REFRESH_CHUNK_SIZE):
+        chunk = symbols[start:start + REFRESH_CHUNK_SIZE]
+        rows = session.execute(
+            select(*LatestBar.__table__.columns).where(LatestBar.symbol.in_(chunk))
+        ).all()
+        result.update((row.symbol, row) for row in rows)
+    return result
+
+
+def get_latest_prices(session, symbols):
+    """
+    批量读取最新收盘价
+
+    快照中没有的股票（如快照表建立前已有的数据）回退为逐只查询 daily_data
+
+    Args:
+        session: 数据库会话
+        symbols: 股票代码列表
+
+    Returns:
+        dict: symbol -> 最新收盘价（没有数据的股票不在结果中）
+    """
+    bars = get_latest_bars(session, symbols)
+    prices = {symbol: bar.close for symbol, bar in bars.items() if bar.close is not None}
+
+    for symbol in symbols:
+        if symbol in prices:
+            continue
+        row = session.execute(
+            select(DailyData.close).where(DailyData.symbol == symbol)
+            .order_by(DailyData.trade_date.desc()).limit(1)
+        ).first()
+        if row is not None:
+            prices[symbol] = row.close
+
+    return prices
+
+
+def load_latest_bars(db_manager, symbols):
+    """
+    按股票所在市场分库批量读取最新行情快照（未分库时等同 get_latest_bars）
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 股票代码列表
+
+    Returns:
+        dict: symbol -> 快照行
+    """
+    bars = {}
+    for result in db_manager.fan_out(get_latest_bars, symbols=symbols).values():
+        bars.update(result)
+    return bars
+
+
+def load_latest_prices(db_manager, symbols):
+    """
+    按股票所在市场分库批量读取最新收盘价（未分库时等同 get_latest_prices）
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 股票代码列表
+
+    Returns:
+        dict: symbol -> 最新收盘价
+    """
+    prices = {}
+    for result in db_manager.fan_out(get_latest_prices, symbols=symbols).values():
+        prices.update(result)
+    return prices
@@ -0,0 +1,439 @@
+"""
+分钟数据保留、汇总与归档模块
+
+minute_data 只保留最近 retention_days 天的1分钟K线（热数据），写入量不随时间无限增长：
+- 写入后按周期汇总为 5/15/60 分钟K线（minute_bars 表，长期保留）
+- 超过保留期的1分钟K线按交易日压缩归档到文件，再从表中删除
+- load_minute_data 透明合并热数据表和归档文件，调用方不区分数据所在位置
+
+归档文件:
+    {root}/{market}/{YYYY}/{YYYYMMDD}.npz   一个市场一个交易日（np.savez_compressed）
+        symbols   股票代码
+        counts    每只股票的K线数（K线按股票、时间排序拼接）
+        seconds   距当日零点的秒数，按股票差分编码（每只股票第一个值为原值）
+        open/high/low/close  价格 × PRICE_SCALE 取整，按股票差分编码；{col}_nan 为缺失值位图
+        volume/turnover      原值
+"""
+import os
+from datetime import datetime, date, time as dt_time, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, delete, func
+from loguru import logger
+
+from database.models import DailyData, MinuteData, MinuteBar
+from database.security_ids import market_of_symbol
+
+
+# 默认归档目录（可通过配置 database.minute_data.archive_path 修改）
+DEFAULT_MINUTE_ARCHIVE_ROOT = 'data/minute_archive'
+
+# 热数据表保留天数（可通过配置 database.minute_data.retention_days 修改）
+DEFAULT_RETENTION_DAYS = 30
+
+# 汇总周期（分钟，可通过配置 database.minute_data.rollup_periods 修改）
+DEFAULT_ROLLUP_PERIODS = (5, 15, 60)
+
+# 归档价格精度（保留4位小数）
+PRICE_SCALE = 10000
+
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+MINUTE_COLUMNS = ['symbol', 'trade_datetime'] + PRICE_COLUMNS + ['volume', 'turnover']
+
+
+def _setting(key, default):
+    """读取配置 database.minute_data.{key}"""
+    try:
+        from utils.config_loader import get_config_loader
+        return get_config_loader().get(f'database.minute_data.{key}', default)
+    except RuntimeError:
+        return default
+
+
+def get_archive_root(root=None):
+    """
+    获取分钟数据归档根目录
+
+    Args:
+        root: 指定目录，为空时读取配置 database.minute_data.archive_path
+
+    Returns:
+        str: 根目录
+    """
+    return root or _setting('archive_path', DEFAULT_MINUTE_ARCHIVE_ROOT)
+
+
+def get_rollup_periods():
+    """汇总周期列表（分钟）"""
+    return sorted(int(p) for p in _setting('rollup_periods', DEFAULT_ROLLUP_PERIODS))
+
+
+def _retention_days():
+    """热数据表保留天数"""
+    return int(_setting('retention_days', DEFAULT_RETENTION_DAYS))
+
+
+def _archive_path(root, market, day):
+    return os.path.join(root, market, f'{day:%Y}', f'{day:%Y%m%d}.npz')
+
+
+def _to_frame(result):
+    df = pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()))
+    if df.empty:
+        return pd.DataFrame(columns=MINUTE_COLUMNS)
+    df['trade_datetime'] = pd.to_datetime(df['trade_datetime'])
+    return df
+
+
+def _query_minutes(session, symbols, start, end):
+    """查询一个库内热数据表中 [start, end) 的1分钟K线"""
+    stmt = select(*[getattr(MinuteData, col) for col in MINUTE_COLUMNS]).where(
+        MinuteData.trade_datetime >= start, MinuteData.trade_datetime < end
+    )
+    if symbols is not None:
+        stmt = stmt.where(MinuteData.symbol.in_(list(symbols)))
+    return _to_frame(session.execute(stmt))
+
+
+def _concat(frames):
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=MINUTE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_hot(db_manager, symbols, start, end):
+    """跨分库读取热数据表"""
+    if symbols is None:
+        results = db_manager.fan_out(lambda session: _query_minutes(session, None, start, end))
+    else:
+        results = db_manager.fan_out(lambda session, group: _query_minutes(session, group, start, end),
+                                     symbols=symbols)
+    return _concat(results.values())
+
+
+def _aggregate(frame, period):
+    """1分钟K线汇总为 period 分钟K线（K线开始时间按周期对齐）"""
+    frame = frame.sort_values(['symbol', 'trade_datetime'])
+    bar_time = frame['trade_datetime'].dt.floor(f'{period}min').rename('bar_time')
+    bars = frame.groupby(['symbol', bar_time], sort=False).agg(
+        open=('open', 'first'), high=('high', 'max'), low=('low', 'min'), close=('close', 'last'),
+        volume=('volume', 'sum'), turnover=('turnover', 'sum'), bar_count=('close', 'count'),
+    ).reset_index()
+    bars['period'] = period
+    return bars
+
+
+def _save_rollups(db_manager, frame, periods=None):
+    """汇总并写入 minute_bars，返回写入的K线数"""
+    if frame.empty:
+        return 0
+    now = datetime.now()
+    count = 0
+    for period in periods or get_rollup_periods():
+        bars = _aggregate(frame, period)
+        bars['updated_at'] = now
+        count += db_manager.bulk_upsert(MinuteBar, bars, key=('symbol', 'period', 'bar_time'))
+    return count
+
+
+def rollup_minute_data(db_manager, symbols=None, start=None, end=None, periods=None):
+    """
+    按热数据表重新汇总 [start, end] 所在周期的分钟K线
+
+    时间范围向外扩展到最大周期的边界，保证受影响的K线按完整的1分钟数据重算。
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 股票代码列表，默认全部
+        start: 开始时间，默认为保留期的起点
+        end: 结束时间，默认当前时间
+        periods: 汇总周期列表，默认取配置
+
+    Returns:
+        int: 写入的汇总K线数
+    """
+    periods = periods or get_rollup_periods()
+    span = pd.Timedelta(minutes=max(periods))
+    start = pd.Timestamp(start if start is not None else datetime.now() - timedelta(days=_retention_days()))
+    end = pd.Timestamp(end if end is not None else datetime.now())
+    start = start.floor(span).to_pydatetime()
+    end = (end.floor(span) + span).to_pydatetime()
+
+    frame = _read_hot(db_manager, symbols, start, end)
+    return _save_rollups(db_manager, frame, periods)
+
+
+def _encode_day(frame, day):
+    """一个交易日的1分钟K线编码为归档数组"""
+    frame = frame.sort_values(['symbol', 'trade_datetime']).reset_index(drop=True)
+    symbols, counts = np.unique(frame['symbol'].to_numpy(dtype=str), return_counts=True)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    def delta(values):
+        encoded = np.diff(values, prepend=values[:1])
+        encoded[starts] = values[starts]
+        return encoded
+
+    midnight = np.datetime64(day, 's')
+    seconds = (frame['trade_datetime'].to_numpy(dtype='datetime64[s]') - midnight).astype(np.int64)
+    arrays = {'symbols': symbols, 'counts': counts.astype(np.int32), 'seconds': delta(seconds)}
+
+    close = frame['close'].to_numpy(dtype=np.float64)
+    for col in PRICE_COLUMNS:
+        values = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(values)
+        if missing.any():
+            values = np.where(missing, close, values)
+            arrays[f'{col}_nan'] = np.packbits(missing)
+        arrays[col] = delta(np.rint(values * PRICE_SCALE).astype(np.int64))
+
+    for col in ('volume', 'turnover'):
+        arrays[col] = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return arrays
+
+
+def _read_archive_day(path, day, symbols=None):
+    """
+    读取一个归档文件
+
+    Args:
+        path: 归档文件路径
+        day: 交易日
+        symbols: 股票代码集合，为空时读取全部
+
+    Returns:
+        DataFrame: 列同 MINUTE_COLUMNS
+    """
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    counts = arrays['counts'].astype(np.int64)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    selected = [i for i, symbol in enumerate(arrays['symbols'])
+                if symbols is None or symbol in symbols]
+    if not selected:
+        return pd.DataFrame(columns=MINUTE_COLUMNS)
+
+    n = int(ends[-1])
+    rows = np.concatenate([np.arange(starts[i], ends[i]) for i in selected])
+
+    def decode(values):
+        # 每只股票的差分从该股票第一个值开始累加
+        return np.concatenate([np.cumsum(values[starts[i]:ends[i]]) for i in selected])
+
+    midnight = np.datetime64(day, 's')
+    frame = {
+        'symbol': np.repeat(arrays['symbols'][selected], counts[selected]),
+        'trade_datetime': midnight + decode(arrays['seconds']).astype('timedelta64[s]'),
+    }
+    for col in PRICE_COLUMNS:
+        values = decode(arrays[col]) / PRICE_SCALE
+        if f'{col}_nan' in arrays:
+            missing = np.unpackbits(arrays[f'{col}_nan'], count=n).astype(bool)[rows]
+            values[missing] = np.nan
+        frame[col] = values
+    for col in ('volume', 'turnover'):
+        frame[col] = arrays[col][rows]
+
+    frame = pd.DataFrame(frame, columns=MINUTE_COLUMNS)
+    frame['trade_datetime'] = frame['trade_datetime'].astype('datetime64[ns]')
+    return frame
+
+
+def _write_archive_day(root, market, day, frame):
+    """写入（合并）一个市场一个交易日的归档文件，先写临时文件再替换"""
+    path = _archive_path(root, market, day)
+    if os.path.exists(path):
+        frame = pd.concat([_read_archive_day(path, day), frame], ignore_index=True)
+        frame = frame.drop_duplicates(['symbol', 'trade_datetime'], keep='last')
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **_encode_day(frame, day))
+    os.replace(tmp_path, path)
+    return path
+
+
+def archive_minute_data(db_manager, before=None, root=None, retention_days=None):
+    """
+    归档并删除超过保留期的1分钟K线
+
+    逐个交易日处理：先重算该日的汇总K线，再合并写入归档文件，最后从热数据表删除，
+    中途失败时已处理的交易日保持完整，重新运行即可继续。
+
+    Args:
+        db_manager: 数据库管理器
+        before: 归档该日期之前（不含）的数据，默认为 今天 - retention_days
+        root: 归档根目录
+        retention_days: 热数据保留天数，默认取配置 database.minute_data.retention_days
+
+    Returns:
+        int: 归档的1分钟K线数
+    """
+    root = get_archive_root(root)
+    if before is None:
+        before = date.today() - timedelta(days=retention_days or _retention_days())
+    cutoff = datetime.combine(before, dt_time())
+
+    total = 0
+    for market in db_manager.markets:
+        with db_manager.get_read_session(market) as session:
+            first = session.execute(
+                select(func.min(MinuteData.trade_datetime)).where(MinuteData.trade_datetime < cutoff)
+            ).scalar()
+        if first is None:
+            continue
+
+        day = pd.Timestamp(first).date()
+        while day < before:
+            start = datetime.combine(day, dt_time())
+            end = start + timedelta(days=1)
+            with db_manager.get_read_session(market) as session:
+                frame = _query_minutes(session, None, start, end)
+
+            if not frame.empty:
+                _save_rollups(db_manager, frame)
+                markets = frame['symbol'].map(market_of_symbol)
+                for archive_market, group in frame.groupby(markets):
+                    _write_archive_day(root, archive_market, day, group)
+
+                with db_manager.get_session(market) as session:
+                    session.execute(delete(MinuteData).where(
+                        MinuteData.trade_datetime >= start, MinuteData.trade_datetime < end
+                    ))
+                total += len(frame)
+                logger.info(f"归档 {day} 分钟数据 {len(frame)} 条")
+            day += timedelta(days=1)
+
+    if total:
+        logger.info(f"分钟数据归档完成: 共 {total} 条（{before} 之前），归档目录 {root}")
+    return total
+
+
+def _archive_days(root, symbols, start, end):
+    """[start, end] 范围内存在的归档文件：(交易日, 路径, 股票代码集合)"""
+    if symbols is None:
+        markets = sorted(os.listdir(root)) if os.path.isdir(root) else []
+        wanted = {market: None for market in markets}
+    else:
+        wanted = {}
+        for symbol in symbols:
+            wanted.setdefault(market_of_symbol(symbol), set()).add(symbol)
+
+    day = start.date()
+    while day <= end.date():
+        for market, market_symbols in wanted.items():
+            path = _archive_path(root, market, day)
+            if os.path.exists(path):
+                yield day, path, market_symbols
+        day += timedelta(days=1)
+
+
+def load_minute_data(db_manager, symbols, start, end, period=1, root=None):
+    """
+    读取分钟K线，透明合并热数据表和归档文件
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 股票代码列表，为 None 时读取全部股票
+        start: 开始时间（含）
+        end: 结束时间（含）
+        period: 周期（分钟），1 为原始分钟K线，其余读取 minute_bars 汇总表
+        root: 归档根目录
+
+    Returns:
+        DataFrame: symbol, trade_datetime, open, high, low, close, volume, turnover，按股票、时间排序
+    """
+    start, end = pd.Timestamp(start).to_pydatetime(), pd.Timestamp(end).to_pydatetime()
+
+    if period != 1:
+        def query(session, group=None):
+            stmt = select(MinuteBar.symbol, MinuteBar.bar_time.label('trade_datetime'),
+                          *[getattr(MinuteBar, col) for col in MINUTE_COLUMNS[2:]]).where(
+                MinuteBar.period == period, MinuteBar.bar_time >= start, MinuteBar.bar_time <= end
+            )
+            if group is not None:
+                stmt = stmt.where(MinuteBar.symbol.in_(group))
+            return _to_frame(session.execute(stmt))
+
+        results = db_manager.fan_out(query, symbols=symbols)
+        frame = _concat(results.values())
+    else:
+        # 归档在前、热数据在后，重复的K线以热数据为准
+        frames = [_read_archive_day(path, day, market_symbols)
+                  for day, path, market_symbols in _archive_days(get_archive_root(root), symbols, start, end)]
+        frames.append(_read_hot(db_manager, symbols, start, end + timedelta(microseconds=1)))
+        frame = _concat(frames)
+        if not frame.empty:
+            frame = frame[(frame['trade_datetime'] >= start) & (frame['trade_datetime'] <= end)]
+            frame = frame.drop_duplicates(['symbol', 'trade_datetime'], keep='last')
+
+    return frame.sort_values(['symbol', 'trade_datetime']).reset_index(drop=True)
+
+
+def check_daily_rollup(db_manager, trade_date, symbols=None, tolerance=0.005, root=None):
+    """
+    用当日1分钟K线汇总的日K线核对 daily_data
+
+    Args:
+        db_manager: 数据库管理器
+        trade_date: 交易日
+        symbols: 股票代码列表，默认当日有分钟数据的全部股票
+        tolerance: 价格和成交量的相对误差容忍度
+        root: 归档根目录
+
+    Returns:
+        DataFrame: 不一致的股票（minute_*/daily_* 对比值及 issues 说明），全部一致时为空
+    """
+    start = datetime.combine(trade_date, dt_time())
+    frame = load_minute_data(db_manager, symbols, start, start + timedelta(days=1) - timedelta(seconds=1),
+                             root=root)
+    if frame.empty:
+        logger.warning(f"{trade_date} 没有分钟数据，无法核对")
+        return pd.DataFrame()
+
+    minute = frame.groupby('symbol').agg(
+        minute_high=('high', 'max'), minute_low=('low', 'min'),
+        minute_close=('close', 'last'), minute_volume=('volume', 'sum'),
+    )
+
+    def query(session, group):
+        result = session.execute(
+            select(DailyData.symbol, DailyData.high.label('daily_high'), DailyData.low.label('daily_low'),
+                   DailyData.close.label('daily_close'), DailyData.volume.label('daily_volume'))
+            .where(DailyData.symbol.in_(group), DailyData.trade_date == trade_date)
+        )
+        return pd.DataFrame.from_records(result.fetchall(), columns=list(result.keys()))
+
+    daily = _concat_daily(db_manager.fan_out(query, symbols=list(minute.index)).values())
+    merged = minute.join(daily, how='left')
+
+    def relative(a, b):
+        return (merged[a] - merged[b]).abs() / merged[b].abs().where(merged[b] != 0)
+
+    checks = {
+        '缺少日线': merged['daily_close'].isna(),
+        '收盘价不一致': relative('minute_close', 'daily_close') > tolerance,
+        '最高价不一致': relative('minute_high', 'daily_high') > tolerance,
+        '最低价不一致': relative('minute_low', 'daily_low') > tolerance,
+        '成交量不一致': relative('minute_volume', 'daily_volume') > tolerance,
+    }
+    issues = pd.Series('', index=merged.index)
+    for name, mask in checks.items():
+        issues = issues.where(~mask.fillna(False), issues + name + ' ')
+    merged['issues'] = issues.str.strip()
+
+    mismatched = merged[merged['issues'] != ''].reset_index()
+    logger.info(f"{trade_date} 分钟汇总核对: {len(merged)} 只股票，{len(mismatched)} 只与日线不一致")
+    return mismatched
+
+
+def _concat_daily(frames):
+    frames = [df for df in frames if not df.empty]
+    columns = ['symbol', 'daily_high', 'daily_low', 'daily_close', 'daily_volume']
+    if not frames:
+        return pd.DataFrame(columns=columns).set_index('symbol')
+    return pd.concat(frames, ignore_index=True).set_index('symbol')
@@ -2,9 +2,11 @@
 数据库模型定义
 """
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Boolean, Text, ForeignKey, Index
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, Date, DateTime, Boolean, Text, ForeignKey, Index, LargeBinary
+from sqlalchemy import select
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, column_property, ColumnProperty
+from sqlalchemy.sql import operators
 
 Base = declarative_base()
 
@@ -50,12 +52,57 @@ class StockInfo(Base):
         return f"<StockInfo(symbol='{self.symbol}', name='{self.name}', market='{self.market}')>"
 
 
+class SymbolComparator(ColumnProperty.Comparator):
+    """
+    时间序列表 symbol 列的比较改写
+
+    这些表以 security_id（stock_info.id）为外键和索引键，symbol 只是冗余字段、不建索引。
+    Model.symbol == '700.HK'、Model.symbol.in_([...]) 以及与其他表 symbol 的连接条件
+    改写为按 security_id 比较，调用方照常按股票代码查询即可走整数索引。
+    """
+
+    def _security_id(self):
+        return self._parententity.entity.security_id
+
+    def operate(self, op, *other, **kwargs):
+        if op is operators.eq and isinstance(other[0], str):
+            return self._security_id() == (
+                select(StockInfo.id).where(StockInfo.symbol == other[0]).scalar_subquery()
+            )
+
+        if op is operators.in_op and isinstance(other[0], (list, tuple, set, frozenset)) \
+                and all(isinstance(value, str) for value in other[0]):
+            return self._security_id().in_(
+                select(StockInfo.id).where(StockInfo.symbol.in_(list(other[0])))
+            )
+
+        if op is operators.eq and getattr(other[0], 'key', None) == 'symbol':
+            target = other[0]
+            if isinstance(target.comparator, SymbolComparator):
+                return self._security_id() == target.comparator._security_id()
+            # 子查询列、column('symbol') 等非ORM属性没有 _parententity，按 symbol 直接比较
+            parent = getattr(target.comparator, '_parententity', None)
+            if parent is not None and parent.class_ is StockInfo:
+                return self._security_id() == parent.entity.id
+
+        return super().operate(op, *other, **kwargs)
+
+
+def symbol_column():
+    """时间序列表的 symbol 列（冗余字段，比较时改写为按 security_id 过滤）"""
+    return column_property(
+        Column('symbol', String(20), nullable=False, comment='股票代码（冗余字段，索引键为 security_id）'),
+        comparator_factory=SymbolComparator
+    )
+
+
 class DailyData(Base):
     """日线数据表"""
     __tablename__ = 'daily_data'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False, index=True)
+    security_id = Column(Integer, ForeignKey('stock_info.id'), nullable=False, comment='证券ID（stock_info.id）')
+    symbol = symbol_column()
     trade_date = Column(Date, nullable=False, index=True, comment='交易日期')
 
     # OHLCV数据
@@ -82,9 +129,9 @@ class DailyData(Base):
     # 关系
     stock = relationship('StockInfo', back_populates='daily_data')
 
-    # 复合索引
+    # 复合唯一索引（自然键，bulk_upsert 依赖）
     __table_args__ = (
-        Index('idx_symbol_date', 'symbol', 'trade_date'),
+        Index('uq_daily_security_date', 'security_id', 'trade_date', unique=True),
     )
 
     def __repr__(self):
@@ -96,7 +143,8 @@ class TechnicalIndicator(Base):
     __tablename__ = 'technical_indicators'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False, index=True)
+    security_id = Column(Integer, ForeignKey('stock_info.id'), nullable=False, comment='证券ID（stock_info.id）')
+    symbol = symbol_column()
     trade_date = Column(Date, nullable=False, index=True, comment='交易日期')
 
     # 趋势指标
@@ -136,9 +184,9 @@ class TechnicalIndicator(Base):
     # 时间戳
     created_at = Column(DateTime, default=datetime.now, comment='创建时间')
 
-    # 复合索引
+    # 复合唯一索引（自然键，bulk_upsert 依赖）
     __table_args__ = (
-        Index('idx_ti_symbol_date', 'symbol', 'trade_date'),
+        Index('uq_ti_security_date', 'security_id', 'trade_date', unique=True),
     )
 
     def __repr__(self):
@@ -180,8 +228,9 @@ class StockSelection(Base):
     # 关系
     stock = relationship('StockInfo', back_populates='selections')
 
-    # 复合索引
+    # 复合索引（(symbol, selection_date) 为自然键）
     __table_args__ = (
+        Index('uq_selection_symbol_date', 'symbol', 'selection_date', unique=True),
         Index('idx_selection_date_score', 'selection_date', 'total_score'),
     )
 
@@ -189,6 +238,116 @@ class StockSelection(Base):
         return f"<StockSelection(symbol='{self.symbol}', date='{self.selection_date}', score={self.total_score})>"
 
 
+class StockScore(Base):
+    """历史评分表（每只股票每个交易日的选股评分，供研究和回测使用）"""
+    __tablename__ = 'stock_scores'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False)
+    trade_date = Column(Date, nullable=False, index=True, comment='交易日期')
+
+    # 评分（均为0-100内的整数）
+    total_score = Column(SmallInteger, nullable=False, comment='总分')
+    technical_score = Column(SmallInteger, comment='技术指标分')
+    volume_score = Column(SmallInteger, comment='量价分析分')
+    trend_score = Column(SmallInteger, comment='趋势分析分')
+    pattern_score = Column(SmallInteger, comment='形态识别分')
+
+    # 复合唯一索引（自然键，bulk_upsert 依赖）
+    __table_args__ = (
+        Index('uq_score_symbol_date', 'symbol', 'trade_date', unique=True),
+        Index('idx_score_date_total', 'trade_date', 'total_score'),
+    )
+
+    def __repr__(self):
+        return f"<StockScore(symbol='{self.symbol}', date='{self.trade_date}', score={self.total_score})>"
+
+
+class LatestBar(Base):
+    """最新行情快照表（每只股票一行，写入日线/技术指标时同步维护）"""
+    __tablename__ = 'latest_bars'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False)
+
+    # 最新日线
+    trade_date = Column(Date, comment='最新交易日期')
+    open = Column(Float, comment='开盘价')
+    high = Column(Float, comment='最高价')
+    low = Column(Float, comment='最低价')
+    close = Column(Float, comment='收盘价')
+    volume = Column(Float, comment='成交量')
+    turnover = Column(Float, comment='成交额')
+    change_pct = Column(Float, comment='涨跌幅(%)')
+
+    # 最新技术指标
+    indicator_date = Column(Date, comment='指标日期')
+    ma5 = Column(Float, comment='5日均线')
+    ma10 = Column(Float, comment='10日均线')
+    ma20 = Column(Float, comment='20日均线')
+    ma60 = Column(Float, comment='60日均线')
+    macd = Column(Float, comment='MACD')
+    macd_signal = Column(Float, comment='MACD信号线')
+    macd_hist = Column(Float, comment='MACD柱状图')
+    rsi = Column(Float, comment='RSI')
+    kdj_k = Column(Float, comment='KDJ-K')
+    kdj_d = Column(Float, comment='KDJ-D')
+    kdj_j = Column(Float, comment='KDJ-J')
+
+    # 前一日指标（判断MACD金叉/死叉）
+    prev_macd = Column(Float, comment='前一日MACD')
+    prev_macd_signal = Column(Float, comment='前一日MACD信号线')
+
+    # 时间戳
+    updated_at = Column(DateTime, default=datetime.now, comment='更新时间')
+
+    __table_args__ = (
+        Index('uq_latest_symbol', 'symbol', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<LatestBar(symbol='{self.symbol}', date='{self.trade_date}', close={self.close})>"
+
+
+class DataCoverage(Base):
+    """日线覆盖索引（每只股票一行，位图记录哪些日期有日线，写入日线时同步维护）"""
+    __tablename__ = 'data_coverage'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False)
+
+    first_date = Column(Date, nullable=False, comment='最早日线日期')
+    last_date = Column(Date, nullable=False, comment='最新日线日期')
+    days = Column(Integer, nullable=False, comment='日线条数')
+    bitmap = Column(LargeBinary, nullable=False, comment='覆盖位图（第i位为 first_date 之后第i个自然日）')
+
+    updated_at = Column(DateTime, default=datetime.now, comment='更新时间')
+
+    __table_args__ = (
+        Index('uq_coverage_symbol', 'symbol', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<DataCoverage(symbol='{self.symbol}', {self.first_date}~{self.last_date}, days={self.days})>"
+
+
+class TradeCalendar(Base):
+    """交易日历缓存（A股来自交易所日历，其余市场由覆盖索引推断）"""
+    __tablename__ = 'trade_calendar'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    market = Column(String(10), nullable=False, comment='市场')
+    trade_date = Column(Date, nullable=False, comment='交易日')
+    source = Column(String(20), nullable=False, default='exchange', comment='来源（exchange 交易所 / data 由数据推断）')
+
+    __table_args__ = (
+        Index('uq_calendar_market_date', 'market', 'trade_date', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<TradeCalendar(market='{self.market}', date='{self.trade_date}', source='{self.source}')>"
+
+
 class BacktestResult(Base):
     """回测结果表"""
     __tablename__ = 'backtest_results'
@@ -238,7 +397,8 @@ class TradingSignal(Base):
     __tablename__ = 'trading_signals'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False, index=True)
+    security_id = Column(Integer, ForeignKey('stock_info.id'), nullable=False, comment='证券ID（stock_info.id）')
+    symbol = symbol_column()
     signal_date = Column(Date, nullable=False, index=True, comment='信号日期')
 
     # 信号类型
@@ -261,8 +421,9 @@ class TradingSignal(Base):
     # 时间戳
     created_at = Column(DateTime, default=datetime.now, comment='创建时间')
 
-    # 复合索引
+    # 复合索引（(security_id, signal_date, signal_type) 为自然键：同一股票每天每个方向只有一个信号）
     __table_args__ = (
+        Index('uq_signal_security_date_type', 'security_id', 'signal_date', 'signal_type', unique=True),
         Index('idx_signal_date_type', 'signal_date', 'signal_type'),
     )
 
@@ -348,7 +509,8 @@ class MinuteData(Base):
     __tablename__ = 'minute_data'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False, index=True)
+    security_id = Column(Integer, ForeignKey('stock_info.id'), nullable=False, comment='证券ID（stock_info.id）')
+    symbol = symbol_column()
     trade_datetime = Column(DateTime, nullable=False, index=True, comment='交易时间（精确到分钟）')
 
     # OHLCV数据
@@ -362,21 +524,53 @@ class MinuteData(Base):
     # 时间戳
     created_at = Column(DateTime, default=datetime.now, comment='创建时间')
 
-    # 复合索引
+    # 复合唯一索引（自然键，bulk_upsert 依赖）
     __table_args__ = (
-        Index('idx_minute_symbol_datetime', 'symbol', 'trade_datetime'),
+        Index('uq_minute_security_datetime', 'security_id', 'trade_datetime', unique=True),
     )
 
     def __repr__(self):
         return f"<MinuteData(symbol='{self.symbol}', datetime='{self.trade_datetime}', close={self.close})>"
 
 
+class MinuteBar(Base):
+    """分钟K线汇总表（由1分钟数据汇总的5/15/60分钟K线，长期保留）"""
+    __tablename__ = 'minute_bars'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    security_id = Column(Integer, ForeignKey('stock_info.id'), nullable=False, comment='证券ID（stock_info.id）')
+    symbol = symbol_column()
+    period = Column(SmallInteger, nullable=False, comment='周期（分钟）')
+    bar_time = Column(DateTime, nullable=False, comment='K线开始时间')
+
+    # OHLCV数据
+    open = Column(Float, comment='开盘价')
+    high = Column(Float, comment='最高价')
+    low = Column(Float, comment='最低价')
+    close = Column(Float, nullable=False, comment='收盘价')
+    volume = Column(Float, comment='成交量')
+    turnover = Column(Float, comment='成交额')
+    bar_count = Column(SmallInteger, comment='包含的1分钟K线数')
+
+    # 时间戳
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
+
+    # 复合唯一索引（自然键，bulk_upsert 依赖）
+    __table_args__ = (
+        Index('uq_minute_bar_security_period_time', 'security_id', 'period', 'bar_time', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<MinuteBar(symbol='{self.symbol}', period={self.period}, time='{self.bar_time}', close={self.close})>"
+
+
 class MoneyFlowAlert(Base):
     """资金流入告警记录表"""
     __tablename__ = 'money_flow_alerts'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(20), ForeignKey('stock_info.symbol'), nullable=False, index=True)
+    security_id = Column(Integer, ForeignKey('stock_info.id'), nullable=False, comment='证券ID（stock_info.id）')
+    symbol = symbol_column()
     alert_datetime = Column(DateTime, nullable=False, index=True, comment='告警时间')
 
     # 告警指标
@@ -402,8 +596,45 @@ class MoneyFlowAlert(Base):
 
     # 复合索引
     __table_args__ = (
-        Index('idx_alert_symbol_datetime', 'symbol', 'alert_datetime'),
+        Index('idx_alert_security_datetime', 'security_id', 'alert_datetime'),
     )
 
     def __repr__(self):
         return f"<MoneyFlowAlert(symbol='{self.symbol}', type='{self.alert_type}', datetime='{self.alert_datetime}')>"
+
+
+class DataChange(Base):
+    """数据变更日志（写入日线、技术指标、选股结果时按表和股票记录，下游按检查点增量处理）"""
+    __tablename__ = 'data_changes'
+
+    seq = Column(Integer, primary_key=True, autoincrement=True, comment='变更序号（单调递增，即数据版本）')
+    table_name = Column(String(50), nullable=False, comment='表名')
+    symbol = Column(String(20), nullable=False, comment='股票代码')
+    changed_at = Column(DateTime, default=datetime.now, comment='变更时间')
+
+    # sqlite_autoincrement：清理旧日志后序号也不会被重用
+    __table_args__ = (
+        Index('idx_change_table_seq', 'table_name', 'seq'),
+        {'sqlite_autoincrement': True},
+    )
+
+    def __repr__(self):
+        return f"<DataChange(seq={self.seq}, table='{self.table_name}', symbol='{self.symbol}')>"
+
+
+class PipelineCheckpoint(Base):
+    """下游处理阶段的检查点（已处理到的变更序号）"""
+    __tablename__ = 'pipeline_checkpoints'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    stage = Column(String(50), nullable=False, comment='处理阶段（如 calculate_indicators）')
+    market = Column(String(10), nullable=False, comment='市场')
+    last_seq = Column(Integer, nullable=False, comment='已处理到的变更序号')
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, comment='更新时间')
+
+    __table_args__ = (
+        Index('uq_checkpoint_stage_market', 'stage', 'market', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<PipelineCheckpoint(stage='{self.stage}', market='{self.market}', last_seq={self.last_seq})>"
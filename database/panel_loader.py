@@ -0,0 +1,178 @@
+"""
+股票池面板数据加载模块
+
+一次查询加载整个股票池最近N根K线（可联结技术指标），不经过ORM对象
+"""
+from sqlalchemy import and_, func, select
+from loguru import logger
+
+from analysis.technical_indicators import INDICATOR_COLUMNS
+from database.fast_read import read_frame
+from database.models import StockInfo, DailyData, TechnicalIndicator, StockScore
+
+
+# 面板默认包含的K线字段
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'turnover', 'change_pct']
+
+
+def build_panel_query(market=None, symbols=None, lookback=60, with_indicators=True,
+                      hk_connect_only=False, active_only=True, start_date=None):
+    """
+    构建"每只股票最近N根K线"的窗口查询
+
+    Args:
+        market: 市场代码（HK/US/CN），为空时不按市场过滤
+        symbols: 股票代码列表，为空时取整个市场
+        lookback: 每只股票取最近多少根K线，为空时取全部
+        with_indicators: 是否左联结技术指标
+        hk_connect_only: 是否只取港股通标的
+        active_only: 是否只取活跃股票
+        start_date: 最早交易日期（可选，用于缩小扫描范围）
+
+    Returns:
+        Select语句
+    """
+    rank = func.row_number().over(
+        partition_by=DailyData.security_id,
+        order_by=DailyData.trade_date.desc()
+    ).label('bar_rank')
+
+    bars = select(
+        DailyData.security_id,
+        DailyData.symbol,
+        DailyData.trade_date,
+        *[getattr(DailyData, col) for col in BAR_COLUMNS],
+        rank
+    )
+
+    if market or hk_connect_only or active_only:
+        bars = bars.join(StockInfo, DailyData.security_id == StockInfo.id)
+        if market:
+            bars = bars.where(StockInfo.market == market)
+        if hk_connect_only:
+            bars = bars.where(StockInfo.is_hk_connect == True)
+        if active_only:
+            bars = bars.where(StockInfo.is_active == True)
+    if symbols is not None:
+        bars = bars.where(DailyData.symbol.in_(list(symbols)))
+    if start_date is not None:
+        bars = bars.where(DailyData.trade_date >= start_date)
+
+    bars = bars.subquery('bars')
+    columns = [bars.c.symbol, bars.c.trade_date] + [bars.c[col] for col in BAR_COLUMNS]
+
+    if with_indicators:
+        columns += [getattr(TechnicalIndicator, col) for col in INDICATOR_COLUMNS]
+        columns.append(TechnicalIndicator.id.isnot(None).label('has_indicators'))
+        stmt = select(*columns).select_from(
+            bars.outerjoin(
+                TechnicalIndicator,
+                and_(
+                    TechnicalIndicator.security_id == bars.c.security_id,
+                    TechnicalIndicator.trade_date == bars.c.trade_date
+                )
+            )
+        )
+    else:
+        stmt = select(*columns)
+
+    if lookback:
+        stmt = stmt.where(bars.c.bar_rank <= lookback)
+
+    return stmt.order_by(bars.c.symbol, bars.c.trade_date)
+
+
+def load_universe_panel(db_manager, market=None, symbols=None, lookback=60, with_indicators=True,
+                        hk_connect_only=False, active_only=True, start_date=None):
+    """
+    一次查询加载股票池的K线与技术指标面板
+
+    Args:
+        db_manager: 数据库管理器
+        其余参数同 build_panel_query
+
+    Returns:
+        DataFrame: MultiIndex (symbol, trade_date)，按时间升序
+    """
+    stmt = build_panel_query(
+        market=market,
+        symbols=symbols,
+        lookback=lookback,
+        with_indicators=with_indicators,
+        hk_connect_only=hk_connect_only,
+        active_only=active_only,
+        start_date=start_date
+    )
+
+    df = read_frame(db_manager, stmt, market, symbols)
+
+    if with_indicators and not df.empty:
+        df['has_indicators'] = df['has_indicators'].astype(bool)
+
+    numeric = [col for col in df.columns if col not in ('symbol', 'trade_date', 'has_indicators')]
+    df[numeric] = df[numeric].astype(float)
+
+    logger.debug(f"加载面板数据: {df['symbol'].nunique() if not df.empty else 0} 只股票, {len(df)} 行")
+    return df.set_index(['symbol', 'trade_date'])
+
+
+def load_score_history(db_manager, market=None, symbols=None, start_date=None, end_date=None):
+    """
+    加载历史评分（stock_scores 表）
+
+    Args:
+        db_manager: 数据库管理器
+        market: 市场代码，为空时不按市场过滤
+        symbols: 股票代码列表，为空时取全部
+        start_date: 开始日期（含）
+        end_date: 结束日期（含）
+
+    Returns:
+        DataFrame: MultiIndex (symbol, trade_date)，包含各维度分数和总分
+    """
+    score_columns = ['total_score', 'technical_score', 'volume_score', 'trend_score', 'pattern_score']
+    stmt = select(StockScore.symbol, StockScore.trade_date,
+                  *[getattr(StockScore, col) for col in score_columns])
+
+    if market:
+        stmt = stmt.join(StockInfo, StockScore.symbol == StockInfo.symbol).where(StockInfo.market == market)
+    if symbols is not None:
+        stmt = stmt.where(StockScore.symbol.in_(list(symbols)))
+    if start_date is not None:
+        stmt = stmt.where(StockScore.trade_date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(StockScore.trade_date <= end_date)
+
+    stmt = stmt.order_by(StockScore.symbol, StockScore.trade_date)
+
+    df = read_frame(db_manager, stmt, market, symbols)
+
+    # 分数在0-100之间，按 int8 存放；个别空值时保留浮点
+    for col in score_columns:
+        if not df[col].isna().any():
+            df[col] = df[col].astype('int8')
+
+    return df.set_index(['symbol', 'trade_date'])
+
+
+def to_kline_records(frame):
+    """
+    将单只股票的面板切片转换为 TradingSignalAnalyzer 使用的K线字典列表
+
+    Args:
+        frame: load_universe_panel 结果中某只股票的切片
+
+    Returns:
+        list: K线字典列表（行情空值为None；指标空值不输出该键，与 dict.get 的默认值配合；
+            MACD信号线同时提供 'signal' 键）
+    """
+    df = frame.reset_index()
+    df = df.drop(columns=[c for c in ('symbol', 'has_indicators') if c in df.columns])
+    df = df.rename(columns={'trade_date': 'date'})
+    if 'macd_signal' in df.columns:
+        df['signal'] = df['macd_signal']
+    indicators = set(INDICATOR_COLUMNS) | {'signal'}
+    return [
+        {key: value for key, value in record.items() if value is not None or key not in indicators}
+        for record in df.astype(object).where(df.notna(), None).to_dict('records')
+    ]
@@ -0,0 +1,297 @@
+"""
+SQL 语句性能分析模块
+
+通过 SQLAlchemy 引擎的 before/after_cursor_execute 事件记录每条语句的耗时，按归一化后的 SQL
+（去掉字面量和参数个数差异）分组统计次数和耗时分布；按“工作单元”（一次会话、一次Web请求）统计
+语句数，同一语句形态在一个工作单元内执行超过阈值时告警（典型的逐只股票循环查询，即 N+1 问题）。
+
+默认关闭。启用方式:
+    - 配置 database.profiling.enabled: true
+    - 环境变量 SQL_PROFILE=1
+    - python scripts/profile_sql.py <脚本> [参数...]
+"""
+import re
+import time
+import atexit
+import threading
+from contextlib import contextmanager
+from bisect import bisect_left
+from sqlalchemy import event
+from loguru import logger
+
+
+# 耗时分布的桶上界（毫秒）
+HISTOGRAM_BOUNDS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# 默认 N+1 告警阈值：同一语句形态在一个工作单元内的执行次数
+DEFAULT_REPEAT_THRESHOLD = 20
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:\?|%\([^)]*\)s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))+', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(statement):
+    """
+    归一化SQL：合并空白、字面量替换为 ?、IN 列表和多行 VALUES 折叠
+
+    Args:
+        statement: SQL语句
+
+    Returns:
+        str: 语句形态
+    """
+    sql = _WHITESPACE.sub(' ', statement).strip()
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _VALUES_LIST.sub(r'VALUES \1, ...', sql)
+    return sql
+
+
+class StatementStats:
+    """一种语句形态的统计"""
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+
+    def add(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS_MS, elapsed_ms)] += 1
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """按直方图估计分位数（返回所在桶的上界，毫秒）"""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if seen >= target and n:
+                return HISTOGRAM_BOUNDS_MS[i] if i < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+
+class WorkUnit:
+    """工作单元（一次会话或一次Web请求）内的语句计数"""
+
+    def __init__(self, name):
+        self.name = name
+        self.statements = 0
+        self.elapsed_ms = 0.0
+        self.shapes = {}
+        self.warned = set()
+
+
+class SQLProfiler:
+    """SQL语句分析器"""
+
+    def __init__(self, repeat_threshold=DEFAULT_REPEAT_THRESHOLD, slow_query_ms=None):
+        """
+        Args:
+            repeat_threshold: 同一语句形态在一个工作单元内执行超过该次数时告警
+            slow_query_ms: 慢查询阈值（毫秒），为空时不记录慢查询
+        """
+        self.repeat_threshold = repeat_threshold
+        self.slow_query_ms = slow_query_ms
+        self.stats = {}
+        self.units = {}
+        self.repeat_warnings = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._engines = []
+
+    def attach(self, engine):
+        """在引擎上注册语句计时事件"""
+        if engine in self._engines:
+            return
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+        self._engines.append(engine)
+
+    def detach(self):
+        """移除所有引擎上的事件"""
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._before_execute)
+            event.remove(engine, 'after_cursor_execute', self._after_execute)
+        self._engines = []
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('profiler_start', []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info['profiler_start'].pop()) * 1000
+        self.record(statement, elapsed_ms)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def record(self, statement, elapsed_ms):
+        """
+        记录一条语句
+
+        Args:
+            statement: SQL语句
+            elapsed_ms: 耗时（毫秒）
+        """
+        shape = normalize_sql(statement)
+
+        with self._lock:
+            stats = self.stats.get(shape)
+            if stats is None:
+                stats = self.stats[shape] = StatementStats(shape)
+            stats.add(elapsed_ms)
+
+        if self.slow_query_ms is not None and elapsed_ms >= self.slow_query_ms:
+            logger.warning(f"慢查询 {elapsed_ms:.1f}ms: {shape[:200]}")
+
+        for unit in self._stack():
+            unit.statements += 1
+            unit.elapsed_ms += elapsed_ms
+            count = unit.shapes.get(shape, 0) + 1
+            unit.shapes[shape] = count
+            if count > self.repeat_threshold and shape not in unit.warned:
+                unit.warned.add(shape)
+                with self._lock:
+                    self.repeat_warnings[(unit.name, shape)] = count
+                logger.warning(f"[{unit.name}] 同一语句执行超过 {self.repeat_threshold} 次，"
+                               f"疑似逐条循环查询（N+1）: {shape[:200]}")
+
+    @contextmanager
+    def unit(self, name):
+        """
+        工作单元上下文：统计其中执行的语句（可嵌套，语句同时计入外层单元）
+
+        Args:
+            name: 单元名称（如 'session'、'GET /api/positions'）
+        """
+        unit = WorkUnit(name)
+        stack = self._stack()
+        stack.append(unit)
+        try:
+            yield unit
+        finally:
+            stack.pop()
+            self._finish(unit)
+
+    def _finish(self, unit):
+        """汇总工作单元，更新 N+1 计数"""
+        with self._lock:
+            summary = self.units.get(unit.name)
+            if summary is None:
+                summary = self.units[unit.name] = {'count': 0, 'statements': 0, 'max_statements': 0, 'elapsed_ms': 0.0}
+            summary['count'] += 1
+            summary['statements'] += unit.statements
+            summary['max_statements'] = max(summary['max_statements'], unit.statements)
+            summary['elapsed_ms'] += unit.elapsed_ms
+            for shape in unit.warned:
+                key = (unit.name, shape)
+                self.repeat_warnings[key] = max(self.repeat_warnings.get(key, 0), unit.shapes[shape])
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self.stats = {}
+            self.units = {}
+            self.repeat_warnings = {}
+
+    def report(self, top=20, width=100):
+        """
+        生成文本报告
+
+        Args:
+            top: 显示耗时最多的前N种语句
+            width: SQL列宽度
+
+        Returns:
+            str: 报告文本
+        """
+        with self._lock:
+            stats = sorted(self.stats.values(), key=lambda s: s.total_ms, reverse=True)
+            units = dict(self.units)
+            warnings = dict(self.repeat_warnings)
+
+        total_count = sum(s.count for s in stats)
+        total_ms = sum(s.total_ms for s in stats)
+
+        lines = ["=" * (width + 60), "📊 SQL 语句统计", "=" * (width + 60)]
+        lines.append(f"语句总数: {total_count}，语句形态: {len(stats)}，总耗时: {total_ms:.1f}ms")
+        lines.append("")
+        lines.append(f"{'次数':>8s} {'总耗时ms':>10s} {'平均ms':>8s} {'P50':>7s} {'P95':>7s} {'最大ms':>8s}  SQL")
+        lines.append("-" * (width + 60))
+        for s in stats[:top]:
+            lines.append(f"{s.count:>8d} {s.total_ms:>10.1f} {s.mean_ms:>8.2f} {s.percentile(0.5):>7.1f} "
+                         f"{s.percentile(0.95):>7.1f} {s.max_ms:>8.1f}  {s.shape[:width]}")
+
+        if units:
+            lines.append("")
+            lines.append(f"{'工作单元':<40s} {'次数':>8s} {'语句数':>10s} {'单次最多':>10s} {'总耗时ms':>10s}")
+            lines.append("-" * (width + 60))
+            for name, u in sorted(units.items(), key=lambda kv: kv[1]['statements'], reverse=True)[:top]:
+                lines.append(f"{name[:40]:<40s} {u['count']:>8d} {u['statements']:>10d} "
+                             f"{u['max_statements']:>10d} {u['elapsed_ms']:>10.1f}")
+
+        if warnings:
+            lines.append("")
+            lines.append(f"⚠️ 疑似 N+1 查询（同一工作单元内执行超过 {self.repeat_threshold} 次）:")
+            for (name, shape), count in sorted(warnings.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+                lines.append(f"  [{name}] {count} 次: {shape[:width]}")
+
+        lines.append("=" * (width + 60))
+        return "\n".join(lines)
+
+
+# 全局分析器
+_profiler = None
+
+
+def enable_profiling(repeat_threshold=DEFAULT_REPEAT_THRESHOLD, slow_query_ms=None, report_at_exit=True):
+    """
+    启用全局SQL分析器（之后创建的 DatabaseManager 会自动挂载）
+
+    Args:
+        repeat_threshold: N+1 告警阈值
+        slow_query_ms: 慢查询阈值（毫秒）
+        report_at_exit: 进程退出时是否打印报告
+
+    Returns:
+        SQLProfiler实例
+    """
+    global _profiler
+    if _profiler is None:
+        _profiler = SQLProfiler(repeat_threshold, slow_query_ms)
+        if report_at_exit:
+            atexit.register(lambda: print(_profiler.report()))
+    return _profiler
+
+
+def get_profiler():
+    """
+    获取全局SQL分析器
+
+    Returns:
+        SQLProfiler实例，未启用时为 None
+    """
+    return _profiler
+
+
+@contextmanager
+def profile_unit(name):
+    """分析器启用时统计一个工作单元，未启用时不做任何事"""
+    if _profiler is None:
+        yield None
+    else:
+        with _profiler.unit(name) as unit:
+            yield unit
@@ -0,0 +1,169 @@
+"""
+证券ID映射模块
+
+daily_data / technical_indicators / minute_data / trading_signals / money_flow_alerts 以整数
+security_id（即 stock_info.id）作为外键和索引键，symbol 仅作冗余字段保留、不再建索引。
+SecurityIdMap 缓存 symbol <-> security_id，DatabaseManager 的写入路径（bulk_upsert、ORM 新增对象）
+据此自动填充 security_id，调用方继续只传股票代码；查询时的 symbol 比较由 models.SymbolComparator 改写。
+"""
+import threading
+from sqlalchemy import select
+from loguru import logger
+
+from database.models import StockInfo
+
+
+# 股票代码后缀 -> 市场
+SUFFIX_MARKETS = {'HK': 'HK', 'US': 'US', 'SH': 'CN', 'SZ': 'CN', 'BJ': 'CN'}
+
+# 每条语句查询的股票数（SQLite 参数个数限制）
+LOOKUP_CHUNK_SIZE = 500
+
+
+def market_of_symbol(symbol):
+    """
+    按股票代码后缀推断市场
+
+    Args:
+        symbol: 股票代码（如 700.HK、600000.SH）
+
+    Returns:
+        str: 市场（HK/US/CN），无法识别时为 UNKNOWN
+    """
+    suffix = symbol.rsplit('.', 1)[-1].upper() if '.' in symbol else ''
+    return SUFFIX_MARKETS.get(suffix, 'UNKNOWN')
+
+
+class SecurityIdMap:
+    """symbol <-> security_id 缓存（只缓存已提交的映射）"""
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine: 数据库引擎
+        """
+        self.engine = engine
+        self._ids = {}
+        self._symbols = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _store(self, mapping):
+        with self._lock:
+            self._ids.update(mapping)
+            self._symbols.update((sid, symbol) for symbol, sid in mapping.items())
+
+    @staticmethod
+    def _fetch(connection, symbols):
+        """查询股票代码对应的 security_id"""
+        symbols = sorted(symbols)
+        result = {}
+        for start in range(0, len(symbols), LOOKUP_CHUNK_SIZE):
+            chunk = symbols[start:start + LOOKUP_CHUNK_SIZE]
+            rows = connection.execute(
+                select(StockInfo.symbol, StockInfo.id).where(StockInfo.symbol.in_(chunk))
+            ).all()
+            result.update((row.symbol, row.id) for row in rows)
+        return result
+
+    def load(self):
+        """全量加载 stock_info 中的映射"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(StockInfo.symbol, StockInfo.id)).all()
+        with self._lock:
+            self._ids = {row.symbol: row.id for row in rows}
+            self._symbols = {row.id: row.symbol for row in rows}
+            self._loaded = True
+        logger.debug(f"加载证券ID映射 {len(rows)} 只股票")
+
+    def register(self, connection, symbols):
+        """
+        在 stock_info 中登记尚不存在的股票（名称暂用代码，市场按后缀推断）
+
+        Args:
+            connection: 数据库连接或会话（在调用方的事务内执行）
+            symbols: 股票代码集合
+
+        Returns:
+            dict: symbol -> security_id
+        """
+        existing = self._fetch(connection, symbols)
+        missing = sorted(set(symbols) - existing.keys())
+        if missing:
+            connection.execute(StockInfo.__table__.insert(), [
+                {'symbol': symbol, 'name': symbol, 'market': market_of_symbol(symbol)}
+                for symbol in missing
+            ])
+            existing.update(self._fetch(connection, missing))
+            logger.info(f"stock_info 中登记新股票 {len(missing)} 只: {', '.join(missing[:10])}"
+                        f"{' ...' if len(missing) > 10 else ''}")
+        return existing
+
+    def get_ids(self, symbols, connection=None, create=True):
+        """
+        批量获取 security_id
+
+        Args:
+            symbols: 股票代码列表
+            connection: 写入方的连接或会话；新登记的股票在该事务内写入，提交前不进缓存
+            create: stock_info 中不存在的股票是否自动登记
+
+        Returns:
+            dict: symbol -> security_id（create=False 时不存在的股票不在结果中）
+        """
+        if not self._loaded:
+            self.load()
+
+        symbols = set(symbols)
+        missing = symbols - self._ids.keys()
+        if missing:
+            # 先按已提交数据补查（其他进程新登记的股票）
+            with self.engine.connect() as conn:
+                found = self._fetch(conn, missing)
+            self._store(found)
+            missing -= found.keys()
+
+        result = {symbol: self._ids[symbol] for symbol in symbols if symbol in self._ids}
+        if missing and create:
+            if connection is None:
+                with self.engine.begin() as conn:
+                    created = self.register(conn, missing)
+                self._store(created)
+            else:
+                created = self.register(connection, missing)
+            result.update(created)
+        return result
+
+    def get_id(self, symbol, connection=None, create=True):
+        """
+        获取单只股票的 security_id
+
+        Returns:
+            int: security_id，不存在且 create=False 时为 None
+        """
+        return self.get_ids([symbol], connection, create).get(symbol)
+
+    def get_symbols(self, security_ids):
+        """
+        批量获取 security_id 对应的股票代码
+
+        Args:
+            security_ids: security_id 列表
+
+        Returns:
+            dict: security_id -> symbol
+        """
+        if not self._loaded or any(sid not in self._symbols for sid in security_ids):
+            self.load()
+        return {sid: self._symbols[sid] for sid in security_ids if sid in self._symbols}
+
+    def get_symbol(self, security_id):
+        """获取 security_id 对应的股票代码，不存在时为 None"""
+        return self.get_symbols([security_id]).get(security_id)
+
+    def invalidate(self):
+        """清空缓存（stock_info 被修改或删除后调用）"""
+        with self._lock:
+            self._ids = {}
+            self._symbols = {}
+            self._loaded = False
@@ -230,7 +230,7 @@ def add_stocks(stock_dict, market):
         print(f"添加 {market} 市场股票")
         print(f"{'='*60}\n")
         
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             for i, (symbol, name) in enumerate(stock_dict.items(), 1):
                 # 检查是否已存在
                 existing = session.query(StockInfo).filter_by(symbol=symbol).first()
@@ -28,7 +28,7 @@ def analyze_entry_signals(min_score=75, market='HK'):
     config = init_config()
     db = DatabaseManager(config)
     
-    with db.get_session() as session:
+    with db.get_session(market) as session:
         # 获取最新的选股结果
         latest_date = session.query(StockSelection.selection_date).filter(
             StockSelection.market == market
@@ -9,17 +9,29 @@ import sys
 from pathlib import Path
 from datetime import datetime, date
 from collections import defaultdict
+from types import SimpleNamespace
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database import get_db_manager, init_database
-from database.models import StockInfo, DailyData, TechnicalIndicator
+from database import get_db_manager, init_database, load_universe_panel
+from database.models import StockInfo
 from utils.config_loader import init_config
 from loguru import logger
 
 
+# 每只股票加载的最近K线数（最新指标和前一日指标均从中取）
+PANEL_LOOKBACK = 5
+
+
+def _to_rows(frame):
+    """将面板切片转换为按时间升序的行对象列表（空值为None，按属性访问）"""
+    df = frame.reset_index()
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    return [SimpleNamespace(**record) for record in records]
+
+
 def analyze_hk_connect_indicators(min_price=1.0, max_price=1000.0, top_n=50):
     """
     分析港股通标的的技术指标
@@ -39,7 +51,7 @@ def analyze_hk_connect_indicators(min_price=1.0, max_price=1000.0, top_n=50):
     print("📊 港股通标的技术指标分析")
     print("="*120 + "\n")
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         # 获取所有港股通标的
         hk_connect_stocks = session.query(StockInfo).filter(
             StockInfo.market == 'HK',
@@ -60,28 +72,36 @@ def analyze_hk_connect_indicators(min_price=1.0, max_price=1000.0, top_n=50):
         
         print("正在分析技术指标...\n")
         
+        # 一次查询加载所有港股通标的最近几天的K线和技术指标
+        panel = load_universe_panel(
+            db_manager,
+            market='HK',
+            lookback=PANEL_LOOKBACK,
+            with_indicators=True,
+            hk_connect_only=True
+        )
+        frames = dict(tuple(panel.groupby(level='symbol', sort=False))) if not panel.empty else {}
+        
         for stock in hk_connect_stocks:
             try:
-                # 获取最新交易数据
-                latest_daily = session.query(DailyData).filter(
-                    DailyData.symbol == stock.symbol
-                ).order_by(DailyData.trade_date.desc()).first()
-                
-                if not latest_daily:
+                frame = frames.get(stock.symbol)
+                if frame is None:
                     continue
                 
+                # 获取最新交易数据
+                latest_daily = _to_rows(frame)[-1]
+                
                 # 价格筛选
                 if latest_daily.close < min_price or latest_daily.close > max_price:
                     continue
                 
                 # 获取最新技术指标
-                latest_indicator = session.query(TechnicalIndicator).filter(
-                    TechnicalIndicator.symbol == stock.symbol
-                ).order_by(TechnicalIndicator.trade_date.desc()).first()
-                
-                if not latest_indicator:
+                indicator_rows = _to_rows(frame[frame['has_indicators']])
+                if not indicator_rows:
                     continue
                 
+                latest_indicator = indicator_rows[-1]
+                
                 # 计算综合评分
                 score = 0
                 signals = []
@@ -102,10 +122,7 @@ def analyze_hk_connect_indicators(min_price=1.0, max_price=1000.0, top_n=50):
                 if latest_indicator.macd and latest_indicator.macd_signal:
                     if latest_indicator.macd > latest_indicator.macd_signal:
                         # 获取前一天的MACD
-                        prev_indicator = session.query(TechnicalIndicator).filter(
-                            TechnicalIndicator.symbol == stock.symbol,
-                            TechnicalIndicator.trade_date < latest_indicator.trade_date
-                        ).order_by(TechnicalIndicator.trade_date.desc()).first()
+                        prev_indicator = indicator_rows[-2] if len(indicator_rows) > 1 else None
                         
                         if prev_indicator and prev_indicator.macd and prev_indicator.macd_signal:
                             if prev_indicator.macd <= prev_indicator.macd_signal:
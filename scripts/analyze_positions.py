@@ -314,10 +314,11 @@ def main():
             print("\n📭 当前没有持仓")
             return
         
-        # 分析每个持仓
+        # 分析每个持仓（行情和指标读取持仓所在市场的库）
         analyses = []
         for pos in positions:
-            analysis = analyze_position(session, pos)
+            with db_manager.get_read_session(db_manager.market_of(pos.symbol)) as market_session:
+                analysis = analyze_position(market_session, pos)
             analyses.append(analysis)
         
         # 显示分析结果
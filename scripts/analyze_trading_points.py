@@ -28,7 +28,7 @@ def analyze_stock_trading_points(symbol):
     """
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(db_manager.market_of(symbol)) as session:
         # 获取股票信息
         stock = session.query(StockInfo).filter_by(symbol=symbol).first()
         if not stock:
@@ -0,0 +1,104 @@
+"""
+按交易日回补A股历史日线（Tushare）
+
+每个交易日一次请求全市场数据，取代按股票逐只请求的 fetch_new_a_stocks_N.py / add_more_a_stocks_N.py
+"""
+import sys
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.config_loader import init_config
+from utils.logger import setup_logger
+from database import init_database
+from data_collection.tushare_client import TushareClient
+from data_collection.tushare_backfill import register_stocks, backfill_daily_data
+from loguru import logger
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='按交易日回补A股历史日线（Tushare全市场快照）',
+        epilog='''
+示例:
+  # 回补全部跟踪A股最近120天的日线（已完整的交易日自动跳过）
+  python backfill_a_stocks.py
+
+  # 回补最近一年
+  python backfill_a_stocks.py --days 365
+
+  # 指定日期区间，强制重新获取
+  python backfill_a_stocks.py --start 2025-01-01 --end 2025-03-31 --force
+
+  # 新增几只股票：登记到 stock_info 并回补一年
+  python backfill_a_stocks.py --register --symbols 601225.SH,600900.SH --days 365
+
+  # 登记全部上市的沪深A股并回补
+  python backfill_a_stocks.py --register
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--days', type=int, default=120, help='回补最近多少天（默认120天）')
+    parser.add_argument('--start', type=str, help='开始日期（YYYY-MM-DD），指定时忽略 --days')
+    parser.add_argument('--end', type=str, help='结束日期（YYYY-MM-DD），默认今天')
+    parser.add_argument('--symbols', type=str, help='只回补这些股票（逗号分隔，如 600000.SH,000001.SZ）')
+    parser.add_argument('--register', action='store_true',
+                        help='先将股票登记到 stock_info（指定 --symbols 时只登记这些股票，否则登记全部上市A股）')
+    parser.add_argument('--force', action='store_true', help='重新获取已有完整数据的交易日')
+    parser.add_argument('--no-daily-basic', action='store_true', help='不请求 daily_basic（无权限时使用）')
+
+    args = parser.parse_args()
+
+    try:
+        # 加载配置
+        project_root = Path(__file__).parent.parent
+        config_dir = str(project_root / 'config')
+        config_loader = init_config(config_dir=config_dir)
+        config = config_loader.config
+
+        # 设置日志
+        setup_logger(config)
+
+        ts_config = config_loader.api_config.get('tushare', {})
+        token = ts_config.get('token')
+        if not token:
+            logger.error("❌ Tushare token未配置，请在config/api_config.yaml中配置tushare.token")
+            sys.exit(1)
+
+        end_date = datetime.strptime(args.end, '%Y-%m-%d') if args.end else datetime.now()
+        start_date = (datetime.strptime(args.start, '%Y-%m-%d') if args.start
+                      else end_date - timedelta(days=args.days))
+        symbols = [s.strip().upper() for s in args.symbols.split(',') if s.strip()] if args.symbols else None
+
+        logger.info("=" * 60)
+        logger.info(f"按交易日回补A股日线: {start_date:%Y-%m-%d} 至 {end_date:%Y-%m-%d}")
+        logger.info("=" * 60)
+
+        # 初始化数据库和客户端
+        db_manager = init_database(config)
+        client = TushareClient(token, enable_daily_basic=not args.no_daily_basic)
+
+        if args.register:
+            register_stocks(db_manager, client, symbols)
+
+        stats = backfill_daily_data(db_manager, client, start_date, end_date, symbols=symbols, force=args.force)
+
+        logger.info("=" * 60)
+        logger.info(f"回补完成！交易日 {stats['dates']} 个（请求 {stats['fetched']}，跳过 {stats['skipped']}），"
+                    f"写入 {stats['saved']} 条")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"执行失败: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
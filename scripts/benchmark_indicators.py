@@ -0,0 +1,254 @@
+"""
+技术指标计算性能与一致性基准
+
+生成合成行情数据，对比原逐只计算实现（Python 循环 OBV、逐个 pandas rolling）与
+当前实现（NumPy 内核 + 指标注册表）的耗时，并校验数值一致性。
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analysis.technical_indicators import TechnicalIndicators, INDICATOR_COLUMNS
+from analysis.panel_indicators import PanelIndicators
+from analysis.indicator_registry import DEFAULT_INDICATORS
+from loguru import logger
+
+
+# 一致性校验的容差（前缀和均值与 pandas 在线算法的末位误差）
+RTOL = 1e-9
+ATOL = 1e-9
+
+
+def legacy_calculate_all(df):
+    """
+    原 TechnicalIndicators.calculate_all 的参考实现（复制整表、逐行循环计算 OBV）
+
+    Args:
+        df: 包含 open/high/low/close/volume 的 DataFrame
+
+    Returns:
+        DataFrame with all indicators
+    """
+    df = df.copy()
+    close, high, low, volume = df['close'], df['high'], df['low'], df['volume']
+
+    for period in [5, 10, 20, 60]:
+        df[f'ma{period}'] = close.rolling(window=period).mean()
+    for period in [12, 26]:
+        df[f'ema{period}'] = close.ewm(span=period, adjust=False).mean()
+
+    ema_fast = close.ewm(span=12, adjust=False).mean()
+    ema_slow = close.ewm(span=26, adjust=False).mean()
+    df['macd'] = ema_fast - ema_slow
+    df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
+    df['macd_hist'] = df['macd'] - df['macd_signal']
+
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    df['rsi'] = 100 - (100 / (1 + gain / loss))
+
+    low_n = low.rolling(window=9).min()
+    high_n = high.rolling(window=9).max()
+    rsv = (close - low_n) / (high_n - low_n) * 100
+    df['kdj_k'] = rsv.ewm(com=2, adjust=False).mean()
+    df['kdj_d'] = df['kdj_k'].ewm(com=2, adjust=False).mean()
+    df['kdj_j'] = 3 * df['kdj_k'] - 2 * df['kdj_d']
+
+    df['boll_middle'] = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+    df['boll_upper'] = df['boll_middle'] + (std * 2)
+    df['boll_lower'] = df['boll_middle'] - (std * 2)
+
+    high_low = high - low
+    high_close = np.abs(high - close.shift())
+    low_close = np.abs(low - close.shift())
+    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    df['atr'] = tr.rolling(window=14).mean()
+
+    obv = []
+    obv_value = 0
+    for i in range(len(df)):
+        if i == 0:
+            obv_value = df['volume'].iloc[i]
+        else:
+            if df['close'].iloc[i] > df['close'].iloc[i - 1]:
+                obv_value += df['volume'].iloc[i]
+            elif df['close'].iloc[i] < df['close'].iloc[i - 1]:
+                obv_value -= df['volume'].iloc[i]
+        obv.append(obv_value)
+    df['obv'] = obv
+
+    for period in [5, 10]:
+        df[f'volume_ma{period}'] = volume.rolling(window=period).mean()
+
+    return df
+
+
+def make_panel(n_symbols, n_days, seed=0):
+    """
+    生成合成日线长表（上市时间不同、含停牌式的平盘日）
+
+    Args:
+        n_symbols: 股票数
+        n_days: 最长交易日数
+        seed: 随机种子
+
+    Returns:
+        DataFrame: symbol, trade_date, open, high, low, close, volume
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(n_days // 4, n_days + 1, n_symbols)
+    lengths[0] = n_days
+    total = int(lengths.sum())
+
+    symbol = np.repeat(np.arange(n_symbols), lengths)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    trade_date = n_days - np.repeat(lengths, lengths) + (np.arange(total) - starts)
+
+    returns = rng.normal(0, 0.02, total)
+    returns[rng.random(total) < 0.03] = 0.0
+    returns[starts == np.arange(total)] = 0.0
+    log_price = np.cumsum(returns)
+    log_price -= np.repeat(log_price[np.cumsum(lengths) - lengths], lengths)
+    close = np.repeat(rng.uniform(2, 200, n_symbols), lengths) * np.exp(log_price)
+
+    open_ = close * (1 + rng.normal(0, 0.01, total))
+    high = np.maximum(open_, close) * (1 + rng.random(total) * 0.02)
+    low = np.minimum(open_, close) * (1 - rng.random(total) * 0.02)
+    volume = rng.integers(100, 10_000_000, total).astype(float)
+
+    return pd.DataFrame({
+        'symbol': symbol, 'trade_date': trade_date,
+        'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume,
+    })
+
+
+def compare(expected, actual, label):
+    """
+    比较两组指标结果
+
+    Returns:
+        bool: 是否一致（空值位置相同且数值在容差内）
+    """
+    ok = True
+    for col in INDICATOR_COLUMNS:
+        x = expected[col].to_numpy(dtype=float)
+        y = actual[col].to_numpy(dtype=float)
+        if not np.array_equal(np.isnan(x), np.isnan(y)):
+            logger.error(f"[{label}] {col} 空值位置不一致")
+            ok = False
+        elif not np.allclose(x, y, rtol=RTOL, atol=ATOL, equal_nan=True):
+            diff = np.nanmax(np.abs(x - y) / np.maximum(np.abs(x), 1))
+            logger.error(f"[{label}] {col} 数值不一致，最大相对误差 {diff:.3e}")
+            ok = False
+    return ok
+
+
+def run_benchmark(n_symbols=5000, n_days=2520, legacy_symbols=50, chunk_size=1000, seed=0):
+    """
+    运行基准测试
+
+    Args:
+        n_symbols: 股票数
+        n_days: 交易日数（10年约2520天）
+        legacy_symbols: 用原实现计算的抽样股票数（原实现过慢，按抽样耗时外推全量）
+        chunk_size: 面板计算每批股票数
+        seed: 随机种子
+
+    Returns:
+        bool: 一致性校验是否通过
+    """
+    logger.info(f"生成合成数据: {n_symbols} 只股票 × {n_days} 天")
+    panel = make_panel(n_symbols, n_days, seed)
+    logger.info(f"共 {len(panel)} 条K线")
+
+    sample = np.linspace(0, n_symbols - 1, min(legacy_symbols, n_symbols)).astype(int)
+    groups = {sym: g[['open', 'high', 'low', 'close', 'volume']].reset_index(drop=True)
+              for sym, g in panel[panel['symbol'].isin(sample)].groupby('symbol')}
+    sample_bars = sum(len(g) for g in groups.values())
+    scale = len(panel) / sample_bars
+
+    # 原实现（抽样）
+    start = time.perf_counter()
+    legacy = {sym: legacy_calculate_all(g) for sym, g in groups.items()}
+    legacy_time = time.perf_counter() - start
+
+    # 当前逐只实现（抽样）
+    start = time.perf_counter()
+    single = {sym: TechnicalIndicators(g.copy(), DEFAULT_INDICATORS).calculate_all() for sym, g in groups.items()}
+    single_time = time.perf_counter() - start
+
+    # 当前面板实现（全量）
+    start = time.perf_counter()
+    result = PanelIndicators(panel, chunk_size=chunk_size, indicators=DEFAULT_INDICATORS).calculate_all()
+    panel_time = time.perf_counter() - start
+
+    ok = True
+    for sym in groups:
+        ok &= compare(legacy[sym], single[sym], f'逐只 {sym}')
+        ok &= compare(legacy[sym], result[result['symbol'] == sym].reset_index(drop=True), f'面板 {sym}')
+
+    print("\n" + "=" * 80)
+    print(f"📊 技术指标基准: {n_symbols} 只股票 × {n_days} 天（{len(panel)} 条K线）")
+    print("=" * 80)
+    print(f"{'实现':<24s} {'抽样耗时(秒)':>14s} {'全量耗时(秒)':>14s} {'加速比':>10s}")
+    print("-" * 80)
+    print(f"{'原逐只实现':<22s} {legacy_time:>14.2f} {legacy_time * scale:>14.1f}（外推） {1:>8.1f}x")
+    print(f"{'当前逐只实现':<21s} {single_time:>14.2f} {single_time * scale:>14.1f}（外推） "
+          f"{legacy_time / single_time:>8.1f}x")
+    print(f"{'当前面板实现':<21s} {'-':>14s} {panel_time:>14.1f}{'':8s} "
+          f"{legacy_time * scale / panel_time:>8.1f}x")
+    print("-" * 80)
+    print(f"一致性校验（{len(groups)} 只抽样股票，rtol={RTOL}）: {'✅ 通过' if ok else '❌ 失败'}")
+    print("=" * 80 + "\n")
+
+    return ok
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='技术指标计算性能与一致性基准',
+        epilog='''
+示例:
+  # 10年 × 5000只股票（默认）
+  python benchmark_indicators.py
+
+  # 快速验证
+  python benchmark_indicators.py --symbols 200 --days 500
+
+  # 增加原实现的抽样数量
+  python benchmark_indicators.py --legacy-symbols 200
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--symbols', type=int, default=5000, help='股票数（默认5000）')
+    parser.add_argument('--days', type=int, default=2520, help='交易日数（默认2520，约10年）')
+    parser.add_argument('--legacy-symbols', type=int, default=50,
+                       help='用原实现计算并校验的抽样股票数（默认50）')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='面板计算每批股票数（默认1000）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+
+    args = parser.parse_args()
+
+    ok = run_benchmark(
+        n_symbols=args.symbols,
+        n_days=args.days,
+        legacy_symbols=args.legacy_symbols,
+        chunk_size=args.chunk_size,
+        seed=args.seed
+    )
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -91,7 +91,7 @@ def main():
     print(f"交易模式: {trading_mode}")
     print(f"{'='*100}\n")
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(db_manager.market_of(symbol)) as session:
         # 获取股票信息
         name = get_stock_name(session, symbol)
         price = get_current_price(session, symbol)
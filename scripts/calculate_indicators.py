@@ -12,12 +12,21 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.config_loader import init_config
 from utils.logger import setup_logger
-from database import init_database, get_db_manager
+from database import init_database, get_db_manager, pending_changes, load_bars
 from database.models import StockInfo, DailyData, TechnicalIndicator
-from analysis.technical_indicators import TechnicalIndicators
+from analysis.technical_indicators import TechnicalIndicators, INDICATOR_COLUMNS
+from analysis.panel_indicators import PanelIndicators
+from analysis.incremental_indicators import IncrementalIndicators
+from analysis.indicator_registry import IndicatorPipeline
+from utils.parallel import split_shards, run_sharded
 from loguru import logger
 
 
+# 增量模式的预热窗口：覆盖最长回看周期（MA60），
+# EMA/MACD/KDJ/OBV 等递推指标从上次保存的值续算，无需更长的收敛窗口
+WARMUP_BARS = 60
+
+
 def calculate_stock_indicators(symbol, save_to_db=True):
     """
     计算单只股票的技术指标
@@ -35,29 +44,11 @@ def calculate_stock_indicators(symbol, save_to_db=True):
         db_manager = get_db_manager()
         
         # 获取历史数据
-        with db_manager.get_session() as session:
-            daily_data = session.query(DailyData).filter_by(
-                symbol=symbol
-            ).order_by(DailyData.trade_date).all()
-            
-            if not daily_data:
-                logger.warning(f"{symbol} 没有历史数据")
-                return None
-            
-            # 转换为DataFrame
-            data = []
-            for d in daily_data:
-                data.append({
-                    'trade_date': d.trade_date,
-                    'open': d.open,
-                    'high': d.high,
-                    'low': d.low,
-                    'close': d.close,
-                    'volume': d.volume
-                })
-            
-            df = pd.DataFrame(data)
-            df.set_index('trade_date', inplace=True)
+        df = load_bars(db_manager, [symbol])
+        if df.empty:
+            logger.warning(f"{symbol} 没有历史数据")
+            return None
+        df = df.drop(columns='symbol').set_index('trade_date')
         
         logger.info(f"获取到 {len(df)} 条历史数据")
         
@@ -69,49 +60,12 @@ def calculate_stock_indicators(symbol, save_to_db=True):
         
         # 保存到数据库
         if save_to_db:
-            saved_count = 0
-            with db_manager.get_session() as session:
-                for date, row in df_with_indicators.iterrows():
-                    # 检查是否已存在
-                    existing = session.query(TechnicalIndicator).filter_by(
-                        symbol=symbol,
-                        trade_date=date
-                    ).first()
-                    
-                    if existing:
-                        # 更新
-                        for col in df_with_indicators.columns:
-                            if col not in ['open', 'high', 'low', 'close', 'volume']:
-                                setattr(existing, col, row.get(col))
-                    else:
-                        # 插入
-                        indicator = TechnicalIndicator(
-                            symbol=symbol,
-                            trade_date=date,
-                            ma5=row.get('ma5'),
-                            ma10=row.get('ma10'),
-                            ma20=row.get('ma20'),
-                            ma60=row.get('ma60'),
-                            ema12=row.get('ema12'),
-                            ema26=row.get('ema26'),
-                            macd=row.get('macd'),
-                            macd_signal=row.get('macd_signal'),
-                            macd_hist=row.get('macd_hist'),
-                            rsi=row.get('rsi'),
-                            kdj_k=row.get('kdj_k'),
-                            kdj_d=row.get('kdj_d'),
-                            kdj_j=row.get('kdj_j'),
-                            boll_upper=row.get('boll_upper'),
-                            boll_middle=row.get('boll_middle'),
-                            boll_lower=row.get('boll_lower'),
-                            atr=row.get('atr'),
-                            obv=row.get('obv'),
-                            volume_ma5=row.get('volume_ma5'),
-                            volume_ma10=row.get('volume_ma10'),
-                            created_at=datetime.now()
-                        )
-                        session.add(indicator)
-                        saved_count += 1
+            # 配置中未启用的指标保存为空
+            records = df_with_indicators.reindex(columns=INDICATOR_COLUMNS)
+            records.insert(0, 'trade_date', records.index)
+            records.insert(0, 'symbol', symbol)
+            records['created_at'] = datetime.now()
+            saved_count = db_manager.bulk_upsert(TechnicalIndicator, records)
             
             logger.info(f"保存 {saved_count} 条技术指标到数据库")
         
@@ -132,13 +86,187 @@ def calculate_stock_indicators(symbol, save_to_db=True):
         return None
 
 
-def calculate_batch_indicators(market='HK', limit=None):
+def calculate_stock_indicators_incremental(symbol, save_to_db=True):
+    """
+    增量计算单只股票的技术指标（只计算并写入上次之后的新K线）
+
+    Args:
+        symbol: 股票代码
+        save_to_db: 是否保存到数据库
+
+    Returns:
+        DataFrame with new indicators
+    """
+    try:
+        db_manager = get_db_manager()
+
+        # 与全量计算使用相同的指标参数
+        calculator = IncrementalIndicators(**IndicatorPipeline().incremental_params())
+        recursive_columns = calculator.recursive_columns()
+        unsaved = [col for col in recursive_columns if col not in TechnicalIndicator.__table__.columns]
+        if unsaved:
+            # 递推状态没有保存的列（如配置了其他EMA周期），无法续算
+            logger.info(f"{symbol} 递推指标 {', '.join(unsaved)} 没有保存的列，执行全量计算")
+            return calculate_stock_indicators(symbol, save_to_db=save_to_db)
+
+        with db_manager.get_session(db_manager.market_of(symbol)) as session:
+            last = session.query(TechnicalIndicator).filter_by(
+                symbol=symbol
+            ).order_by(TechnicalIndicator.trade_date.desc()).first()
+
+            if last is None:
+                logger.info(f"{symbol} 没有已保存的指标，执行全量计算")
+                return calculate_stock_indicators(symbol, save_to_db=save_to_db)
+
+            last_date = last.trade_date
+            last_values = {col: getattr(last, col) for col in recursive_columns}
+
+            columns = [
+                DailyData.trade_date,
+                DailyData.high,
+                DailyData.low,
+                DailyData.close,
+                DailyData.volume
+            ]
+
+            # 预热窗口（截至上次指标日期）
+            warmup = session.query(*columns).filter(
+                DailyData.symbol == symbol,
+                DailyData.trade_date <= last_date
+            ).order_by(DailyData.trade_date.desc()).limit(WARMUP_BARS).all()
+
+            # 新K线
+            new_bars = session.query(*columns).filter(
+                DailyData.symbol == symbol,
+                DailyData.trade_date > last_date
+            ).order_by(DailyData.trade_date).all()
+
+        if not new_bars:
+            logger.debug(f"{symbol} 没有新K线，跳过")
+            return pd.DataFrame()
+
+        warmup = list(reversed(warmup))
+        truncated = len(warmup) == WARMUP_BARS
+
+        # 预热窗口必须以上次指标日期结尾；窗口被截断时还需要完整的递推状态
+        if (not warmup or warmup[-1].trade_date != last_date or
+                (truncated and any(v is None for v in last_values.values()))):
+            logger.info(f"{symbol} 已保存的指标不完整，执行全量计算")
+            return calculate_stock_indicators(symbol, save_to_db=save_to_db)
+
+        for bar in warmup:
+            calculator.update(bar._asdict())
+
+        if truncated:
+            calculator.restore_recursive(last_values)
+
+        now = datetime.now()
+        records = []
+        for bar in new_bars:
+            values = calculator.update(bar._asdict())
+            record = {col: values[col] for col in INDICATOR_COLUMNS}
+            record.update(symbol=symbol, trade_date=bar.trade_date, created_at=now)
+            records.append(record)
+
+        df = pd.DataFrame(records).set_index('trade_date')
+        if save_to_db:
+            db_manager.bulk_upsert(TechnicalIndicator, df.reset_index())
+
+        logger.info(f"{symbol} 增量计算完成，新增 {len(df)} 条技术指标")
+        return df
+
+    except Exception as e:
+        logger.error(f"增量计算 {symbol} 技术指标失败: {e}")
+        return None
+
+
+def compute_indicator_shard(symbols, incremental=False):
+    """
+    计算一个分片的技术指标（在工作进程中执行，只读不写库）
+
+    Args:
+        symbols: 股票代码列表
+        incremental: 是否只计算上次之后的新K线
+
+    Returns:
+        (DataFrame, list): 待写入的指标记录（symbol, trade_date + 指标列）和计算失败的股票
+    """
+    columns = ['symbol', 'trade_date'] + INDICATOR_COLUMNS
+
+    if incremental:
+        frames = []
+        failed = []
+        for symbol in symbols:
+            df = calculate_stock_indicators_incremental(symbol, save_to_db=False)
+            if df is None:
+                failed.append(symbol)
+            elif not df.empty:
+                df = df.reindex(columns=INDICATOR_COLUMNS)
+                df.insert(0, 'trade_date', df.index)
+                df.insert(0, 'symbol', symbol)
+                frames.append(df.reset_index(drop=True))
+        records = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        return records, failed
+
+    # 按市场分库时从各股票所在的库读取
+    df = load_bars(get_db_manager(), symbols)
+    if df.empty:
+        return pd.DataFrame(columns=columns), []
+
+    result = PanelIndicators(df).calculate_all()
+    return result.reindex(columns=columns), []
+
+
+def calculate_parallel_indicators(symbols, incremental=False, workers=4, shard_size=200):
+    """
+    多进程批量计算技术指标：工作进程按分片读取和计算，主进程统一写库
+
+    Args:
+        symbols: 股票代码列表
+        incremental: 是否只计算上次之后的新K线
+        workers: 进程数
+        shard_size: 每个分片的股票数
+
+    Returns:
+        tuple: (成功的股票数, 失败的股票代码列表)
+    """
+    shards = split_shards(symbols, shard_size)
+    success_count = 0
+    total_saved = 0
+    failed_symbols = []
+
+    for shard in run_sharded(compute_indicator_shard, shards, workers, incremental):
+        if shard.error:
+            failed_symbols.extend(shard.items)
+            continue
+
+        records, failed = shard.result
+        failed_symbols.extend(failed)
+        success_count += len(shard.items) - len(failed)
+
+        if not records.empty:
+            total_saved += save_panel_indicators(records)
+
+    if failed_symbols:
+        logger.warning(f"{len(failed_symbols)} 只股票计算失败: {', '.join(failed_symbols[:20])}"
+                       f"{' ...' if len(failed_symbols) > 20 else ''}")
+
+    logger.info(f"写入 {total_saved} 条技术指标")
+    return success_count, failed_symbols
+
+
+def calculate_batch_indicators(market='HK', limit=None, incremental=False, workers=1, shard_size=200,
+                               changed_only=False):
     """
     批量计算技术指标
     
     Args:
         market: 市场代码
         limit: 数量限制
+        incremental: 是否只计算上次之后的新K线
+        workers: 进程数（大于1时按分片并行计算）
+        shard_size: 并行模式下每个分片的股票数
+        changed_only: 只处理上次检查点之后日线有变化的股票（见 database.change_feed）
     """
     try:
         logger.info(f"开始批量计算 {market} 市场的技术指标...")
@@ -147,7 +275,7 @@ def calculate_batch_indicators(market='HK', limit=None):
         
         # 获取股票列表
         stock_list = []
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             query = session.query(StockInfo).filter_by(
                 market=market,
                 is_active=True
@@ -169,8 +297,28 @@ def calculate_batch_indicators(market='HK', limit=None):
             return
         
         logger.info(f"找到 {len(stock_list)} 只股票")
+
+        changes = None
+        if changed_only:
+            changes = pending_changes(db_manager, 'calculate_indicators', market, ['daily_data'])
+            if not changes.full:
+                changed = set(changes.symbols)
+                stock_list = [s for s in stock_list if s['symbol'] in changed]
+                if not stock_list:
+                    logger.info("没有日线变化的股票，无需计算")
+                    changes.commit()
+                    return
+        
+        if workers > 1:
+            symbols = [s['symbol'] for s in stock_list]
+            success_count, failed_symbols = calculate_parallel_indicators(symbols, incremental, workers, shard_size)
+            logger.info(f"批量计算完成！成功: {success_count}/{len(stock_list)}")
+            if changes is not None:
+                changes.commit(failed_symbols)
+            return
         
         success_count = 0
+        failed_symbols = []
         
         for i, stock_info in enumerate(stock_list, 1):
             symbol = stock_info['symbol']
@@ -178,18 +326,108 @@ def calculate_batch_indicators(market='HK', limit=None):
             
             logger.info(f"[{i}/{len(stock_list)}] 处理 {symbol} - {name}")
             
-            result = calculate_stock_indicators(symbol, save_to_db=True)
+            if incremental:
+                result = calculate_stock_indicators_incremental(symbol)
+            else:
+                result = calculate_stock_indicators(symbol, save_to_db=True)
             
             if result is not None:
                 success_count += 1
+            else:
+                failed_symbols.append(symbol)
         
         logger.info(f"批量计算完成！成功: {success_count}/{len(stock_list)}")
+        if changes is not None:
+            changes.commit(failed_symbols)
         
     except Exception as e:
         logger.error(f"批量计算技术指标失败: {e}")
         raise
 
 
+def save_panel_indicators(df):
+    """
+    批量保存面板指标结果
+
+    Args:
+        df: PanelIndicators.calculate_all() 的结果
+
+    Returns:
+        int: 写入的记录数
+    """
+    records = df.reindex(columns=['symbol', 'trade_date'] + INDICATOR_COLUMNS)
+    records['created_at'] = datetime.now()
+    return get_db_manager().bulk_upsert(TechnicalIndicator, records)
+
+
+def calculate_panel_indicators(market='HK', limit=None):
+    """
+    面板模式批量计算技术指标（一次读取全市场K线，一次向量化计算）
+
+    Args:
+        market: 市场代码
+        limit: 数量限制
+    """
+    try:
+        logger.info(f"开始面板计算 {market} 市场的技术指标...")
+
+        db_manager = get_db_manager()
+
+        with db_manager.get_session(market) as session:
+            query = session.query(StockInfo.symbol).filter_by(
+                market=market,
+                is_active=True
+            )
+
+            if limit:
+                query = query.limit(limit)
+
+            symbols = [row.symbol for row in query.all()]
+
+            if not symbols:
+                logger.warning(f"{market} 市场没有股票数据")
+                return
+
+            query = session.query(
+                DailyData.symbol,
+                DailyData.trade_date,
+                DailyData.open,
+                DailyData.high,
+                DailyData.low,
+                DailyData.close,
+                DailyData.volume
+            )
+
+            if limit:
+                query = query.filter(DailyData.symbol.in_(symbols))
+            else:
+                query = query.join(
+                    StockInfo, DailyData.symbol == StockInfo.symbol
+                ).filter(
+                    StockInfo.market == market,
+                    StockInfo.is_active == True
+                )
+
+            rows = query.all()
+
+        df = pd.DataFrame(rows, columns=['symbol', 'trade_date', 'open', 'high', 'low', 'close', 'volume'])
+
+        if df.empty:
+            logger.warning(f"{market} 市场没有历史数据")
+            return
+
+        logger.info(f"获取到 {df['symbol'].nunique()} 只股票、{len(df)} 条历史数据")
+
+        result = PanelIndicators(df).calculate_all()
+        saved = save_panel_indicators(result)
+
+        logger.info(f"面板计算完成！股票: {result['symbol'].nunique()}, 写入: {saved} 条")
+
+    except Exception as e:
+        logger.error(f"面板计算技术指标失败: {e}")
+        raise
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -204,6 +442,18 @@ def main():
   
   # 批量计算指定数量
   python calculate_indicators.py --batch --market HK --limit 10
+
+  # 增量模式（只计算上次之后的新K线）
+  python calculate_indicators.py --batch --market CN --incremental
+
+  # 面板模式（全市场一次性向量化计算）
+  python calculate_indicators.py --batch --market CN --panel
+
+  # 多进程模式（8个进程，每个分片200只）
+  python calculate_indicators.py --batch --market CN --workers 8
+
+  # 只处理上次运行以来日线有变化的股票（补抓部分数据后的盘中重跑）
+  python calculate_indicators.py --batch --market CN --changed --workers 4
         ''',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -214,6 +464,16 @@ def main():
                        choices=['HK', 'US', 'CN'],
                        help='市场代码（批量模式）')
     parser.add_argument('--limit', type=int, help='批量模式下的数量限制')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量模式：只计算并写入上次之后的新K线')
+    parser.add_argument('--panel', action='store_true',
+                       help='面板模式：全市场一次性向量化计算（批量模式）')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='进程数（批量模式，默认1即单进程）')
+    parser.add_argument('--shard-size', type=int, default=200,
+                       help='多进程模式下每个分片的股票数（默认200）')
+    parser.add_argument('--changed', action='store_true',
+                       help='只处理上次检查点之后日线有变化的股票（批量模式，首次运行为全量）')
     
     args = parser.parse_args()
     
@@ -235,12 +495,25 @@ def main():
         db_manager = init_database(config)
         
         # 执行计算
-        if args.batch:
+        if args.batch and args.panel:
+            # 面板模式
+            calculate_panel_indicators(
+                market=args.market,
+                limit=args.limit
+            )
+        elif args.batch:
             # 批量模式
             calculate_batch_indicators(
                 market=args.market,
-                limit=args.limit
+                limit=args.limit,
+                incremental=args.incremental,
+                workers=args.workers,
+                shard_size=args.shard_size,
+                changed_only=args.changed
             )
+        elif args.symbol and args.incremental:
+            # 单只股票增量模式
+            calculate_stock_indicators_incremental(args.symbol)
         elif args.symbol:
             # 单只股票模式
             calculate_stock_indicators(args.symbol, save_to_db=True)
@@ -0,0 +1,146 @@
+"""
+计算历史评分脚本
+
+对每只股票的每个交易日计算选股评分（与 run_stock_selection 的评分规则一致），
+结果写入 stock_scores 表，供研究和选股回测使用
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.config_loader import init_config
+from utils.logger import setup_logger
+from database import init_database, get_db_manager, load_universe_panel
+from database.models import StockInfo, StockScore
+from analysis.scoring_engine import PanelScoringEngine
+from loguru import logger
+
+
+def calculate_score_history(market='HK', days=None, chunk_size=500, limit=None):
+    """
+    批量计算历史评分
+
+    Args:
+        market: 市场代码
+        days: 只计算每只股票最近N个交易日（为空时计算全部历史）
+        chunk_size: 每批处理的股票数
+        limit: 股票数量限制
+
+    Returns:
+        int: 写入的记录数
+    """
+    logger.info(f"开始计算 {market} 市场的历史评分...")
+
+    db_manager = get_db_manager()
+
+    with db_manager.get_session(market) as session:
+        query = session.query(StockInfo.symbol).filter_by(
+            market=market,
+            is_active=True
+        )
+
+        if limit:
+            query = query.limit(limit)
+
+        symbols = [row.symbol for row in query.all()]
+
+    if not symbols:
+        logger.warning(f"{market} 市场没有股票数据")
+        return 0
+
+    # 最早的几天需要更早的K线才能得到与选股一致的分数
+    lookback = days + PanelScoringEngine.LOOKBACK - 1 if days else None
+
+    total_saved = 0
+    for start in range(0, len(symbols), chunk_size):
+        chunk = symbols[start:start + chunk_size]
+
+        panel = load_universe_panel(db_manager, symbols=chunk, lookback=lookback, active_only=False)
+        if panel.empty:
+            continue
+
+        scores = PanelScoringEngine(panel).calculate_score_history()
+
+        if days:
+            recent = scores.groupby(level='symbol', sort=False).cumcount(ascending=False) < days
+            scores = scores[recent.to_numpy()]
+
+        saved = db_manager.bulk_upsert(StockScore, scores.reset_index())
+        total_saved += saved
+
+        logger.info(f"[{min(start + chunk_size, len(symbols))}/{len(symbols)}] 写入 {saved} 条评分")
+
+    logger.info(f"历史评分计算完成！股票: {len(symbols)}, 写入: {total_saved} 条")
+    return total_saved
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='计算历史评分（每只股票每个交易日）',
+        epilog='''
+示例:
+  # 计算A股全部历史评分
+  python calculate_score_history.py --market CN
+
+  # 只更新最近5个交易日
+  python calculate_score_history.py --market CN --days 5
+
+  # 计算港股，每批200只
+  python calculate_score_history.py --market HK --chunk-size 200
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--market', type=str, default='HK',
+                       choices=['HK', 'US', 'CN'],
+                       help='市场代码')
+    parser.add_argument('--days', type=int,
+                       help='只计算最近N个交易日（默认全部历史）')
+    parser.add_argument('--chunk-size', type=int, default=500,
+                       help='每批处理的股票数（默认500）')
+    parser.add_argument('--limit', type=int, help='股票数量限制')
+
+    args = parser.parse_args()
+
+    try:
+        # 加载配置
+        project_root = Path(__file__).parent.parent
+        config_dir = str(project_root / 'config')
+        config_loader = init_config(config_dir=config_dir)
+        config = config_loader.config
+
+        # 设置日志
+        setup_logger(config)
+
+        logger.info("=" * 60)
+        logger.info("计算历史评分")
+        logger.info("=" * 60)
+
+        # 初始化数据库（确保 stock_scores 表存在）
+        db_manager = init_database(config)
+        db_manager.create_tables()
+
+        calculate_score_history(
+            market=args.market,
+            days=args.days,
+            chunk_size=args.chunk_size,
+            limit=args.limit
+        )
+
+        logger.info("=" * 60)
+        logger.info("历史评分计算完成！")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"执行失败: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
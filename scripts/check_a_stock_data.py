@@ -19,7 +19,7 @@ def check_stock_data(symbol: str, name: str):
     """检查单只股票的数据"""
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(db_manager.market_of(symbol)) as session:
         # 查询最近10天的数据
         data = session.query(DailyData).filter(
             DailyData.symbol == symbol
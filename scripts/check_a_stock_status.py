@@ -23,7 +23,7 @@ def check_status():
     
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         # 统计A股数量
         total_stocks = session.query(StockInfo).filter_by(market='CN').count()
         
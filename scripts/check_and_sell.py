@@ -22,7 +22,7 @@ from loguru import logger
 
 def get_current_positions(db_manager):
     """获取当前所有港股持仓"""
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         positions = session.query(Position).filter(
             Position.quantity > 0,
             Position.market == 'HK'
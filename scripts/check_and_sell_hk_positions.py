@@ -58,7 +58,7 @@ def display_positions(positions, db_manager):
     total_cost = 0
     total_value = 0
 
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         for pos in positions:
             # 获取最新价格
             latest_data = session.query(DailyData).filter(
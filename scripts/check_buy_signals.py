@@ -14,54 +14,57 @@ sys.path.insert(0, str(project_root))
 
 from database import get_db_manager, init_database
 from database.models import TradingSignal, StockSelection, StockInfo, DailyData, Position
+from database.latest_bars import load_latest_prices
 from utils.config_loader import init_config
 from sqlalchemy import desc
 
 
 def check_trading_signals(db_manager):
     """检查未执行的买入信号"""
-    with db_manager.get_session() as session:
+    def query(session):
         # 查询未执行的买入信号
         signals = session.query(TradingSignal, StockInfo).join(
             StockInfo, TradingSignal.symbol == StockInfo.symbol
         ).filter(
             TradingSignal.signal_type == 'BUY',
             TradingSignal.is_executed == False
-        ).order_by(desc(TradingSignal.signal_date), desc(TradingSignal.signal_strength)).all()
-        
-        if not signals:
-            print("\n📭 没有未执行的买入信号")
-            return []
-        
-        print(f"\n{'='*100}")
-        print(f"🔔 未执行的买入信号 ({len(signals)} 个)")
-        print(f"{'='*100}")
-        print(f"{'日期':<12} {'代码':<12} {'名称':<20} {'信号强度':<10} {'建议价格':<12} {'来源':<15} {'原因':<30}")
-        print(f"{'-'*100}")
-        
-        signal_list = []
-        for sig, stock in signals:
-            signal_list.append({
-                'date': sig.signal_date,
-                'symbol': sig.symbol,
-                'name': stock.name,
-                'strength': sig.signal_strength,
-                'price': sig.signal_price,
-                'source': sig.source,
-                'reason': sig.reason
-            })
-            
-            print(f"{sig.signal_date.strftime('%Y-%m-%d'):<12} {sig.symbol:<12} {stock.name:<20} "
-                  f"{sig.signal_strength:<10.2f} {sig.signal_price or 0:<12.2f} {sig.source or 'N/A':<15} "
-                  f"{(sig.reason or 'N/A')[:30]:<30}")
-        
-        print(f"{'='*100}\n")
-        return signal_list
+        ).all()
+        return [{
+            'date': sig.signal_date,
+            'symbol': sig.symbol,
+            'name': stock.name,
+            'strength': sig.signal_strength,
+            'price': sig.signal_price,
+            'source': sig.source,
+            'reason': sig.reason
+        } for sig, stock in signals]
+
+    # 分库时查询各市场的库后合并排序
+    signal_list = [sig for rows in db_manager.fan_out(query).values() for sig in rows]
+    signal_list.sort(key=lambda sig: (sig['date'], sig['strength'] or 0), reverse=True)
+    
+    if not signal_list:
+        print("\n📭 没有未执行的买入信号")
+        return []
+    
+    print(f"\n{'='*100}")
+    print(f"🔔 未执行的买入信号 ({len(signal_list)} 个)")
+    print(f"{'='*100}")
+    print(f"{'日期':<12} {'代码':<12} {'名称':<20} {'信号强度':<10} {'建议价格':<12} {'来源':<15} {'原因':<30}")
+    print(f"{'-'*100}")
+    
+    for sig in signal_list:
+        print(f"{sig['date'].strftime('%Y-%m-%d'):<12} {sig['symbol']:<12} {sig['name']:<20} "
+              f"{sig['strength']:<10.2f} {sig['price'] or 0:<12.2f} {sig['source'] or 'N/A':<15} "
+              f"{(sig['reason'] or 'N/A')[:30]:<30}")
+    
+    print(f"{'='*100}\n")
+    return signal_list
 
 
 def check_latest_selections(db_manager, market='HK', top_n=20):
     """检查最新的选股结果"""
-    with db_manager.get_session() as session:
+    with db_manager.get_session(market) as session:
         # 获取最新选股日期
         latest_date = session.query(StockSelection.selection_date).order_by(
             desc(StockSelection.selection_date)
@@ -133,9 +136,19 @@ def check_latest_selections(db_manager, market='HK', top_n=20):
 def check_all_positions(db_manager):
     """检查所有持仓"""
     with db_manager.get_session() as session:
-        positions = session.query(Position, StockInfo).join(
-            StockInfo, Position.symbol == StockInfo.symbol
-        ).filter(Position.quantity > 0).all()
+        positions = session.query(Position).filter(Position.quantity > 0).all()
+        
+        # 股票名称和最新价格按所在市场的库读取（分库时持仓在核心库，不能与 stock_info 连接）
+        names = {}
+        for rows in db_manager.fan_out(
+            lambda market_session, group: dict(market_session.query(StockInfo.symbol, StockInfo.name).filter(
+                StockInfo.symbol.in_(group)
+            ).all()),
+            symbols=[pos.symbol for pos in positions]
+        ).values():
+            names.update(rows)
+        positions = [(pos, names[pos.symbol]) for pos in positions if pos.symbol in names]
+        prices = load_latest_prices(db_manager, [pos.symbol for pos, _ in positions])
         
         if not positions:
             print("\n📭 当前没有任何持仓\n")
@@ -151,14 +164,11 @@ def check_all_positions(db_manager):
         total_value = 0
         position_list = []
         
-        for pos, stock in positions:
+        for pos, name in positions:
             # 获取最新价格
-            latest_data = session.query(DailyData).filter(
-                DailyData.symbol == pos.symbol
-            ).order_by(DailyData.trade_date.desc()).first()
+            current_price = prices.get(pos.symbol)
             
-            if latest_data:
-                current_price = latest_data.close
+            if current_price is not None:
                 cost = pos.avg_price * pos.quantity
                 value = current_price * pos.quantity
                 pnl = value - cost
@@ -169,7 +179,7 @@ def check_all_positions(db_manager):
                 
                 position_list.append({
                     'symbol': pos.symbol,
-                    'name': stock.name,
+                    'name': name,
                     'market': pos.market,
                     'quantity': pos.quantity,
                     'avg_price': pos.avg_price,
@@ -181,10 +191,10 @@ def check_all_positions(db_manager):
                 pnl_str = f"{pnl:+.2f}" if pnl != 0 else "0.00"
                 pnl_pct_str = f"{pnl_pct:+.2f}%" if pnl_pct != 0 else "0.00%"
                 
-                print(f"{pos.symbol:<12} {stock.name:<20} {pos.market:<8} {pos.quantity:<10} "
+                print(f"{pos.symbol:<12} {name:<20} {pos.market:<8} {pos.quantity:<10} "
                       f"{pos.avg_price:<12.2f} {current_price:<12.2f} {pnl_str:<12} {pnl_pct_str:<10}")
             else:
-                print(f"{pos.symbol:<12} {stock.name:<20} {pos.market:<8} {pos.quantity:<10} "
+                print(f"{pos.symbol:<12} {name:<20} {pos.market:<8} {pos.quantity:<10} "
                       f"{pos.avg_price:<12.2f} {'N/A':<12} {'N/A':<12} {'N/A':<10}")
         
         if total_cost > 0:
@@ -10,42 +10,29 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from database.db_manager import DatabaseManager
-from database.models import StockInfo, DailyData
-from sqlalchemy import func, and_
+from database.coverage import coverage_report
 from utils.config_loader import ConfigLoader
 from datetime import datetime, timedelta
 
-def check_market_data_coverage(session, market):
-    """检查市场数据覆盖情况"""
+def check_market_data_coverage(db, market):
+    """检查市场数据覆盖情况（读取日线覆盖索引，不扫描 daily_data）"""
     print(f"\n{'='*100}")
     print(f"{market}市场数据覆盖情况")
     print(f"{'='*100}\n")
     
-    # 获取该市场的股票总数
-    total_stocks = session.query(StockInfo).filter(StockInfo.market == market).count()
+    report = coverage_report(db, market)
+    total_stocks = len(report)
     print(f"📊 {market}市场股票总数: {total_stocks:,} 只\n")
     
-    # 统计每只股票的数据天数
-    stock_data_stats = session.query(
-        DailyData.symbol,
-        StockInfo.name,
-        func.count(DailyData.id).label('data_days'),
-        func.min(DailyData.trade_date).label('first_date'),
-        func.max(DailyData.trade_date).label('last_date')
-    ).join(
-        StockInfo, DailyData.symbol == StockInfo.symbol
-    ).filter(
-        StockInfo.market == market
-    ).group_by(
-        DailyData.symbol, StockInfo.name
-    ).all()
-    
-    if not stock_data_stats:
+    # 每只股票的数据天数
+    stock_data_stats = report[report['days'] > 0]
+    
+    if stock_data_stats.empty:
         print(f"❌ {market}市场没有数据")
         return
     
     # 计算统计信息
-    data_days_list = [s.data_days for s in stock_data_stats]
+    data_days_list = stock_data_stats['days'].tolist()
     avg_days = sum(data_days_list) / len(data_days_list)
     max_days = max(data_days_list)
     min_days = min(data_days_list)
@@ -65,7 +52,9 @@ def check_market_data_coverage(session, market):
     print(f"  最多数据天数: {max_days} 天")
     print(f"  最少数据天数: {min_days} 天")
     print(f"  有数据的股票: {len(stock_data_stats):,} 只")
-    print(f"  无数据的股票: {total_stocks - len(stock_data_stats):,} 只\n")
+    print(f"  无数据的股票: {total_stocks - len(stock_data_stats):,} 只")
+    print(f"  有缺口的股票: {(stock_data_stats['missing'] > 0).sum():,} 只"
+          f"（共缺 {stock_data_stats['missing'].sum():,} 个交易日）\n")
     
     print(f"📊 数据天数分布:")
     print(f"{'-'*100}")
@@ -86,9 +75,9 @@ def check_market_data_coverage(session, market):
     print(f"{'排名':<6} {'代码':<15} {'名称':<20} {'数据天数':<12} {'起始日期':<15} {'最新日期'}")
     print(f"{'-'*100}")
     
-    sorted_stocks = sorted(stock_data_stats, key=lambda x: x.data_days, reverse=True)
+    sorted_stocks = list(stock_data_stats.sort_values('days', ascending=False).itertuples())
     for i, stock in enumerate(sorted_stocks[:10], 1):
-        print(f"{i:<6} {stock.symbol:<15} {stock.name:<20} {stock.data_days:<12} {stock.first_date} {stock.last_date}")
+        print(f"{i:<6} {stock.symbol:<15} {stock.name:<20} {stock.days:<12} {stock.first_date} {stock.last_date}")
     
     print(f"{'-'*100}\n")
     
@@ -99,28 +88,19 @@ def check_market_data_coverage(session, market):
     print(f"{'-'*100}")
     
     for i, stock in enumerate(sorted_stocks[-10:], 1):
-        print(f"{i:<6} {stock.symbol:<15} {stock.name:<20} {stock.data_days:<12} {stock.first_date} {stock.last_date}")
+        print(f"{i:<6} {stock.symbol:<15} {stock.name:<20} {stock.days:<12} {stock.first_date} {stock.last_date}")
     
     print(f"{'-'*100}\n")
     
     # 检查最新数据日期
-    latest_date = session.query(func.max(DailyData.trade_date)).join(
-        StockInfo, DailyData.symbol == StockInfo.symbol
-    ).filter(StockInfo.market == market).scalar()
+    latest_date = stock_data_stats['last_date'].max()
     
     if latest_date:
         days_ago = (datetime.now().date() - latest_date).days
         print(f"📅 最新数据日期: {latest_date} ({days_ago}天前)")
         
         # 统计有最新数据的股票数量
-        stocks_with_latest = session.query(func.count(func.distinct(DailyData.symbol))).join(
-            StockInfo, DailyData.symbol == StockInfo.symbol
-        ).filter(
-            and_(
-                StockInfo.market == market,
-                DailyData.trade_date == latest_date
-            )
-        ).scalar()
+        stocks_with_latest = int((stock_data_stats['last_date'] == latest_date).sum())
         
         print(f"📊 有最新数据的股票: {stocks_with_latest:,} 只 ({stocks_with_latest/total_stocks*100:.1f}%)")
     
@@ -138,12 +118,11 @@ def main():
     config = config_loader.load_config()
     db = DatabaseManager(config)
     
-    with db.get_session() as session:
-        # 检查A股数据
-        check_market_data_coverage(session, 'CN')
-        
-        # 检查港股数据
-        check_market_data_coverage(session, 'HK')
+    # 检查A股数据
+    check_market_data_coverage(db, 'CN')
+    
+    # 检查港股数据
+    check_market_data_coverage(db, 'HK')
     
     print(f"{'='*100}\n")
 
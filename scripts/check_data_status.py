@@ -19,7 +19,7 @@ def check_market_data(market: str):
     """检查指定市场的数据状态"""
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(market) as session:
         # 股票总数
         total_stocks = session.query(StockInfo).filter_by(market=market).count()
         
@@ -11,8 +11,7 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database import get_db_manager, init_database
-from sqlalchemy import func
+from database import get_db_manager, init_database, coverage_report
 from database.models import DailyData, StockInfo, TechnicalIndicator
 from datetime import datetime, timedelta
 from utils.config_loader import init_config
@@ -24,10 +23,13 @@ def check_hk_data_status():
     init_database(config_loader.config)
     db_manager = get_db_manager()
 
-    with db_manager.get_session() as session:
+    # 日线天数、起止日期读取覆盖索引，不逐只扫描 daily_data
+    coverage = coverage_report(db_manager, 'HK').set_index('symbol')
+
+    with db_manager.get_session('HK') as session:
     
         # 1. 港股总数
-        hk_stocks = session.query(StockInfo).filter(StockInfo.market == 'HK').count()
+        hk_stocks = len(coverage)
         print(f"📊 港股总数: {hk_stocks}")
         print()
         
@@ -44,19 +46,10 @@ def check_hk_data_status():
         ]
         
         for symbol in famous_stocks:
-            stock = session.query(StockInfo).filter(StockInfo.symbol == symbol).first()
-            if stock:
-                data_count = session.query(DailyData).filter(DailyData.symbol == symbol).count()
-                
-                # 获取最新和最早的数据日期
-                latest = session.query(DailyData).filter(DailyData.symbol == symbol).order_by(DailyData.trade_date.desc()).first()
-                earliest = session.query(DailyData).filter(DailyData.symbol == symbol).order_by(DailyData.trade_date.asc()).first()
-                
-                latest_date = latest.trade_date if latest else None
-                earliest_date = earliest.trade_date if earliest else None
-                
-                print(f"{symbol:12} {stock.name:20} 数据天数: {data_count:4}天  "
-                      f"最早: {earliest_date}  最新: {latest_date}")
+            if symbol in coverage.index:
+                stock = coverage.loc[symbol]
+                print(f"{symbol:12} {stock['name']:20} 数据天数: {stock['days']:4}天  "
+                      f"最早: {stock['first_date']}  最新: {stock['last_date']}")
         
         print()
         
@@ -92,17 +85,6 @@ def check_hk_data_status():
         print("港股历史数据分布统计:")
         print("=" * 80)
         
-        data_distribution = session.query(
-            func.count(DailyData.id).label('days'),
-            func.count(func.distinct(DailyData.symbol)).label('stocks')
-        ).join(
-            StockInfo, StockInfo.symbol == DailyData.symbol
-        ).filter(
-            StockInfo.market == 'HK'
-        ).group_by(
-            DailyData.symbol
-        ).subquery()
-        
         ranges = [
             (0, 10, "0-10天"),
             (11, 30, "11-30天"),
@@ -113,16 +95,7 @@ def check_hk_data_status():
         ]
         
         for min_days, max_days, label in ranges:
-            count = session.query(StockInfo.symbol).join(
-                DailyData, StockInfo.symbol == DailyData.symbol
-            ).filter(
-                StockInfo.market == 'HK'
-            ).group_by(
-                StockInfo.symbol
-            ).having(
-                func.count(DailyData.id) >= min_days,
-                func.count(DailyData.id) <= max_days
-            ).count()
+            count = int(coverage['days'].between(max(min_days, 1), max_days).sum())
             
             percentage = (count / hk_stocks * 100) if hk_stocks > 0 else 0
             print(f"{label:15} {count:5}只  ({percentage:5.1f}%)")
@@ -136,7 +109,7 @@ def check_hk_data_status():
         
         today = datetime(2025, 10, 22).date()
         today_count = session.query(DailyData).join(
-            StockInfo, StockInfo.symbol == DailyData.symbol
+            StockInfo, StockInfo.id == DailyData.security_id
         ).filter(
             StockInfo.market == 'HK',
             DailyData.trade_date == today
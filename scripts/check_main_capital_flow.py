@@ -28,32 +28,25 @@ def find_stock(keyword):
     config = init_config()
     db = DatabaseManager(config)
     
-    with db.get_session() as session:
-        # 模糊查询股票名称
-        stocks = session.query(StockInfo).filter(
-            StockInfo.name.like(f'%{keyword}%')
-        ).all()
-        
-        if not stocks:
-            print(f"\n❌ 未找到包含 '{keyword}' 的股票")
-            return None
-        
-        # 转换为字典列表，避免session关闭后无法访问
-        stock_list = []
-        for stock in stocks:
-            stock_list.append({
-                'symbol': stock.symbol,
-                'name': stock.name,
-                'market': stock.market
-            })
-        
-        print(f"\n找到 {len(stock_list)} 只股票：")
-        print("-" * 80)
-        for stock in stock_list:
-            print(f"{stock['symbol']:<15} {stock['name']:<30} {stock['market']}")
-        print("-" * 80)
-        
-        return stock_list
+    # 模糊查询股票名称（分库时查询各市场的库）
+    def query(session):
+        return [
+            {'symbol': stock.symbol, 'name': stock.name, 'market': stock.market}
+            for stock in session.query(StockInfo).filter(StockInfo.name.like(f'%{keyword}%'))
+        ]
+
+    stock_list = [stock for rows in db.fan_out(query).values() for stock in rows]
+    if not stock_list:
+        print(f"\n❌ 未找到包含 '{keyword}' 的股票")
+        return None
+
+    print(f"\n找到 {len(stock_list)} 只股票：")
+    print("-" * 80)
+    for stock in stock_list:
+        print(f"{stock['symbol']:<15} {stock['name']:<30} {stock['market']}")
+    print("-" * 80)
+
+    return stock_list
 
 
 def get_main_capital_flow(symbol, days=5):
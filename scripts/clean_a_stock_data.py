@@ -23,7 +23,7 @@ def clean_a_stock_data():
     
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         # 获取所有A股代码
         cn_stocks = session.query(StockInfo).filter_by(market='CN').all()
         cn_symbols = [s.symbol for s in cn_stocks]
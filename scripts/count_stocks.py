@@ -28,12 +28,12 @@ def main():
         print("📊 股票数量统计")
         print("=" * 60 + "\n")
         
-        with db_manager.get_session() as session:
-            # 统计各市场股票数量
-            markets = ['HK', 'US', 'CN']
-            total = 0
-            
-            for market in markets:
+        # 统计各市场股票数量（分库时各市场读取各自的库）
+        markets = ['HK', 'US', 'CN']
+        total = 0
+        
+        for market in markets:
+            with db_manager.get_session(market) as session:
                 count = session.query(StockInfo).filter_by(
                     market=market,
                     is_active=True
@@ -51,16 +51,19 @@ def main():
                     
                     print(f"  {market:4s} 市场: {count:3d} 只股票 (有数据: {stocks_with_data} 只)")
                     total += count
-            
-            print(f"\n  {'总计':4s}      : {total:3d} 只股票")
-            
-            # 统计数据条数
-            data_count = session.query(func.count(DailyData.id)).scalar()
-            print(f"\n  历史数据: {data_count:,} 条")
-            
-            if total > 0 and data_count > 0:
-                avg = data_count // total
-                print(f"  平均每只: {avg} 条数据")
+        
+        print(f"\n  {'总计':4s}      : {total:3d} 只股票")
+        
+        # 统计数据条数
+        data_count = 0
+        for market in db_manager.markets:
+            with db_manager.get_session(market) as session:
+                data_count += session.query(func.count(DailyData.id)).scalar()
+        print(f"\n  历史数据: {data_count:,} 条")
+        
+        if total > 0 and data_count > 0:
+            avg = data_count // total
+            print(f"  平均每只: {avg} 条数据")
         
         print("\n" + "=" * 60 + "\n")
         
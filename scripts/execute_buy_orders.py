@@ -113,7 +113,7 @@ def execute_buy_orders(buy_plan, db_manager, dry_run=False):
     success_count = 0
     fail_count = 0
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         for plan in buy_plan:
             symbol = plan['symbol']
             quantity = plan['quantity']
@@ -202,7 +202,7 @@ def main():
     print(f"总投资金额: ¥{args.amount:,.2f}")
     print(f"{'='*120}")
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         # 定义买入计划（基于之前的分析）
         # 采用稳健型方案
         buy_plan = []
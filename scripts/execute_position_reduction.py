@@ -88,7 +88,7 @@ def execute_reduction(reduction_plan, db_manager, dry_run=False):
     success_count = 0
     fail_count = 0
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         for plan in reduction_plan:
             symbol = plan['symbol']
             quantity = plan['quantity']
@@ -160,7 +160,7 @@ def main():
     print(f"交易模式: {trading_mode}")
     print(f"{'='*100}")
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         # 定义减仓计划（基于之前的分析）
         reduction_plan = []
         
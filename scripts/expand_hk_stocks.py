@@ -117,7 +117,7 @@ def add_stocks_from_list(stock_list, category_name):
         unique_stocks = list(set(stock_list))
         total = len(unique_stocks)
         
-        with db_manager.get_session() as session:
+        with db_manager.get_session('HK') as session:
             for i, symbol in enumerate(unique_stocks, 1):
                 # 检查是否已存在
                 existing = session.query(StockInfo).filter_by(symbol=symbol).first()
@@ -205,10 +205,11 @@ def main():
     print(f"\n🎉 全部完成！共新增 {total_added} 只港股\n")
     
     # 统计当前数量
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         hk_count = session.query(StockInfo).filter_by(market='HK', is_active=True).count()
+    with db_manager.get_session('US') as session:
         us_count = session.query(StockInfo).filter_by(market='US', is_active=True).count()
-        total_count = hk_count + us_count
+    total_count = hk_count + us_count
     
     print(f"📊 当前股票数量:")
     print(f"  港股: {hk_count} 只")
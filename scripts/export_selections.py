@@ -31,7 +31,7 @@ def export_to_excel(market='HK', output_file=None):
         db_manager = init_database(config)
         
         # 查询选股结果
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             selections = session.query(StockSelection).filter_by(
                 market=market
             ).order_by(
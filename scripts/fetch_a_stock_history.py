@@ -14,11 +14,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.config_loader import init_config
 from utils.logger import setup_logger
-from database import init_database, get_db_manager
+from database import init_database, get_db_manager, load_coverage
 from database.models import StockInfo, DailyData
 from data_collection.tushare_client import TushareClient
+from data_collection.tushare_backfill import backfill_daily_data
 from loguru import logger
-from sqlalchemy import func
 
 
 def get_stocks_need_data(min_days=60):
@@ -33,20 +33,20 @@ def get_stocks_need_data(min_days=60):
     """
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         # 获取所有A股
         all_stocks = session.query(StockInfo).filter(
             StockInfo.market == 'CN',
             StockInfo.is_active == True
         ).all()
         
+        # 各股票的数据条数读取日线覆盖索引
+        coverage = load_coverage(db_manager, 'CN', [stock.symbol for stock in all_stocks])
+
         stocks_need_data = []
         
         for stock in all_stocks:
-            # 查询该股票的数据条数
-            count = session.query(func.count(DailyData.id)).filter(
-                DailyData.symbol == stock.symbol
-            ).scalar()
+            count = coverage[stock.symbol].days if stock.symbol in coverage else 0
             
             if count < min_days:
                 stocks_need_data.append({
@@ -97,7 +97,7 @@ def fetch_stock_history_tushare(symbol, name, days=120, tushare_token=None):
         saved_count = 0
         updated_count = 0
 
-        with db_manager.get_session() as session:
+        with db_manager.get_session('CN') as session:
             for data in data_list:
                 trade_date = data['trade_date']
 
@@ -149,7 +149,7 @@ def fetch_all_a_stock_history(days=120, min_days=60, batch_size=100, auto_confir
     Args:
         days: 获取天数
         min_days: 最少需要的数据天数
-        batch_size: 每批处理的股票数量
+        batch_size: 累积多少个交易日写一次库
         auto_confirm: 是否自动确认，不等待用户输入
         tushare_token: Tushare API Token
     """
@@ -180,60 +180,30 @@ def fetch_all_a_stock_history(days=120, min_days=60, batch_size=100, auto_confir
         for i, stock in enumerate(stocks_need_data[:10], 1):
             logger.info(f"  {i}. {stock['symbol']} - {stock['name']} (当前: {stock['current_count']}条)")
 
-        # 确认是否继续
+        # 确认是否继续（按交易日请求全市场数据，请求次数与股票数无关）
+        estimate = days * 0.7 * 2 * 0.3 / 60
         if not auto_confirm:
-            print(f"\n⚠️  将为 {total_stocks} 只A股补充历史数据，预计耗时: {total_stocks * 0.6 / 60:.1f} 分钟")
+            print(f"\n⚠️  将为 {total_stocks} 只A股补充历史数据，预计耗时: {estimate:.1f} 分钟")
             confirm = input("是否继续？(y/n): ")
             if confirm.lower() != 'y':
                 logger.info("用户取消操作")
                 return
         else:
-            logger.info(f"\n⚠️  将为 {total_stocks} 只A股补充历史数据，预计耗时: {total_stocks * 0.6 / 60:.1f} 分钟")
+            logger.info(f"\n⚠️  将为 {total_stocks} 只A股补充历史数据，预计耗时: {estimate:.1f} 分钟")
             logger.info("自动确认模式，开始执行...")
-        
-        # 开始批量获取
-        total_saved = 0
-        success_count = 0
-        failed_count = 0
-        
+
         start_time = time.time()
-        
-        for i, stock_info in enumerate(stocks_need_data, 1):
-            symbol = stock_info['symbol']
-            name = stock_info['name']
-            current_count = stock_info['current_count']
-            
-            logger.info(f"\n[{i}/{total_stocks}] 处理 {symbol} - {name} (当前: {current_count}条)")
-
-            try:
-                saved = fetch_stock_history_tushare(symbol, name, days=days, tushare_token=tushare_token)
-                total_saved += saved
-                
-                if saved > 0:
-                    success_count += 1
-                else:
-                    failed_count += 1
-                
-                # Tushare限制：每分钟最多200次请求，这里设置为0.6秒/次（100次/分钟）
-                time.sleep(0.6)
-                
-                # 每100只股票显示一次进度
-                if i % batch_size == 0:
-                    elapsed = time.time() - start_time
-                    avg_time = elapsed / i
-                    remaining = (total_stocks - i) * avg_time
-                    logger.info(f"\n📊 进度报告:")
-                    logger.info(f"  已处理: {i}/{total_stocks} ({i/total_stocks*100:.1f}%)")
-                    logger.info(f"  成功: {success_count}, 失败: {failed_count}")
-                    logger.info(f"  新增数据: {total_saved} 条")
-                    logger.info(f"  已用时: {elapsed/60:.1f} 分钟")
-                    logger.info(f"  预计剩余: {remaining/60:.1f} 分钟")
-                
-            except Exception as e:
-                logger.error(f"处理 {symbol} - {name} 失败: {e}")
-                failed_count += 1
-                continue
-        
+
+        end_date = datetime.now()
+        client = TushareClient(token=tushare_token)
+        stats = backfill_daily_data(
+            get_db_manager(), client,
+            start_date=end_date - timedelta(days=days),
+            end_date=end_date,
+            symbols=[stock['symbol'] for stock in stocks_need_data],
+            flush_days=batch_size
+        )
+
         # 最终统计
         elapsed = time.time() - start_time
         logger.info("\n" + "=" * 80)
@@ -241,11 +211,9 @@ def fetch_all_a_stock_history(days=120, min_days=60, batch_size=100, auto_confir
         logger.info("=" * 80)
         logger.info(f"\n📊 最终统计:")
         logger.info(f"  总股票数: {total_stocks}")
-        logger.info(f"  成功: {success_count} ({success_count/total_stocks*100:.1f}%)")
-        logger.info(f"  失败: {failed_count} ({failed_count/total_stocks*100:.1f}%)")
-        logger.info(f"  新增数据: {total_saved} 条")
+        logger.info(f"  交易日: {stats['dates']} 个（请求 {stats['fetched']}，跳过 {stats['skipped']}）")
+        logger.info(f"  写入数据: {stats['saved']} 条")
         logger.info(f"  总用时: {elapsed/60:.1f} 分钟")
-        logger.info(f"  平均速度: {elapsed/total_stocks:.2f} 秒/股")
         
     except Exception as e:
         logger.error(f"批量补充历史数据失败: {e}")
@@ -261,7 +229,7 @@ def main():
     parser = argparse.ArgumentParser(description='补充A股历史数据')
     parser.add_argument('--days', type=int, default=120, help='获取天数（默认120天）')
     parser.add_argument('--min-days', type=int, default=60, help='最少需要的数据天数（默认60天）')
-    parser.add_argument('--batch-size', type=int, default=100, help='每批处理的股票数量（默认100）')
+    parser.add_argument('--batch-size', type=int, default=100, help='累积多少个交易日写一次库（默认100）')
     parser.add_argument('--auto-confirm', action='store_true', help='自动确认，不等待用户输入')
 
     args = parser.parse_args()
@@ -73,7 +73,7 @@ def fetch_stock_slowly(symbol, name, days=365, delay_after=10):
         # 保存到数据库
         saved_count = 0
         
-        with db_manager.get_session() as session:
+        with db_manager.get_session('CN') as session:
             for candle in candlesticks:
                 # 检查是否已存在
                 existing = session.query(DailyData).filter_by(
@@ -147,7 +147,7 @@ def main():
     print("="*60 + "\n")
     
     # 获取A股列表（转换为字典列表避免session问题）
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         cn_stocks_query = session.query(StockInfo).filter_by(market='CN').order_by(StockInfo.symbol).all()
         cn_stocks = [{'symbol': s.symbol, 'name': s.name} for s in cn_stocks_query]
 
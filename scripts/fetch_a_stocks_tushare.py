@@ -54,7 +54,7 @@ def fetch_stock_data(symbol: str, name: str, days: int = 365):
         # 保存到数据库
         saved_count = 0
         
-        with db_manager.get_session() as session:
+        with db_manager.get_session('CN') as session:
             for data in daily_data_list:
                 # 检查是否已存在
                 existing = session.query(DailyData).filter_by(
@@ -143,7 +143,7 @@ def main():
     # 获取A股列表
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         cn_stocks_query = session.query(StockInfo).filter_by(market='CN').order_by(StockInfo.symbol).all()
         cn_stocks = [{'symbol': s.symbol, 'name': s.name} for s in cn_stocks_query]
     
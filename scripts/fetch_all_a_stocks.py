@@ -21,7 +21,7 @@ def get_cn_stock_count():
     init_database(config_loader.config)
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         count = session.query(StockInfo).filter_by(market='CN').count()
     
     return count
@@ -33,7 +33,7 @@ def get_fetched_count():
     init_database(config_loader.config)
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         # 查询有历史数据的A股股票
         fetched = session.query(DailyData.symbol).distinct().join(
             StockInfo, DailyData.symbol == StockInfo.symbol
@@ -81,7 +81,7 @@ def add_stocks_to_db(stocks, db_manager, longport_client):
     
     print(f"\n开始添加 {total} 只港股到数据库...\n")
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         for i, stock_info in enumerate(stocks, 1):
             symbol = stock_info['symbol']
             name = stock_info['name']
@@ -124,10 +124,6 @@ def add_stocks_to_db(stocks, db_manager, longport_client):
                 if i % 100 == 0:
                     session.commit()
                     print(f"\n📊 进度: {i}/{total} ({i*100//total}%), 新增: {added}, 已存在: {existed}, 失败: {failed}\n")
-                
-                # 避免请求过快
-                if i % 10 == 0:
-                    time.sleep(0.1)
                     
             except Exception as e:
                 logger.error(f"添加 {symbol} 失败: {e}")
@@ -183,7 +179,7 @@ def main():
     print("="*80)
     
     # 查询当前数据库中的港股总数
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         total_hk = session.query(StockInfo).filter_by(market='HK', is_active=True).count()
         print(f"\n📊 数据库中现有港股总数: {total_hk} 只")
     
@@ -5,7 +5,6 @@ import sys
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-import time
 
 # 添加项目根目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -55,7 +54,7 @@ def fetch_stock_history(symbol, days=365, period='day'):
         db_manager = get_db_manager()
         saved_count = 0
         
-        with db_manager.get_session() as session:
+        with db_manager.get_session(db_manager.market_of(symbol)) as session:
             for candle in candlesticks:
                 # 检查是否已存在
                 existing = session.query(DailyData).filter_by(
@@ -111,7 +110,7 @@ def fetch_batch_history(market='HK', limit=10, days=365):
 
         # 获取股票列表（提取需要的字段，避免会话问题）
         stock_list = []
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             stocks = session.query(StockInfo).filter_by(
                 market=market,
                 is_active=True
@@ -143,9 +142,6 @@ def fetch_batch_history(market='HK', limit=10, days=365):
                 total_saved += saved
                 success_count += 1
 
-                # 避免请求过快
-                time.sleep(0.5)
-
             except Exception as e:
                 logger.error(f"处理 {symbol} 失败: {e}")
                 continue
@@ -35,7 +35,7 @@ def fetch_stock_history(symbol, name, longport_client, db_manager):
             return 0, 0, "无数据"
         
         # 保存到数据库
-        with db_manager.get_session() as session:
+        with db_manager.get_session('HK') as session:
             inserted = 0
             updated = 0
             
@@ -100,7 +100,7 @@ def main():
     longport_client = get_longport_client()
     
     # 获取所有活跃港股
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         hk_stocks = [(s.symbol, s.name) for s in session.query(StockInfo).filter_by(
             market='HK', 
             is_active=True
@@ -138,9 +138,6 @@ def main():
             print(f"\n📊 进度: {i}/{len(hk_stocks)} ({i*100//len(hk_stocks)}%), "
                   f"成功: {success_count}, 失败: {fail_count}, "
                   f"已用时: {elapsed/60:.1f}分钟, 预计剩余: {remaining/60:.1f}分钟\n")
-        
-        # 避免请求过快（每秒最多2个请求）
-        time.sleep(0.6)
     
     # 最终统计
     elapsed = time.time() - start_time
@@ -2,126 +2,74 @@
 # -*- coding: utf-8 -*-
 """
 获取缺失的港股历史数据
+
+按交易日历和日线覆盖索引求出每只港股缺失的交易日区间，只请求缺失的部分
 """
 
 import sys
+import argparse
 from pathlib import Path
-import time
 from datetime import datetime, timedelta
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database import get_db_manager, init_database
-from database.models import DailyData, StockInfo
+from database import get_db_manager, init_database, derive_trade_calendar, plan_gaps
 from data_collection.longport_client import LongPortClient
+from data_collection.ingest_pipeline import IngestPipeline, candles_to_frame
 from utils.config_loader import init_config
-from sqlalchemy import func
 
 def main():
     """获取缺失的港股历史数据"""
+    parser = argparse.ArgumentParser(description='按覆盖索引补齐港股缺失的历史日线')
+    parser.add_argument('--days', type=int, default=365, help='检查最近多少天（默认365天）')
+    parser.add_argument('--include-history', action='store_true',
+                        help='同时补各股票最早日线之前的区间（默认只补没有数据的股票和已有区间的缺口）')
+    parser.add_argument('--workers', type=int, default=8, help='并发抓取线程数（默认8）')
+    args = parser.parse_args()
+
     config_loader = init_config()
     init_database(config_loader.config)
     db_manager = get_db_manager()
-    
-    # 初始化LongPort客户端
-    longport_client = LongPortClient(api_config=config_loader.api_config)
-    
-    # 获取无数据的港股列表
-    missing_symbols = []
-    with db_manager.get_session() as session:
-        hk_stocks = session.query(StockInfo).filter_by(market='HK').all()
-        
-        for stock in hk_stocks:
-            count = session.query(func.count(DailyData.id)).filter_by(symbol=stock.symbol).scalar()
-            if count == 0:
-                missing_symbols.append((stock.symbol, stock.name))
-    
-    if not missing_symbols:
-        print("所有港股都有数据！")
-        return
-    
-    # 获取最近1年的数据
+
+    # 港股没有交易所日历来源，由已有日线推断后求缺口
     end_date = datetime.now()
-    start_date = datetime.now() - timedelta(days=365)
-    
-    success_count = 0
-    fail_count = 0
-    total_records = 0
-    
+    start_date = end_date - timedelta(days=args.days)
+    derive_trade_calendar(db_manager, 'HK')
+    plan = plan_gaps(db_manager, 'HK', start_date, end_date, include_history=args.include_history)
+    ranges = plan.ranges
+
+    if not ranges:
+        print("所有港股数据都已完整！")
+        return
+
     print(f"\n{'='*60}")
     print(f"开始获取缺失的港股历史数据")
-    print(f"股票数量: {len(missing_symbols)} 只")
+    print(f"股票数量: {len(plan.symbols)} 只（其中 {len(plan.uncovered)} 只没有数据）")
+    print(f"缺失日线: {plan.total} 条，请求 {len(ranges)} 次")
     print(f"时间范围: {start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}")
     print(f"{'='*60}\n")
-    
-    start_time = time.time()
-    
-    for i, (symbol, name) in enumerate(missing_symbols, 1):
-        try:
-            print(f"[{i}/{len(missing_symbols)}] 获取 {symbol} - {name} 数据...", end=' ')
-
-            # 获取历史K线数据
-            candlesticks = longport_client.get_history_candlesticks(
-                symbol=symbol,
-                period='day',
-                start_date=start_date.date(),
-                end_date=end_date.date()
-            )
 
-            if candlesticks and len(candlesticks) > 0:
-                # 保存到数据库
-                saved_count = 0
-                with db_manager.get_session() as session:
-                    # 删除旧数据
-                    session.query(DailyData).filter_by(symbol=symbol).delete()
-
-                    # 插入新数据
-                    for candle in candlesticks:
-                        daily_data = DailyData(
-                            symbol=symbol,
-                            trade_date=candle.timestamp.date(),
-                            open=candle.open,
-                            high=candle.high,
-                            low=candle.low,
-                            close=candle.close,
-                            volume=candle.volume,
-                            turnover=candle.turnover,
-                            created_at=datetime.now()
-                        )
-                        session.add(daily_data)
-                        saved_count += 1
+    # 初始化LongPort客户端（请求频率由共享限流器控制）
+    longport_client = LongPortClient(api_config=config_loader.api_config)
 
-                    session.commit()
+    def fetch(item):
+        symbol, start, end = item
+        return longport_client.get_history_candlesticks(symbol=symbol, period='day', start_date=start, end_date=end)
 
-                print(f"✅ 保存 {saved_count} 条数据")
-                success_count += 1
-                total_records += saved_count
-            else:
-                print(f"⚠️  无数据")
-                fail_count += 1
+    def convert(item, candles):
+        return candles_to_frame(item[0], candles)
 
-            # 控制请求频率（避免触发限流）
-            time.sleep(2)
+    pipeline = IngestPipeline(db_manager, fetch, convert, update=False, workers=args.workers)
+    stats = pipeline.run(ranges)
 
-        except Exception as e:
-            print(f"❌ 错误: {e}")
-            fail_count += 1
-            time.sleep(3)
-    
-    end_time = time.time()
-    elapsed = end_time - start_time
-    
     print(f"\n{'='*60}")
     print(f"港股数据补充完成！")
-    print(f"成功: {success_count}/{len(missing_symbols)} ({success_count/len(missing_symbols)*100:.1f}%)")
-    print(f"失败: {fail_count}/{len(missing_symbols)} ({fail_count/len(missing_symbols)*100:.1f}%)")
-    print(f"总数据: {total_records} 条")
-    print(f"总用时: {elapsed/60:.1f} 分钟")
-    print(f"平均速度: {elapsed/len(missing_symbols):.1f} 秒/股票")
+    print(f"请求: {stats['total']} 次（失败 {len(stats['failed'])}，无数据 {len(stats['empty'])}）")
+    print(f"总数据: {stats['saved']} 条")
+    print(f"总用时: {stats['elapsed']/60:.1f} 分钟")
     print(f"{'='*60}")
 
 if __name__ == '__main__':
     main()
-
@@ -32,7 +32,7 @@ def add_stock_manually(symbols, market='HK'):
         db_manager = get_db_manager()
         saved_count = 0
 
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             for symbol in symbols:
                 # 检查是否已存在
                 existing = session.query(StockInfo).filter_by(symbol=symbol).first()
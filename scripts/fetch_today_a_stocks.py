@@ -32,10 +32,10 @@ def main():
         raise ValueError("Tushare token未配置")
     
     # 使用保守提速配置：关闭daily_basic，统一用客户端限速；去掉每只股票额外sleep
-    tushare_client = TushareClient(token=token, request_interval=1.2, enable_daily_basic=False)
+    tushare_client = TushareClient(token=token, enable_daily_basic=False)
 
     # 获取所有A股的symbol和name
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         a_stocks = [(s.symbol, s.name) for s in session.query(StockInfo).filter_by(market='CN').all()]
 
     # 仅获取最近2天的数据（覆盖最近交易日即可）
@@ -69,7 +69,7 @@ def main():
 
             if daily_data and len(daily_data) > 0:
                 # 保存到数据库
-                with db_manager.get_session() as session:
+                with db_manager.get_session('CN') as session:
                     new_count = 0
                     update_count = 0
 
@@ -130,7 +130,7 @@ def main():
 
     # 显示最新数据日期
     if total_records > 0:
-        with db_manager.get_session() as session:
+        with db_manager.get_session('CN') as session:
             latest_date = session.query(DailyData.trade_date).filter(
                 DailyData.symbol.like('%.SH') | DailyData.symbol.like('%.SZ')
             ).order_by(DailyData.trade_date.desc()).first()
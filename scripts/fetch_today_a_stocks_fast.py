@@ -56,7 +56,7 @@ def get_last_trade_date(pro) -> str:
 
 def load_cn_symbols(db_manager) -> Set[str]:
     """从库中加载已跟踪A股代码集合（如 600000.SH/000001.SZ）"""
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         rows = session.query(StockInfo.symbol).filter_by(market='CN').all()
         return {r[0] for r in rows}
 
@@ -70,41 +70,30 @@ def upsert_daily_rows(db_manager, df: pd.DataFrame, trade_date_str: str, symbols
         logger.warning('当日数据在当前跟踪列表中为空，可能是代码不匹配或列表为空')
         return 0, 0
 
-    insert_cnt = 0
-    update_cnt = 0
-
-    with db_manager.get_session() as session:
-        for _, row in df.iterrows():
-            symbol = str(row['ts_code'])
-            existing = session.query(DailyData).filter_by(symbol=symbol, trade_date=trade_date).first()
-
-            payload = {
-                'open': float(row['open']) if pd.notna(row['open']) else None,
-                'high': float(row['high']) if pd.notna(row['high']) else None,
-                'low': float(row['low']) if pd.notna(row['low']) else None,
-                'close': float(row['close']) if pd.notna(row['close']) else None,
-                # Tushare vol 单位：手；amount 单位：千元
-                'volume': int(row['vol'] * 100) if pd.notna(row['vol']) else None,
-                'turnover': float(row['amount'] * 1000) if pd.notna(row['amount']) else None,
-                'change': float(row['change']) if 'change' in row and pd.notna(row['change']) else None,
-                'change_pct': float(row['pct_chg']) if 'pct_chg' in row and pd.notna(row['pct_chg']) else None,
-            }
-
-            if existing:
-                for k, v in payload.items():
-                    if k not in ['symbol', 'trade_date']:
-                        setattr(existing, k, v)
-                update_cnt += 1
-            else:
-                rec = DailyData(
-                    symbol=symbol,
-                    trade_date=trade_date,
-                    **payload
-                )
-                session.add(rec)
-                insert_cnt += 1
-
-        session.commit()
+    # 写入前统计已存在的记录数（一次查询），用于区分新增/更新
+    with db_manager.get_session('CN') as session:
+        existing_cnt = session.query(DailyData.symbol).filter(
+            DailyData.trade_date == trade_date,
+            DailyData.symbol.in_(df['ts_code'].tolist())
+        ).count()
+
+    # 向量化转换（Tushare vol 单位：手；amount 单位：千元）
+    records = pd.DataFrame({
+        'symbol': df['ts_code'].astype(str),
+        'trade_date': trade_date,
+        'open': df['open'],
+        'high': df['high'],
+        'low': df['low'],
+        'close': df['close'],
+        'volume': (df['vol'] * 100).round(),
+        'turnover': df['amount'] * 1000,
+        'change': df['change'] if 'change' in df.columns else None,
+        'change_pct': df['pct_chg'] if 'pct_chg' in df.columns else None,
+    })
+
+    total = db_manager.bulk_upsert(DailyData, records)
+    update_cnt = existing_cnt
+    insert_cnt = total - existing_cnt
 
     return insert_cnt, update_cnt
 
@@ -46,7 +46,7 @@ def fetch_stock_data(symbol, days=365):
         
         # 保存到数据库
         saved_count = 0
-        with db_manager.get_session() as session:
+        with db_manager.get_session('US') as session:
             for candle in candlesticks:
                 # 检查是否已存在
                 existing = session.query(DailyData).filter_by(
@@ -107,7 +107,7 @@ def main():
     print("=" * 60 + "\n")
     
     # 获取所有美股
-    with db_manager.get_session() as session:
+    with db_manager.get_session('US') as session:
         us_stocks = session.query(StockInfo).filter_by(
             market='US',
             is_active=True
@@ -31,13 +31,13 @@ def main():
         raise ValueError("Tushare token未配置")
 
     # 保守提速：关闭 daily_basic，统一限速
-    ts_client = TushareClient(token=token, request_interval=1.2, enable_daily_basic=False)
+    ts_client = TushareClient(token=token, enable_daily_basic=False)
 
     # 目标日期：昨天（自然日）。如需“自动回退到最近交易日”，可后续增强。
     target_date = (datetime.now() - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
 
     # 获取所有A股
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         a_stocks = [(s.symbol, s.name) for s in session.query(StockInfo).filter_by(market='CN').all()]
 
     success, fail, no_data = 0, 0, 0
@@ -66,7 +66,7 @@ def main():
                 rows = [r for r in rows if r['trade_date'].date() == target_date.date()]
 
                 if rows:
-                    with db_manager.get_session() as session:
+                    with db_manager.get_session('CN') as session:
                         new_cnt, upd_cnt = 0, 0
                         for data in rows:
                             existing = session.query(DailyData).filter_by(
@@ -116,7 +116,7 @@ def main():
 
     # 显示数据库中该市场的最新交易日期
     if total_records > 0:
-        with db_manager.get_session() as session:
+        with db_manager.get_session('CN') as session:
             from sqlalchemy import desc
             latest_date = session.query(DailyData.trade_date).\
                 filter(DailyData.symbol.like('%.SH') | DailyData.symbol.like('%.SZ')).\
@@ -33,7 +33,7 @@ def main():
     tushare_client = TushareClient(token=token)
     
     # 获取所有A股的symbol和name
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         a_stocks = [(s.symbol, s.name) for s in session.query(StockInfo).filter_by(market='CN').all()]
 
     # 计算昨天的日期
@@ -69,7 +69,7 @@ def main():
 
             if daily_data and len(daily_data) > 0:
                 # 保存到数据库
-                with db_manager.get_session() as session:
+                with db_manager.get_session('CN') as session:
                     new_count = 0
                     update_count = 0
 
@@ -130,7 +130,7 @@ def main():
 
     # 显示最新数据日期
     if total_records > 0:
-        with db_manager.get_session() as session:
+        with db_manager.get_session('CN') as session:
             latest_date = session.query(DailyData.trade_date).filter(
                 DailyData.symbol.like('%.SH') | DailyData.symbol.like('%.SZ')
             ).order_by(DailyData.trade_date.desc()).first()
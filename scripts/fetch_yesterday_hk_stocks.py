@@ -6,7 +6,6 @@
 
 import sys
 from pathlib import Path
-import time
 from datetime import datetime, timedelta
 
 # 将项目根目录加入路径
@@ -28,7 +27,7 @@ def main():
     lp_client = LongPortClient(config_loader.api_config)
 
     # 读取港股清单
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         hk_stocks = [
             (s.symbol, s.name) for s in session.query(StockInfo).filter_by(market='HK').all()
         ]
@@ -46,9 +45,7 @@ def main():
     zero = 0
     total = 0
 
-    # 简单速率控制，避免过快
-    sleep_secs = 0.15
-
+    # 请求频率由长桥客户端的共享限流器控制
     for i, (symbol, name) in enumerate(hk_stocks, 1):
         try:
             print(f"[{i}/{len(hk_stocks)}] {symbol} - {name} ...", end=' ')
@@ -58,7 +55,6 @@ def main():
             if not candles:
                 print("⚠️ 无数据")
                 zero += 1
-                time.sleep(sleep_secs)
                 continue
 
             # 过滤昨日
@@ -66,13 +62,12 @@ def main():
             if not selected:
                 print("⚠️ 昨日无K线（可能是非交易日或该股停牌）")
                 zero += 1
-                time.sleep(sleep_secs)
                 continue
 
             c = selected[-1]
 
             # 写库：存在则更新，不存在则插入
-            with db_manager.get_session() as session:
+            with db_manager.get_session('HK') as session:
                 existing = (
                     session.query(DailyData)
                     .filter_by(symbol=symbol, trade_date=c.timestamp.date())
@@ -104,11 +99,9 @@ def main():
             print("✅ OK")
             success += 1
             total += 1
-            time.sleep(sleep_secs)
         except Exception as e:
             print(f"❌ 失败: {e}")
             fail += 1
-            time.sleep(sleep_secs)
 
     print(f"\n{'='*60}")
     print("港股昨日数据获取完成！")
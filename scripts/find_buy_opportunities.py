@@ -12,69 +12,39 @@ from datetime import datetime, date
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database import get_db_manager, init_database
-from database.models import StockSelection, DailyData, TechnicalIndicator, StockInfo, Position
+from database import get_db_manager, init_database, load_universe_panel, to_kline_records
+from database.models import StockSelection, StockInfo, Position
 from utils.config_loader import init_config
 from analysis.trading_signals import TradingSignalAnalyzer
 from loguru import logger
 
 
-def get_stock_data_with_indicators(session, symbol, days=60):
-    """获取股票数据和技术指标"""
-    # 获取日线数据
-    daily_data = session.query(DailyData).filter(
-        DailyData.symbol == symbol
-    ).order_by(DailyData.trade_date.desc()).limit(days).all()
-    
-    if not daily_data:
+def get_stock_data_with_indicators(panel, symbol):
+    """
+    从面板数据中取出单只股票的K线和技术指标（只保留有指标的交易日）
+
+    Args:
+        panel: load_universe_panel 结果
+        symbol: 股票代码
+
+    Returns:
+        list: K线数据列表，无数据时返回None
+    """
+    if symbol not in panel.index.get_level_values('symbol'):
         return None
-    
-    # 获取技术指标
-    indicators = session.query(TechnicalIndicator).filter(
-        TechnicalIndicator.symbol == symbol
-    ).order_by(TechnicalIndicator.trade_date.desc()).limit(days).all()
-    
-    if not indicators:
+
+    frame = panel.loc[[symbol]]
+    frame = frame[frame['has_indicators']]
+    if frame.empty:
         return None
-    
-    # 合并数据
-    kline_data = []
-    for data in reversed(daily_data):
-        indicator = next((ind for ind in indicators if ind.trade_date == data.trade_date), None)
-        if indicator:
-            kline_data.append({
-                'date': data.trade_date,
-                'open': data.open,
-                'high': data.high,
-                'low': data.low,
-                'close': data.close,
-                'volume': data.volume,
-                'ma5': indicator.ma5,
-                'ma10': indicator.ma10,
-                'ma20': indicator.ma20,
-                'ma60': indicator.ma60,
-                'macd': indicator.macd,
-                'signal': indicator.macd_signal,  # TradingSignalAnalyzer expects 'signal' not 'macd_signal'
-                'macd_hist': indicator.macd_hist,
-                'rsi': indicator.rsi,
-                'kdj_k': indicator.kdj_k,
-                'kdj_d': indicator.kdj_d,
-                'kdj_j': indicator.kdj_j,
-                'boll_upper': indicator.boll_upper,
-                'boll_middle': indicator.boll_middle,
-                'boll_lower': indicator.boll_lower,
-            })
-    
-    return kline_data
 
+    return to_kline_records(frame)
 
-def check_if_already_holding(session, symbol):
-    """检查是否已持仓"""
-    position = session.query(Position).filter(
-        Position.symbol == symbol,
-        Position.quantity > 0
-    ).first()
-    return position is not None
+
+def get_held_symbols(session):
+    """获取当前持仓的股票代码集合"""
+    rows = session.query(Position.symbol).filter(Position.quantity > 0).all()
+    return {row.symbol for row in rows}
 
 
 def find_buy_opportunities(market='HK', min_score=70, min_signal_strength=40, top_n=20, hk_connect_only=False):
@@ -94,7 +64,7 @@ def find_buy_opportunities(market='HK', min_score=70, min_signal_strength=40, to
 
     opportunities = []
 
-    with db_manager.get_session() as session:
+    with db_manager.get_session(market) as session:
         # 获取高分选股结果
         query = session.query(StockSelection).filter(
             StockSelection.market == market,
@@ -112,16 +82,25 @@ def find_buy_opportunities(market='HK', min_score=70, min_signal_strength=40, to
         
         logger.info(f"找到 {len(selections)} 只高分股票 (>={min_score}分)")
         
+        # 持仓和候选股票的K线/指标各一次查询
+        held_symbols = get_held_symbols(session)
+        panel = load_universe_panel(
+            db_manager,
+            symbols=[s.symbol for s in selections],
+            lookback=60,
+            active_only=False
+        )
+        
         for selection in selections:
             symbol = selection.symbol
             
             # 检查是否已持仓
-            if check_if_already_holding(session, symbol):
+            if symbol in held_symbols:
                 logger.debug(f"{symbol} 已持仓，跳过")
                 continue
             
             # 获取数据和指标
-            kline_data = get_stock_data_with_indicators(session, symbol)
+            kline_data = get_stock_data_with_indicators(panel, symbol)
             if not kline_data:
                 logger.debug(f"{symbol} 无数据，跳过")
                 continue
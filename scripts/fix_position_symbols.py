@@ -35,7 +35,7 @@ def main():
     init_database(config_loader.config)
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         # 获取所有持仓
         positions = session.query(Position).all()
         
@@ -19,7 +19,7 @@ from utils.config_loader import ConfigLoader
 
 def get_stock_details(db: DatabaseManager, symbol: str, market: str):
     """获取股票详细信息"""
-    with db.get_session() as session:
+    with db.get_session(market) as session:
         # 获取股票基本信息
         stock = session.query(StockInfo).filter(
             and_(
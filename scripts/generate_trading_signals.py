@@ -9,92 +9,38 @@ import sys
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from collections import defaultdict
+import pandas as pd
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from database import get_db_manager, init_database
-from database.models import StockInfo, DailyData, TechnicalIndicator, TradingSignal
+from database import get_db_manager, init_database, load_universe_panel, to_kline_records, pending_changes
+from database.models import StockInfo, TradingSignal
 from analysis.trading_signals import TradingSignalAnalyzer
 from utils.config_loader import init_config
 from loguru import logger
 
 
-def get_stock_data_with_indicators(session, symbol, days=60):
+def get_stock_data_with_indicators(db_manager, symbol, days=60):
     """
     获取股票数据和技术指标
     
     Args:
-        session: 数据库会话
+        db_manager: 数据库管理器
         symbol: 股票代码
         days: 获取天数
         
     Returns:
         list: K线数据列表，包含技术指标
     """
-    # 获取最近N天的数据
-    daily_data = session.query(DailyData).filter(
-        DailyData.symbol == symbol
-    ).order_by(DailyData.trade_date.desc()).limit(days).all()
-    
-    if not daily_data:
+    panel = load_universe_panel(db_manager, symbols=[symbol], lookback=days, active_only=False)
+    if panel.empty:
         return []
-    
-    # 反转为时间正序
-    daily_data = list(reversed(daily_data))
-    
-    # 获取技术指标
-    indicators_data = session.query(TechnicalIndicator).filter(
-        TechnicalIndicator.symbol == symbol
-    ).order_by(TechnicalIndicator.trade_date.desc()).limit(days).all()
-    
-    # 创建指标字典，方便查找
-    indicators_dict = {ind.trade_date: ind for ind in indicators_data}
-    
-    # 合并数据
-    kline_data = []
-    for daily in daily_data:
-        ind = indicators_dict.get(daily.trade_date)
-        
-        data_point = {
-            'date': daily.trade_date,
-            'open': daily.open,
-            'high': daily.high,
-            'low': daily.low,
-            'close': daily.close,
-            'volume': daily.volume,
-        }
-        
-        # 添加技术指标
-        if ind:
-            data_point.update({
-                'ma5': ind.ma5,
-                'ma10': ind.ma10,
-                'ma20': ind.ma20,
-                'ma60': ind.ma60,
-                'ema12': ind.ema12,
-                'ema26': ind.ema26,
-                'macd': ind.macd,
-                'signal': ind.macd_signal,
-                'macd_hist': ind.macd_hist,
-                'rsi': ind.rsi,
-                'kdj_k': ind.kdj_k,
-                'kdj_d': ind.kdj_d,
-                'kdj_j': ind.kdj_j,
-                'boll_upper': ind.boll_upper,
-                'boll_middle': ind.boll_middle,
-                'boll_lower': ind.boll_lower,
-                'atr': ind.atr,
-                'obv': ind.obv,
-            })
-        
-        kline_data.append(data_point)
-    
-    return kline_data
+    return to_kline_records(panel)
 
 
-def generate_signals_for_all_stocks(db_manager, market='CN', min_strength=40, save_to_db=False):
+def generate_signals_for_all_stocks(db_manager, market='CN', min_strength=40, save_to_db=False, changed_only=False):
     """
     为所有股票生成买卖信号
     
@@ -103,31 +49,49 @@ def generate_signals_for_all_stocks(db_manager, market='CN', min_strength=40, sa
         market: 市场代码 (CN/HK/US)
         min_strength: 最小信号强度
         save_to_db: 是否保存到数据库
+        changed_only: 只分析上次检查点之后日线/技术指标有变化的股票（保存到数据库后推进检查点）
         
     Returns:
         dict: 买入和卖出信号列表
     """
     buy_signals = []
     sell_signals = []
+
+    changes = None
+    if changed_only:
+        changes = pending_changes(db_manager, 'generate_trading_signals', market,
+                                  ['daily_data', 'technical_indicators'])
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(market) as session:
         # 获取所有股票
         stocks = session.query(StockInfo).filter_by(market=market).all()
+        if changes is not None and not changes.full:
+            changed = set(changes.symbols)
+            stocks = [stock for stock in stocks if stock.symbol in changed]
         total = len(stocks)
         
         logger.info(f"开始分析 {total} 只{market}市场股票...")
         
+        # 一次查询加载最近60天的K线和技术指标（增量模式只加载有变化的股票）
+        if changes is not None and not changes.full:
+            panel = load_universe_panel(db_manager, symbols=[stock.symbol for stock in stocks],
+                                        lookback=60, active_only=False) if stocks else pd.DataFrame()
+        else:
+            panel = load_universe_panel(db_manager, market=market, lookback=60, active_only=False)
+        frames = dict(tuple(panel.groupby(level='symbol', sort=False))) if not panel.empty else {}
+        
         for idx, stock in enumerate(stocks, 1):
             if idx % 100 == 0:
                 logger.info(f"进度: [{idx}/{total}] {stock.symbol} {stock.name}")
             
             try:
                 # 获取数据
-                kline_data = get_stock_data_with_indicators(session, stock.symbol, days=60)
-                
-                if len(kline_data) < 30:
+                frame = frames.get(stock.symbol)
+                if frame is None or len(frame) < 30:
                     continue
                 
+                kline_data = to_kline_records(frame)
+                
                 # 创建分析器
                 analyzer = TradingSignalAnalyzer(kline_data)
                 
@@ -166,6 +130,9 @@ def generate_signals_for_all_stocks(db_manager, market='CN', min_strength=40, sa
         # 保存到数据库
         if save_to_db:
             save_signals_to_db(session, buy_signals, sell_signals)
+
+    if changes is not None and save_to_db:
+        changes.commit()
     
     return {
         'buy_signals': buy_signals,
@@ -185,44 +152,21 @@ def save_signals_to_db(session, buy_signals, sell_signals):
     today = date.today()
     saved_count = 0
     
-    # 保存买入信号
-    for sig in buy_signals:
-        # 检查是否已存在
-        existing = session.query(TradingSignal).filter(
-            TradingSignal.symbol == sig['symbol'],
-            TradingSignal.signal_date == today,
-            TradingSignal.signal_type == 'BUY',
-            TradingSignal.is_executed == False
-        ).first()
-        
-        if not existing:
-            signal = TradingSignal(
-                symbol=sig['symbol'],
-                signal_date=today,
-                signal_type='BUY',
-                signal_strength=sig['strength'] / 100.0,  # 转换为0-1
-                signal_price=sig['price'],
-                source='trading_signal_analyzer',
-                reason=', '.join(sig['reasons'])
-            )
-            session.add(signal)
-            saved_count += 1
+    # 今日已有的信号（含已执行的；(symbol, signal_date, signal_type) 唯一）
+    existing = set(session.query(TradingSignal.symbol, TradingSignal.signal_type).filter(
+        TradingSignal.signal_date == today
+    ).all())
     
-    # 保存卖出信号
-    for sig in sell_signals:
-        # 检查是否已存在
-        existing = session.query(TradingSignal).filter(
-            TradingSignal.symbol == sig['symbol'],
-            TradingSignal.signal_date == today,
-            TradingSignal.signal_type == 'SELL',
-            TradingSignal.is_executed == False
-        ).first()
-        
-        if not existing:
+    for signal_type, signals in (('BUY', buy_signals), ('SELL', sell_signals)):
+        for sig in signals:
+            if (sig['symbol'], signal_type) in existing:
+                continue
+            existing.add((sig['symbol'], signal_type))
+            
             signal = TradingSignal(
                 symbol=sig['symbol'],
                 signal_date=today,
-                signal_type='SELL',
+                signal_type=signal_type,
                 signal_strength=sig['strength'] / 100.0,  # 转换为0-1
                 signal_price=sig['price'],
                 source='trading_signal_analyzer',
@@ -305,6 +249,8 @@ def main():
     parser.add_argument('--market', default='CN', choices=['CN', 'HK', 'US'], help='市场代码')
     parser.add_argument('--min-strength', type=int, default=40, help='最小信号强度 (0-100)')
     parser.add_argument('--save-db', action='store_true', help='保存信号到数据库')
+    parser.add_argument('--changed', action='store_true',
+                        help='只分析上次检查点之后数据有变化的股票（与 --save-db 一起使用时推进检查点）')
     args = parser.parse_args()
 
     # 初始化
@@ -322,7 +268,8 @@ def main():
         db_manager, 
         market=args.market,
         min_strength=args.min_strength,
-        save_to_db=args.save_db
+        save_to_db=args.save_db,
+        changed_only=args.changed
     )
     
     # 打印报告
@@ -62,7 +62,7 @@ def main():
     
     print("开始添加到数据库...\n")
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         for i, row in df.iterrows():
             try:
                 symbol = row['ts_code']  # 如 600000.SH
@@ -11,7 +11,7 @@ sys.path.insert(0, str(project_root))
 from utils.config_loader import ConfigLoader
 from utils.logger import logger
 from database.db_manager import DatabaseManager
-from database.models import Base, MinuteData, MoneyFlowAlert
+from database.models import Base, MinuteData, MinuteBar, MoneyFlowAlert
 
 
 def main():
@@ -30,12 +30,14 @@ def main():
         logger.info("创建资金流入监控相关表...")
         Base.metadata.create_all(db_manager.engine, tables=[
             MinuteData.__table__,
+            MinuteBar.__table__,
             MoneyFlowAlert.__table__
         ])
         
         logger.info("✅ 数据库表创建成功！")
         logger.info("已创建以下表：")
         logger.info("  - minute_data: 分钟数据表")
+        logger.info("  - minute_bars: 分钟K线汇总表")
         logger.info("  - money_flow_alerts: 资金流入告警记录表")
         
     except Exception as e:
@@ -22,17 +22,18 @@ def list_stocks_by_market():
     
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
-        # 按市场分组统计
-        markets = ['HK', 'US', 'CN']
-        
-        for market in markets:
+    # 按市场分组统计
+    markets = ['HK', 'US', 'CN']
+    
+    for market in markets:
+        # 分库时各市场读取各自的库
+        with db_manager.get_session(market) as session:
             stocks = session.query(StockInfo).filter_by(market=market).order_by(StockInfo.symbol).all()
-            
+        
             print(f"\n{'='*80}")
             print(f"{market}股 - 共 {len(stocks)} 只")
             print(f"{'='*80}")
-            
+        
             if market == 'CN':
                 # A股详细列出
                 for i, stock in enumerate(stocks, 1):
@@ -0,0 +1,109 @@
+"""
+日线覆盖索引维护
+
+重建覆盖位图、同步/推断交易日历，并输出补齐缺失日线的请求计划
+"""
+import sys
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.config_loader import init_config
+from utils.logger import setup_logger
+from database import init_database, rebuild_coverage, sync_trade_calendar, derive_trade_calendar, plan_gaps
+from loguru import logger
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='日线覆盖索引维护（重建位图、交易日历、缺口计划）',
+        epilog='''
+示例:
+  # 按 daily_data 重建全部股票的覆盖位图（用原生SQL删除过日线后执行）
+  python maintain_coverage.py --rebuild
+
+  # 同步A股交易日历（Tushare）最近3年
+  python maintain_coverage.py --sync-calendar --days 1095
+
+  # 由覆盖索引推断港股交易日历
+  python maintain_coverage.py --derive-calendar --market HK
+
+  # 查看港股最近120天缺失日线的请求计划
+  python maintain_coverage.py --plan --market HK --days 120
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--rebuild', action='store_true', help='按 daily_data 重建覆盖位图')
+    parser.add_argument('--sync-calendar', action='store_true', help='从 Tushare 同步A股交易日历')
+    parser.add_argument('--derive-calendar', action='store_true', help='由覆盖索引推断交易日历（港股/美股）')
+    parser.add_argument('--plan', action='store_true', help='输出补齐缺失日线的请求计划')
+    parser.add_argument('--market', type=str, default='CN', help='市场（CN/HK/US，默认CN）')
+    parser.add_argument('--days', type=int, default=120, help='交易日历/计划覆盖最近多少天（默认120天）')
+    parser.add_argument('--include-history', action='store_true',
+                        help='计划中包含各股票最早日线之前的区间（回补更早的历史）')
+
+    args = parser.parse_args()
+    if not (args.rebuild or args.sync_calendar or args.derive_calendar or args.plan):
+        parser.error('请至少指定 --rebuild、--sync-calendar、--derive-calendar、--plan 之一')
+
+    try:
+        # 加载配置
+        project_root = Path(__file__).parent.parent
+        config_dir = str(project_root / 'config')
+        config_loader = init_config(config_dir=config_dir)
+        config = config_loader.config
+
+        # 设置日志
+        setup_logger(config)
+
+        # 初始化数据库
+        db_manager = init_database(config)
+        market = args.market.upper()
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=args.days)
+
+        if args.rebuild:
+            for shard in db_manager.markets:
+                with db_manager.get_session(shard) as session:
+                    rebuild_coverage(session)
+
+        if args.sync_calendar:
+            from data_collection.tushare_client import TushareClient
+            token = config_loader.api_config.get('tushare', {}).get('token')
+            if not token:
+                logger.error("❌ Tushare token未配置，请在config/api_config.yaml中配置tushare.token")
+                sys.exit(1)
+            dates = TushareClient(token).get_trade_calendar(start_date, end_date)
+            sync_trade_calendar(db_manager, 'CN', dates)
+
+        if args.derive_calendar:
+            count = derive_trade_calendar(db_manager, market)
+            logger.info(f"{market} 推断交易日 {count} 天")
+
+        if args.plan:
+            plan = plan_gaps(db_manager, market, start_date, end_date, include_history=args.include_history)
+            ranges = plan.ranges
+            logger.info("=" * 60)
+            logger.info(f"{market} 缺失日线 {plan.total} 条，涉及 {len(plan.symbols)} 只股票")
+            logger.info(f"  按股票请求: {len(ranges)} 次")
+            logger.info(f"  按交易日请求: {len(plan.trade_dates)} 次")
+            logger.info("=" * 60)
+            for symbol, start, end in ranges[:20]:
+                logger.info(f"  {symbol:12} {start} ~ {end}")
+            if len(ranges) > 20:
+                logger.info(f"  ... 其余 {len(ranges) - 20} 个区间")
+
+    except Exception as e:
+        logger.error(f"执行失败: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
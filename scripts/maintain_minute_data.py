@@ -0,0 +1,103 @@
+"""
+分钟数据维护
+
+按保留期归档过期的1分钟K线、重算多周期汇总K线，并用分钟汇总核对日线数据
+"""
+import sys
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.config_loader import init_config
+from utils.logger import setup_logger
+from database import init_database, archive_minute_data, rollup_minute_data, check_daily_rollup
+from loguru import logger
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='分钟数据维护（归档、汇总、核对）',
+        epilog='''
+示例:
+  # 归档超过保留期（配置 database.minute_data.retention_days）的分钟数据
+  python maintain_minute_data.py --archive
+
+  # 归档指定日期之前的分钟数据
+  python maintain_minute_data.py --archive --before 2025-01-01
+
+  # 重算热数据表中全部的多周期汇总K线
+  python maintain_minute_data.py --rollup
+
+  # 用分钟汇总核对昨天的日线
+  python maintain_minute_data.py --check
+
+  # 核对指定交易日
+  python maintain_minute_data.py --check --date 2025-01-10
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--archive', action='store_true', help='归档并删除过期的分钟数据')
+    parser.add_argument('--before', type=str, help='归档该日期之前的数据（YYYY-MM-DD）')
+    parser.add_argument('--rollup', action='store_true', help='重算热数据表的多周期汇总K线')
+    parser.add_argument('--check', action='store_true', help='用分钟汇总核对日线数据')
+    parser.add_argument('--date', type=str, help='核对的交易日（YYYY-MM-DD），默认昨天')
+    parser.add_argument('--root', type=str, help='归档目录（默认取配置 database.minute_data.archive_path）')
+
+    args = parser.parse_args()
+    if not (args.archive or args.rollup or args.check):
+        parser.error('请至少指定 --archive、--rollup、--check 之一')
+
+    try:
+        # 加载配置
+        project_root = Path(__file__).parent.parent
+        config_dir = str(project_root / 'config')
+        config_loader = init_config(config_dir=config_dir)
+        config = config_loader.config
+
+        # 设置日志
+        setup_logger(config)
+
+        logger.info("=" * 60)
+        logger.info("分钟数据维护")
+        logger.info("=" * 60)
+
+        # 初始化数据库
+        db_manager = init_database(config)
+
+        if args.rollup:
+            count = rollup_minute_data(db_manager)
+            logger.info(f"重算汇总K线 {count} 条")
+
+        if args.check:
+            trade_date = (datetime.strptime(args.date, '%Y-%m-%d').date() if args.date
+                          else datetime.now().date() - timedelta(days=1))
+            mismatched = check_daily_rollup(db_manager, trade_date, root=args.root)
+            for row in mismatched.itertuples():
+                logger.warning(
+                    f"{row.symbol}: {row.issues} | 分钟收盘 {row.minute_close} / 日线收盘 {row.daily_close} | "
+                    f"分钟成交量 {row.minute_volume:.0f} / 日线成交量 {row.daily_volume}"
+                )
+
+        if args.archive:
+            before = datetime.strptime(args.before, '%Y-%m-%d').date() if args.before else None
+            count = archive_minute_data(db_manager, before=before, root=args.root)
+            logger.info(f"归档分钟数据 {count} 条")
+
+        logger.info("=" * 60)
+        logger.info("维护完成！")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"执行失败: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+SQL语句分析
+
+运行任意脚本并统计其执行的SQL：按语句形态汇总次数和耗时分布，标出疑似逐只股票循环查询（N+1）的语句
+"""
+import sys
+import runpy
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database.profiler import enable_profiling, DEFAULT_REPEAT_THRESHOLD
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='运行脚本并统计SQL语句（N+1 检测）',
+        epilog='''
+示例:
+  # 分析批量指标计算
+  python profile_sql.py scripts/calculate_indicators.py --batch --market HK --limit 50
+
+  # 分析选股，同一语句超过10次即告警
+  python profile_sql.py --threshold 10 scripts/run_stock_selection.py --market HK
+
+  # 记录超过100ms的慢查询，报告显示前30种语句
+  python profile_sql.py --slow-ms 100 --top 30 scripts/generate_trading_signals.py
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--threshold', type=int, default=DEFAULT_REPEAT_THRESHOLD,
+                       help=f'同一语句执行超过该次数时告警（默认{DEFAULT_REPEAT_THRESHOLD}）')
+    parser.add_argument('--slow-ms', type=float, help='慢查询阈值（毫秒）')
+    parser.add_argument('--top', type=int, default=20, help='报告显示的语句形态数（默认20）')
+    parser.add_argument('script', type=str, help='要运行的脚本')
+    parser.add_argument('script_args', nargs=argparse.REMAINDER, help='脚本参数')
+
+    args = parser.parse_args()
+
+    profiler = enable_profiling(
+        repeat_threshold=args.threshold,
+        slow_query_ms=args.slow_ms,
+        report_at_exit=False
+    )
+
+    script = str(Path(args.script).resolve())
+    sys.argv = [script] + args.script_args
+
+    exit_code = 0
+    with profiler.unit(Path(script).name):
+        try:
+            runpy.run_path(script, run_name='__main__')
+        except SystemExit as e:
+            exit_code = e.code or 0
+
+    print(profiler.report(top=args.top))
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
@@ -109,8 +109,9 @@ def check_watch_list():
     config = config_loader.config
     
     db_manager = DatabaseManager(config)
+    market = config.get('money_flow_monitor', {}).get('market', 'HK')  # 资金流监控的市场
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(market) as session:
         # 获取最新选股日期
         latest_date = session.query(func.max(StockSelection.selection_date)).scalar()
         
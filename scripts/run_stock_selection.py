@@ -12,86 +12,41 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.config_loader import init_config
 from utils.logger import setup_logger
-from database import init_database, get_db_manager
-from database.models import StockInfo, DailyData, TechnicalIndicator, StockSelection
-from analysis.scoring_engine import ScoringEngine
+from database import init_database, get_db_manager, load_universe_panel, load_score_history, pending_changes
+from database.latest_bars import load_latest_bars
+from database.models import StockInfo, StockSelection, StockScore
+from analysis.scoring_engine import ScoringEngine, PanelScoringEngine
+from utils.parallel import split_shards, run_sharded
 from loguru import logger
 
 
-def analyze_stock(symbol, name):
+# 参与选股所需的最少K线数
+MIN_BARS = 20
+
+
+def analyze_stock(symbol, name, df=None):
     """
     分析单只股票
     
     Args:
         symbol: 股票代码
         name: 股票名称
+        df: 该股票的面板切片（load_universe_panel 结果），为空时单独查询
         
     Returns:
         dict: 评分结果
     """
     try:
-        db_manager = get_db_manager()
+        if df is None:
+            panel = load_universe_panel(get_db_manager(), symbols=[symbol], lookback=60, active_only=False)
+            df = panel.loc[symbol] if not panel.empty else panel
         
-        # 获取历史数据和技术指标
-        with db_manager.get_session() as session:
-            # 获取最近60天的数据
-            daily_data = session.query(DailyData).filter_by(
-                symbol=symbol
-            ).order_by(DailyData.trade_date.desc()).limit(60).all()
-            
-            if not daily_data or len(daily_data) < 20:
-                logger.warning(f"{symbol} 数据不足（少于20天）")
-                return None
-            
-            # 反转顺序（从旧到新）
-            daily_data = list(reversed(daily_data))
-            
-            # 获取技术指标
-            indicators = session.query(TechnicalIndicator).filter_by(
-                symbol=symbol
-            ).order_by(TechnicalIndicator.trade_date.desc()).limit(60).all()
-            
-            indicators = list(reversed(indicators))
-            indicator_dict = {ind.trade_date: ind for ind in indicators}
-            
-            # 构建DataFrame
-            data = []
-            for d in daily_data:
-                ind = indicator_dict.get(d.trade_date)
-                
-                row = {
-                    'date': d.trade_date,
-                    'open': d.open,
-                    'high': d.high,
-                    'low': d.low,
-                    'close': d.close,
-                    'volume': d.volume
-                }
-                
-                if ind:
-                    row.update({
-                        'ma5': ind.ma5,
-                        'ma10': ind.ma10,
-                        'ma20': ind.ma20,
-                        'ma60': ind.ma60,
-                        'macd': ind.macd,
-                        'macd_signal': ind.macd_signal,
-                        'macd_hist': ind.macd_hist,
-                        'rsi': ind.rsi,
-                        'kdj_k': ind.kdj_k,
-                        'kdj_d': ind.kdj_d,
-                        'kdj_j': ind.kdj_j,
-                        'boll_upper': ind.boll_upper,
-                        'boll_middle': ind.boll_middle,
-                        'boll_lower': ind.boll_lower,
-                        'volume_ma5': ind.volume_ma5,
-                        'volume_ma10': ind.volume_ma10,
-                    })
-                
-                data.append(row)
-            
-            df = pd.DataFrame(data)
-            df.set_index('date', inplace=True)
+        if len(df) < MIN_BARS:
+            logger.warning(f"{symbol} 数据不足（少于{MIN_BARS}天）")
+            return None
+        
+        df = df.drop(columns=['has_indicators'], errors='ignore')
+        df.index.name = 'date'
         
         # 计算评分
         engine = ScoringEngine(df)
@@ -110,7 +65,58 @@ def analyze_stock(symbol, name):
         return None
 
 
-def run_stock_selection(market='HK', min_score=50, top_n=50, hk_connect_only=False):
+def score_shard(symbols):
+    """
+    计算一个分片的截面评分（在工作进程中执行）
+
+    Args:
+        symbols: 股票代码列表
+
+    Returns:
+        DataFrame: PanelScoringEngine.calculate_scores() 的结果
+    """
+    panel = load_universe_panel(get_db_manager(), symbols=symbols, lookback=MIN_BARS, active_only=False)
+    return PanelScoringEngine(panel).calculate_scores()
+
+
+def load_cached_scores(db_manager, symbols):
+    """
+    读取仍然有效的评分：stock_scores 中已有该股票最新交易日（latest_bars）的评分
+
+    Args:
+        db_manager: 数据库管理器
+        symbols: 股票代码列表
+
+    Returns:
+        DataFrame: 同 PanelScoringEngine.calculate_scores()，只包含评分有效的股票
+    """
+    columns = PanelScoringEngine.SCORE_COLUMNS + ['latest_price', 'latest_date', 'bar_count']
+    bars = {symbol: bar for symbol, bar in load_latest_bars(db_manager, symbols).items() if bar.trade_date}
+    if not bars:
+        return pd.DataFrame(columns=columns).rename_axis('symbol')
+
+    history = load_score_history(db_manager, symbols=list(bars),
+                                 start_date=min(bar.trade_date for bar in bars.values())).reset_index()
+    history = history[history['trade_date'] == history['symbol'].map(lambda s: bars[s].trade_date)]
+
+    scores = history.set_index('symbol')[PanelScoringEngine.SCORE_COLUMNS]
+    scores['latest_price'] = [bars[s].close for s in scores.index]
+    scores['latest_date'] = [bars[s].trade_date for s in scores.index]
+    scores['bar_count'] = MIN_BARS
+    return scores
+
+
+def save_latest_scores(db_manager, scores):
+    """把本次计算的最新评分写入 stock_scores（供下次 --changed 运行沿用）"""
+    if scores.empty:
+        return 0
+    rows = scores[PanelScoringEngine.SCORE_COLUMNS].astype(int)
+    rows['trade_date'] = [pd.Timestamp(d).date() for d in scores['latest_date']]
+    return db_manager.bulk_upsert(StockScore, rows.rename_axis('symbol').reset_index())
+
+
+def run_stock_selection(market='HK', min_score=50, top_n=50, hk_connect_only=False, workers=1, shard_size=500,
+                        changed_only=False):
     """
     运行选股分析
 
@@ -119,6 +125,9 @@ def run_stock_selection(market='HK', min_score=50, top_n=50, hk_connect_only=Fal
         min_score: 最低分数
         top_n: 返回前N只股票
         hk_connect_only: 是否只选港股通标的（仅对HK市场有效）
+        workers: 进程数（大于1时按分片并行评分）
+        shard_size: 并行模式下每个分片的股票数
+        changed_only: 只对上次检查点之后日线/技术指标有变化的股票重新评分，其余沿用 stock_scores 中的评分
     """
     try:
         logger.info(f"开始选股分析 - 市场:{market}, 最低分:{min_score}, Top:{top_n}, 港股通:{hk_connect_only}")
@@ -127,7 +136,7 @@ def run_stock_selection(market='HK', min_score=50, top_n=50, hk_connect_only=Fal
 
         # 获取股票列表
         stock_list = []
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             # 构建查询条件
             query = session.query(StockInfo).filter_by(
                 market=market,
@@ -147,30 +156,81 @@ def run_stock_selection(market='HK', min_score=50, top_n=50, hk_connect_only=Fal
                 })
 
         logger.info(f"找到 {len(stock_list)} 只股票")
+
+        changes = None
+        cached = None
+        symbols = [s['symbol'] for s in stock_list]
+        if changed_only:
+            changes = pending_changes(db_manager, 'run_stock_selection', market, ['daily_data', 'technical_indicators'])
+            if not changes.full:
+                unchanged = sorted(set(symbols) - set(changes.symbols))
+                cached = load_cached_scores(db_manager, unchanged)
+                symbols = [s for s in symbols if s not in cached.index]
+                logger.info(f"沿用 {len(cached)} 只股票的评分，重新评分 {len(symbols)} 只")
         
-        # 分析所有股票
-        results = []
-        for i, stock_info in enumerate(stock_list, 1):
-            symbol = stock_info['symbol']
-            name = stock_info['name']
-            
-            logger.info(f"[{i}/{len(stock_list)}] 分析 {symbol} - {name}")
-            
-            scores = analyze_stock(symbol, name)
+        if workers > 1:
+            # 多进程：按分片加载和评分，结果在主进程合并
+            shards = split_shards(symbols, shard_size)
+            results = list(run_sharded(score_shard, shards, workers))
+            failed = [symbol for shard in results if shard.error for symbol in shard.items]
+            if failed:
+                # 缺少部分股票的评分时排名不完整，不保存结果、不推进检查点
+                logger.error(f"{len(failed)} 只股票所在分片评分失败，本次选股中止")
+                return []
+            frames = [shard.result for shard in results]
+            scores = pd.concat(frames) if frames else pd.DataFrame(columns=['total_score', 'bar_count'])
+        elif cached is not None:
+            scores = score_shard(symbols) if symbols else pd.DataFrame(columns=['total_score', 'bar_count'])
+        else:
+            # 一次查询加载全市场最近的K线和技术指标（MIN_BARS 根即可判断数据是否充足）
+            panel = load_universe_panel(
+                db_manager,
+                market=market,
+                lookback=MIN_BARS,
+                hk_connect_only=(market == 'HK' and hk_connect_only)
+            )
             
-            if scores and scores['total_score'] >= min_score:
-                results.append(scores)
+            # 全市场截面评分
+            scores = PanelScoringEngine(panel).calculate_scores()
+        if changed_only:
+            fresh = scores[scores['bar_count'] >= MIN_BARS].dropna(subset=['total_score'])
+            save_latest_scores(db_manager, fresh)
+            if cached is not None:
+                scores = pd.concat([scores, cached])
+        scores = scores.reindex([s['symbol'] for s in stock_list]).dropna(subset=['total_score'])
+        
+        insufficient = scores['bar_count'] < MIN_BARS
+        if insufficient.any():
+            logger.warning(f"{int(insufficient.sum())} 只股票数据不足（少于{MIN_BARS}天）")
+        scores = scores[~insufficient]
         
-        # 按总分排序
-        results.sort(key=lambda x: x['total_score'], reverse=True)
+        names = {s['symbol']: s['name'] for s in stock_list}
+        qualified = int((scores['total_score'] >= min_score).sum())
         
-        # 取前N只
-        top_stocks = results[:top_n]
+        # 取前N只（按总分降序）
+        top = PanelScoringEngine.select_top(scores, top_n, min_score)
+        top_stocks = [
+            {
+                'total_score': int(row.total_score),
+                'technical_score': int(row.technical_score),
+                'volume_score': int(row.volume_score),
+                'trend_score': int(row.trend_score),
+                'pattern_score': int(row.pattern_score),
+                'max_score': 100,
+                'symbol': symbol,
+                'name': names[symbol],
+                'latest_price': float(row.latest_price),
+                'latest_date': row.latest_date,
+            }
+            for symbol, row in zip(top.index, top.itertuples(index=False))
+        ]
         
-        logger.info(f"选股完成！共 {len(results)} 只股票达到最低分，返回Top {len(top_stocks)}")
+        logger.info(f"选股完成！共 {qualified} 只股票达到最低分，返回Top {len(top_stocks)}")
         
         # 保存到数据库
         save_selection_results(top_stocks, market)
+        if changes is not None:
+            changes.commit()
         
         # 显示结果
         display_results(top_stocks)
@@ -189,7 +249,7 @@ def save_selection_results(results, market):
     try:
         db_manager = get_db_manager()
         
-        with db_manager.get_session() as session:
+        with db_manager.get_session(market) as session:
             # 删除旧的选股结果
             session.query(StockSelection).filter_by(market=market).delete()
             
@@ -253,6 +313,12 @@ def main():
   
   # 选出Top 100
   python run_stock_selection.py --market HK --top 100
+
+  # 多进程评分（8个进程）
+  python run_stock_selection.py --market CN --workers 8
+
+  # 只对上次运行以来数据有变化的股票重新评分
+  python run_stock_selection.py --market CN --changed
         ''',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -266,6 +332,12 @@ def main():
                        help='返回前N只股票（默认50）')
     parser.add_argument('--hk-connect-only', action='store_true',
                        help='只选港股通标的（仅对HK市场有效）')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='进程数（默认1即单进程）')
+    parser.add_argument('--shard-size', type=int, default=500,
+                       help='多进程模式下每个分片的股票数（默认500）')
+    parser.add_argument('--changed', action='store_true',
+                       help='只对上次检查点之后数据有变化的股票重新评分（首次运行为全量）')
     
     args = parser.parse_args()
     
@@ -291,7 +363,10 @@ def main():
             market=args.market,
             min_score=args.min_score,
             top_n=args.top,
-            hk_connect_only=args.hk_connect_only
+            hk_connect_only=args.hk_connect_only,
+            workers=args.workers,
+            shard_size=args.shard_size,
+            changed_only=args.changed
         )
         
         logger.info("=" * 60)
@@ -71,7 +71,7 @@ def main():
         ("0005.HK", "HSBC Holdings", 60.0),
     ]
 
-    with db.get_session() as session:
+    with db.get_session('HK') as session:
         for sym, name, px in items:
             upsert_stock(session, sym, name)
             upsert_daily(session, sym, today, px)
@@ -156,7 +156,7 @@ def add_a_stocks():
     skipped_count = 0
     error_count = 0
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         for i, (symbol, name) in enumerate(all_stocks.items(), 1):
             try:
                 # 检查是否已存在
@@ -0,0 +1,88 @@
+"""
+同步列式行情存储
+
+把 daily_data 中的日线同步为按市场存放的内存映射矩阵，供研究脚本和回测快速读取
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.config_loader import init_config
+from utils.logger import setup_logger
+from database import init_database, sync_columnar_store, load_columnar
+from loguru import logger
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(
+        description='同步列式行情存储',
+        epilog='''
+示例:
+  # 增量同步A股（追加新K线和新股票）
+  python sync_columnar_store.py --market CN
+
+  # 全量重建所有市场
+  python sync_columnar_store.py --all --full
+
+  # 指定存储目录
+  python sync_columnar_store.py --market HK --root data/columnar
+        ''',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+
+    parser.add_argument('--market', type=str, default='CN',
+                       choices=['HK', 'US', 'CN'],
+                       help='市场代码')
+    parser.add_argument('--all', action='store_true', help='同步所有市场')
+    parser.add_argument('--full', action='store_true', help='全量重建')
+    parser.add_argument('--root', type=str, help='存储目录（默认取配置 database.columnar.path）')
+
+    args = parser.parse_args()
+
+    try:
+        # 加载配置
+        project_root = Path(__file__).parent.parent
+        config_dir = str(project_root / 'config')
+        config_loader = init_config(config_dir=config_dir)
+        config = config_loader.config
+
+        # 设置日志
+        setup_logger(config)
+
+        logger.info("=" * 60)
+        logger.info("同步列式行情存储")
+        logger.info("=" * 60)
+
+        # 初始化数据库
+        db_manager = init_database(config)
+
+        markets = ['HK', 'US', 'CN'] if args.all else [args.market]
+        for market in markets:
+            start = time.perf_counter()
+            sync_columnar_store(db_manager, market, root=args.root, full=args.full)
+            logger.info(f"{market} 同步耗时 {time.perf_counter() - start:.1f} 秒")
+
+            # 验证映射速度
+            start = time.perf_counter()
+            data = load_columnar(market, root=args.root)
+            logger.info(f"{market} 映射 {data.shape[0]} 个交易日 × {data.shape[1]} 只股票，"
+                        f"耗时 {(time.perf_counter() - start) * 1000:.1f} 毫秒")
+
+        logger.info("=" * 60)
+        logger.info("同步完成！")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"执行失败: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -85,7 +85,7 @@ def update_hk_connect_flag():
     
     # 更新数据库
     print("\n正在更新数据库...")
-    with db_manager.get_session() as session:
+    with db_manager.get_session('HK') as session:
         # 获取所有港股
         hk_stocks = session.query(StockInfo).filter_by(market='HK', is_active=True).all()
         print(f"数据库中港股总数: {len(hk_stocks)}")
@@ -11,9 +11,10 @@ import argparse
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.config_loader import init_config
-from database import init_database, get_db_manager
+from database import init_database, get_db_manager, get_latest_bars
 from database.models import StockInfo, DailyData
 from data_collection.longport_client import init_longport_client, get_longport_client
+from data_collection.ingest_pipeline import IngestPipeline, candles_to_frame
 from loguru import logger
 
 
@@ -29,7 +30,7 @@ def get_latest_data_date(symbol):
     """
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session(db_manager.market_of(symbol)) as session:
         latest = session.query(DailyData).filter_by(
             symbol=symbol
         ).order_by(
@@ -89,7 +90,7 @@ def update_stock_latest_data(symbol, name, days=7):
         # 保存新数据
         db_manager = get_db_manager()
 
-        with db_manager.get_session() as session:
+        with db_manager.get_session(db_manager.market_of(symbol)) as session:
             for candle in new_data:
                 trade_date = candle.timestamp.date()
 
@@ -126,49 +127,56 @@ def update_stock_latest_data(symbol, name, days=7):
         return 0
 
 
-def update_all_latest_data(market='HK', days=7):
+def update_all_latest_data(market='HK', days=7, workers=8):
     """
-    更新所有股票的最新数据
+    更新所有股票的最新数据（并发抓取，批量写入）
 
     Args:
         market: 市场代码
         days: 获取最近几天的数据
+        workers: 抓取线程数
     """
 
     # 获取股票列表
     db_manager = get_db_manager()
 
-    with db_manager.get_session() as session:
-        stocks = session.query(StockInfo).filter_by(market=market).all()
+    with db_manager.get_session(market) as session:
+        stock_list = [row.symbol for row in session.query(StockInfo.symbol).filter_by(market=market).all()]
 
-        if not stocks:
+        if not stock_list:
             logger.warning(f"没有找到 {market} 市场的股票")
             return
 
-        # 提取股票信息到列表，避免session关闭后访问
-        stock_list = [(stock.symbol, stock.name) for stock in stocks]
+        # 各股票最新数据日期（读最新行情快照，一次查询）
+        latest_dates = {symbol: bar.trade_date for symbol, bar in get_latest_bars(session, stock_list).items()}
 
-    # 在session外部处理
     logger.info(f"开始更新 {len(stock_list)} 只股票的最新数据...")
 
-    total_new = 0
-    success_count = 0
+    client = get_longport_client()
 
-    for i, (symbol, name) in enumerate(stock_list, 1):
-        logger.info(f"[{i}/{len(stock_list)}] 更新 {symbol} - {name}")
+    def fetch(symbol):
+        return client.get_candlesticks(symbol, 'day', count=days)
 
-        new_count = update_stock_latest_data(symbol, name, days)
+    def convert(symbol, candles):
+        # 只保留比最新数据日期新的K线
+        frame = candles_to_frame(symbol, candles)
+        latest_date = latest_dates.get(symbol)
+        if latest_date is not None and not frame.empty:
+            frame = frame[frame['trade_date'] > latest_date]
+        return frame
 
-        if new_count > 0:
-            total_new += new_count
-            success_count += 1
+    # 已存在的记录保留不覆盖
+    pipeline = IngestPipeline(db_manager, fetch, convert, update=False, workers=workers)
+    result = pipeline.run(stock_list)
 
     print("\n" + "=" * 60)
     print("✅ 更新完成！")
     print("=" * 60)
     print(f"总股票数: {len(stock_list)}")
-    print(f"有更新的股票: {success_count}")
-    print(f"新增数据条数: {total_new}")
+    print(f"有更新的股票: {len(stock_list) - len(result['empty']) - len(result['failed'])}")
+    print(f"失败: {len(result['failed'])}")
+    print(f"新增数据条数: {result['saved']}")
+    print(f"用时: {result['elapsed']:.1f} 秒")
     print("=" * 60 + "\n")
 
 
@@ -178,6 +186,7 @@ def main():
     parser.add_argument('--market', default='HK', help='市场代码 (HK/US/CN)')
     parser.add_argument('--symbol', help='指定股票代码（可选）')
     parser.add_argument('--days', type=int, default=7, help='获取最近几天的数据（默认7天）')
+    parser.add_argument('--workers', type=int, default=8, help='并发抓取线程数（默认8）')
     
     args = parser.parse_args()
     
@@ -200,7 +209,7 @@ def main():
     
     if args.symbol:
         # 更新单只股票
-        with db_manager.get_session() as session:
+        with db_manager.get_session(db_manager.market_of(args.symbol)) as session:
             stock = session.query(StockInfo).filter_by(symbol=args.symbol).first()
 
             if not stock:
@@ -222,7 +231,7 @@ def main():
         print("=" * 60 + "\n")
     else:
         # 更新所有股票
-        update_all_latest_data(args.market, args.days)
+        update_all_latest_data(args.market, args.days, args.workers)
     
     # 更新完成后，计算技术指标
     print("💡 提示: 数据更新完成后，建议运行以下命令计算技术指标：")
@@ -23,7 +23,7 @@ def main():
     init_database(config_loader.config)
     db_manager = get_db_manager()
     
-    with db_manager.get_session() as session:
+    with db_manager.get_session('CN') as session:
         # 获取最新交易日期
         latest_date = session.query(func.max(DailyData.trade_date)).filter(
             (DailyData.symbol.like('%.SH')) | (DailyData.symbol.like('%.SZ'))
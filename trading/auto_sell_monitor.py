@@ -10,7 +10,8 @@ from datetime import datetime, date
 from typing import Dict, List
 from loguru import logger
 
-from database.models import Position, TradingSignal, DailyData, TechnicalIndicator
+from database.models import Position, TradingSignal
+from database.latest_bars import load_latest_bars, load_latest_prices
 from trading.auto_sell_strategy import CompositeStrategy
 
 
@@ -44,15 +45,20 @@ class AutoSellMonitor:
             
             logger.info(f"检查 {len(positions)} 个持仓...")
             
+            # 一次读取所有持仓的最新价格和技术指标
+            symbols = [pos.symbol for pos in positions]
+            prices = load_latest_prices(self.db, symbols)
+            bars = load_latest_bars(self.db, symbols)
+            
             for pos in positions:
                 # 获取当前价格
-                current_price = self._get_latest_price(session, pos.symbol)
+                current_price = prices.get(pos.symbol)
                 if not current_price:
                     logger.warning(f"{pos.symbol}: 无法获取最新价格，跳过")
                     continue
                 
                 # 获取技术指标
-                indicators = self._get_latest_indicators(session, pos.symbol)
+                indicators = self._get_latest_indicators(bars.get(pos.symbol))
                 
                 # 构造持仓信息
                 position_info = {
@@ -115,69 +121,55 @@ class AutoSellMonitor:
         count = 0
         today = date.today()
         
-        with self.db.get_session() as session:
-            for sig in sell_signals:
-                # 检查是否已有今日该股票的卖出信号
-                existing = session.query(TradingSignal).filter(
-                    TradingSignal.symbol == sig['symbol'],
+        # 持仓可能分属多个市场，按股票所在市场分别写入
+        by_symbol = {sig['symbol']: sig for sig in sell_signals}
+        for market, symbols in self.db.group_by_market(list(by_symbol)).items():
+            with self.db.get_session(market) as session:
+                # 今日已有卖出信号的股票（含已执行的；每天每个方向只有一个信号）
+                existing = {row.symbol for row in session.query(TradingSignal.symbol).filter(
                     TradingSignal.signal_date == today,
-                    TradingSignal.signal_type == 'SELL',
-                    TradingSignal.is_executed == False
-                ).first()
-                
-                if existing:
-                    logger.debug(f"{sig['symbol']}: 今日已有卖出信号，跳过")
-                    continue
-                
-                # 创建新信号
-                signal = TradingSignal(
-                    symbol=sig['symbol'],
-                    signal_date=today,
-                    signal_type='SELL',
-                    signal_strength=1.0,  # 自动卖出信号强度为1.0
-                    signal_price=sig['current_price'],
-                    source='auto_sell_monitor',
-                    reason=', '.join(sig['reasons'])
-                )
-                session.add(signal)
-                count += 1
-            
-            session.commit()
+                    TradingSignal.signal_type == 'SELL'
+                )}
+
+                for symbol in symbols:
+                    if symbol in existing:
+                        logger.debug(f"{symbol}: 今日已有卖出信号，跳过")
+                        continue
+                    sig = by_symbol[symbol]
+
+                    # 创建新信号
+                    signal = TradingSignal(
+                        symbol=symbol,
+                        signal_date=today,
+                        signal_type='SELL',
+                        signal_strength=1.0,  # 自动卖出信号强度为1.0
+                        signal_price=sig['current_price'],
+                        source='auto_sell_monitor',
+                        reason=', '.join(sig['reasons'])
+                    )
+                    session.add(signal)
+                    count += 1
+
+                session.commit()
         
         return count
     
-    def _get_latest_price(self, session, symbol: str) -> float:
-        """获取最新价格"""
-        row = session.query(DailyData).filter(
-            DailyData.symbol == symbol
-        ).order_by(DailyData.trade_date.desc()).first()
-        
-        return row.close if row else None
-    
-    def _get_latest_indicators(self, session, symbol: str) -> Dict:
-        """获取最新技术指标"""
-        # 获取最近两天的指标（用于判断MACD死叉等）
-        rows = session.query(TechnicalIndicator).filter(
-            TechnicalIndicator.symbol == symbol
-        ).order_by(TechnicalIndicator.trade_date.desc()).limit(2).all()
-        
-        if not rows:
+    def _get_latest_indicators(self, bar) -> Dict:
+        """从最新行情快照取技术指标（含前一日MACD，用于判断死叉等）"""
+        if bar is None or bar.indicator_date is None:
             return {}
         
-        latest = rows[0]
-        prev = rows[1] if len(rows) > 1 else None
-        
         indicators = {
-            'rsi': latest.rsi,
-            'macd': latest.macd,
-            'macd_signal': latest.macd_signal,
-            'kdj_k': latest.kdj_k,
-            'kdj_d': latest.kdj_d,
+            'rsi': bar.rsi,
+            'macd': bar.macd,
+            'macd_signal': bar.macd_signal,
+            'kdj_k': bar.kdj_k,
+            'kdj_d': bar.kdj_d,
         }
         
-        if prev:
-            indicators['prev_macd'] = prev.macd
-            indicators['prev_signal'] = prev.macd_signal
+        if bar.prev_macd is not None or bar.prev_macd_signal is not None:
+            indicators['prev_macd'] = bar.prev_macd
+            indicators['prev_signal'] = bar.prev_macd_signal
         
         return indicators
 
@@ -54,8 +54,8 @@ class AutoTrader:
             待执行信号列表
         """
         today = date.today()
-        
-        with self.db.get_session() as session:
+
+        def query(session):
             # 查询今日未执行的信号
             signals = session.query(TradingSignal).filter(
                 and_(
@@ -80,6 +80,9 @@ class AutoTrader:
                 ))
             
             return result
+
+        # 按市场分库时各市场的信号分别存放，并行读取后合并
+        return [sig for signals in self.db.fan_out(query).values() for sig in signals]
     
     def execute_signal(self, signal: TradingSignal) -> bool:
         """
@@ -136,7 +139,7 @@ class AutoTrader:
             logger.info(f"✅ 买入成功: {signal.symbol} | {result}")
             
             # 标记信号已执行
-            self._mark_signal_executed(signal.id)
+            self._mark_signal_executed(signal.id, signal.symbol)
             
             return True
             
@@ -178,7 +181,7 @@ class AutoTrader:
             logger.info(f"✅ 卖出成功: {signal.symbol} | {result}")
             
             # 标记信号已执行
-            self._mark_signal_executed(signal.id)
+            self._mark_signal_executed(signal.id, signal.symbol)
             
             return True
             
@@ -186,15 +189,16 @@ class AutoTrader:
             logger.error(f"卖出失败 {signal.symbol}: {e}")
             return False
     
-    def _mark_signal_executed(self, signal_id: int):
+    def _mark_signal_executed(self, signal_id: int, symbol: str = None):
         """
         标记信号已执行
         
         Args:
             signal_id: 信号ID
+            symbol: 股票代码（按市场分库时确定信号所在的库）
         """
         try:
-            with self.db.get_session() as session:
+            with self.db.get_session(self.db.market_of(symbol) if symbol else None) as session:
                 signal = session.query(TradingSignal).filter_by(id=signal_id).first()
                 if signal:
                     signal.is_executed = True
@@ -6,6 +6,7 @@ from datetime import datetime
 from loguru import logger
 from longport.openapi import TradeContext, OrderSide, OrderType, TimeInForceType
 
+from utils.rate_limiter import get_rate_limiter
 from .trading_engine import TradingEngine
 
 
@@ -25,6 +26,7 @@ class LongPortPaperEngine(TradingEngine):
         self.db = db_manager
         self.config = config
         self.trade_ctx = None
+        self.rate_limiter = get_rate_limiter()
 
         # 风控参数
         self.risk_config = config.get('trading', {}).get('risk', {})
@@ -54,10 +56,9 @@ class LongPortPaperEngine(TradingEngine):
         return self.initial_cash, 0.0, self.initial_cash
 
     def _get_latest_price(self, session, symbol: str):
-        """获取最新价格"""
-        from database.models import DailyData
-        row = session.query(DailyData).filter(DailyData.symbol == symbol).order_by(DailyData.trade_date.desc()).first()
-        return row.close if row else None
+        """获取最新价格（读取最新行情快照表）"""
+        from database.latest_bars import load_latest_prices
+        return load_latest_prices(self.db, [symbol]).get(symbol)
 
     def _get_lot_size(self, symbol: str) -> int:
         """
@@ -162,6 +163,7 @@ class LongPortPaperEngine(TradingEngine):
                 lp_type = OrderType.LO if order_type == 'LIMIT' else OrderType.MO
 
                 # 提交订单到 LongPort
+                self.rate_limiter.acquire('longport_trade')
                 resp = self.trade_ctx.submit_order(
                     symbol=symbol,
                     order_type=lp_type,
@@ -222,6 +224,7 @@ class LongPortPaperEngine(TradingEngine):
                     raise ValueError(f'订单不存在或无外部订单ID：{order_id}')
                 
                 # 从 LongPort 查询订单详情
+                self.rate_limiter.acquire('longport_trade')
                 lp_order = self.trade_ctx.order_detail(order.external_order_id)
                 
                 # 更新本地订单状态
@@ -263,6 +266,7 @@ class LongPortPaperEngine(TradingEngine):
                     raise ValueError(f'订单不存在或无外部订单ID：{order_id}')
                 
                 # 调用 LongPort 撤单
+                self.rate_limiter.acquire('longport_trade')
                 self.trade_ctx.cancel_order(order.external_order_id)
                 
                 # 更新本地状态
@@ -285,6 +289,7 @@ class LongPortPaperEngine(TradingEngine):
         """
         try:
             # 从 LongPort 获取持仓
+            self.rate_limiter.acquire('longport_trade')
             positions = self.trade_ctx.stock_positions()
             
             result = []
@@ -316,6 +321,7 @@ class LongPortPaperEngine(TradingEngine):
         """
         try:
             # 获取账户余额
+            self.rate_limiter.acquire('longport_trade')
             balances = self.trade_ctx.account_balance()
             
             # 通常返回多个币种，这里取第一个（或根据需要筛选）
@@ -357,6 +363,7 @@ class LongPortPaperEngine(TradingEngine):
                     
                     try:
                         # 从 LongPort 查询订单详情
+                        self.rate_limiter.acquire('longport_trade')
                         lp_order = self.trade_ctx.order_detail(order.external_order_id)
                         
                         # 更新本地订单状态
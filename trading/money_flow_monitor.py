@@ -10,6 +10,7 @@ from sqlalchemy import func
 from data_collection.longport_client import LongPortClient
 from database.db_manager import DatabaseManager
 from database.models import StockInfo, MinuteData, MoneyFlowAlert, TradingSignal
+from database.minute_archive import rollup_minute_data, archive_minute_data
 from utils.logger import logger
 from utils.email_notifier import EmailNotifier
 
@@ -35,6 +36,7 @@ class MoneyFlowMonitor:
         self.enabled = monitor_config.get('enabled', False)
         self.interval = monitor_config.get('interval', 60)  # 监控间隔（秒）
         self.lookback_minutes = monitor_config.get('lookback_minutes', 30)  # 回溯分钟数
+        self.market = monitor_config.get('market', 'HK')  # 监控市场（按市场分库时会话路由到该市场的库）
         
         # 告警阈值
         self.volume_ratio_threshold = monitor_config.get('volume_ratio_threshold', 3.0)  # 成交量倍数阈值
@@ -54,6 +56,9 @@ class MoneyFlowMonitor:
         
         # 监控股票列表
         self.watch_list: List[str] = []
+
+        # 上次执行分钟数据归档的日期（每天一次）
+        self.archived_date = None
         
         # 缓存：用于存储历史数据，避免频繁查询数据库
         self.minute_data_cache: Dict[str, List[MinuteData]] = defaultdict(list)
@@ -72,12 +77,12 @@ class MoneyFlowMonitor:
             logger.info(f"加载监控列表: {len(symbols)} 只股票")
         else:
             # 从数据库加载所有港股通股票
-            with self.db.get_session() as session:
+            with self.db.get_session(self.market) as session:
                 from database.models import StockInfo
 
                 # 获取所有港股通股票
                 stocks = session.query(StockInfo).filter(
-                    StockInfo.market == 'HK',
+                    StockInfo.market == self.market,
                     StockInfo.is_hk_connect == True
                 ).all()
 
@@ -138,21 +143,13 @@ class MoneyFlowMonitor:
             return
 
         try:
-            with self.db.get_session() as session:
-                for data_dict in minute_data_list:
-                    # 检查是否已存在
-                    existing = session.query(MinuteData).filter(
-                        MinuteData.symbol == data_dict['symbol'],
-                        MinuteData.trade_datetime == data_dict['trade_datetime']
-                    ).first()
+            self.db.bulk_upsert(MinuteData, minute_data_list, key=('symbol', 'trade_datetime'))
+            logger.debug(f"保存 {len(minute_data_list)} 条分钟数据")
 
-                    if not existing:
-                        # 从字典创建ORM对象
-                        data = MinuteData(**data_dict)
-                        session.add(data)
-
-                session.commit()
-                logger.debug(f"保存 {len(minute_data_list)} 条分钟数据")
+            # 重算受影响时段的多周期汇总K线
+            symbols = sorted({item['symbol'] for item in minute_data_list})
+            times = [item['trade_datetime'] for item in minute_data_list]
+            rollup_minute_data(self.db, symbols, min(times), max(times))
 
         except Exception as e:
             logger.error(f"保存分钟数据失败: {e}")
@@ -255,7 +252,7 @@ class MoneyFlowMonitor:
         """
         # 获取股票名称
         stock_name = ''
-        with self.db.get_session() as session:
+        with self.db.get_session(self.market) as session:
             stock = session.query(StockInfo).filter(StockInfo.symbol == indicators['symbol']).first()
             if stock:
                 stock_name = stock.name
@@ -286,7 +283,7 @@ class MoneyFlowMonitor:
             alert: 告警记录
         """
         try:
-            with self.db.get_session() as session:
+            with self.db.get_session(self.market) as session:
                 # 检查是否已存在相同告警（5分钟内）
                 recent_time = alert.alert_datetime - timedelta(minutes=5)
                 existing = session.query(MoneyFlowAlert).filter(
@@ -321,19 +318,18 @@ class MoneyFlowMonitor:
         count = 0
         today = datetime.now().date()
 
-        with self.db.get_session() as session:
-            for alert in alerts:
-                # 检查是否已有今日买入信号
-                existing = session.query(TradingSignal).filter(
-                    TradingSignal.symbol == alert.symbol,
-                    TradingSignal.signal_date == today,
-                    TradingSignal.signal_type == 'BUY',
-                    TradingSignal.is_executed == False
-                ).first()
+        with self.db.get_session(self.market) as session:
+            # 今日已有买入信号的股票（含已执行的；每天每个方向只有一个信号）
+            existing = {row.symbol for row in session.query(TradingSignal.symbol).filter(
+                TradingSignal.signal_date == today,
+                TradingSignal.signal_type == 'BUY'
+            )}
 
-                if existing:
+            for alert in alerts:
+                if alert.symbol in existing:
                     logger.debug(f"今日已有买入信号，跳过: {alert.symbol}")
                     continue
+                existing.add(alert.symbol)
 
                 # 计算信号强度（基于成交量和成交额倍数）
                 strength = min(1.0, (alert.volume_ratio + alert.turnover_ratio) / 10.0)
@@ -390,7 +386,7 @@ class MoneyFlowMonitor:
 
         if success:
             # 更新发送状态
-            with self.db.get_session() as session:
+            with self.db.get_session(self.market) as session:
                 for alert in alerts:
                     db_alert = session.query(MoneyFlowAlert).filter(
                         MoneyFlowAlert.id == alert.id
@@ -400,6 +396,20 @@ class MoneyFlowMonitor:
                         db_alert.sent_at = datetime.now()
                 session.commit()
 
+    def archive_expired_minute_data(self):
+        """每天一次：归档并删除超过保留期的分钟数据"""
+        today = datetime.now().date()
+        if self.archived_date == today:
+            return
+
+        try:
+            count = archive_minute_data(self.db)
+            if count:
+                logger.info(f"已归档 {count} 条过期分钟数据")
+            self.archived_date = today
+        except Exception as e:
+            logger.error(f"归档分钟数据失败: {e}")
+
     def monitor_once(self):
         """执行一次监控"""
         if not self.watch_list:
@@ -444,9 +454,6 @@ class MoneyFlowMonitor:
                         f"价格变动: {indicators['price_change_pct']:+.2f}%"
                     )
 
-                # 避免请求过快
-                time.sleep(0.5)
-
             except Exception as e:
                 logger.error(f"监控股票失败 {symbol}: {e}")
                 continue
@@ -493,6 +500,7 @@ class MoneyFlowMonitor:
         try:
             while True:
                 logger.info(f"\n[{datetime.now().strftime('%H:%M:%S')}] 执行监控...")
+                self.archive_expired_minute_data()
                 self.monitor_once()
 
                 # 等待下一次监控
@@ -7,7 +7,8 @@ from typing import Dict, List, Any
 from sqlalchemy import and_
 
 from database.db_manager import DatabaseManager
-from database.models import Position, TradingSignal, DailyData
+from database.models import Position, TradingSignal
+from database.latest_bars import load_latest_prices
 from trading.auto_sell_strategy import TakeProfitStrategy, StopLossStrategy, TrailingStopStrategy, CompositeStrategy
 from utils.logger import logger
 
@@ -75,30 +76,37 @@ class ProfitMonitor:
         Returns:
             最新价格，如果没有则返回None
         """
-        with self.db.get_session() as session:
-            latest = session.query(DailyData).filter(
-                DailyData.symbol == symbol
-            ).order_by(DailyData.trade_date.desc()).first()
+        return self.get_latest_prices([symbol]).get(symbol)
+    
+    def get_latest_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        批量获取最新价格（读取最新行情快照表）
+        
+        Args:
+            symbols: 股票代码列表
             
-            if latest:
-                return latest.close
-            return None
+        Returns:
+            symbol -> 最新价格（没有数据的股票不在结果中）
+        """
+        return load_latest_prices(self.db, symbols)
     
-    def check_position(self, position: Position) -> tuple:
+    def check_position(self, position: Position, current_price: float = None) -> tuple:
         """
         检查单个持仓是否需要卖出
         
         Args:
             position: 持仓信息
+            current_price: 当前价格，为空时查询最新价格
             
         Returns:
-            (是否卖出, 原因列表)
+            (是否卖出, 原因列表, 当前价格)
         """
         # 获取当前价格
-        current_price = self.get_latest_price(position.symbol)
+        if current_price is None:
+            current_price = self.get_latest_price(position.symbol)
         if not current_price:
             logger.warning(f"{position.symbol}: 无法获取最新价格")
-            return False, []
+            return False, [], None
         
         # 构造持仓信息
         position_info = {
@@ -128,14 +136,13 @@ class ProfitMonitor:
         today = date.today()
         
         try:
-            with self.db.get_session() as session:
-                # 检查是否已有今日卖出信号
+            with self.db.get_session(self.db.market_of(position.symbol)) as session:
+                # 检查是否已有今日卖出信号（含已执行的；每天每个方向只有一个信号）
                 existing = session.query(TradingSignal).filter(
                     and_(
                         TradingSignal.symbol == position.symbol,
                         TradingSignal.signal_date == today,
-                        TradingSignal.signal_type == 'SELL',
-                        TradingSignal.is_executed == False
+                        TradingSignal.signal_type == 'SELL'
                     )
                 ).first()
                 
@@ -183,10 +190,13 @@ class ProfitMonitor:
         
         logger.info(f"检查 {len(positions)} 个持仓...")
         
+        # 一次读取所有持仓的最新价格
+        prices = self.get_latest_prices([p.symbol for p in positions])
+        
         # 检查每个持仓
         signal_count = 0
         for position in positions:
-            should_sell, reasons, current_price = self.check_position(position)
+            should_sell, reasons, current_price = self.check_position(position, prices.get(position.symbol))
             
             if should_sell:
                 logger.info(f"🔔 {position.symbol} 触发卖出: {', '.join(reasons)}")
@@ -51,6 +51,9 @@ class RealtimeSignalMonitor:
         
         # 监控间隔（秒）
         self.check_interval = config.get('check_interval', 60)  # 默认60秒
+
+        # 买入信号所在市场（按市场分库时读取该市场的选股结果）
+        self.market = config.get('market', 'HK')
         
         # 是否运行
         self.running = False
@@ -155,36 +158,38 @@ class RealtimeSignalMonitor:
             count = 0
             today = date.today()
             
-            with self.db.get_session() as session:
-                for sig in sell_signals:
-                    # 检查是否已有今日卖出信号
-                    existing = session.query(TradingSignal).filter(
-                        TradingSignal.symbol == sig['symbol'],
+            # 持仓可能分属多个市场，按股票所在市场分别写入
+            by_symbol = {sig['symbol']: sig for sig in sell_signals}
+            for market, symbols in self.db.group_by_market(list(by_symbol)).items():
+                with self.db.get_session(market) as session:
+                    # 今日已有卖出信号的股票（含已执行的；每天每个方向只有一个信号）
+                    existing = {row.symbol for row in session.query(TradingSignal.symbol).filter(
                         TradingSignal.signal_date == today,
-                        TradingSignal.signal_type == 'SELL',
-                        TradingSignal.is_executed == False
-                    ).first()
-                    
-                    if existing:
-                        logger.debug(f"{sig['symbol']}: 今日已有卖出信号，跳过")
-                        continue
-                    
-                    # 创建卖出信号
-                    signal = TradingSignal(
-                        symbol=sig['symbol'],
-                        signal_date=today,
-                        signal_type='SELL',
-                        signal_strength=sig.get('strength', 0.8),
-                        signal_price=sig.get('current_price'),
-                        source='realtime_monitor',
-                        reason='; '.join(sig.get('reasons', []))
-                    )
-                    session.add(signal)
-                    count += 1
-                    
-                    logger.info(f"🔴 生成卖出信号: {sig['symbol']} - {sig.get('reasons', [])}")
-                
-                session.commit()
+                        TradingSignal.signal_type == 'SELL'
+                    )}
+
+                    for symbol in symbols:
+                        sig = by_symbol[symbol]
+                        if symbol in existing:
+                            logger.debug(f"{symbol}: 今日已有卖出信号，跳过")
+                            continue
+
+                        # 创建卖出信号
+                        signal = TradingSignal(
+                            symbol=symbol,
+                            signal_date=today,
+                            signal_type='SELL',
+                            signal_strength=sig.get('strength', 0.8),
+                            signal_price=sig.get('current_price'),
+                            source='realtime_monitor',
+                            reason='; '.join(sig.get('reasons', []))
+                        )
+                        session.add(signal)
+                        count += 1
+
+                        logger.info(f"🔴 生成卖出信号: {symbol} - {sig.get('reasons', [])}")
+
+                    session.commit()
             
             return count
             
@@ -212,7 +217,7 @@ class RealtimeSignalMonitor:
             
             count = 0
             
-            with self.db.get_session() as session:
+            with self.db.get_session(self.market) as session:
                 # 检查当前持仓数
                 current_positions = session.query(Position).filter(
                     Position.quantity > 0
@@ -231,6 +236,12 @@ class RealtimeSignalMonitor:
                     StockSelection.total_score >= min_score
                 ).order_by(StockSelection.rank).all()
                 
+                # 今日已有买入信号的股票（含已执行的；每天每个方向只有一个信号）
+                existing = {row.symbol for row in session.query(TradingSignal.symbol).filter(
+                    TradingSignal.signal_date == today,
+                    TradingSignal.signal_type == 'BUY'
+                )}
+                
                 for sel in selections[:available_slots * 2]:  # 多查一些备选
                     # 检查是否已持有
                     pos = session.query(Position).filter_by(symbol=sel.symbol).first()
@@ -238,15 +249,9 @@ class RealtimeSignalMonitor:
                         continue
                     
                     # 检查是否已有今日买入信号
-                    existing = session.query(TradingSignal).filter(
-                        TradingSignal.symbol == sel.symbol,
-                        TradingSignal.signal_date == today,
-                        TradingSignal.signal_type == 'BUY',
-                        TradingSignal.is_executed == False
-                    ).first()
-                    
-                    if existing:
+                    if sel.symbol in existing:
                         continue
+                    existing.add(sel.symbol)
                     
                     # 获取实时价格（可选）
                     # current_price = self._get_realtime_price(sel.symbol)
@@ -90,23 +90,16 @@ class MinuteScheduler:
         - Execute strategy signals (TradingSignal) for HK market (BUY/SELL)
         """
         from database import get_db_manager
-        from database.models import PortfolioSnapshot, Position, DailyData, TradingSignal
+        from database.models import PortfolioSnapshot, Position, TradingSignal
+        from database.latest_bars import load_latest_prices
         from datetime import datetime as _d
         from trading.engine_factory import get_trading_engine
 
-        def _latest_price(session, symbol: str):
-            row = (
-                session.query(DailyData)
-                .filter(DailyData.symbol == symbol)
-                .order_by(DailyData.trade_date.desc())
-                .first()
-            )
-            return row.close if row else None
-
         db = get_db_manager()
         engine = get_trading_engine()
 
-        with db.get_session() as session:
+        # 只执行港股信号，会话路由到港股的库（持仓、组合快照在共享的核心库）
+        with db.get_session('HK') as session:
             # 1) snapshot
             last = (
                 session.query(PortfolioSnapshot)
@@ -115,8 +108,10 @@ class MinuteScheduler:
             )
             cash = last.cash if last else 1_000_000.0
             equity = 0.0
-            for p in session.query(Position).all():
-                lp = _latest_price(session, p.symbol)
+            positions = session.query(Position).all()
+            prices = load_latest_prices(db, [p.symbol for p in positions])
+            for p in positions:
+                lp = prices.get(p.symbol)
                 price = (lp if lp is not None else p.avg_price) or 0.0
                 equity += (p.quantity or 0) * price
             total = cash + equity
@@ -142,6 +137,11 @@ class MinuteScheduler:
                     'source': sig.source
                 })
 
+            # 一次读取所有信号标的的最新价格
+            signal_prices = load_latest_prices(
+                db, [d['symbol'] for d in signal_data_list if d['symbol'].endswith('.HK')]
+            )
+
             for sig_data in signal_data_list:
                 sig_id = sig_data['id']
                 symbol = sig_data['symbol']
@@ -152,7 +152,7 @@ class MinuteScheduler:
                 if not symbol.endswith('.HK'):
                     continue
 
-                mkt_price = _latest_price(session, symbol)
+                mkt_price = signal_prices.get(symbol)
                 if not mkt_price:
                     continue
 
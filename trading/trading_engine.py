@@ -65,15 +65,10 @@ class LocalPaperEngine(TradingEngine):
         logger.info("本地Paper Trading引擎初始化完成")
     
     def _get_latest_price(self, session, symbol: str) -> Optional[float]:
-        """获取最新价格"""
-        from database.models import DailyData
-        row = (
-            session.query(DailyData)
-            .filter(DailyData.symbol == symbol)
-            .order_by(DailyData.trade_date.desc())
-            .first()
-        )
-        return float(row.close) if row else None
+        """获取最新价格（读取最新行情快照表）"""
+        from database.latest_bars import load_latest_prices
+        price = load_latest_prices(self.db, [symbol]).get(symbol)
+        return float(price) if price is not None else None
     
     def _get_portfolio_state(self, session):
         """获取组合状态"""
@@ -86,10 +81,13 @@ class LocalPaperEngine(TradingEngine):
         )
         cash = snapshot.cash if snapshot else self.initial_cash
         
+        from database.latest_bars import load_latest_prices
+        
         positions = session.query(Position).all()
+        prices = load_latest_prices(self.db, [p.symbol for p in positions])
         equity = 0.0
         for p in positions:
-            last_price = self._get_latest_price(session, p.symbol) or p.avg_price or 0.0
+            last_price = prices.get(p.symbol) or p.avg_price or 0.0
             equity += (p.quantity or 0) * last_price
         
         total_value = cash + equity
@@ -0,0 +1,122 @@
+"""
+多进程分片执行工具
+
+把股票列表切成分片交给进程池计算，结果在主进程逐个返回，由主进程统一写库，
+避免多个进程同时写 SQLite 产生锁冲突。每个工作进程启动时独立加载配置并创建自己的数据库引擎。
+"""
+import sys
+import time
+import traceback
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from loguru import logger
+
+
+# 分片执行结果：index 分片序号，items 分片内容，result 返回值，error 失败信息，elapsed 工作进程内耗时（秒）
+ShardResult = namedtuple('ShardResult', ['index', 'items', 'result', 'error', 'elapsed'])
+
+
+def split_shards(items, shard_size):
+    """
+    按固定大小切分列表（分片数多于进程数时负载更均衡）
+
+    Args:
+        items: 待切分的列表
+        shard_size: 每个分片的元素数
+
+    Returns:
+        list: 分片列表
+    """
+    shard_size = max(1, int(shard_size))
+    return [items[start:start + shard_size] for start in range(0, len(items), shard_size)]
+
+
+def init_worker(config_dir):
+    """
+    工作进程初始化：加载配置、设置控制台日志、创建独立的数据库引擎
+
+    Args:
+        config_dir: 配置文件目录
+    """
+    from utils.config_loader import init_config
+    from database import init_database
+
+    config = init_config(config_dir=config_dir).config
+
+    # 工作进程只输出到控制台，日志文件由主进程写入
+    log_config = config.get('logging', {})
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        format='{time:YYYY-MM-DD HH:mm:ss} | {level} | [worker {process}] {message}',
+        level=log_config.get('level', 'INFO')
+    )
+
+    init_database(config)
+
+
+def _run_shard(func, index, items, args):
+    """在工作进程中执行单个分片并计时（异常转为错误信息返回）"""
+    start = time.perf_counter()
+    try:
+        result = func(items, *args)
+        return ShardResult(index, items, result, None, time.perf_counter() - start)
+    except Exception as e:
+        error = f"{e}\n{traceback.format_exc()}"
+        return ShardResult(index, items, None, error, time.perf_counter() - start)
+
+
+def run_sharded(func, shards, workers, *args, config_dir=None):
+    """
+    用进程池并行执行分片，按完成顺序返回结果
+
+    func 必须是模块级函数（可被 pickle），签名为 func(items, *args)，只做读取和计算；
+    写库由调用方在主进程中对返回的结果进行。
+
+    Args:
+        func: 分片计算函数
+        shards: 分片列表
+        workers: 进程数
+        *args: 传给 func 的额外参数
+        config_dir: 配置文件目录，默认使用主进程已加载的配置目录
+
+    Yields:
+        ShardResult: 分片结果（失败时 error 非空）
+    """
+    if config_dir is None:
+        from utils.config_loader import get_config_loader
+        config_dir = str(get_config_loader().config_dir)
+
+    total = len(shards)
+    workers = max(1, min(workers, total))
+    failed = 0
+    start = time.perf_counter()
+
+    logger.info(f"启动 {workers} 个工作进程，共 {total} 个分片")
+
+    # spawn 方式启动：子进程不继承主进程的数据库连接
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_worker, initargs=(config_dir,)) as executor:
+        futures = [executor.submit(_run_shard, func, i, shard, args) for i, shard in enumerate(shards)]
+
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                shard_result = future.result()
+            except Exception as e:
+                # 工作进程异常退出等无法在分片内捕获的错误
+                index = futures.index(future)
+                shard_result = ShardResult(index, shards[index], None, str(e), 0.0)
+
+            if shard_result.error:
+                failed += 1
+                logger.error(f"[{done}/{total}] 分片 {shard_result.index} 失败"
+                             f"（{len(shard_result.items)} 只）: {shard_result.error}")
+            else:
+                logger.info(f"[{done}/{total}] 分片 {shard_result.index} 完成"
+                            f"（{len(shard_result.items)} 只，耗时 {shard_result.elapsed:.1f} 秒）")
+
+            yield shard_result
+
+    logger.info(f"并行计算结束：成功 {total - failed}/{total} 个分片，总耗时 {time.perf_counter() - start:.1f} 秒")
@@ -0,0 +1,262 @@
+"""
+API频率限制（滑动窗口）
+
+每类接口一个限流窗口（如 longport_quote / longport_candlesticks / longport_history / longport_trade / tushare），
+窗口内的请求时间戳保存在 state_dir 下的小文件中，取额度时对文件加锁，
+因此同一台机器上的多个线程和多个进程共享同一份额度。
+
+窗口按"任意 period 秒内不超过 limit 次"配置：文件中保留最近 period 秒内的请求时间，
+不足 limit 次时立即放行，否则等到最早的请求移出窗口，请求速率可以用满接口允许的上限。
+窗口可以指定 parent，取额度时同时占用上级窗口的额度（如长桥的K线接口同时占用行情接口的总额度）。
+
+    limiter = get_rate_limiter()
+    limiter.acquire('longport_quote')
+"""
+import os
+import struct
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# 默认的窗口配置（依据各接口文档的频率限制）
+DEFAULT_BUCKETS = {
+    # 长桥行情接口：1秒内不超过10次
+    'longport_quote': {'limit': 10, 'period': 1.0},
+    'longport_candlesticks': {'limit': 10, 'period': 1.0, 'parent': 'longport_quote'},
+    'longport_history': {'limit': 10, 'period': 1.0, 'parent': 'longport_quote'},
+    # 长桥交易接口：30秒内不超过30次
+    'longport_trade': {'limit': 30, 'period': 30.0},
+    # Tushare：每分钟不超过200次
+    'tushare': {'limit': 200, 'period': 60.0},
+}
+
+# 默认状态目录
+DEFAULT_STATE_DIR = './data/rate_limits'
+
+# 状态文件格式：按时间顺序排列的请求时间戳
+_STAMP = struct.Struct('d')
+
+
+class SlidingWindow:
+    """跨线程、跨进程共享的滑动窗口限流"""
+
+    def __init__(self, name: str, limit: int, period: float = 1.0,
+                 state_dir: str = DEFAULT_STATE_DIR):
+        """
+        Args:
+            name: 窗口名称（同名的窗口共享状态）
+            limit: 任意 period 秒内最多请求次数
+            period: 窗口长度（秒）
+            state_dir: 状态文件目录
+        """
+        if limit < 1 or period <= 0:
+            raise ValueError(f"限流窗口 {name} 配置错误: limit={limit}, period={period}")
+
+        self.name = name
+        self.limit = int(limit)
+        self.period = float(period)
+        self.path = os.path.join(state_dir, f'{name}.window')
+        self._lock = threading.Lock()
+
+        os.makedirs(state_dir, exist_ok=True)
+        # 追加模式创建即可，不截断其他进程已写入的状态
+        with open(self.path, 'ab'):
+            pass
+
+    def __repr__(self):
+        return f"<SlidingWindow(name='{self.name}', limit={self.limit}, period={self.period:g}s)>"
+
+    def _wait(self, file, tokens: int, now: float) -> float:
+        """
+        清理过期的请求，返回还需等待的秒数（0 表示可以放行）
+
+        需在 _locked 内调用；清理后的时间戳暂存在 _stamps，由 _commit 写回
+        """
+        file.seek(0)
+        data = file.read()
+        count = len(data) // _STAMP.size
+        self._stamps = sorted(t for t in struct.unpack(f'{count}d', data[:count * _STAMP.size])
+                              if t > now - self.period)
+        if len(self._stamps) + tokens <= self.limit:
+            return 0.0
+        # 等到足够多的早期请求移出窗口
+        return max(self._stamps[len(self._stamps) + tokens - self.limit - 1] + self.period - now, 1e-3)
+
+    def _commit(self, file, tokens: int, now: float):
+        """登记本次请求（tokens 为 0 时只写回清理后的时间戳）"""
+        stamps = self._stamps + [now] * tokens
+        file.seek(0)
+        file.write(struct.pack(f'{len(stamps)}d', *stamps))
+        file.truncate()
+        file.flush()
+
+    @contextmanager
+    def _locked(self):
+        """加线程锁和文件锁，返回状态文件"""
+        with self._lock, open(self.path, 'r+b') as file:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, _STAMP.size)
+            try:
+                yield file
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+                else:
+                    file.seek(0)
+                    msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, _STAMP.size)
+
+    def try_acquire(self, tokens: int = 1) -> bool:
+        """
+        不等待地取额度
+
+        Returns:
+            bool: 是否取到
+        """
+        return _try_acquire([self], tokens) == 0
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        取额度，不足时等待
+
+        Args:
+            tokens: 请求次数
+
+        Returns:
+            float: 等待的秒数
+        """
+        return _acquire([self], tokens)
+
+
+def _try_acquire(windows, tokens: int) -> float:
+    """
+    同时锁住一组窗口，全部有额度时一起登记本次请求
+
+    分开取各窗口会让先取的窗口登记的时间早于实际发出请求的时间，上级窗口因此可能超限。
+    窗口按固定顺序（上级在前）加锁，避免死锁。
+
+    Returns:
+        float: 0 表示已放行，否则为还需等待的秒数
+    """
+    for window in windows:
+        if tokens > window.limit:
+            raise ValueError(f"限流窗口 {window.name} 单次请求 {tokens} 超过上限 {window.limit}")
+    with ExitStack() as stack:
+        files = [stack.enter_context(window._locked()) for window in windows]
+        now = time.time()
+        wait = max(window._wait(file, tokens, now) for window, file in zip(windows, files))
+        for window, file in zip(windows, files):
+            window._commit(file, 0 if wait else tokens, now)
+        return wait
+
+
+def _acquire(windows, tokens: int) -> float:
+    """取一组窗口的额度，不足时等待；返回等待的秒数"""
+    waited = 0.0
+    while True:
+        wait = _try_acquire(windows, tokens)
+        if wait == 0:
+            return waited
+        time.sleep(wait)
+        waited += wait
+
+
+class RateLimiter:
+    """按接口类别管理限流窗口"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            config: 频率限制配置（data_collection.rate_limits），包含 state_dir 和 buckets，
+                    buckets 中的项覆盖 DEFAULT_BUCKETS 的同名配置
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.state_dir = config.get('state_dir', DEFAULT_STATE_DIR)
+        self.specs = {name: dict(spec) for name, spec in DEFAULT_BUCKETS.items()}
+        for name, spec in (config.get('buckets') or {}).items():
+            self.specs.setdefault(name, {}).update(spec)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, name: str) -> SlidingWindow:
+        """获取（必要时创建）限流窗口"""
+        with self._lock:
+            if name not in self._buckets:
+                spec = self.specs.get(name)
+                if spec is None:
+                    raise KeyError(f"未配置的频率限制: {name}")
+                self._buckets[name] = SlidingWindow(name, spec['limit'], spec.get('period', 1.0), self.state_dir)
+            return self._buckets[name]
+
+    def acquire(self, name: str, tokens: int = 1) -> float:
+        """
+        按接口类别取额度（与上级窗口一起登记），不足时等待
+
+        Args:
+            name: 接口类别
+            tokens: 请求次数
+
+        Returns:
+            float: 等待的秒数
+        """
+        if not self.enabled:
+            return 0.0
+
+        # 自上级到本级的窗口链，一起加锁登记
+        chain = []
+        current = name
+        while current and current not in chain:
+            chain.insert(0, current)
+            current = self.specs.get(current, {}).get('parent')
+        waited = _acquire([self.bucket(item) for item in chain], tokens)
+        if waited > 1:
+            logger.debug(f"{name} 频率限制等待 {waited:.2f} 秒")
+        return waited
+
+
+# 全局限流器实例
+_rate_limiter = None
+
+
+def init_rate_limiter(config: Optional[Dict[str, Any]] = None) -> RateLimiter:
+    """
+    初始化全局限流器
+
+    Args:
+        config: 完整配置字典（读取 data_collection.rate_limits）
+
+    Returns:
+        RateLimiter实例
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(((config or {}).get('data_collection') or {}).get('rate_limits'))
+    return _rate_limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    获取全局限流器；未初始化时按已加载的配置（没有配置时按默认值）初始化
+
+    Returns:
+        RateLimiter实例
+    """
+    if _rate_limiter is None:
+        from utils.config_loader import get_config_loader
+        try:
+            config = get_config_loader().config
+        except RuntimeError:
+            config = None
+        return init_rate_limiter(config)
+    return _rate_limiter
@@ -25,12 +25,41 @@ def create_app(config):
     # 启用CORS
     CORS(app)
 
+    # SQL分析：按请求统计语句数
+    register_sql_profiling(app)
+
     # 注册路由
     register_routes(app, config)
 
     return app
 
 
+def register_sql_profiling(app):
+    """SQL分析器启用时，把每个请求作为一个工作单元统计，并提供报告接口"""
+    from flask import g
+    from database.profiler import get_profiler
+
+    profiler = get_profiler()
+    if profiler is None:
+        return
+
+    @app.before_request
+    def _start_sql_unit():
+        g.sql_unit = profiler.unit(f"{request.method} {request.url_rule or request.path}")
+        g.sql_unit.__enter__()
+
+    @app.teardown_request
+    def _finish_sql_unit(exc):
+        unit = g.pop('sql_unit', None)
+        if unit is not None:
+            unit.__exit__(None, None, None)
+
+    @app.route('/api/debug/sql-profile')
+    def sql_profile():
+        """SQL语句统计报告"""
+        return app.response_class(profiler.report(), mimetype='text/plain')
+
+
 def register_routes(app, config):
     """注册路由"""
 
@@ -91,7 +120,7 @@ def register_routes(app, config):
             page = int(request.args.get('page', 1))
             per_page = int(request.args.get('per_page', 20))
 
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session(market) as session:
                 # 查询股票
                 query = session.query(StockInfo).filter_by(market=market, is_active=True)
                 total = query.count()
@@ -128,12 +157,13 @@ def register_routes(app, config):
         """获取股票详情"""
         try:
             from database import get_db_manager
-            from database.models import StockInfo, DailyData
+            from database import load_bars
+            from database.models import StockInfo
             from datetime import datetime, timedelta
 
             db_manager = get_db_manager()
 
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session(db_manager.market_of(symbol)) as session:
                 # 查询股票信息
                 stock = session.query(StockInfo).filter_by(symbol=symbol).first()
                 if not stock:
@@ -146,11 +176,8 @@ def register_routes(app, config):
                 end_date = datetime.now().date()
                 start_date = end_date - timedelta(days=30)
 
-                daily_data = session.query(DailyData).filter(
-                    DailyData.symbol == symbol,
-                    DailyData.trade_date >= start_date,
-                    DailyData.trade_date <= end_date
-                ).order_by(DailyData.trade_date).all()
+                daily_data = load_bars(db_manager, [symbol], start_date=start_date, end_date=end_date)
+                daily_data = daily_data.astype(object).where(daily_data.notna(), None)
 
                 return jsonify({
                     'success': True,
@@ -171,7 +198,7 @@ def register_routes(app, config):
                                 'close': d.close,
                                 'volume': d.volume
                             }
-                            for d in daily_data
+                            for d in daily_data.itertuples(index=False)
                         ]
                     }
                 })
@@ -187,7 +214,8 @@ def register_routes(app, config):
         """获取股票K线数据（含技术指标）"""
         try:
             from database import get_db_manager
-            from database.models import StockInfo, DailyData, TechnicalIndicator
+            from database import load_bars
+            from database.models import StockInfo
             from datetime import datetime, timedelta
 
             db_manager = get_db_manager()
@@ -195,7 +223,7 @@ def register_routes(app, config):
             # 获取查询参数
             days = int(request.args.get('days', 90))  # 默认90天
 
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session(db_manager.market_of(symbol)) as session:
                 # 查询股票信息
                 stock = session.query(StockInfo).filter_by(symbol=symbol).first()
                 if not stock:
@@ -204,58 +232,29 @@ def register_routes(app, config):
                         'error': '股票不存在'
                     }), 404
 
-                # 查询K线数据
+                # 查询K线数据（左联结技术指标）
                 end_date = datetime.now().date()
                 start_date = end_date - timedelta(days=days)
 
-                daily_data = session.query(DailyData).filter(
-                    DailyData.symbol == symbol,
-                    DailyData.trade_date >= start_date,
-                    DailyData.trade_date <= end_date
-                ).order_by(DailyData.trade_date).all()
+                bar_columns = ['open', 'high', 'low', 'close', 'volume']
+                indicator_columns = ['ma5', 'ma10', 'ma20', 'ma60', 'macd', 'macd_signal', 'macd_hist', 'rsi',
+                                     'kdj_k', 'kdj_d', 'kdj_j', 'boll_upper', 'boll_middle', 'boll_lower']
+                bars = load_bars(db_manager, [symbol], columns=bar_columns, indicator_columns=indicator_columns,
+                                 start_date=start_date, end_date=end_date)
 
-                # 查询技术指标
-                indicators = session.query(TechnicalIndicator).filter(
-                    TechnicalIndicator.symbol == symbol,
-                    TechnicalIndicator.trade_date >= start_date,
-                    TechnicalIndicator.trade_date <= end_date
-                ).order_by(TechnicalIndicator.trade_date).all()
+                # 组合数据（空值和0均返回None）
+                values = bars[bar_columns + indicator_columns].astype(float)
+                values = values.astype(object).where(values.notna() & (values != 0), None)
+                has_indicators = bars['has_indicators'].to_numpy()
 
-                # 构建指标字典（按日期索引）
-                indicator_dict = {ind.trade_date: ind for ind in indicators}
-
-                # 组合数据
                 kline_data = []
-                for d in daily_data:
-                    ind = indicator_dict.get(d.trade_date)
-
-                    item = {
-                        'date': d.trade_date.isoformat(),
-                        'open': float(d.open) if d.open else None,
-                        'high': float(d.high) if d.high else None,
-                        'low': float(d.low) if d.low else None,
-                        'close': float(d.close) if d.close else None,
-                        'volume': float(d.volume) if d.volume else None,
-                    }
+                for i, row in enumerate(values.to_dict('records')):
+                    item = {'date': bars['trade_date'].iat[i].isoformat()}
+                    item.update({col: row[col] for col in bar_columns})
 
                     # 添加技术指标
-                    if ind:
-                        item.update({
-                            'ma5': float(ind.ma5) if ind.ma5 else None,
-                            'ma10': float(ind.ma10) if ind.ma10 else None,
-                            'ma20': float(ind.ma20) if ind.ma20 else None,
-                            'ma60': float(ind.ma60) if ind.ma60 else None,
-                            'macd': float(ind.macd) if ind.macd else None,
-                            'macd_signal': float(ind.macd_signal) if ind.macd_signal else None,
-                            'macd_hist': float(ind.macd_hist) if ind.macd_hist else None,
-                            'rsi': float(ind.rsi) if ind.rsi else None,
-                            'kdj_k': float(ind.kdj_k) if ind.kdj_k else None,
-                            'kdj_d': float(ind.kdj_d) if ind.kdj_d else None,
-                            'kdj_j': float(ind.kdj_j) if ind.kdj_j else None,
-                            'boll_upper': float(ind.boll_upper) if ind.boll_upper else None,
-                            'boll_middle': float(ind.boll_middle) if ind.boll_middle else None,
-                            'boll_lower': float(ind.boll_lower) if ind.boll_lower else None,
-                        })
+                    if has_indicators[i]:
+                        item.update({col: row[col] for col in indicator_columns})
 
                     kline_data.append(item)
 
@@ -297,7 +296,7 @@ def register_routes(app, config):
             else:
                 selection_date = datetime.now().date()
 
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session(market) as session:
                 # 查询选股结果（按市场过滤）
                 selections = session.query(StockSelection, StockInfo).join(
                     StockInfo, StockSelection.symbol == StockInfo.symbol
@@ -342,12 +341,13 @@ def register_routes(app, config):
         """获取股票买卖信号"""
         try:
             from database import get_db_manager
-            from database.models import StockInfo, DailyData, TechnicalIndicator
+            from database import load_universe_panel, to_kline_records
+            from database.models import StockInfo
             from analysis.trading_signals import TradingSignalAnalyzer
 
             db_manager = get_db_manager()
 
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session(db_manager.market_of(symbol)) as session:
                 # 获取股票信息
                 stock = session.query(StockInfo).filter_by(symbol=symbol).first()
                 if not stock:
@@ -356,58 +356,19 @@ def register_routes(app, config):
                         'error': f'股票 {symbol} 不存在'
                     }), 404
 
-                # 获取K线数据和技术指标
-                query = session.query(
-                    DailyData, TechnicalIndicator
-                ).outerjoin(
-                    TechnicalIndicator,
-                    (DailyData.symbol == TechnicalIndicator.symbol) &
-                    (DailyData.trade_date == TechnicalIndicator.trade_date)
-                ).filter(
-                    DailyData.symbol == symbol
-                ).order_by(
-                    DailyData.trade_date
-                )
-
-                results = query.all()
+                # 获取K线数据和技术指标（列式读取，不构造ORM对象）
+                panel = load_universe_panel(db_manager, symbols=[symbol], lookback=None, active_only=False)
 
-                if not results:
+                if panel.empty:
                     return jsonify({
                         'success': False,
                         'error': f'股票 {symbol} 没有数据'
                     }), 404
 
                 # 转换为字典列表
-                kline_data = []
-                for daily, indicator in results:
-                    data = {
-                        'date': daily.trade_date.strftime('%Y-%m-%d'),
-                        'open': daily.open,
-                        'high': daily.high,
-                        'low': daily.low,
-                        'close': daily.close,
-                        'volume': daily.volume
-                    }
-
-                    if indicator:
-                        data.update({
-                            'ma5': indicator.ma5,
-                            'ma10': indicator.ma10,
-                            'ma20': indicator.ma20,
-                            'ma60': indicator.ma60,
-                            'macd': indicator.macd,
-                            'signal': indicator.macd_signal,
-                            'rsi': indicator.rsi,
-                            'kdj_k': indicator.kdj_k,
-                            'kdj_d': indicator.kdj_d,
-                            'kdj_j': indicator.kdj_j,
-                            'boll_upper': indicator.boll_upper,
-                            'boll_middle': indicator.boll_middle,
-                            'boll_lower': indicator.boll_lower,
-                            'atr': indicator.atr
-                        })
-
-                    kline_data.append(data)
+                kline_data = to_kline_records(panel)
+                for data in kline_data:
+                    data['date'] = data['date'].strftime('%Y-%m-%d')
 
                 # 创建分析器
                 analyzer = TradingSignalAnalyzer(kline_data)
@@ -443,18 +404,10 @@ def register_routes(app, config):
     DEFAULT_INITIAL_CASH = 1000000.0
     DEFAULT_SLIPPAGE = 0.003       # 0.3%
 
-    def _get_latest_price(session, symbol: str):
-        from database.models import DailyData
-        row = (
-            session.query(DailyData)
-            .filter(DailyData.symbol == symbol)
-            .order_by(DailyData.trade_date.desc())
-            .first()
-        )
-        return row.close if row else None
-
     def _get_portfolio_state(session):
-        from database.models import Position, PortfolioSnapshot, DailyData
+        from database import get_db_manager
+        from database.models import Position, PortfolioSnapshot
+        from database.latest_bars import load_latest_prices
         # 取最近快照
         snapshot = (
             session.query(PortfolioSnapshot)
@@ -462,11 +415,12 @@ def register_routes(app, config):
             .first()
         )
         cash = snapshot.cash if snapshot else DEFAULT_INITIAL_CASH
-        # 计算当前持仓市值
+        # 计算当前持仓市值（一次读取最新行情快照）
         positions = session.query(Position).all()
+        prices = load_latest_prices(get_db_manager(), [p.symbol for p in positions])
         equity = 0.0
         for p in positions:
-            last_price = _get_latest_price(session, p.symbol) or p.avg_price or 0.0
+            last_price = prices.get(p.symbol) or p.avg_price or 0.0
             equity += (p.quantity or 0) * (last_price or 0.0)
         total_value = cash + equity
         return cash, equity, total_value
@@ -548,7 +502,7 @@ def register_routes(app, config):
             from database import get_db_manager
             from database.models import Position
             db_manager = get_db_manager()
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session() as session:
                 rows = session.query(Position).all()
                 data = [
                     {
@@ -570,7 +524,7 @@ def register_routes(app, config):
             from database import get_db_manager
             from database.models import Order
             db_manager = get_db_manager()
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session() as session:
                 rows = (
                     session.query(Order)
                     .order_by(Order.created_at.desc())
@@ -602,7 +556,7 @@ def register_routes(app, config):
             from database import get_db_manager
             from database.models import PortfolioSnapshot
             db_manager = get_db_manager()
-            with db_manager.get_session() as session:
+            with db_manager.get_read_session() as session:
                 cash, equity, total_value = _get_portfolio_state(session)
                 initial = DEFAULT_INITIAL_CASH
                 from datetime import datetime as _d